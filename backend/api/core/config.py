@@ -1,7 +1,7 @@
 """Application configuration settings."""
 
 from functools import lru_cache
-from typing import List
+from typing import List, Literal
 
 from pydantic_settings import BaseSettings
 
@@ -10,26 +10,89 @@ class Settings(BaseSettings):
     """Application settings loaded from environment variables."""
 
     DATABASE_URL: str = "sqlite:///uni_pilot.db"
+    DB_AUTO_MIGRATE: bool = True  # run database/migrations on startup (new tables, columns, indexes)
 
     AWS_REGION: str = "us-east-1"
     AWS_ACCESS_KEY_ID: str | None = None
     AWS_SECRET_ACCESS_KEY: str | None = None
     BEDROCK_MODEL_CHAT: str = "anthropic.claude-3-haiku-20240307-v1:0"
     BEDROCK_MODEL_ROADMAP: str = "anthropic.claude-3-sonnet-20240229-v1:0"
+    BEDROCK_ENDPOINT_URL: str | None = None  # e.g. the local fake Bedrock server of the load tests
+
+    # LLM backend: "bedrock" (AWS) or "emulator" (local, no credentials; for benchmarks and soak tests)
+    LLM_BACKEND: Literal["bedrock", "emulator"] = "bedrock"
+    LLM_EMULATOR_LATENCY_MS: float = 300.0  # time to first token
+    LLM_EMULATOR_JITTER_MS: float = 100.0
+    LLM_EMULATOR_TOKENS_PER_SECOND: float = 50.0  # streaming rate (0 = no delay)
+    LLM_EMULATOR_THROTTLE_RATE: float = 0.0  # share of calls failing with ThrottlingException
+    LLM_EMULATOR_TRUNCATE_RATE: float = 0.0  # share of replies cut off at max_tokens
 
     # JWT Configuration
     SECRET_KEY: str = "your-secret-key-change-in-production"  # Should be set via env var
     ALGORITHM: str = "HS256"
     ACCESS_TOKEN_EXPIRE_MINUTES: int = 1440  # 24 hours for simplicity
+    AUTH_PRINCIPAL_CACHE_SIZE: int = 10000  # authenticated users kept in memory (0 disables)
+    AUTH_PRINCIPAL_CACHE_TTL_SECONDS: float = 60.0
+    # bcrypt runs in a bounded worker pool so logins do not block the event loop
+    PASSWORD_HASH_WORKERS: int = 0  # 0 = one per CPU core
+    PASSWORD_HASH_MAX_QUEUE: int = 64  # waiting hash/verify calls before requests get 503
 
     # CORS Configuration
     CORS_ORIGINS: List[str] = ["*"]  # In production, specify exact origins
 
     # LLM Settings
-    MAX_CHAT_HISTORY_MESSAGES: int = 20
+    MAX_CHAT_HISTORY_MESSAGES: int = 20  # upper bound; the token budget usually limits the history first
+    CHAT_CONTEXT_TOKEN_BUDGET: int = 3000  # estimated tokens for summary + history + current message
+    CHAT_SUMMARY_MAX_TOKENS: int = 400  # length of the rolling summary of older turns
+    CHAT_HISTORY_CACHE_SIZE: int = 1024  # sessions whose recent history is kept in memory (0 disables)
+    CHAT_HISTORY_CACHE_TTL_SECONDS: float = 600.0
+    # Opt-in cache of first-turn answers per topic field/job (similar questions skip the LLM)
+    CHAT_RESPONSE_CACHE_ENABLED: bool = False
+    CHAT_RESPONSE_CACHE_THRESHOLD: float = 0.8  # trigram similarity (0-1) needed for a hit
+    CHAT_RESPONSE_CACHE_TTL_SECONDS: float = 86400.0
+    CHAT_RESPONSE_CACHE_SIZE: int = 2048
     CHAT_TEMPERATURE: float = 0.7
     ROADMAP_TEMPERATURE: float = 0.1
 
+    # LLM Concurrency (blocking Bedrock calls run in a bounded worker pool)
+    LLM_MAX_CONCURRENCY: int = 16  # raised to LLM_MAX_INFLIGHT if lower, so an admitted call never waits for a thread
+    LLM_CLIENT_POOL_SIZE: int = 1  # boto3 clients are thread-safe; >1 spreads load over several HTTP pools
+    BEDROCK_MAX_POOL_CONNECTIONS: int = 32
+    BEDROCK_CONNECT_TIMEOUT: int = 10  # seconds
+    BEDROCK_READ_TIMEOUT: int = 120  # seconds (roadmap generation can take a while)
+    # Anthropic prompt caching (cache_control on stable prompt blocks); only enable for models that support it
+    BEDROCK_PROMPT_CACHING: bool = False
+
+    # LLM Resilience (retries with jittered backoff, per-model circuit breakers, in-flight limit)
+    LLM_RETRY_MAX_ATTEMPTS: int = 3  # attempts per call for throttled/transient Bedrock errors
+    LLM_RETRY_BASE_DELAY: float = 0.5  # seconds before the first retry, doubled per retry (full jitter)
+    LLM_RETRY_MAX_DELAY: float = 8.0  # upper bound of a single backoff
+    LLM_CIRCUIT_FAILURE_THRESHOLD: int = 5  # consecutive failures that open a model's breaker
+    LLM_CIRCUIT_RESET_SECONDS: float = 30.0  # breaker stays open this long before a probe call
+    LLM_MAX_INFLIGHT: int = 16  # concurrent Bedrock calls incl. open streams across the process (0 = unlimited)
+    LLM_ACQUIRE_TIMEOUT: float = 5.0  # seconds a call may wait for a slot before it gets a 503
+
+    # Roadmap Job Queue (roadmap generation runs in background workers)
+    ROADMAP_JOB_WORKERS: int = 2
+    ROADMAP_JOB_STALE_SECONDS: int = 1800  # RUNNING jobs older than this are resumed on startup (crashed process)
+
+    # Single-flight roadmap generation (cross-process lock rows in SQLite)
+    GENERATION_LOCK_TTL: int = 300  # seconds before a lock of a crashed process can be taken over (renewed while running)
+    GENERATION_LOCK_POLL_INTERVAL: float = 0.5  # seconds between checks while another process generates
+
+    # SQLite tuning (pragmas are applied to every new connection)
+    SQLITE_JOURNAL_MODE: Literal["WAL", "DELETE", "TRUNCATE", "PERSIST", "MEMORY"] = "WAL"
+    SQLITE_SYNCHRONOUS: Literal["OFF", "NORMAL", "FULL", "EXTRA"] = "NORMAL"  # NORMAL is durable enough in WAL mode
+    SQLITE_BUSY_TIMEOUT_MS: int = 5000  # wait this long for the write lock before "database is locked"
+    SQLITE_CACHE_SIZE: int = -64000  # page cache per connection (negative = KiB, i.e. 64 MB)
+    SQLITE_MMAP_SIZE: int = 268435456  # bytes of the database file to memory-map (256 MB)
+    SQLITE_FOREIGN_KEYS: bool = True
+    SQLITE_POOL_SIZE: int = 8  # connections kept open (readers run concurrently with the writer in WAL mode)
+    SQLITE_MAX_OVERFLOW: int = 8
+    SQLITE_POOL_TIMEOUT: int = 30  # seconds to wait for a free connection
+    SQLITE_READ_POOL_SIZE: int = 8  # read-only connections for GET endpoints (get_read_db)
+    SQLITE_READ_MAX_OVERFLOW: int = 8
+
     # Logging
     LOG_LEVEL: str = "INFO"
 
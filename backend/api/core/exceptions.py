@@ -42,6 +42,14 @@ class LLMError(UniPilotException):
     pass
 
 
+class ServiceUnavailableError(UniPilotException):
+    """Temporarily overloaded; the client should retry later."""
+
+    def __init__(self, message: str, error_code: str = None, retry_after: int = 1):
+        super().__init__(message, error_code)
+        self.retry_after = retry_after
+
+
 class CredentialException(HTTPException):
     """Custom exception for authentication/authorization errors."""
 
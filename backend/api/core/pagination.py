@@ -0,0 +1,101 @@
+"""Keyset (cursor) pagination helpers."""
+
+import base64
+import binascii
+import json
+from typing import Any, List, Optional, Tuple
+
+from sqlalchemy import String, literal, tuple_, type_coerce
+from sqlalchemy.orm import Query
+
+from api.core.exceptions import ValidationError
+
+# Response header carrying the cursor of the next page for endpoints returning plain lists
+NEXT_CURSOR_HEADER = "X-Next-Cursor"
+
+
+def encode_cursor(sort_value: str, row_id: int) -> str:
+    """
+    Encode the position after a row as an opaque cursor.
+
+    Args:
+        sort_value: Sort column value as stored in SQLite (raw text)
+        row_id: Row ID (tie-breaker)
+
+    Returns:
+        URL-safe cursor string
+    """
+    payload = json.dumps([sort_value, row_id], separators=(",", ":")).encode()
+    return base64.urlsafe_b64encode(payload).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str) -> Tuple[str, int]:
+    """
+    Decode a cursor created by encode_cursor().
+
+    Raises:
+        ValidationError: If the cursor is malformed
+    """
+    try:
+        payload = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4))
+        sort_value, row_id = json.loads(payload)
+    except (binascii.Error, UnicodeDecodeError, ValueError, TypeError):
+        raise ValidationError("Invalid pagination cursor", "INVALID_CURSOR")
+    if not isinstance(sort_value, str) or not isinstance(row_id, int):
+        raise ValidationError("Invalid pagination cursor", "INVALID_CURSOR")
+    return sort_value, row_id
+
+
+def keyset_paginate(
+    query: Query,
+    sort_column: Any,
+    id_column: Any,
+    limit: int,
+    cursor: Optional[str] = None,
+    offset: int = 0,
+    descending: bool = False,
+) -> Tuple[List[Any], Optional[str]]:
+    """
+    Fetch one page of an ORM query ordered by (sort_column, id_column).
+
+    The cursor compares against the raw stored text of sort_column: SQLite keeps
+    timestamps as text and mixes formats (CURRENT_TIMESTAMP has no fractional
+    seconds, Python datetimes do), so the comparison must use the same values as
+    ORDER BY. With a matching (..., sort_column) index the page is an index range
+    scan, so its cost does not grow with the position in the result.
+
+    Args:
+        query: Query selecting a single entity (filters applied, no ordering)
+        sort_column: Timestamp column to order by (e.g. created_at)
+        id_column: Primary key column (tie-breaker)
+        limit: Page size
+        cursor: Cursor returned with the previous page (None for the first page)
+        offset: Additional offset (kept for offset-based clients)
+        descending: Newest first
+
+    Returns:
+        Tuple of (rows, next_cursor); next_cursor is None on the last page
+    """
+    raw_sort = type_coerce(sort_column, String)
+    query = query.add_columns(raw_sort)
+
+    if cursor:
+        sort_value, row_id = decode_cursor(cursor)
+        position = tuple_(literal(sort_value, String), literal(row_id))
+        key = tuple_(raw_sort, id_column)
+        query = query.filter(key < position if descending else key > position)
+
+    if descending:
+        query = query.order_by(sort_column.desc(), id_column.desc())
+    else:
+        query = query.order_by(sort_column.asc(), id_column.asc())
+
+    rows = query.offset(offset).limit(limit + 1).all()
+    has_more = len(rows) > limit
+    rows = rows[:limit]
+
+    next_cursor = None
+    if has_more:
+        last_entity, last_sort_value = rows[-1]
+        next_cursor = encode_cursor(last_sort_value, last_entity.id)
+    return [row[0] for row in rows], next_cursor
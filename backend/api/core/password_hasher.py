@@ -0,0 +1,137 @@
+"""Bounded worker pool for bcrypt password hashing and verification."""
+
+import asyncio
+import logging
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Dict, Optional, TypeVar
+
+from api.core.config import get_settings
+from api.core.exceptions import ServiceUnavailableError
+from api.core.security import hash_password, verify_password
+
+logger = logging.getLogger(__name__)
+settings = get_settings()
+
+T = TypeVar("T")
+
+
+class PasswordHasher:
+    """
+    Runs bcrypt off the event loop in a pool sized to the CPU cores.
+
+    bcrypt releases the GIL while hashing, so worker threads use all cores
+    without the pickling overhead of a process pool. The number of calls that
+    may wait for a worker is bounded: when the queue is full, new calls fail
+    fast with ServiceUnavailableError (503) instead of piling up latency for
+    every login behind them.
+    """
+
+    def __init__(self, max_workers: Optional[int] = None, max_queue: Optional[int] = None):
+        """
+        Initialize the pool.
+
+        Args:
+            max_workers: Worker threads (defaults to config; 0 = one per CPU core)
+            max_queue: Calls allowed to wait for a free worker (defaults to config)
+        """
+        workers = max_workers if max_workers is not None else settings.PASSWORD_HASH_WORKERS
+        self.max_workers = workers if workers > 0 else (os.cpu_count() or 1)
+        self.max_queue = max(0, max_queue if max_queue is not None else settings.PASSWORD_HASH_MAX_QUEUE)
+        self.executor = ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix="bcrypt")
+        self._lock = threading.Lock()
+        self._pending = 0
+        self._stats = {"completed": 0, "rejected": 0}
+
+    def _acquire(self) -> None:
+        with self._lock:
+            if self._pending >= self.max_workers + self.max_queue:
+                self._stats["rejected"] += 1
+                raise ServiceUnavailableError("Too many login requests, please retry shortly", "HASHING_BUSY")
+            self._pending += 1
+
+    def _release(self, _future: Any = None) -> None:
+        with self._lock:
+            self._pending -= 1
+            self._stats["completed"] += 1
+
+    async def run(self, func: Callable[..., T], *args: Any) -> T:
+        """
+        Run a CPU-bound call in the pool.
+
+        Args:
+            func: Blocking function
+            *args: Positional arguments for func
+
+        Returns:
+            Result of func
+
+        Raises:
+            ServiceUnavailableError: If the pool and its queue are full
+        """
+        self._acquire()
+        try:
+            future = self.executor.submit(func, *args)
+        except BaseException:
+            self._release()
+            raise
+        # Release on completion, not on await: a cancelled request still occupies its worker
+        future.add_done_callback(self._release)
+        return await asyncio.wrap_future(future)
+
+    async def hash(self, password: str) -> str:
+        """Hash a password (see security.hash_password)."""
+        return await self.run(hash_password, password)
+
+    async def verify(self, plain_password: str, hashed_password: str) -> bool:
+        """Verify a password against a hash (see security.verify_password)."""
+        return await self.run(verify_password, plain_password, hashed_password)
+
+    def stats(self) -> Dict[str, int]:
+        """Return pool size, queue limit, in-flight calls and counters."""
+        with self._lock:
+            return {
+                "max_workers": self.max_workers,
+                "max_queue": self.max_queue,
+                "pending": self._pending,
+                **self._stats,
+            }
+
+    def close(self) -> None:
+        """Wait for in-flight calls and stop the workers."""
+        self.executor.shutdown(wait=True)
+
+
+_hasher: Optional[PasswordHasher] = None
+_hasher_lock = threading.Lock()
+
+
+def init_password_hasher(**kwargs: Any) -> PasswordHasher:
+    """Create the process-wide hashing pool (called from the application lifespan)."""
+    global _hasher
+    with _hasher_lock:
+        if _hasher is None:
+            _hasher = PasswordHasher(**kwargs)
+            logger.info(
+                f"Password hashing pool started (max_workers={_hasher.max_workers}, "
+                f"max_queue={_hasher.max_queue})"
+            )
+        return _hasher
+
+
+def get_password_hasher() -> PasswordHasher:
+    """Get the process-wide hashing pool, creating it if the lifespan has not run (scripts, tests)."""
+    if _hasher is None:
+        return init_password_hasher()
+    return _hasher
+
+
+def close_password_hasher() -> None:
+    """Close the process-wide hashing pool (called on application shutdown)."""
+    global _hasher
+    with _hasher_lock:
+        hasher, _hasher = _hasher, None
+    if hasher is not None:
+        hasher.close()
+        logger.info("Password hashing pool closed")
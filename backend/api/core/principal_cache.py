@@ -0,0 +1,128 @@
+"""In-process cache of authenticated principals."""
+
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Dict, Optional, Tuple
+
+from sqlalchemy import event
+
+from api.core.config import get_settings
+from database.models import User
+
+settings = get_settings()
+
+# (user_id, token iat); tokens issued before iat was added have iat None
+PrincipalKey = Tuple[int, Optional[int]]
+
+
+@dataclass(frozen=True)
+class AuthenticatedUser:
+    """
+    Snapshot of the authenticated user (no password hash, not bound to a session).
+
+    Routes that only need the user's identity depend on this instead of the ORM
+    User, so a cached principal serves the request without a database query.
+    """
+
+    id: int
+    email: str
+    first_name: str
+    last_name: str
+    created_at: datetime
+
+    @classmethod
+    def from_user(cls, user: User) -> "AuthenticatedUser":
+        """Create a snapshot of a User row."""
+        return cls(
+            id=user.id,
+            email=user.email,
+            first_name=user.first_name,
+            last_name=user.last_name,
+            created_at=user.created_at,
+        )
+
+
+class PrincipalCache:
+    """
+    Size-bounded LRU cache of principals keyed by (user_id, token iat) with a short TTL.
+
+    Entries of a user are dropped when the user row is updated (e.g. password
+    change) or deleted through the ORM; changes made by other processes are
+    picked up once the TTL expires.
+    """
+
+    def __init__(self, max_entries: Optional[int] = None, ttl_seconds: Optional[float] = None):
+        """
+        Initialize the cache.
+
+        Args:
+            max_entries: Maximum number of cached principals (defaults to config, 0 disables caching)
+            ttl_seconds: Seconds a principal is served without a database lookup (defaults to config)
+        """
+        self.max_entries = max_entries if max_entries is not None else settings.AUTH_PRINCIPAL_CACHE_SIZE
+        self.ttl_seconds = ttl_seconds if ttl_seconds is not None else settings.AUTH_PRINCIPAL_CACHE_TTL_SECONDS
+        self._lock = threading.Lock()
+        self._entries: "OrderedDict[PrincipalKey, Tuple[AuthenticatedUser, float]]" = OrderedDict()
+        self._stats = {"hits": 0, "misses": 0}
+
+    def get(self, user_id: int, iat: Optional[int]) -> Optional[AuthenticatedUser]:
+        """Get the cached principal for a token, or None if missing or expired."""
+        key = (user_id, iat)
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None or entry[1] <= time.monotonic():
+                if entry is not None:
+                    del self._entries[key]
+                self._stats["misses"] += 1
+                return None
+            self._entries.move_to_end(key)
+            self._stats["hits"] += 1
+            return entry[0]
+
+    def set(self, iat: Optional[int], principal: AuthenticatedUser) -> None:
+        """Cache the principal resolved for a token."""
+        if self.max_entries <= 0:
+            return
+        key = (principal.id, iat)
+        with self._lock:
+            self._entries[key] = (principal, time.monotonic() + self.ttl_seconds)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def invalidate_user(self, user_id: int) -> None:
+        """Drop all cached principals of a user (all tokens)."""
+        with self._lock:
+            for key in [key for key in self._entries if key[0] == user_id]:
+                del self._entries[key]
+
+    def clear(self) -> None:
+        """Drop all cached principals."""
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self) -> Dict[str, int]:
+        """Return hit and miss counters and the current size."""
+        with self._lock:
+            return {**self._stats, "size": len(self._entries)}
+
+
+_cache: Optional[PrincipalCache] = None
+
+
+def get_principal_cache() -> PrincipalCache:
+    """Get the process-wide principal cache, creating it if needed."""
+    global _cache
+    if _cache is None:
+        _cache = PrincipalCache()
+    return _cache
+
+
+@event.listens_for(User, "after_update")
+@event.listens_for(User, "after_delete")
+def _invalidate_changed_user(mapper, connection, target: User) -> None:
+    """Deleted users and changed credentials must not authenticate from the cache."""
+    get_principal_cache().invalidate_user(target.id)
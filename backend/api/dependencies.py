@@ -1,49 +1,89 @@
-"""FastAPI dependencies for authentication and database."""
+"""FastAPI dependencies for authentication, database and LLM access."""
+
+from typing import Optional, Tuple
 
 from fastapi import Depends, HTTPException, status
 from fastapi.security import OAuth2PasswordBearer
 from sqlalchemy.orm import Session
 
 from api.core.exceptions import CredentialException
+from api.core.principal_cache import AuthenticatedUser, get_principal_cache
 from api.core.security import decode_token
-from database.base import get_db
+from api.services.llm_registry import get_llm_registry
+from api.services.llm_service import LLMService
+from database.base import get_db, get_read_db
 from database.models import User
 
 # OAuth2 scheme for token extraction
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl="api/v1/auth/login")
 
 
-async def get_current_user(
+def _token_subject(token: str) -> Tuple[int, Optional[int]]:
+    """
+    Decode a token into (user_id, iat).
+
+    Raises:
+        CredentialException: If the token is invalid or has no subject
+    """
+    try:
+        payload = decode_token(token)
+        user_id_str = payload.get("sub")
+        if user_id_str is None:
+            raise CredentialException()
+        # Convert string back to int (jose requires sub to be string)
+        return int(user_id_str), payload.get("iat")
+    except Exception:
+        raise CredentialException()
+
+
+async def get_current_principal(
     token: str = Depends(oauth2_scheme),
-    db: Session = Depends(get_db),
-) -> User:
+    db: Session = Depends(get_read_db),
+) -> AuthenticatedUser:
     """
-    Dependency to get the current authenticated user from JWT token.
+    Dependency to get the authenticated user without loading the ORM User.
+
+    Principals are cached per (user_id, token iat) for a short TTL, so
+    authentication does not query the database on every request. The session
+    is only used on a cache miss; routes that need more than the principal's
+    fields load the User row themselves.
 
     Args:
         token: JWT token from Authorization header
-        db: Database session
+        db: Read-only database session
 
     Returns:
-        User object
+        AuthenticatedUser snapshot
 
     Raises:
         HTTPException: If token is invalid or user not found
     """
+    user_id, iat = _token_subject(token)
+    cache = get_principal_cache()
+    principal = cache.get(user_id, iat)
+    if principal is not None:
+        return principal
+
     try:
-        payload = decode_token(token)
-        user_id_str = payload.get("sub")
+        user = db.query(User).filter(User.id == user_id).first()
+    except Exception:
+        raise CredentialException()
+    if user is None:
+        raise CredentialException()
 
-        if user_id_str is None:
-            raise CredentialException()
+    principal = AuthenticatedUser.from_user(user)
+    cache.set(iat, principal)
+    return principal
 
-        # Convert string back to int (jose requires sub to be string)
-        user_id = int(user_id_str)
 
-        user = db.query(User).filter(User.id == user_id).first()
-        if user is None:
-            raise CredentialException()
+def get_llm_service() -> LLMService:
+    """
+    Dependency to get the shared LLM service.
 
-        return user
-    except Exception:
-        raise CredentialException()
+    The service and its Bedrock clients live in the process-wide LLMClientRegistry
+    (created in the application lifespan), so requests never construct clients.
+
+    Returns:
+        Shared LLMService instance
+    """
+    return get_llm_registry().get_service()
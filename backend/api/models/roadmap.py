@@ -7,7 +7,7 @@ from typing import List, Optional
 
 from pydantic import BaseModel, field_validator
 
-from database.models import RoadmapItemType
+from database.models import RoadmapItemType, RoadmapJobStatus
 
 
 class TopSkill(BaseModel):
@@ -136,6 +136,23 @@ class RoadmapTreeResponse(BaseModel):
         from_attributes = True
 
 
+class RoadmapJobResponse(BaseModel):
+    """Background roadmap generation job (poll until status is DONE or FAILED)."""
+
+    id: int
+    topic_field_id: int
+    career_tree_node_id: Optional[int] = None
+    status: RoadmapJobStatus
+    roadmap_id: Optional[int] = None
+    error: Optional[str] = None
+    created_at: datetime
+    started_at: Optional[datetime] = None
+    finished_at: Optional[datetime] = None
+
+    class Config:
+        from_attributes = True
+
+
 class UserRoadmapItemProgressResponse(BaseModel):
     """User progress on a roadmap item."""
 
@@ -172,6 +189,9 @@ class RoadmapProgressResponse(BaseModel):
 def parse_skill_data_from_description(description: Optional[str]) -> Optional[dict]:
     """
     Parse skill_impact from description field using placeholders.
+
+    Legacy format: new roadmaps store skill_impact in roadmap_item_skills. Only used
+    to migrate old data (database/migrations/normalize_skill_data.py).
     
     Args:
         description: Description string that may contain skill data
@@ -199,6 +219,9 @@ def parse_skill_data_from_description(description: Optional[str]) -> Optional[di
 def parse_current_skills_from_description(description: Optional[str]) -> Optional[List[TopSkill]]:
     """
     Parse current_skills from roadmap description field using placeholders.
+
+    Legacy format: new roadmaps store current_skills in roadmap_current_skills. Only
+    used to migrate old data (database/migrations/normalize_skill_data.py).
     
     Args:
         description: Roadmap description string that may contain current_skills data
@@ -61,6 +61,7 @@ class UserProfileResponse(BaseModel):
     updated_at: datetime
     university: Optional[UniversityResponse] = None
     study_program: Optional[StudyProgramResponse] = None
+    roadmap_job_id: Optional[int] = None  # Set when selecting a job queued roadmap generation
 
     class Config:
         from_attributes = True
@@ -171,4 +172,5 @@ class PaginatedUserQuestionsResponse(BaseModel):
     total: int
     limit: int
     offset: int
+    next_cursor: Optional[str] = None  # pass as ?cursor= to get the next page (None on the last page)
 
@@ -1,6 +1,8 @@
 """Chat prompt templates for topic field and job conversations."""
 
-from database.models import CareerTreeNode, TopicField
+from typing import List
+
+from database.models import CareerTreeNode, ChatMessage, TopicField
 
 
 def get_chat_system_prompt(topic_field: TopicField) -> str:
@@ -140,3 +142,38 @@ Erstelle jetzt eine ähnliche Begrüßung für "{job_name}":"""
 
     return prompt
 
+
+
+SUMMARY_SYSTEM_PROMPT = (
+    "Du fasst Beratungsgespräche zwischen Studierenden und einem Karriere-Assistenten knapp und sachlich zusammen."
+)
+
+
+def generate_chat_summary_prompt(previous_summary: str | None, messages: List[ChatMessage]) -> str:
+    """
+    Generate a prompt that folds older chat turns into the rolling conversation summary.
+
+    Args:
+        previous_summary: Summary of the turns before these messages (None if there is none yet)
+        messages: Chat messages to add to the summary (chronological)
+
+    Returns:
+        Prompt string for LLM to generate the updated summary
+    """
+    transcript = "\n".join(
+        f"{'Studierende/r' if message.role == 'user' else 'Assistent'}: {message.content}" for message in messages
+    )
+    previous = previous_summary or "(noch keine)"
+
+    return f"""Bisherige Zusammenfassung:
+{previous}
+
+Neue Gesprächsausschnitte:
+{transcript}
+
+Aktualisiere die Zusammenfassung, sodass sie beides abdeckt:
+- Interessen, Ziele, Vorwissen und Fragen der/des Studierenden
+- Wichtige Empfehlungen und Antworten des Assistenten
+- Offene Punkte
+
+Maximal 150 Wörter, auf Deutsch, als Fließtext. Antworte nur mit der Zusammenfassung."""
@@ -0,0 +1,38 @@
+"""Prompt blocks with prompt-caching checkpoints."""
+
+from dataclasses import dataclass
+from typing import Sequence, Union
+
+
+@dataclass(frozen=True)
+class PromptBlock:
+    """
+    One text block of a system prompt or user message.
+
+    Blocks with cache=True end a cacheable prefix: with prompt caching enabled,
+    the model provider reuses everything up to and including that block when a
+    later request starts with the same content. Stable blocks must therefore
+    come before request-specific ones.
+    """
+
+    text: str
+    cache: bool = False
+
+
+# A prompt is either plain text or a sequence of blocks (stable blocks first)
+Prompt = Union[str, Sequence[PromptBlock]]
+
+
+def prompt_text(prompt: Prompt) -> str:
+    """
+    Flatten a prompt into plain text.
+
+    Args:
+        prompt: Plain text or prompt blocks
+
+    Returns:
+        The blocks joined by blank lines (plain text is returned unchanged)
+    """
+    if isinstance(prompt, str):
+        return prompt
+    return "\n\n".join(block.text for block in prompt)
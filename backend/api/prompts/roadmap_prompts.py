@@ -1,8 +1,21 @@
-"""Roadmap generation prompt templates."""
+"""Roadmap generation prompt templates.
+
+Prompts are built from blocks ordered from most to least stable, so prompt
+caching can reuse the prefix across generations:
+
+1. Instructions and JSON schema (identical for every generation of a kind)
+2. Module catalog of the study program (identical for all its students)
+3. The request itself (user profile, completed modules, goal)
+"""
 
 import json
-from typing import List
+import threading
+from typing import Dict, Iterable, List, Tuple
 
+from sqlalchemy import event
+from sqlalchemy.orm import Session
+
+from api.prompts.prompt_blocks import PromptBlock
 from database.models import CareerTreeNode, Module, RoadmapItemType, StudyProgram, TopicField, UserProfile
 
 # JSON Schema for structured roadmap response
@@ -20,6 +33,10 @@ ROADMAP_JSON_SCHEMA = {
             "items": {
                 "type": "object",
                 "properties": {
+                    "id": {
+                        "type": "integer",
+                        "description": "Unique ID of this item within the response (1, 2, 3, ...)",
+                    },
                     "item_type": {
                         "type": "string",
                         "enum": [
@@ -54,7 +71,7 @@ ROADMAP_JSON_SCHEMA = {
                     },
                     "parent_id": {
                         "type": "integer",
-                        "description": "ID of parent item (null for root items)",
+                        "description": "id of the parent item within this response (null for root items)",
                         "nullable": True,
                     },
                     "level": {
@@ -116,6 +133,7 @@ ROADMAP_JSON_SCHEMA = {
                     },
                 },
                 "required": [
+                    "id",
                     "item_type",
                     "title",
                     "description",
@@ -152,91 +170,7 @@ ROADMAP_JSON_SCHEMA = {
 }
 
 
-def generate_roadmap_prompt(
-    study_program: StudyProgram,
-    user_profile: UserProfile,
-    topic_field: TopicField,
-    available_modules: List[Module],
-    completed_modules: List[Module] = None,
-) -> str:
-    """
-    Generate prompt for roadmap generation.
-
-    Args:
-        study_program: StudyProgram database model
-        user_profile: UserProfile database model
-        topic_field: TopicField database model
-        available_modules: List of available modules for the study program
-        completed_modules: List of completed modules for the user (optional)
-
-    Returns:
-        Prompt string for LLM
-    """
-    # Format modules as JSON for context
-    modules_data = []
-    for module in available_modules:
-        modules_data.append(
-            {
-                "id": module.id,
-                "name": module.name,
-                "description": module.description or "",
-                "type": module.module_type.value,
-                "semester": module.semester,
-            }
-        )
-
-    modules_json = json.dumps(modules_data, indent=2, ensure_ascii=False)
-
-    # Format completed modules for context
-    completed_modules_data = []
-    if completed_modules:
-        for module in completed_modules:
-            completed_modules_data.append(
-                {
-                    "id": module.id,
-                    "name": module.name,
-                    "description": module.description or "",
-                    "type": module.module_type.value,
-                    "semester": module.semester,
-                }
-            )
-    completed_modules_json = json.dumps(completed_modules_data, indent=2, ensure_ascii=False)
-
-    # Current semester calculation
-    current_semester = user_profile.current_semester or 1
-    target_semesters = current_semester + 4  # Plan for next 4 semesters
-
-    prompt = f"""Du bist ein Karriereberater für {study_program.name} Studierende.
-
-Erstelle eine detaillierte, hierarchische Roadmap für das Karriereziel: {topic_field.name}
-
-Kontext:
-- Studiengang: {study_program.name} ({study_program.degree_type or 'Bachelor'})
-- Aktuelles Semester: {current_semester}
-- Bereits vorhandene Skills: {user_profile.skills or "Keine angegeben"}
-- Themenfeld: {topic_field.name}
-- Beschreibung: {topic_field.description or "Keine Beschreibung verfügbar"}
-
-Abgeschlossene Module (bereits bestanden):
-{completed_modules_json if completed_modules_data else "Keine abgeschlossenen Module"}
-
-Verfügbare Module aus dem Modulhandbuch (noch NICHT abgeschlossen):
-{modules_json}
-
-WICHTIG: Diese Module sind noch nicht vom Studierenden abgeschlossen. 
-Die Roadmap sollte diese Module in die Planung einbeziehen, da sie noch zu absolvieren sind.
-
-WICHTIG - Die Roadmap muss eine HIERARCHISCHE STRUKTUR haben:
-1. Root-Level Items: Semester-Blöcke (z.B. "Semester {current_semester}", "Semester {current_semester + 1}")
-2. Child Items: Konkrete Lerninhalte (Module, Kurse, Skills, Projekte)
-3. Leaf Nodes: Berufe (item_type = "CAREER", is_leaf = true, is_career_goal = true)
-
-Struktur die Roadmap folgendermaßen:
-
-1. Zeitlich organisiert nach Semestern (bis Semester {target_semesters}) und Semesterferien
-2. Hierarchisch: Semester → Module/Skills → Beruf (Leaf Node)
-3. Integriere verfügbare Module aus dem Modulhandbuch (verwende die IDs aus obiger Liste)
-4. Empfehle zusätzliche Ressourcen:
+_RESOURCE_RULES = """4. Empfehle zusätzliche Ressourcen:
    - Bücher (item_type: "BOOK")
    - Online-Kurse (item_type: "COURSE")
    - Projekte (item_type: "PROJECT")
@@ -257,45 +191,71 @@ Struktur die Roadmap folgendermaßen:
    - Für Semesterferien: Verwende einen gültigen item_type (z.B. "COURSE", "PROJECT", "SKILL") 
      UND setze is_semester_break: true
    - "SEMESTER_BREAK" ist KEIN gültiger item_type!
-   - Beispiel: {{"item_type": "COURSE", "title": "Online-Kurs in Python", "semester": 2, "is_semester_break": true, "description": "Zeitliche Entlastung während der Semesterferien, Vorbereitung auf Module im nächsten Semester"}}
-
-7. WICHTIG: Die Endknoten (Leaf Nodes) müssen Berufe sein (item_type: "CAREER", is_career_goal: true)
-   - Z.B. "Full Stack Developer", "Data Scientist", etc.
-   - Diese sind die ZIELE der Roadmap
-   - Jeder Leaf Node MUSS ein "top_skills" Array enthalten mit den Top 5 Skills:
-     * Format: [{{"skill": "Skill-Name", "score": 85}}, ...]
-     * score: 0-100 (Wichtigkeit für diesen Beruf)
-     * Beispiel: {{"top_skills": [{{"skill": "Python", "score": 95}}, {{"skill": "Machine Learning", "score": 90}}, {{"skill": "Data Analysis", "score": 85}}, {{"skill": "Statistics", "score": 80}}, {{"skill": "SQL", "score": 75}}]}}
+   - Beispiel: {"item_type": "COURSE", "title": "Online-Kurs in Python", "semester": 2, "is_semester_break": true, "description": "Zeitliche Entlastung während der Semesterferien, Vorbereitung auf Module im nächsten Semester"}"""
 
-8. WICHTIG - skill_impact für ALLE Items:
+_SKILL_RULES = """8. WICHTIG - skill_impact für ALLE Items:
    - JEDES Roadmap-Item (nicht nur Leaf Nodes) MUSS ein "skill_impact" Array enthalten
-   - Format: [{{"skill": "Skill-Name", "impact": 15}}, ...]
+   - Format: [{"skill": "Skill-Name", "impact": 15}, ...]
    - impact: 0-100 (wie stark verbessert dieses Item den Skill beim Abschluss)
-   - Beispiel: {{"skill_impact": [{{"skill": "Python", "impact": 20}}, {{"skill": "Data Analysis", "impact": 15}}]}}
+   - Beispiel: {"skill_impact": [{"skill": "Python", "impact": 20}, {"skill": "Data Analysis", "impact": 15}]}
    - Die Skills in skill_impact sollten zu den Skills aus top_skills (Leaf Nodes) passen
 
 9. WICHTIG - current_skills (Ist-Zustand) berechnen:
    - Du MUSST ein "current_skills" Array im Root-Level der Roadmap berechnen
-   - Format: [{{"skill": "Skill-Name", "score": 45}}, ...]
+   - Format: [{"skill": "Skill-Name", "score": 45}, ...]
    - score: 0-100 (aktueller Skill-Level, KONSERVATIV bewerten)
-   - WICHTIG: Die Skill-Namen MÜSSEN GENAU mit den Skill-Namen aus "top_skills" der Leaf Nodes übereinstimmen (1:1 Mapping)
+   - WICHTIG: Die Skill-Namen MÜSSEN GENAU mit den Skill-Namen aus "top_skills" {leaf_nodes} übereinstimmen (1:1 Mapping)
    - Bewertungsgrundlage:
-     * Abgeschlossene Module (siehe oben)
-     * Initiale Skills aus UserProfile: {user_profile.skills or "Keine angegeben"}
+     * Abgeschlossene Module (siehe Anfrage)
+     * Bereits vorhandene Skills aus der Anfrage
    - Bewerte KONSERVATIV - nicht überoptimistisch
-   - Beispiel: Wenn top_skills = [{{"skill": "Python", "score": 95}}, ...], dann current_skills = [{{"skill": "Python", "score": 45}}, ...]
+   - Beispiel: Wenn top_skills = [{"skill": "Python", "score": 95}, ...], dann current_skills = [{"skill": "Python", "score": 45}, ...]"""
+
+_TOP_SKILLS_FORMAT = """     * Format: [{"skill": "Skill-Name", "score": 85}, ...]
+     * score: 0-100 (Wichtigkeit für diesen Beruf)
+     * Beispiel: {"top_skills": [{"skill": "Python", "score": 95}, {"skill": "Machine Learning", "score": 90}, {"skill": "Data Analysis", "score": 85}, {"skill": "Statistics", "score": 80}, {"skill": "SQL", "score": 75}]}"""
+
+# Serialized once; the schema never changes at runtime
+ROADMAP_JSON_SCHEMA_TEXT = json.dumps(ROADMAP_JSON_SCHEMA, indent=2, ensure_ascii=False)
+
+_SCHEMA_SECTION = "Gib die Antwort als JSON zurück mit folgendem Schema:\n" + ROADMAP_JSON_SCHEMA_TEXT
+
+# Stable instructions for topic field roadmaps (first prompt block, cached)
+ROADMAP_INSTRUCTIONS = f"""Du bist ein Karriereberater für Studierende und erstellst detaillierte, hierarchische Roadmaps.
+Am Ende dieser Nachricht stehen das Modulhandbuch des Studiengangs und die konkrete Anfrage.
+
+Die Roadmap sollte die noch NICHT abgeschlossenen Module aus dem Modulhandbuch in die Planung einbeziehen, da sie noch zu absolvieren sind.
+
+WICHTIG - Die Roadmap muss eine HIERARCHISCHE STRUKTUR haben:
+1. Root-Level Items: Semester-Blöcke ab dem aktuellen Semester (z.B. "Semester 3", "Semester 4")
+2. Child Items: Konkrete Lerninhalte (Module, Kurse, Skills, Projekte)
+3. Leaf Nodes: Berufe (item_type = "CAREER", is_leaf = true, is_career_goal = true)
 
-Struktur-Beispiel:
-- Semester {current_semester} (level=0, parent_id=null)
-  - Modul: Web Development (level=1, parent_id=<semester_id>)
-    - Skill: HTML/CSS (level=2, parent_id=<web_dev_id>)
-      - Full Stack Developer (level=3, parent_id=<skill_id>, is_leaf=true, is_career_goal=true, item_type="CAREER")
+Struktur die Roadmap folgendermaßen:
+
+1. Zeitlich organisiert nach Semestern (bis zum Zielsemester aus der Anfrage) und Semesterferien
+2. Hierarchisch: Semester → Module/Skills → Beruf (Leaf Node)
+3. Integriere verfügbare Module aus dem Modulhandbuch (verwende die IDs aus dem Modulhandbuch)
+{_RESOURCE_RULES}
 
-Gib die Antwort als JSON zurück mit folgendem Schema:
-{json.dumps(ROADMAP_JSON_SCHEMA, indent=2, ensure_ascii=False)}
+7. WICHTIG: Die Endknoten (Leaf Nodes) müssen Berufe sein (item_type: "CAREER", is_career_goal: true)
+   - Z.B. "Full Stack Developer", "Data Scientist", etc.
+   - Diese sind die ZIELE der Roadmap
+   - Jeder Leaf Node MUSS ein "top_skills" Array enthalten mit den Top 5 Skills:
+{_TOP_SKILLS_FORMAT}
+
+{_SKILL_RULES.replace("{leaf_nodes}", "der Leaf Nodes")}
+
+Struktur-Beispiel (aktuelles Semester 3):
+- Semester 3 (id=1, level=0, parent_id=null)
+  - Modul: Web Development (id=2, level=1, parent_id=1)
+    - Skill: HTML/CSS (id=3, level=2, parent_id=2)
+      - Full Stack Developer (id=4, level=3, parent_id=3, is_leaf=true, is_career_goal=true, item_type="CAREER")
+
+{_SCHEMA_SECTION}
 
 WICHTIG:
-- Alle Items müssen korrekt verschachtelt sein (parent_id referenziert korrekte IDs)
+- Jedes Item hat eine eindeutige "id" (fortlaufend ab 1); parent_id verweist auf die "id" des Eltern-Items
 - level muss korrekt sein (0 für Root, 1+ für verschachtelt)
 - Mindestens ein Leaf Node (Beruf) pro Hauptpfad
 - order: Sortierung bei Geschwister-Nodes (1, 2, 3, ...)
@@ -306,164 +266,270 @@ WICHTIG:
 
 Antworte NUR mit dem JSON, keine zusätzlichen Erklärungen."""
 
-    return prompt
+# Stable instructions for job roadmaps (first prompt block, cached)
+ROADMAP_INSTRUCTIONS_FOR_JOB = f"""Du bist ein Karriereberater für Studierende und erstellst detaillierte, hierarchische Roadmaps zu einem Zielberuf.
+Am Ende dieser Nachricht stehen das Modulhandbuch des Studiengangs und die konkrete Anfrage mit dem Zielberuf.
 
+Die Roadmap sollte die noch NICHT abgeschlossenen Module aus dem Modulhandbuch in die Planung einbeziehen, da sie noch zu absolvieren sind.
 
-def generate_roadmap_prompt_for_job(
+WICHTIG - Die Roadmap muss eine HIERARCHISCHE STRUKTUR haben:
+1. Root-Level Items: Semester-Blöcke ab dem aktuellen Semester (z.B. "Semester 3", "Semester 4")
+2. Child Items: Konkrete Lerninhalte (Module, Kurse, Skills, Projekte)
+3. Leaf Node: Der Zielberuf aus der Anfrage (item_type = "CAREER", is_leaf = true, is_career_goal = true)
+
+Struktur die Roadmap folgendermaßen:
+
+1. Zeitlich organisiert nach Semestern (bis zum Zielsemester aus der Anfrage) und Semesterferien
+2. Hierarchisch: Semester → Module/Skills → Beruf (Leaf Node: der Zielberuf)
+3. Integriere verfügbare Module aus dem Modulhandbuch (verwende die IDs aus dem Modulhandbuch)
+{_RESOURCE_RULES}
+
+7. WICHTIG: Der Endknoten (Leaf Node) muss der Zielberuf sein (item_type: "CAREER", is_career_goal: true)
+   - Dies ist das ZIEL der Roadmap
+   - Der Leaf Node MUSS ein "top_skills" Array enthalten mit den Top 5 Skills:
+{_TOP_SKILLS_FORMAT}
+
+{_SKILL_RULES.replace("{leaf_nodes}", "des Leaf Nodes")}
+
+Struktur-Beispiel (aktuelles Semester 3, Zielberuf "Data Scientist"):
+- Semester 3 (id=1, level=0, parent_id=null)
+  - Modul: Web Development (id=2, level=1, parent_id=1)
+    - Skill: HTML/CSS (id=3, level=2, parent_id=2)
+      - Data Scientist (id=4, level=3, parent_id=3, is_leaf=true, is_career_goal=true, item_type="CAREER")
+
+{_SCHEMA_SECTION}
+
+WICHTIG:
+- Jedes Item hat eine eindeutige "id" (fortlaufend ab 1); parent_id verweist auf die "id" des Eltern-Items
+- level muss korrekt sein (0 für Root, 1+ für verschachtelt)
+- Der Leaf Node muss der Zielberuf aus der Anfrage sein
+- order: Sortierung bei Geschwister-Nodes (1, 2, 3, ...)
+- semester: NIEMALS null - jeder Knoten braucht einen gültigen Semesterwert
+- top_skills: Für den Leaf Node (is_career_goal=true) - Array mit 5 Skills und Scores (0-100)
+- skill_impact: Für ALLE Items (nicht nur Leaf Nodes) - Array mit Skills und Impact-Scores (0-100)
+- current_skills: Im Root-Level der Roadmap - Array mit Skills und Scores (0-100), MUSS dieselben Skill-Namen wie top_skills haben
+
+Antworte NUR mit dem JSON, keine zusätzlichen Erklärungen."""
+
+
+def _module_data(module: Module) -> dict:
+    """Module fields shown to the LLM."""
+    return {
+        "id": module.id,
+        "name": module.name,
+        "description": module.description or "",
+        "type": module.module_type.value,
+        "semester": module.semester,
+    }
+
+
+# Formatted module catalogs keyed by (study_program_id, name, degree, module-set version).
+# Modules only change on import, so every generation for a study program reuses the same text.
+_CATALOG_CACHE_MAX_ENTRIES = 256
+_catalog_lock = threading.Lock()
+_catalog_cache: Dict[Tuple, str] = {}
+_catalog_generation = 0
+
+
+def invalidate_module_catalogs() -> None:
+    """Drop all cached module catalogs (called whenever Module rows change)."""
+    global _catalog_generation
+    with _catalog_lock:
+        _catalog_generation += 1
+        _catalog_cache.clear()
+
+
+def generate_module_catalog(study_program: StudyProgram, modules: Iterable[Module]) -> str:
+    """
+    Format the module catalog of a study program.
+
+    The text only depends on the study program and its modules (not on the
+    user), so it forms a cacheable prompt prefix shared by all its students.
+    It is memoized per study program and module-set version: changes to Module
+    rows made through the ORM invalidate all catalogs, and a different set of
+    module IDs (e.g. an import by another process) yields a new key.
+
+    Args:
+        study_program: StudyProgram database model
+        modules: All modules of the study program
+
+    Returns:
+        Catalog text for the prompt
+    """
+    ordered = sorted(modules, key=lambda module: (module.semester or 0, module.id))
+    with _catalog_lock:
+        key = (
+            study_program.id,
+            study_program.name,
+            study_program.degree_type,
+            _catalog_generation,
+            tuple(module.id for module in ordered),
+        )
+        cached = _catalog_cache.get(key)
+    if cached is not None:
+        return cached
+
+    modules_json = json.dumps([_module_data(module) for module in ordered], indent=2, ensure_ascii=False)
+    catalog = f"""Modulhandbuch {study_program.name} ({study_program.degree_type or 'Bachelor'}):
+{modules_json}"""
+
+    with _catalog_lock:
+        # Only store if no invalidation happened while formatting
+        if key[3] == _catalog_generation:
+            if len(_catalog_cache) >= _CATALOG_CACHE_MAX_ENTRIES:
+                _catalog_cache.clear()
+            _catalog_cache[key] = catalog
+    return catalog
+
+
+@event.listens_for(Module, "after_insert")
+@event.listens_for(Module, "after_update")
+@event.listens_for(Module, "after_delete")
+def _module_changed(mapper, connection, target: Module) -> None:
+    """Invalidate catalogs on flush and again on commit (readers may cache the old rows in between)."""
+    invalidate_module_catalogs()
+    session = Session.object_session(target)
+    if session is not None:
+        session.info["module_catalogs_dirty"] = True
+
+
+@event.listens_for(Session, "do_orm_execute")
+def _module_bulk_changed(orm_execute_state) -> None:
+    """Invalidate catalogs on bulk INSERT/UPDATE/DELETE statements on modules."""
+    if orm_execute_state.is_insert or orm_execute_state.is_update or orm_execute_state.is_delete:
+        if any(mapper.class_ is Module for mapper in orm_execute_state.all_mappers):
+            invalidate_module_catalogs()
+            orm_execute_state.session.info["module_catalogs_dirty"] = True
+
+
+@event.listens_for(Session, "after_commit")
+def _module_changes_committed(session: Session) -> None:
+    if session.info.pop("module_catalogs_dirty", False):
+        invalidate_module_catalogs()
+
+
+def _catalog_modules(
+    study_program: StudyProgram,
+    available_modules: List[Module],
+    completed_modules: List[Module],
+) -> List[Module]:
+    """All modules of the study program (available and completed ones)."""
+    modules = {module.id: module for module in available_modules}
+    for module in completed_modules:
+        if module.study_program_id == study_program.id:
+            modules.setdefault(module.id, module)
+    return list(modules.values())
+
+
+def _completed_modules_section(completed_modules: List[Module]) -> str:
+    """Completed modules of the user (request-specific)."""
+    if not completed_modules:
+        return "Keine abgeschlossenen Module"
+    return json.dumps(
+        [{"id": module.id, "name": module.name} for module in completed_modules], indent=2, ensure_ascii=False
+    )
+
+
+def generate_roadmap_prompt(
     study_program: StudyProgram,
     user_profile: UserProfile,
-    job: CareerTreeNode,
+    topic_field: TopicField,
     available_modules: List[Module],
     completed_modules: List[Module] = None,
-) -> str:
+) -> List[PromptBlock]:
     """
-    Generate prompt for roadmap generation based on a specific job.
+    Generate prompt for roadmap generation.
 
     Args:
         study_program: StudyProgram database model
         user_profile: UserProfile database model
-        job: CareerTreeNode database model (must be a leaf node)
+        topic_field: TopicField database model
         available_modules: List of available modules for the study program
         completed_modules: List of completed modules for the user (optional)
 
     Returns:
-        Prompt string for LLM
+        Prompt blocks for LLM (instructions, module catalog, request)
     """
-    # Format modules as JSON for context
-    modules_data = []
-    for module in available_modules:
-        modules_data.append(
-            {
-                "id": module.id,
-                "name": module.name,
-                "description": module.description or "",
-                "type": module.module_type.value,
-                "semester": module.semester,
-            }
-        )
-
-    modules_json = json.dumps(modules_data, indent=2, ensure_ascii=False)
-
-    # Format completed modules for context
-    completed_modules_data = []
-    if completed_modules:
-        for module in completed_modules:
-            completed_modules_data.append(
-                {
-                    "id": module.id,
-                    "name": module.name,
-                    "description": module.description or "",
-                    "type": module.module_type.value,
-                    "semester": module.semester,
-                }
-            )
-    completed_modules_json = json.dumps(completed_modules_data, indent=2, ensure_ascii=False)
+    completed_modules = completed_modules or []
 
     # Current semester calculation
     current_semester = user_profile.current_semester or 1
     target_semesters = current_semester + 4  # Plan for next 4 semesters
 
-    job_name = job.name
-    job_description = job.description or "Keine Beschreibung verfügbar"
-
-    prompt = f"""Du bist ein Karriereberater für {study_program.name} Studierende.
-
-Erstelle eine detaillierte, hierarchische Roadmap für den Beruf: {job_name}
+    request = f"""Anfrage: Erstelle eine detaillierte, hierarchische Roadmap für das Karriereziel: {topic_field.name}
 
 Kontext:
 - Studiengang: {study_program.name} ({study_program.degree_type or 'Bachelor'})
 - Aktuelles Semester: {current_semester}
+- Zielsemester: {target_semesters}
 - Bereits vorhandene Skills: {user_profile.skills or "Keine angegeben"}
-- Zielberuf: {job_name}
-- Berufsbeschreibung: {job_description}
-
-Abgeschlossene Module (bereits bestanden):
-{completed_modules_json if completed_modules_data else "Keine abgeschlossenen Module"}
-
-Verfügbare Module aus dem Modulhandbuch (noch NICHT abgeschlossen):
-{modules_json}
-
-WICHTIG: Diese Module sind noch nicht vom Studierenden abgeschlossen. 
-Die Roadmap sollte diese Module in die Planung einbeziehen, da sie noch zu absolvieren sind.
-
-WICHTIG - Die Roadmap muss eine HIERARCHISCHE STRUKTUR haben:
-1. Root-Level Items: Semester-Blöcke (z.B. "Semester {current_semester}", "Semester {current_semester + 1}")
-2. Child Items: Konkrete Lerninhalte (Module, Kurse, Skills, Projekte)
-3. Leaf Node: Der Zielberuf "{job_name}" (item_type = "CAREER", is_leaf = true, is_career_goal = true)
-
-Struktur die Roadmap folgendermaßen:
-
-1. Zeitlich organisiert nach Semestern (bis Semester {target_semesters}) und Semesterferien
-2. Hierarchisch: Semester → Module/Skills → Beruf (Leaf Node: {job_name})
-3. Integriere verfügbare Module aus dem Modulhandbuch (verwende die IDs aus obiger Liste)
-4. Empfehle zusätzliche Ressourcen:
-   - Bücher (item_type: "BOOK")
-   - Online-Kurse (item_type: "COURSE")
-   - Projekte (item_type: "PROJECT")
-   - Skills (item_type: "SKILL")
-   - Praktika (item_type: "INTERNSHIP")
-   - Bootcamps (item_type: "BOOTCAMP")
-   - Zertifikate (item_type: "CERTIFICATE")
+- Themenfeld: {topic_field.name}
+- Beschreibung: {topic_field.description or "Keine Beschreibung verfügbar"}
 
-5. WICHTIG - Semester darf NIEMALS null sein:
-   - JEDER Knoten (auch non-module nodes wie COURSE, PROJECT, SKILL, etc.) MUSS einen gültigen Semesterwert haben
-   - Für Knoten mit is_semester_break=true: Verwende das Semester, das der Semesterferien-Zeitraum zugeordnet ist
-     (z.B. wenn die Ferien zwischen Semester 2 und 3 liegen, verwende Semester 2 oder 3)
-   - Begründe in der description, warum dieses Semester für non-module nodes sinnvoll ist:
-     * Bei is_semester_break=true: Erkläre die zeitliche Entlastung, thematischen Übergang oder Vorbereitung auf spätere Module
-     * Bei is_semester_break=false: Erkläre die thematische Passung zu den Modulen dieses Semesters
+Abgeschlossene Module (bereits bestanden, NICHT mehr einplanen):
+{_completed_modules_section(completed_modules)}"""
 
-6. WICHTIG - item_type und is_semester_break:
-   - Für Semesterferien: Verwende einen gültigen item_type (z.B. "COURSE", "PROJECT", "SKILL") 
-     UND setze is_semester_break: true
-   - "SEMESTER_BREAK" ist KEIN gültiger item_type!
-   - Beispiel: {{"item_type": "COURSE", "title": "Online-Kurs in Python", "semester": 2, "is_semester_break": true, "description": "Zeitliche Entlastung während der Semesterferien, Vorbereitung auf Module im nächsten Semester"}}
+    return [
+        PromptBlock(ROADMAP_INSTRUCTIONS, cache=True),
+        PromptBlock(
+            generate_module_catalog(
+                study_program, _catalog_modules(study_program, available_modules, completed_modules)
+            ),
+            cache=True,
+        ),
+        PromptBlock(request),
+    ]
 
-7. WICHTIG: Der Endknoten (Leaf Node) muss der Beruf "{job_name}" sein (item_type: "CAREER", is_career_goal: true)
-   - Dies ist das ZIEL der Roadmap
-   - Der Leaf Node MUSS ein "top_skills" Array enthalten mit den Top 5 Skills:
-     * Format: [{{"skill": "Skill-Name", "score": 85}}, ...]
-     * score: 0-100 (Wichtigkeit für diesen Beruf)
-     * Beispiel: {{"top_skills": [{{"skill": "Python", "score": 95}}, {{"skill": "Machine Learning", "score": 90}}, {{"skill": "Data Analysis", "score": 85}}, {{"skill": "Statistics", "score": 80}}, {{"skill": "SQL", "score": 75}}]}}
 
-8. WICHTIG - skill_impact für ALLE Items:
-   - JEDES Roadmap-Item (nicht nur Leaf Nodes) MUSS ein "skill_impact" Array enthalten
-   - Format: [{{"skill": "Skill-Name", "impact": 15}}, ...]
-   - impact: 0-100 (wie stark verbessert dieses Item den Skill beim Abschluss)
-   - Beispiel: {{"skill_impact": [{{"skill": "Python", "impact": 20}}, {{"skill": "Data Analysis", "impact": 15}}]}}
-   - Die Skills in skill_impact sollten zu den Skills aus top_skills (Leaf Nodes) passen
+def generate_roadmap_prompt_for_job(
+    study_program: StudyProgram,
+    user_profile: UserProfile,
+    job: CareerTreeNode,
+    available_modules: List[Module],
+    completed_modules: List[Module] = None,
+) -> List[PromptBlock]:
+    """
+    Generate prompt for roadmap generation based on a specific job.
 
-9. WICHTIG - current_skills (Ist-Zustand) berechnen:
-   - Du MUSST ein "current_skills" Array im Root-Level der Roadmap berechnen
-   - Format: [{{"skill": "Skill-Name", "score": 45}}, ...]
-   - score: 0-100 (aktueller Skill-Level, KONSERVATIV bewerten)
-   - WICHTIG: Die Skill-Namen MÜSSEN GENAU mit den Skill-Namen aus "top_skills" des Leaf Nodes übereinstimmen (1:1 Mapping)
-   - Bewertungsgrundlage:
-     * Abgeschlossene Module (siehe oben)
-     * Initiale Skills aus UserProfile: {user_profile.skills or "Keine angegeben"}
-   - Bewerte KONSERVATIV - nicht überoptimistisch
-   - Beispiel: Wenn top_skills = [{{"skill": "Python", "score": 95}}, ...], dann current_skills = [{{"skill": "Python", "score": 45}}, ...]
+    Args:
+        study_program: StudyProgram database model
+        user_profile: UserProfile database model
+        job: CareerTreeNode database model (must be a leaf node)
+        available_modules: List of available modules for the study program
+        completed_modules: List of completed modules for the user (optional)
 
-Struktur-Beispiel:
-- Semester {current_semester} (level=0, parent_id=null)
-  - Modul: Web Development (level=1, parent_id=<semester_id>)
-    - Skill: HTML/CSS (level=2, parent_id=<web_dev_id>)
-      - {job_name} (level=3, parent_id=<skill_id>, is_leaf=true, is_career_goal=true, item_type="CAREER")
+    Returns:
+        Prompt blocks for LLM (instructions, module catalog, request)
+    """
+    completed_modules = completed_modules or []
 
-Gib die Antwort als JSON zurück mit folgendem Schema:
-{json.dumps(ROADMAP_JSON_SCHEMA, indent=2, ensure_ascii=False)}
+    # Current semester calculation
+    current_semester = user_profile.current_semester or 1
+    target_semesters = current_semester + 4  # Plan for next 4 semesters
 
-WICHTIG:
-- Alle Items müssen korrekt verschachtelt sein (parent_id referenziert korrekte IDs)
-- level muss korrekt sein (0 für Root, 1+ für verschachtelt)
-- Der Leaf Node muss der Beruf "{job_name}" sein
-- order: Sortierung bei Geschwister-Nodes (1, 2, 3, ...)
-- semester: NIEMALS null - jeder Knoten braucht einen gültigen Semesterwert
-- top_skills: Für den Leaf Node (is_career_goal=true) - Array mit 5 Skills und Scores (0-100)
-- skill_impact: Für ALLE Items (nicht nur Leaf Nodes) - Array mit Skills und Impact-Scores (0-100)
-- current_skills: Im Root-Level der Roadmap - Array mit Skills und Scores (0-100), MUSS dieselben Skill-Namen wie top_skills haben
+    job_name = job.name
+    job_description = job.description or "Keine Beschreibung verfügbar"
 
-Antworte NUR mit dem JSON, keine zusätzlichen Erklärungen."""
+    request = f"""Anfrage: Erstelle eine detaillierte, hierarchische Roadmap für den Beruf: {job_name}
 
-    return prompt
+Kontext:
+- Studiengang: {study_program.name} ({study_program.degree_type or 'Bachelor'})
+- Aktuelles Semester: {current_semester}
+- Zielsemester: {target_semesters}
+- Bereits vorhandene Skills: {user_profile.skills or "Keine angegeben"}
+- Zielberuf (Leaf Node): {job_name}
+- Berufsbeschreibung: {job_description}
 
+Abgeschlossene Module (bereits bestanden, NICHT mehr einplanen):
+{_completed_modules_section(completed_modules)}"""
+
+    return [
+        PromptBlock(ROADMAP_INSTRUCTIONS_FOR_JOB, cache=True),
+        PromptBlock(
+            generate_module_catalog(
+                study_program, _catalog_modules(study_program, available_modules, completed_modules)
+            ),
+            cache=True,
+        ),
+        PromptBlock(request),
+    ]
@@ -6,11 +6,11 @@ from typing import Optional
 from fastapi import APIRouter, Depends, HTTPException, Request, status
 from sqlalchemy.orm import Session
 
-from api.core.exceptions import AuthenticationError, ValidationError
-from api.dependencies import get_current_user, get_db
+from api.core.exceptions import AuthenticationError, ServiceUnavailableError, ValidationError
+from api.core.principal_cache import AuthenticatedUser
+from api.dependencies import get_current_principal, get_db, get_read_db
 from api.models.auth import TokenResponse, UserLogin, UserRegister, UserResponse
 from api.services.auth_service import AuthService
-from database.models import User
 
 logger = logging.getLogger(__name__)
 router = APIRouter(prefix="/api/v1/auth", tags=["auth"])
@@ -35,7 +35,7 @@ async def register_user(
         HTTPException: If email already exists or validation fails
     """
     try:
-        user = AuthService.register_user(
+        user = await AuthService.aregister_user(
             email=request.email,
             password=request.password,
             first_name=request.first_name,
@@ -48,8 +48,8 @@ async def register_user(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail=e.message,
         )
-    except HTTPException:
-        # Re-raise HTTP exceptions
+    except (HTTPException, ServiceUnavailableError):
+        # Re-raise HTTP exceptions and hashing backpressure (503)
         raise
     except Exception as e:
         # Log unexpected errors for debugging
@@ -118,7 +118,7 @@ async def login(
             )
     
     try:
-        user, token = AuthService.login_user(
+        user, token = await AuthService.alogin_user(
             email=email,
             password=password,
             db=db,
@@ -137,8 +137,8 @@ async def login(
 
 @router.get("/me", response_model=UserResponse)
 async def get_current_user_info(
-    current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db),
+    current_user: AuthenticatedUser = Depends(get_current_principal),
+    db: Session = Depends(get_read_db),
 ):
     """
     Get current authenticated user information.
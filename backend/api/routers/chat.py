@@ -1,17 +1,22 @@
 """Chat router."""
 
-from typing import List, Optional
+import json
+from typing import Any, AsyncIterator, Dict, List, Optional
 
-from fastapi import APIRouter, Depends, HTTPException, Query, status
+from fastapi import APIRouter, Depends, HTTPException, Query, Response, status
+from fastapi.responses import StreamingResponse
 from sqlalchemy.orm import Session
 
-from api.core.exceptions import NotFoundError
-from api.dependencies import get_current_user, get_db
+from api.core.exceptions import NotFoundError, UniPilotException
+from api.core.pagination import NEXT_CURSOR_HEADER
+from api.core.principal_cache import AuthenticatedUser
+from api.dependencies import get_current_principal, get_db, get_llm_service, get_read_db
 from api.models.career import CareerTreeNodeResponse
 from api.models.chat import ChatMessageCreate, ChatMessageResponse, ChatSendMessageResponse, ChatSessionResponse
 from api.services.career_service import CareerService
 from api.services.chat_service import ChatService
-from database.models import CareerTreeNode, TopicField, User
+from api.services.llm_service import LLMService
+from database.models import CareerTreeNode, TopicField
 
 router = APIRouter(prefix="/api/v1", tags=["chat"])
 
@@ -19,8 +24,9 @@ router = APIRouter(prefix="/api/v1", tags=["chat"])
 @router.post("/topic-fields/{topic_field_id}/chat/sessions", response_model=ChatSessionResponse, status_code=status.HTTP_201_CREATED)
 async def create_or_get_chat_session(
     topic_field_id: int,
-    current_user: User = Depends(get_current_user),
+    current_user: AuthenticatedUser = Depends(get_current_principal),
     db: Session = Depends(get_db),
+    llm_service: LLMService = Depends(get_llm_service),
 ):
     """
     Create or get chat session for a topic field.
@@ -29,6 +35,7 @@ async def create_or_get_chat_session(
         topic_field_id: Topic field ID
         current_user: Current authenticated user
         db: Database session
+        llm_service: Shared LLM service
 
     Returns:
         Chat session information
@@ -45,15 +52,14 @@ async def create_or_get_chat_session(
         )
 
     # Create ChatService instance to use instance method
-    chat_service = ChatService()
-    session = chat_service.get_or_create_topic_field_session(
+    chat_service = ChatService(llm_service=llm_service)
+    session = await chat_service.aget_or_create_topic_field_session(
         user_id=current_user.id,
         topic_field_id=topic_field_id,
         db=db,
     )
 
-    # Get message count
-    message_count = len(ChatService.get_messages(session.id, db=db))
+    message_count = ChatService.count_session_messages(session.id, db)
 
     return ChatSessionResponse(
         id=session.id,
@@ -77,8 +83,9 @@ async def create_or_get_chat_session(
 @router.post("/jobs/{job_id}/chat/sessions", response_model=ChatSessionResponse, status_code=status.HTTP_201_CREATED)
 async def create_or_get_job_chat_session(
     job_id: int,
-    current_user: User = Depends(get_current_user),
+    current_user: AuthenticatedUser = Depends(get_current_principal),
     db: Session = Depends(get_db),
+    llm_service: LLMService = Depends(get_llm_service),
 ):
     """
     Create or get chat session for a job.
@@ -87,6 +94,7 @@ async def create_or_get_job_chat_session(
         job_id: Career tree node ID (must be a leaf node)
         current_user: Current authenticated user
         db: Database session
+        llm_service: Shared LLM service
 
     Returns:
         Chat session information
@@ -99,15 +107,14 @@ async def create_or_get_job_chat_session(
         job = CareerService.get_job(job_id, db)
 
         # Create ChatService instance to use instance method
-        chat_service = ChatService()
-        session = chat_service.get_or_create_job_session(
+        chat_service = ChatService(llm_service=llm_service)
+        session = await chat_service.aget_or_create_job_session(
             user_id=current_user.id,
             job_id=job_id,
             db=db,
         )
 
-        # Get message count
-        message_count = len(ChatService.get_messages(session.id, db=db))
+        message_count = ChatService.count_session_messages(session.id, db)
 
         # Build job response
         job_response = CareerTreeNodeResponse(
@@ -139,18 +146,25 @@ async def create_or_get_job_chat_session(
 @router.get("/chat/sessions/{session_id}/messages", response_model=List[ChatMessageResponse])
 async def get_chat_messages(
     session_id: int,
+    response: Response,
     limit: int = Query(100, ge=1, le=1000),
     offset: int = Query(0, ge=0),
-    current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db),
+    cursor: Optional[str] = Query(None, description="Cursor from the X-Next-Cursor header of the previous page"),
+    current_user: AuthenticatedUser = Depends(get_current_principal),
+    db: Session = Depends(get_read_db),
 ):
     """
     Get chat messages for a session.
 
+    Pages are chained with the cursor: the X-Next-Cursor response header holds the
+    cursor of the next page and is absent on the last page.
+
     Args:
         session_id: Session ID
+        response: Response (for the X-Next-Cursor header)
         limit: Maximum number of messages
-        offset: Pagination offset
+        offset: Pagination offset (kept for backward compatibility; prefer cursor)
+        cursor: Keyset cursor of the previous page
         current_user: Current authenticated user
         db: Database session
 
@@ -164,7 +178,11 @@ async def get_chat_messages(
         # Verify session belongs to user
         ChatService.get_session(session_id, current_user.id, db)
 
-        messages = ChatService.get_messages(session_id, db=db, limit=limit, offset=offset)
+        messages, next_cursor = ChatService.get_messages_page(
+            session_id, db=db, limit=limit, offset=offset, cursor=cursor
+        )
+        if next_cursor:
+            response.headers[NEXT_CURSOR_HEADER] = next_cursor
         return [ChatMessageResponse.model_validate(msg) for msg in messages]
     except NotFoundError as e:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail=e.message)
@@ -174,8 +192,9 @@ async def get_chat_messages(
 async def send_chat_message(
     session_id: int,
     request: ChatMessageCreate,
-    current_user: User = Depends(get_current_user),
+    current_user: AuthenticatedUser = Depends(get_current_principal),
     db: Session = Depends(get_db),
+    llm_service: LLMService = Depends(get_llm_service),
 ):
     """
     Send a message in a chat session and get LLM response.
@@ -185,6 +204,7 @@ async def send_chat_message(
         request: Message content
         current_user: Current authenticated user
         db: Database session
+        llm_service: Shared LLM service
 
     Returns:
         User message and assistant response
@@ -211,8 +231,8 @@ async def send_chat_message(
             )
 
         # Send message
-        chat_service = ChatService()
-        user_message, assistant_message = chat_service.send_message(
+        chat_service = ChatService(llm_service=llm_service)
+        user_message, assistant_message = await chat_service.asend_message(
             session_id=session_id,
             user_message_content=request.content,
             topic_field=topic_field,
@@ -228,83 +248,133 @@ async def send_chat_message(
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail=e.message)
 
 
-@router.get("/users/me/chat/sessions", response_model=List[ChatSessionResponse])
-async def get_user_chat_sessions(
-    topic_field_id: Optional[int] = Query(None, description="Filter by topic field"),
-    limit: int = Query(100, ge=1, le=1000),
-    offset: int = Query(0, ge=0),
-    current_user: User = Depends(get_current_user),
+def _sse_event(event: str, data: Dict[str, Any]) -> str:
+    """Format one Server-Sent Event."""
+    return f"event: {event}\ndata: {json.dumps(data, ensure_ascii=False)}\n\n"
+
+
+async def _chat_event_stream(events: AsyncIterator[Dict[str, Any]]) -> AsyncIterator[str]:
+    """Translate chat service stream events into SSE frames."""
+    try:
+        async for event in events:
+            if event["type"] == "token":
+                yield _sse_event("token", {"text": event["text"]})
+            elif event["type"] == "done":
+                response = ChatSendMessageResponse(
+                    user_message=ChatMessageResponse.model_validate(event["user_message"]),
+                    assistant_message=ChatMessageResponse.model_validate(event["assistant_message"]),
+                )
+                yield _sse_event("done", response.model_dump(mode="json"))
+    except UniPilotException as e:
+        # Headers are already sent - report the failure in-band
+        yield _sse_event("error", {"detail": e.message})
+    except Exception:
+        yield _sse_event("error", {"detail": "Failed to generate response"})
+
+
+@router.post("/chat/sessions/{session_id}/messages/stream")
+async def stream_chat_message(
+    session_id: int,
+    request: ChatMessageCreate,
+    current_user: AuthenticatedUser = Depends(get_current_principal),
     db: Session = Depends(get_db),
+    llm_service: LLMService = Depends(get_llm_service),
 ):
     """
-    Get all chat sessions for current user.
+    Send a message in a chat session and stream the LLM response as Server-Sent Events.
+
+    Events:
+        token: {"text": "..."} for each generated text delta
+        done: user and assistant message (same shape as the non-streaming endpoint),
+            sent after the assembled reply has been persisted
+        error: {"detail": "..."} if generation fails after the stream started
 
     Args:
-        topic_field_id: Optional filter by topic field
-        limit: Maximum number of sessions
-        offset: Pagination offset
+        session_id: Session ID
+        request: Message content
         current_user: Current authenticated user
         db: Database session
+        llm_service: Shared LLM service
 
     Returns:
-        List of chat sessions
+        text/event-stream response
+
+    Raises:
+        HTTPException: If session not found or access denied
     """
-    from database.models import ChatSession
+    try:
+        # Verify session belongs to user
+        session = ChatService.get_session(session_id, current_user.id, db)
 
-    query = db.query(ChatSession).filter(ChatSession.user_id == current_user.id)
+        # Get topic field and/or job
+        topic_field = None
+        job = None
+        if session.topic_field_id:
+            topic_field = db.query(TopicField).filter(TopicField.id == session.topic_field_id).first()
+        if session.career_tree_node_id:
+            job = db.query(CareerTreeNode).filter(CareerTreeNode.id == session.career_tree_node_id).first()
+
+        if not topic_field and not job:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail=f"Topic field or job for session {session_id} not found",
+            )
 
-    if topic_field_id:
-        query = query.filter(ChatSession.topic_field_id == topic_field_id)
+        chat_service = ChatService(llm_service=llm_service)
+        events = chat_service.stream_message(
+            session_id=session_id,
+            user_message_content=request.content,
+            topic_field=topic_field,
+            job=job,
+            db=db,
+        )
+    except NotFoundError as e:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail=e.message)
 
-    sessions = query.order_by(ChatSession.updated_at.desc()).offset(offset).limit(limit).all()
+    return StreamingResponse(
+        _chat_event_stream(events),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
 
-    result = []
-    for session in sessions:
-        # Get message count
-        message_count = len(ChatService.get_messages(session.id, db=db))
 
-        # Get topic field
-        topic_field = db.query(TopicField).filter(TopicField.id == session.topic_field_id).first()
+@router.get("/users/me/chat/sessions", response_model=List[ChatSessionResponse])
+async def get_user_chat_sessions(
+    response: Response,
+    topic_field_id: Optional[int] = Query(None, description="Filter by topic field"),
+    limit: int = Query(100, ge=1, le=1000),
+    offset: int = Query(0, ge=0),
+    cursor: Optional[str] = Query(None, description="Cursor from the X-Next-Cursor header of the previous page"),
+    current_user: AuthenticatedUser = Depends(get_current_principal),
+    db: Session = Depends(get_read_db),
+):
+    """
+    Get all chat sessions for current user (most recently updated first).
 
-        # Get job if session has career_tree_node_id
-        job_response = None
-        if session.career_tree_node_id:
-            job = db.query(CareerTreeNode).filter(CareerTreeNode.id == session.career_tree_node_id).first()
-            if job:
-                job_response = CareerTreeNodeResponse(
-                    id=job.id,
-                    name=job.name,
-                    description=job.description,
-                    is_leaf=job.is_leaf,
-                    level=job.level,
-                    topic_field=None,
-                    questions=None,
-                    children=[],
-                )
+    The X-Next-Cursor response header holds the cursor of the next page and is
+    absent on the last page.
 
-        result.append(
-            ChatSessionResponse(
-                id=session.id,
-                user_id=session.user_id,
-                topic_field_id=session.topic_field_id,
-                career_tree_node_id=session.career_tree_node_id,
-                created_at=session.created_at,
-                updated_at=session.updated_at,
-                topic_field=(
-                    {
-                        "id": topic_field.id,
-                        "name": topic_field.name,
-                        "description": topic_field.description,
-                        "system_prompt": topic_field.system_prompt,
-                        "created_at": topic_field.created_at,
-                    }
-                    if topic_field
-                    else None
-                ),
-                job=job_response,
-                message_count=message_count,
-            )
-        )
+    Args:
+        response: Response (for the X-Next-Cursor header)
+        topic_field_id: Optional filter by topic field
+        limit: Maximum number of sessions
+        offset: Pagination offset (kept for backward compatibility; prefer cursor)
+        cursor: Keyset cursor of the previous page
+        current_user: Current authenticated user
+        db: Database session
 
-    return result
+    Returns:
+        List of chat sessions
+    """
+    sessions, next_cursor = ChatService.list_sessions(
+        user_id=current_user.id,
+        db=db,
+        topic_field_id=topic_field_id,
+        limit=limit,
+        offset=offset,
+        cursor=cursor,
+    )
+    if next_cursor:
+        response.headers[NEXT_CURSOR_HEADER] = next_cursor
+    return sessions
 
@@ -3,7 +3,7 @@
 from fastapi import APIRouter, Depends
 from sqlalchemy.orm import Session
 
-from database.base import get_db
+from database.base import get_read_db
 
 router = APIRouter(prefix="/api/v1", tags=["example"])
 
@@ -24,7 +24,7 @@ async def api_info():
 
 
 @router.get("/example")
-async def example_endpoint(db: Session = Depends(get_db)):
+async def example_endpoint(db: Session = Depends(get_read_db)):
     """Example endpoint demonstrating database dependency injection."""
     
     return {
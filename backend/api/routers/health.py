@@ -2,6 +2,10 @@
 
 from fastapi import APIRouter
 
+from api.services.llm_registry import get_llm_registry
+from api.services.llm_service import get_llm_usage_metrics
+from api.services.roadmap_pipeline import get_stage_metrics
+
 router = APIRouter()
 
 
@@ -17,6 +21,24 @@ async def health_check():
     }
 
 
+@router.get("/health/llm")
+async def llm_health():
+    """LLM client registry statistics (client and connection reuse)."""
+    return get_llm_registry().stats()
+
+
+@router.get("/health/llm-usage")
+async def llm_usage_health():
+    """Token usage per model since startup, including prompt-cache reads and writes."""
+    return get_llm_usage_metrics().snapshot()
+
+
+@router.get("/health/roadmap-pipeline")
+async def roadmap_pipeline_health():
+    """Per-stage timings of roadmap generations since startup."""
+    return get_stage_metrics().snapshot()
+
+
 @router.get("/version")
 async def get_version():
     """Get API version."""
@@ -5,7 +5,7 @@ from typing import List, Optional
 from fastapi import APIRouter, Depends, HTTPException, Query, status
 from sqlalchemy.orm import Session
 
-from api.dependencies import get_db
+from api.dependencies import get_read_db
 from api.models.user import ModuleResponse, PaginatedModulesResponse
 from database.models import Module, ModuleType, StudyProgram
 
@@ -19,7 +19,7 @@ async def get_modules_by_study_program(
     semester: Optional[int] = Query(None, description="Filter by recommended semester"),
     limit: int = Query(100, ge=1, le=1000),
     offset: int = Query(0, ge=0),
-    db: Session = Depends(get_db),
+    db: Session = Depends(get_read_db),
 ):
     """
     Get all modules for a study program.
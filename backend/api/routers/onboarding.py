@@ -6,14 +6,16 @@ from typing import List, Optional
 from fastapi import APIRouter, Depends, HTTPException, Query, status
 from sqlalchemy.orm import Session
 
-from api.core.exceptions import LLMError, NotFoundError
-from api.dependencies import get_current_user, get_db
+from api.core.exceptions import NotFoundError, ValidationError
+from api.core.pagination import keyset_paginate
+from api.core.principal_cache import AuthenticatedUser
+from api.dependencies import get_current_principal, get_db, get_read_db
 from api.models.career import CareerTreeResponse, JobSelectRequest, TopicFieldResponse, TopicFieldSelectRequest, UserQuestionCreate
 from api.models.user import PaginatedStudyProgramsResponse, PaginatedUniversitiesResponse, StudyProgramResponse, UniversityResponse, UserProfileResponse
 from api.services.career_service import CareerService
-from api.services.roadmap_service import RoadmapService
+from api.services.roadmap_job_queue import RoadmapJobQueue, get_roadmap_job_queue
 from api.services.user_service import UserService
-from database.models import StudyProgram, University, User
+from database.models import StudyProgram, University
 
 logger = logging.getLogger(__name__)
 router = APIRouter(prefix="/api/v1", tags=["onboarding"])
@@ -24,7 +26,7 @@ async def get_universities(
     search: Optional[str] = Query(None, description="Search term for name or abbreviation"),
     limit: int = Query(100, ge=1, le=1000),
     offset: int = Query(0, ge=0),
-    db: Session = Depends(get_db),
+    db: Session = Depends(get_read_db),
 ):
     """
     Get all available universities.
@@ -61,7 +63,7 @@ async def get_universities(
 async def get_study_programs_by_university(
     university_id: int,
     degree_type: Optional[str] = Query(None, description="Filter by degree type"),
-    db: Session = Depends(get_db),
+    db: Session = Depends(get_read_db),
 ):
     """
     Get all study programs for a university.
@@ -100,7 +102,7 @@ async def get_study_programs_by_university(
 @router.get("/study-programs/{study_program_id}/career-tree", response_model=CareerTreeResponse)
 async def get_career_tree(
     study_program_id: int,
-    db: Session = Depends(get_db),
+    db: Session = Depends(get_read_db),
 ):
     """
     Get career tree (Themenfelder-Tree) for a study program.
@@ -131,7 +133,7 @@ async def get_topic_fields(
     search: Optional[str] = Query(None, description="Search term"),
     limit: int = Query(100, ge=1, le=1000),
     offset: int = Query(0, ge=0),
-    db: Session = Depends(get_db),
+    db: Session = Depends(get_read_db),
 ):
     """
     Get all available topic fields.
@@ -163,7 +165,7 @@ async def get_topic_fields(
 @router.get("/topic-fields/{topic_field_id}", response_model=TopicFieldResponse)
 async def get_topic_field(
     topic_field_id: int,
-    db: Session = Depends(get_db),
+    db: Session = Depends(get_read_db),
 ):
     """
     Get topic field by ID.
@@ -188,7 +190,7 @@ async def get_topic_field(
 @router.put("/users/me/profile/topic-field", response_model=UserProfileResponse)
 async def select_topic_field(
     request: TopicFieldSelectRequest,
-    current_user: User = Depends(get_current_user),
+    current_user: AuthenticatedUser = Depends(get_current_principal),
     db: Session = Depends(get_db),
 ):
     """
@@ -219,23 +221,26 @@ async def select_topic_field(
 @router.put("/users/me/profile/job", response_model=UserProfileResponse)
 async def select_job(
     request: JobSelectRequest,
-    current_user: User = Depends(get_current_user),
+    current_user: AuthenticatedUser = Depends(get_current_principal),
     db: Session = Depends(get_db),
+    roadmap_job_queue: RoadmapJobQueue = Depends(get_roadmap_job_queue),
 ):
     """
     Select job for current user (after career tree navigation).
-    Automatically generates a roadmap for the selected job.
+    Queues roadmap generation for the selected job; poll
+    GET /api/v1/roadmap-jobs/{roadmap_job_id} for its status.
 
     Args:
         request: Job selection request
         current_user: Current authenticated user
         db: Database session
+        roadmap_job_queue: Background roadmap generation queue
 
     Returns:
-        Updated user profile
+        Updated user profile (with roadmap_job_id if generation was queued)
 
     Raises:
-        HTTPException: If job not found, not a leaf node, or roadmap generation fails
+        HTTPException: If job not found or not a leaf node
     """
     try:
         # Select job
@@ -245,24 +250,19 @@ async def select_job(
             db=db,
         )
 
-        # Automatically generate roadmap for the selected job
+        response = UserProfileResponse.model_validate(profile)
+
+        # Queue roadmap generation for the selected job (runs in the background)
         if profile.study_program_id:
             try:
                 job = CareerService.get_job(request.job_id, db)
-                study_program = db.query(StudyProgram).filter(StudyProgram.id == profile.study_program_id).first()
-                if study_program:
-                    roadmap_service = RoadmapService()
-                    roadmap_service.generate_roadmap_for_job(
-                        user_profile=profile,
-                        job=job,
-                        study_program=study_program,
-                        db=db,
-                    )
-            except (LLMError, NotFoundError) as e:
+                roadmap_job = roadmap_job_queue.enqueue_for_job(current_user.id, job, db)
+                response.roadmap_job_id = roadmap_job.id
+            except (ValidationError, NotFoundError) as e:
                 # Log error but don't fail the job selection
-                logger.warning(f"Failed to auto-generate roadmap for job {request.job_id}: {e}")
+                logger.warning(f"Failed to queue roadmap generation for job {request.job_id}: {e}")
 
-        return UserProfileResponse.model_validate(profile)
+        return response
     except NotFoundError as e:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail=e.message)
 
@@ -270,7 +270,7 @@ async def select_job(
 @router.post("/users/me/questions", status_code=status.HTTP_201_CREATED)
 async def create_user_question(
     request: UserQuestionCreate,
-    current_user: User = Depends(get_current_user),
+    current_user: AuthenticatedUser = Depends(get_current_principal),
     db: Session = Depends(get_db),
 ):
     """
@@ -305,16 +305,18 @@ async def get_user_questions(
     career_tree_node_id: Optional[int] = Query(None, description="Filter by career tree node"),
     limit: int = Query(100, ge=1, le=1000),
     offset: int = Query(0, ge=0),
-    current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db),
+    cursor: Optional[str] = Query(None, description="next_cursor of the previous page"),
+    current_user: AuthenticatedUser = Depends(get_current_principal),
+    db: Session = Depends(get_read_db),
 ):
     """
-    Get all user questions.
+    Get all user questions (newest first).
 
     Args:
         career_tree_node_id: Optional filter by career tree node
         limit: Maximum number of results
-        offset: Pagination offset
+        offset: Pagination offset (kept for backward compatibility; prefer cursor)
+        cursor: Keyset cursor (next_cursor of the previous page)
         current_user: Current authenticated user
         db: Database session
 
@@ -330,12 +332,21 @@ async def get_user_questions(
         query = query.filter(UserQuestion.career_tree_node_id == career_tree_node_id)
 
     total = query.count()
-    questions = query.order_by(UserQuestion.created_at.desc()).offset(offset).limit(limit).all()
+    questions, next_cursor = keyset_paginate(
+        query,
+        UserQuestion.created_at,
+        UserQuestion.id,
+        limit=limit,
+        cursor=cursor,
+        offset=offset,
+        descending=True,
+    )
 
     return PaginatedUserQuestionsResponse(
         items=[UserQuestionResponse.model_validate(q) for q in questions],
         total=total,
         limit=limit,
         offset=offset,
+        next_cursor=next_cursor,
     )
 
@@ -0,0 +1,39 @@
+"""Roadmap jobs router (status of background roadmap generation)."""
+
+from fastapi import APIRouter, Depends, HTTPException, status
+from sqlalchemy.orm import Session
+
+from api.core.exceptions import NotFoundError
+from api.core.principal_cache import AuthenticatedUser
+from api.dependencies import get_current_principal, get_read_db
+from api.models.roadmap import RoadmapJobResponse
+from api.services.roadmap_job_queue import RoadmapJobQueue
+
+router = APIRouter(prefix="/api/v1", tags=["roadmaps"])
+
+
+@router.get("/roadmap-jobs/{roadmap_job_id}", response_model=RoadmapJobResponse)
+async def get_roadmap_job(
+    roadmap_job_id: int,
+    current_user: AuthenticatedUser = Depends(get_current_principal),
+    db: Session = Depends(get_read_db),
+):
+    """
+    Get the status of a background roadmap generation job.
+
+    Args:
+        roadmap_job_id: Roadmap job ID
+        current_user: Current authenticated user
+        db: Database session
+
+    Returns:
+        Roadmap job status (roadmap_id is set once the job is DONE)
+
+    Raises:
+        HTTPException: If job not found or not owned by the user
+    """
+    try:
+        roadmap_job = RoadmapJobQueue.get_job(roadmap_job_id, current_user.id, db)
+        return RoadmapJobResponse.model_validate(roadmap_job)
+    except NotFoundError as e:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail=e.message)
@@ -6,12 +6,14 @@ from fastapi import APIRouter, Depends, HTTPException, status
 from sqlalchemy.orm import Session
 
 from api.core.exceptions import LLMError, NotFoundError
-from api.dependencies import get_current_user, get_db
+from api.core.principal_cache import AuthenticatedUser
+from api.dependencies import get_current_principal, get_db, get_llm_service
 from api.models.roadmap import RoadmapResponse
 from api.services.career_service import CareerService
+from api.services.llm_service import LLMService
 from api.services.roadmap_service import RoadmapService
 from api.services.user_service import UserService
-from database.models import StudyProgram, TopicField, User
+from database.models import StudyProgram, TopicField
 
 logger = logging.getLogger(__name__)
 router = APIRouter(prefix="/api/v1/topic-fields", tags=["roadmaps"])
@@ -20,8 +22,9 @@ router = APIRouter(prefix="/api/v1/topic-fields", tags=["roadmaps"])
 @router.post("/{topic_field_id}/roadmap", response_model=RoadmapResponse)
 async def get_or_generate_roadmap(
     topic_field_id: int,
-    current_user: User = Depends(get_current_user),
+    current_user: AuthenticatedUser = Depends(get_current_principal),
     db: Session = Depends(get_db),
+    llm_service: LLMService = Depends(get_llm_service),
 ):
     """
     Get existing roadmap for a topic field, or generate a new one if it doesn't exist.
@@ -30,6 +33,7 @@ async def get_or_generate_roadmap(
         topic_field_id: Topic field ID
         current_user: Current authenticated user
         db: Database session
+        llm_service: Shared LLM service
 
     Returns:
         Existing or newly generated roadmap with hierarchical tree structure
@@ -79,8 +83,8 @@ async def get_or_generate_roadmap(
 
     # Generate roadmap
     try:
-        roadmap_service = RoadmapService()
-        roadmap = roadmap_service.generate_roadmap(
+        roadmap_service = RoadmapService(llm_service=llm_service)
+        roadmap = await roadmap_service.agenerate_roadmap(
             user_profile=profile,
             topic_field=topic_field,
             study_program=study_program,
@@ -102,8 +106,9 @@ async def get_or_generate_roadmap(
 @router.post("/jobs/{job_id}/roadmap", response_model=RoadmapResponse)
 async def get_or_generate_roadmap_for_job(
     job_id: int,
-    current_user: User = Depends(get_current_user),
+    current_user: AuthenticatedUser = Depends(get_current_principal),
     db: Session = Depends(get_db),
+    llm_service: LLMService = Depends(get_llm_service),
 ):
     """
     Get existing roadmap for a specific job, or generate a new one if it doesn't exist.
@@ -115,6 +120,7 @@ async def get_or_generate_roadmap_for_job(
         job_id: Career tree node ID (must be a leaf node)
         current_user: Current authenticated user
         db: Database session
+        llm_service: Shared LLM service
 
     Returns:
         Existing or newly generated roadmap with hierarchical tree structure
@@ -141,5 +147,6 @@ async def get_or_generate_roadmap_for_job(
         topic_field_id=job.topic_field_id,
         current_user=current_user,
         db=db,
+        llm_service=llm_service,
     )
 
@@ -3,7 +3,7 @@ from fastapi import APIRouter, HTTPException, status, Depends
 from sqlalchemy.orm import Session
 from api.models.skills import SkillsExtractRequest, SkillsExtractResponse, Skill
 from api.services.llm_service import LLMService
-from api.dependencies import get_db
+from api.dependencies import get_db, get_llm_service
 import json
 import logging
 
@@ -19,14 +19,14 @@ SKILLS_EXTRACTION_PROMPT = (
 )
 
 @router.post("/extract", response_model=SkillsExtractResponse)
-def extract_skills(
+async def extract_skills(
     req: SkillsExtractRequest,
     db: Session = Depends(get_db),
+    llm: LLMService = Depends(get_llm_service),
 ):
-    llm = LLMService()
     prompt = f"{SKILLS_EXTRACTION_PROMPT}\n\nText: {req.text}"
     try:
-        response = llm.chat(
+        response = await llm.achat(
             system_prompt=None,
             messages=[{"role": "user", "content": prompt}],
             temperature=0.2,
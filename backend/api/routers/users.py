@@ -7,7 +7,8 @@ from fastapi import APIRouter, Depends, HTTPException, Query, status
 from sqlalchemy.orm import Session
 
 from api.core.exceptions import NotFoundError
-from api.dependencies import get_current_user, get_db
+from api.core.principal_cache import AuthenticatedUser
+from api.dependencies import get_current_principal, get_db, get_read_db
 from api.models.user import (
     ModuleProgressUpdate,
     RoadmapProgressUpdate,
@@ -16,15 +17,14 @@ from api.models.user import (
     UserProfileResponse,
 )
 from api.services.user_service import UserService
-from database.models import User
 
 router = APIRouter(prefix="/api/v1/users/me", tags=["users"])
 
 
 @router.get("/profile", response_model=UserProfileResponse)
 async def get_profile(
-    current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db),
+    current_user: AuthenticatedUser = Depends(get_current_principal),
+    db: Session = Depends(get_read_db),
 ):
     """
     Get current user's profile.
@@ -51,7 +51,7 @@ async def get_profile(
 @router.put("/profile", response_model=UserProfileResponse)
 async def create_or_update_profile(
     profile_data: UserProfileCreate,
-    current_user: User = Depends(get_current_user),
+    current_user: AuthenticatedUser = Depends(get_current_principal),
     db: Session = Depends(get_db),
 ):
     """
@@ -75,8 +75,8 @@ async def create_or_update_profile(
 
 @router.get("/modules", response_model=List[UserModuleProgressResponse])
 async def get_user_modules(
-    current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db),
+    current_user: AuthenticatedUser = Depends(get_current_principal),
+    db: Session = Depends(get_read_db),
 ):
     """
     Get all modules with progress for current user.
@@ -115,7 +115,7 @@ async def get_user_modules(
 async def update_module_progress(
     module_id: int,
     progress_data: ModuleProgressUpdate,
-    current_user: User = Depends(get_current_user),
+    current_user: AuthenticatedUser = Depends(get_current_principal),
     db: Session = Depends(get_db),
 ):
     """
@@ -165,8 +165,8 @@ async def update_module_progress(
 @router.get("/roadmap/progress")
 async def get_roadmap_progress(
     topic_field_id: Optional[int] = Query(None, description="Optional topic field ID to filter by"),
-    current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db),
+    current_user: AuthenticatedUser = Depends(get_current_principal),
+    db: Session = Depends(get_read_db),
 ):
     """
     Get roadmap progress for current user.
@@ -217,7 +217,7 @@ async def get_roadmap_progress(
 async def update_roadmap_item_progress(
     roadmap_item_id: int,
     progress_data: RoadmapProgressUpdate,
-    current_user: User = Depends(get_current_user),
+    current_user: AuthenticatedUser = Depends(get_current_principal),
     db: Session = Depends(get_db),
 ):
     """
@@ -8,6 +8,7 @@ from sqlalchemy.orm import Session
 
 from api.core.config import get_settings
 from api.core.exceptions import AuthenticationError, ValidationError
+from api.core.password_hasher import get_password_hasher
 from api.core.security import create_access_token, hash_password, verify_password
 from database.models import User
 
@@ -41,15 +42,48 @@ class AuthService:
         Raises:
             ValidationError: If email already exists or validation fails
         """
-        # Check if user already exists
+        AuthService._ensure_email_available(email, db)
+        return AuthService._create_user(email, hash_password(password), first_name, last_name, db)
+
+    @staticmethod
+    async def aregister_user(
+        email: str,
+        password: str,
+        first_name: str,
+        last_name: str,
+        db: Session,
+    ) -> User:
+        """
+        Register a new user, hashing the password in the hashing pool.
+
+        Args:
+            email: User email
+            password: Plain text password
+            first_name: User first name
+            last_name: User last name
+            db: Database session
+
+        Returns:
+            Created User object
+
+        Raises:
+            ValidationError: If email already exists or validation fails
+            ServiceUnavailableError: If the hashing pool is saturated
+        """
+        AuthService._ensure_email_available(email, db)
+        password_hash = await get_password_hasher().hash(password)
+        return AuthService._create_user(email, password_hash, first_name, last_name, db)
+
+    @staticmethod
+    def _ensure_email_available(email: str, db: Session) -> None:
+        """Raise ValidationError if the email is already registered."""
         existing_user = db.query(User).filter(User.email == email).first()
         if existing_user:
             raise ValidationError("Email already registered", "EMAIL_EXISTS")
 
-        # Hash password
-        password_hash = hash_password(password)
-
-        # Create user
+    @staticmethod
+    def _create_user(email: str, password_hash: str, first_name: str, last_name: str, db: Session) -> User:
+        """Insert a user with an already hashed password."""
         user = User(
             email=email,
             password_hash=password_hash,
@@ -92,6 +126,32 @@ class AuthService:
 
         return user
 
+    @staticmethod
+    async def aauthenticate_user(email: str, password: str, db: Session) -> Optional[User]:
+        """
+        Authenticate user with email and password, verifying in the hashing pool.
+
+        Args:
+            email: User email
+            password: Plain text password
+            db: Database session
+
+        Returns:
+            User object if authentication successful, None otherwise
+
+        Raises:
+            ServiceUnavailableError: If the hashing pool is saturated
+        """
+        user = db.query(User).filter(User.email == email).first()
+
+        if not user:
+            return None
+
+        if not await get_password_hasher().verify(password, user.password_hash):
+            return None
+
+        return user
+
     @staticmethod
     def create_token_for_user(user: User) -> str:
         """
@@ -131,3 +191,27 @@ class AuthService:
         token = AuthService.create_token_for_user(user)
         return user, token
 
+    @staticmethod
+    async def alogin_user(email: str, password: str, db: Session) -> tuple[User, str]:
+        """
+        Login user without blocking the event loop on bcrypt.
+
+        Args:
+            email: User email
+            password: Plain text password
+            db: Database session
+
+        Returns:
+            Tuple of (User, access_token)
+
+        Raises:
+            AuthenticationError: If authentication fails
+            ServiceUnavailableError: If the hashing pool is saturated
+        """
+        user = await AuthService.aauthenticate_user(email, password, db)
+
+        if not user:
+            raise AuthenticationError("Invalid email or password", "INVALID_CREDENTIALS")
+
+        token = AuthService.create_token_for_user(user)
+        return user, token
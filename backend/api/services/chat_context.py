@@ -0,0 +1,338 @@
+"""Token-budgeted chat context with a rolling summary of older turns.
+
+The LLM only sees the newest turns that fit into CHAT_CONTEXT_TOKEN_BUDGET.
+Turns that fall out of the window are folded into ChatSession.summary, which is
+added to the system prompt. The summary is refreshed in the background after a
+reply has been stored, so it never delays the answer itself.
+"""
+
+import asyncio
+import logging
+import math
+import threading
+from dataclasses import dataclass
+from typing import Callable, Dict, List, Optional, Sequence, Set
+
+from sqlalchemy.orm import Session
+
+from api.core.config import get_settings
+from api.prompts.chat_prompts import SUMMARY_SYSTEM_PROMPT, generate_chat_summary_prompt
+from api.prompts.prompt_blocks import PromptBlock
+from api.services.llm_service import TRUNCATED_MARKER, LLMService
+from database.base import SessionLocal
+from database.models import ChatMessage, ChatSession
+
+logger = logging.getLogger(__name__)
+settings = get_settings()
+
+# Rough characters per token for German/English prose (no tokenizer available for Bedrock models)
+CHARS_PER_TOKEN = 4
+# Role markers and message framing added by the Messages API
+MESSAGE_OVERHEAD_TOKENS = 4
+
+
+def estimate_tokens(text: str) -> int:
+    """
+    Estimate the number of input tokens of one chat message.
+
+    Args:
+        text: Message content
+
+    Returns:
+        Estimated token count (including per-message overhead)
+    """
+    return math.ceil(len(text or "") / CHARS_PER_TOKEN) + MESSAGE_OVERHEAD_TOKENS
+
+
+def with_summary(system_prompt: str, summary: Optional[str]) -> List[PromptBlock]:
+    """
+    Build the system prompt blocks of a chat turn.
+
+    The topic field/job prompt is the same on every turn and is marked for
+    prompt caching; the rolling summary changes and therefore follows it.
+    """
+    blocks = [PromptBlock(system_prompt, cache=True)]
+    if summary:
+        blocks.append(PromptBlock(f"Zusammenfassung des bisherigen Gesprächs:\n{summary}"))
+    return blocks
+
+
+@dataclass
+class ChatContext:
+    """LLM request for one chat turn."""
+
+    messages: List[Dict[str, str]]
+    system_prompt: List[PromptBlock]
+    estimated_tokens: int
+    needs_summary: bool = False  # older turns were left out and are not covered by the summary yet
+    first_turn: bool = False  # no earlier user message (the answer only depends on the chat's system prompt)
+    scope: Optional[str] = None  # chat context the system prompt belongs to (e.g. "topic_field:3")
+
+
+def build_chat_context(
+    history: Sequence[Dict[str, str]],
+    current_content: str,
+    system_prompt: str,
+    summary: Optional[str] = None,
+    token_budget: Optional[int] = None,
+    truncated: bool = False,
+) -> ChatContext:
+    """
+    Fit the newest turns of a conversation into the token budget.
+
+    The budget covers the summary, the history and the current message. History
+    is taken newest-first and stops at the first message that no longer fits, so
+    the window is always a contiguous tail of the conversation. Bedrock requires
+    the first message to have role "user", so leading assistant messages (e.g.
+    the greeting) are dropped.
+
+    Args:
+        history: Unsummarized messages before the current one (chronological, LLM format)
+        current_content: Content of the message being answered
+        system_prompt: Chat system prompt (topic field or job)
+        summary: Rolling summary of the turns before history
+        token_budget: Token budget (defaults to config)
+        truncated: Whether history was already cut off by the message limit
+
+    Returns:
+        ChatContext with the messages and system prompt to send
+    """
+    budget = token_budget if token_budget is not None else settings.CHAT_CONTEXT_TOKEN_BUDGET
+    used = estimate_tokens(current_content) + (estimate_tokens(summary) if summary else 0)
+
+    window: List[Dict[str, str]] = []
+    for message in reversed(history):
+        cost = estimate_tokens(message["content"])
+        if used + cost > budget:
+            break
+        window.append(message)
+        used += cost
+    window.reverse()
+    needs_summary = truncated or len(window) < len(history)
+
+    # Bedrock: first message must be "user" (greeting stays in the DB for display)
+    while window and window[0]["role"] != "user":
+        used -= estimate_tokens(window.pop(0)["content"])
+
+    messages = [{"role": message["role"], "content": message["content"]} for message in window]
+    messages.append({"role": "user", "content": current_content})
+
+    return ChatContext(
+        messages=messages,
+        system_prompt=with_summary(system_prompt, summary),
+        estimated_tokens=used,
+        needs_summary=needs_summary,
+        first_turn=not summary and not truncated and all(message["role"] != "user" for message in history),
+    )
+
+
+class ChatSummaryRefresher:
+    """
+    Folds turns that left the context window into ChatSession.summary.
+
+    A refresh summarizes everything except the newest turns filling half of the
+    token budget, so the next few turns fit again without another refresh. At
+    most one refresh per session runs at a time; the summary row is updated with
+    a compare-and-set on summarized_until_message_id.
+    """
+
+    def __init__(self, session_factory: Callable[[], Session] = SessionLocal):
+        """
+        Initialize the refresher.
+
+        Args:
+            session_factory: Factory for the database sessions used by refreshes
+        """
+        self.session_factory = session_factory
+        self._lock = threading.Lock()
+        self._inflight: Set[int] = set()
+        self._tasks: Set[asyncio.Task] = set()
+
+    def _claim(self, session_id: int) -> bool:
+        with self._lock:
+            if session_id in self._inflight:
+                return False
+            self._inflight.add(session_id)
+            return True
+
+    def _release(self, session_id: int) -> None:
+        with self._lock:
+            self._inflight.discard(session_id)
+
+    def schedule(self, session_id: int, llm_service: LLMService) -> bool:
+        """
+        Refresh the summary of a session in the background.
+
+        Runs as an asyncio task when called from the event loop, otherwise in a
+        daemon thread.
+
+        Args:
+            session_id: Chat session ID
+            llm_service: LLM service used to write the summary
+
+        Returns:
+            False if a refresh for this session is already running
+        """
+        if not self._claim(session_id):
+            return False
+
+        try:
+            loop = asyncio.get_running_loop()
+        except RuntimeError:
+            loop = None
+
+        if loop is not None:
+            task = loop.create_task(self._arun_claimed(session_id, llm_service))
+            self._tasks.add(task)
+            task.add_done_callback(self._tasks.discard)
+        else:
+            threading.Thread(
+                target=self._run_claimed,
+                args=(session_id, llm_service),
+                name=f"chat-summary-{session_id}",
+                daemon=True,
+            ).start()
+        return True
+
+    def _run_claimed(self, session_id: int, llm_service: LLMService) -> None:
+        try:
+            self.refresh(session_id, llm_service)
+        except Exception as e:
+            logger.warning(f"Chat summary refresh for session {session_id} failed: {e}")
+        finally:
+            self._release(session_id)
+
+    async def _arun_claimed(self, session_id: int, llm_service: LLMService) -> None:
+        try:
+            await self.arefresh(session_id, llm_service)
+        except Exception as e:
+            logger.warning(f"Chat summary refresh for session {session_id} failed: {e}")
+        finally:
+            self._release(session_id)
+
+    def refresh(self, session_id: int, llm_service: LLMService) -> bool:
+        """
+        Update the summary of a session now (blocking).
+
+        Args:
+            session_id: Chat session ID
+            llm_service: LLM service used to write the summary
+
+        Returns:
+            True if the summary was updated
+        """
+        db = self.session_factory()
+        try:
+            plan = self._plan(session_id, db)
+            if plan is None:
+                return False
+            previous_cut, previous_summary, older = plan
+            summary = llm_service.chat(
+                system_prompt=SUMMARY_SYSTEM_PROMPT,
+                messages=[{"role": "user", "content": generate_chat_summary_prompt(previous_summary, older)}],
+                temperature=0.2,
+                max_tokens=settings.CHAT_SUMMARY_MAX_TOKENS,
+            )
+            return self._store(session_id, previous_cut, summary, older[-1].id, db)
+        finally:
+            db.close()
+
+    async def arefresh(self, session_id: int, llm_service: LLMService) -> bool:
+        """Awaitable version of refresh() (the LLM call does not block the event loop)."""
+        db = self.session_factory()
+        try:
+            plan = self._plan(session_id, db)
+            if plan is None:
+                return False
+            previous_cut, previous_summary, older = plan
+            summary = await llm_service.achat(
+                system_prompt=SUMMARY_SYSTEM_PROMPT,
+                messages=[{"role": "user", "content": generate_chat_summary_prompt(previous_summary, older)}],
+                temperature=0.2,
+                max_tokens=settings.CHAT_SUMMARY_MAX_TOKENS,
+            )
+            return self._store(session_id, previous_cut, summary, older[-1].id, db)
+        finally:
+            db.close()
+
+    @staticmethod
+    def _plan(session_id: int, db: Session):
+        """
+        Select the messages to fold into the summary.
+
+        Returns:
+            Tuple of (previous_cut, previous_summary, older_messages) or None if
+            the unsummarized turns still fit into half of the budget
+        """
+        session = db.query(ChatSession).filter(ChatSession.id == session_id).first()
+        if not session:
+            return None
+
+        previous_cut = session.summarized_until_message_id
+        query = db.query(ChatMessage).filter(ChatMessage.session_id == session_id)
+        if previous_cut is not None:
+            query = query.filter(ChatMessage.id > previous_cut)
+        messages = query.order_by(ChatMessage.created_at, ChatMessage.id).all()
+
+        # Keep the newest turns filling half of the budget (and at most half the message limit)
+        keep_budget = settings.CHAT_CONTEXT_TOKEN_BUDGET // 2
+        keep_count = max(1, settings.MAX_CHAT_HISTORY_MESSAGES // 2)
+        used = 0
+        split = len(messages)
+        while split > 0 and len(messages) - split < keep_count:
+            cost = estimate_tokens(messages[split - 1].content)
+            if used + cost > keep_budget:
+                break
+            used += cost
+            split -= 1
+        # The kept window should start with a user turn
+        while split < len(messages) and messages[split].role != "user":
+            split += 1
+
+        older = messages[:split]
+        if not older:
+            return None
+        return previous_cut, session.summary, older
+
+    @staticmethod
+    def _store(session_id: int, previous_cut: Optional[int], summary: str, cut: int, db: Session) -> bool:
+        """Write the new summary unless another refresh got there first."""
+        # A summary cut off at CHAT_SUMMARY_MAX_TOKENS is still useful, but the marker must not reach prompts
+        summary = summary.removeprefix(TRUNCATED_MARKER).strip()
+        query = db.query(ChatSession).filter(ChatSession.id == session_id)
+        if previous_cut is None:
+            query = query.filter(ChatSession.summarized_until_message_id.is_(None))
+        else:
+            query = query.filter(ChatSession.summarized_until_message_id == previous_cut)
+
+        # updated_at orders the session list by user activity, so a summary must not bump it
+        updated = query.update(
+            {
+                ChatSession.summary: summary,
+                ChatSession.summarized_until_message_id: cut,
+                ChatSession.updated_at: ChatSession.updated_at,
+            },
+            synchronize_session=False,
+        )
+        db.commit()
+        if updated:
+            logger.info(f"Updated chat summary for session {session_id} (up to message {cut})")
+        return bool(updated)
+
+
+_refresher: Optional[ChatSummaryRefresher] = None
+
+
+def init_chat_summary_refresher(**kwargs) -> ChatSummaryRefresher:
+    """Create the process-wide chat summary refresher."""
+    global _refresher
+    if _refresher is None:
+        _refresher = ChatSummaryRefresher(**kwargs)
+    return _refresher
+
+
+def get_chat_summary_refresher() -> ChatSummaryRefresher:
+    """Get the process-wide chat summary refresher, creating it if needed."""
+    if _refresher is None:
+        return init_chat_summary_refresher()
+    return _refresher
@@ -0,0 +1,174 @@
+"""In-memory cache of recent chat histories per session."""
+
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from datetime import datetime
+from typing import Dict, List, Optional, Tuple
+
+from sqlalchemy import event
+
+from api.core.config import get_settings
+from database.models import ChatSession
+
+settings = get_settings()
+
+# (updated_at, summarized_until_message_id) of the session the history belongs to
+HistoryVersion = Tuple[Optional[datetime], Optional[int]]
+
+
+@dataclass
+class CachedHistory:
+    """Newest unsummarized messages of a session, formatted for the LLM."""
+
+    messages: List[Dict[str, str]]
+    truncated: bool  # older unsummarized messages exist beyond messages
+    version: HistoryVersion
+    expires_at: float = field(default=0.0)
+
+
+class ChatHistoryCache:
+    """
+    LRU cache of recent chat histories with TTL expiry.
+
+    Entries are written through when a turn is stored and are only used while
+    the session row still has the version they were built for: any change made
+    elsewhere (another worker process, a new summary) bumps updated_at or the
+    summary cut and turns the entry into a miss.
+    """
+
+    def __init__(self, max_sessions: Optional[int] = None, ttl_seconds: Optional[float] = None):
+        """
+        Initialize the cache.
+
+        Args:
+            max_sessions: Maximum number of cached sessions (defaults to config, 0 disables caching)
+            ttl_seconds: Seconds an entry stays valid after its last write (defaults to config)
+        """
+        self.max_sessions = max_sessions if max_sessions is not None else settings.CHAT_HISTORY_CACHE_SIZE
+        self.ttl_seconds = ttl_seconds if ttl_seconds is not None else settings.CHAT_HISTORY_CACHE_TTL_SECONDS
+        self._lock = threading.Lock()
+        self._entries: "OrderedDict[int, CachedHistory]" = OrderedDict()
+        self._stats = {"hits": 0, "misses": 0, "evictions": 0}
+
+    def get(self, session_id: int, version: HistoryVersion) -> Optional[CachedHistory]:
+        """
+        Get the cached history of a session.
+
+        Args:
+            session_id: Chat session ID
+            version: Current version of the session row
+
+        Returns:
+            Cached history, or None if missing, expired or built for another version
+        """
+        with self._lock:
+            entry = self._entries.get(session_id)
+            if entry is None or entry.version != version or entry.expires_at <= time.monotonic():
+                if entry is not None:
+                    del self._entries[session_id]
+                self._stats["misses"] += 1
+                return None
+            self._entries.move_to_end(session_id)
+            self._stats["hits"] += 1
+            return CachedHistory(list(entry.messages), entry.truncated, entry.version, entry.expires_at)
+
+    def set(
+        self,
+        session_id: int,
+        messages: List[Dict[str, str]],
+        truncated: bool,
+        version: HistoryVersion,
+    ) -> None:
+        """
+        Store the history of a session (after loading it from the database).
+
+        Args:
+            session_id: Chat session ID
+            messages: Newest unsummarized messages (chronological, LLM format)
+            truncated: Whether older unsummarized messages were left out
+            version: Version of the session row the messages were read for
+        """
+        if self.max_sessions <= 0:
+            return
+        with self._lock:
+            self._entries[session_id] = CachedHistory(
+                list(messages), truncated, version, time.monotonic() + self.ttl_seconds
+            )
+            self._entries.move_to_end(session_id)
+            while len(self._entries) > self.max_sessions:
+                self._entries.popitem(last=False)
+                self._stats["evictions"] += 1
+
+    def append(
+        self,
+        session_id: int,
+        previous_version: HistoryVersion,
+        messages: List[Dict[str, str]],
+        version: HistoryVersion,
+    ) -> bool:
+        """
+        Write newly stored messages through to a cached history.
+
+        Only extends an entry that is still current for previous_version; otherwise
+        the entry is dropped and the next turn reloads from the database.
+
+        Args:
+            session_id: Chat session ID
+            previous_version: Session version the cached history must have
+            messages: Newly stored messages (chronological, LLM format)
+            version: Session version after storing them
+
+        Returns:
+            True if the cached history was extended
+        """
+        limit = settings.MAX_CHAT_HISTORY_MESSAGES
+        with self._lock:
+            entry = self._entries.get(session_id)
+            if entry is None:
+                return False
+            if entry.version != previous_version or entry.expires_at <= time.monotonic():
+                del self._entries[session_id]
+                return False
+
+            history = entry.messages + list(messages)
+            truncated = entry.truncated or len(history) > limit
+            self._entries[session_id] = CachedHistory(
+                history[-limit:], truncated, version, time.monotonic() + self.ttl_seconds
+            )
+            self._entries.move_to_end(session_id)
+            return True
+
+    def invalidate(self, session_id: int) -> None:
+        """Drop the cached history of a session."""
+        with self._lock:
+            self._entries.pop(session_id, None)
+
+    def clear(self) -> None:
+        """Drop all cached histories."""
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self) -> Dict[str, int]:
+        """Return hit, miss and eviction counters and the current size."""
+        with self._lock:
+            return {**self._stats, "size": len(self._entries)}
+
+
+_cache: Optional[ChatHistoryCache] = None
+
+
+def get_chat_history_cache() -> ChatHistoryCache:
+    """Get the process-wide chat history cache, creating it if needed."""
+    global _cache
+    if _cache is None:
+        _cache = ChatHistoryCache()
+    return _cache
+
+
+@event.listens_for(ChatSession, "after_delete")
+def _invalidate_deleted_session(mapper, connection, target: ChatSession) -> None:
+    """Drop the cached history of deleted sessions (also when deleted via User cascade)."""
+    if _cache is not None:
+        _cache.invalidate(target.id)
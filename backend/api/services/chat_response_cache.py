@@ -0,0 +1,178 @@
+"""Similarity cache for first-turn chat answers per topic field or job."""
+
+import re
+import threading
+import time
+import unicodedata
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Dict, FrozenSet, Optional, Set, Tuple
+
+from api.core.config import get_settings
+
+settings = get_settings()
+
+_UMLAUTS = str.maketrans({"ä": "ae", "ö": "oe", "ü": "ue", "ß": "ss"})
+_NON_WORD = re.compile(r"[^\w]+")
+
+
+def normalize_question(text: str) -> str:
+    """
+    Normalize a question for comparison.
+
+    Lowercases, folds umlauts, removes punctuation and collapses whitespace, so
+    "Welche Skills brauche ich?" and "welche skills  brauche ich" are equal.
+    """
+    text = unicodedata.normalize("NFKC", text).lower().translate(_UMLAUTS)
+    return " ".join(_NON_WORD.sub(" ", text).split())
+
+
+def trigrams(normalized: str) -> FrozenSet[str]:
+    """Character trigrams of a normalized question (padded, so short words count)."""
+    padded = f"  {normalized} "
+    return frozenset(padded[i : i + 3] for i in range(len(padded) - 2))
+
+
+def trigram_similarity(a: FrozenSet[str], b: FrozenSet[str]) -> float:
+    """Jaccard similarity of two trigram sets (0.0 - 1.0)."""
+    if not a or not b:
+        return 0.0
+    return len(a & b) / len(a | b)
+
+
+@dataclass
+class CachedResponse:
+    """One cached answer."""
+
+    question: str  # normalized
+    grams: FrozenSet[str]
+    response: str
+    expires_at: float
+
+
+class ChatResponseCache:
+    """
+    LRU cache of first-turn answers, looked up by question similarity.
+
+    Answers are scoped per chat context (e.g. "topic_field:3" or "job:12"), since
+    the same question gets a different answer in another topic field. A lookup
+    returns the answer of the most similar cached question in the scope if its
+    trigram similarity reaches the threshold.
+    """
+
+    def __init__(
+        self,
+        max_entries: Optional[int] = None,
+        ttl_seconds: Optional[float] = None,
+        threshold: Optional[float] = None,
+    ):
+        """
+        Initialize the cache.
+
+        Args:
+            max_entries: Maximum number of cached answers over all scopes (defaults to config)
+            ttl_seconds: Seconds an answer may be served (defaults to config)
+            threshold: Minimum trigram similarity for a hit (defaults to config)
+        """
+        self.max_entries = max_entries if max_entries is not None else settings.CHAT_RESPONSE_CACHE_SIZE
+        self.ttl_seconds = ttl_seconds if ttl_seconds is not None else settings.CHAT_RESPONSE_CACHE_TTL_SECONDS
+        self.threshold = threshold if threshold is not None else settings.CHAT_RESPONSE_CACHE_THRESHOLD
+        self._lock = threading.Lock()
+        self._entries: "OrderedDict[Tuple[str, str], CachedResponse]" = OrderedDict()
+        self._scopes: Dict[str, Set[str]] = {}
+        self._stats = {"hits": 0, "misses": 0, "evictions": 0}
+
+    def _remove(self, key: Tuple[str, str]) -> None:
+        del self._entries[key]
+        questions = self._scopes.get(key[0])
+        if questions is not None:
+            questions.discard(key[1])
+            if not questions:
+                del self._scopes[key[0]]
+
+    def lookup(self, scope: str, question: str) -> Optional[str]:
+        """
+        Find a cached answer for a question.
+
+        Args:
+            scope: Chat context scope (e.g. "topic_field:3")
+            question: Question as typed by the user
+
+        Returns:
+            Cached answer or None
+        """
+        normalized = normalize_question(question)
+        grams = trigrams(normalized)
+        now = time.monotonic()
+
+        with self._lock:
+            best_key, best_score = None, 0.0
+            for cached_question in list(self._scopes.get(scope, ())):
+                key = (scope, cached_question)
+                entry = self._entries[key]
+                if entry.expires_at <= now:
+                    self._remove(key)
+                    continue
+                score = 1.0 if cached_question == normalized else trigram_similarity(grams, entry.grams)
+                if score > best_score:
+                    best_key, best_score = key, score
+
+            if best_key is None or best_score < self.threshold:
+                self._stats["misses"] += 1
+                return None
+            self._entries.move_to_end(best_key)
+            self._stats["hits"] += 1
+            return self._entries[best_key].response
+
+    def store(self, scope: str, question: str, response: str) -> None:
+        """
+        Cache the answer to a question.
+
+        Args:
+            scope: Chat context scope
+            question: Question as typed by the user
+            response: Assistant answer
+        """
+        if self.max_entries <= 0:
+            return
+        normalized = normalize_question(question)
+        if not normalized:
+            return
+        key = (scope, normalized)
+        with self._lock:
+            self._entries[key] = CachedResponse(
+                normalized, trigrams(normalized), response, time.monotonic() + self.ttl_seconds
+            )
+            self._entries.move_to_end(key)
+            self._scopes.setdefault(scope, set()).add(normalized)
+            while len(self._entries) > self.max_entries:
+                self._remove(next(iter(self._entries)))
+                self._stats["evictions"] += 1
+
+    def invalidate_scope(self, scope: str) -> None:
+        """Drop all answers of a scope (e.g. after its system prompt changed)."""
+        with self._lock:
+            for question in list(self._scopes.get(scope, ())):
+                self._remove((scope, question))
+
+    def clear(self) -> None:
+        """Drop all cached answers."""
+        with self._lock:
+            self._entries.clear()
+            self._scopes.clear()
+
+    def stats(self) -> Dict[str, int]:
+        """Return hit, miss and eviction counters and the current size."""
+        with self._lock:
+            return {**self._stats, "size": len(self._entries)}
+
+
+_cache: Optional[ChatResponseCache] = None
+
+
+def get_chat_response_cache() -> ChatResponseCache:
+    """Get the process-wide chat response cache, creating it if needed."""
+    global _cache
+    if _cache is None:
+        _cache = ChatResponseCache()
+    return _cache
@@ -1,31 +1,68 @@
 """Chat service for LLM-powered chat sessions."""
 
 import logging
-from typing import List, Optional
+from datetime import datetime
+from typing import Any, AsyncIterator, Dict, Iterable, List, Optional
 
-from sqlalchemy.orm import Session
+from sqlalchemy import func
+from sqlalchemy.orm import Session, joinedload
 
 from api.core.config import get_settings
 from api.core.exceptions import NotFoundError
+from api.core.pagination import keyset_paginate
+from api.models.career import CareerTreeNodeResponse, TopicFieldResponse
+from api.models.chat import ChatSessionResponse
+from api.services.chat_context import (
+    ChatContext,
+    ChatSummaryRefresher,
+    build_chat_context,
+    get_chat_summary_refresher,
+)
 from api.prompts.chat_prompts import (
     generate_job_greeting_prompt,
     generate_topic_field_greeting_prompt,
     get_chat_system_prompt,
     get_chat_system_prompt_for_job,
 )
-from api.services.llm_service import LLMService
+from api.services.chat_history_cache import ChatHistoryCache, HistoryVersion, get_chat_history_cache
+from api.services.chat_response_cache import ChatResponseCache, get_chat_response_cache
+from api.services.llm_service import TRUNCATED_MARKER, LLMService, StreamEnd
 from database.models import ChatMessage, ChatSession, TopicField, CareerTreeNode
 
 logger = logging.getLogger(__name__)
 settings = get_settings()
 
+GREETING_SYSTEM_PROMPT = (
+    "Du bist ein kreativer Texter, der witzige und einladende Begrüßungen für Chat-Assistenten schreibt."
+)
+
 
 class ChatService:
     """Service for chat operations."""
 
-    def __init__(self, llm_service: Optional[LLMService] = None):
-        """Initialize chat service with optional LLM service."""
+    def __init__(
+        self,
+        llm_service: Optional[LLMService] = None,
+        summary_refresher: Optional[ChatSummaryRefresher] = None,
+        history_cache: Optional[ChatHistoryCache] = None,
+        response_cache: Optional[ChatResponseCache] = None,
+    ):
+        """
+        Initialize chat service.
+
+        Args:
+            llm_service: Optional LLM service
+            summary_refresher: Optional summary refresher (defaults to the process-wide one)
+            history_cache: Optional history cache (defaults to the process-wide one)
+            response_cache: Optional first-turn response cache (defaults to the process-wide
+                one if CHAT_RESPONSE_CACHE_ENABLED, otherwise no response caching)
+        """
         self.llm_service = llm_service or LLMService()
+        self.summary_refresher = summary_refresher or get_chat_summary_refresher()
+        self.history_cache = history_cache if history_cache is not None else get_chat_history_cache()
+        if response_cache is None and settings.CHAT_RESPONSE_CACHE_ENABLED:
+            response_cache = get_chat_response_cache()
+        self.response_cache = response_cache
 
     @staticmethod
     def get_or_create_session(
@@ -83,12 +120,9 @@ class ChatService:
 
         return session
 
-    def get_or_create_job_session(self, user_id: int, job_id: int, db: Session) -> ChatSession:
+    def _open_job_session(self, user_id: int, job_id: int, db: Session) -> tuple[ChatSession, CareerTreeNode, bool]:
         """
-        Get existing chat session for a job or create a new one.
-        
-        Also sets the job's topic_field_id to connect the chat session with the roadmap.
-        If a new session is created, generates and stores a job-specific greeting.
+        Get or create the chat session for a job.
 
         Args:
             user_id: User ID
@@ -96,7 +130,7 @@ class ChatService:
             db: Database session
 
         Returns:
-            ChatSession object
+            Tuple of (session, job, needs_greeting)
         """
         # Get job to access its topic_field_id
         job = db.query(CareerTreeNode).filter(CareerTreeNode.id == job_id).first()
@@ -120,9 +154,27 @@ class ChatService:
             db=db,
         )
         
-        # Check if there are any messages - if not, generate greeting
+        # Check if there are any messages - if not, a greeting is needed
         existing_messages = ChatService.get_messages(session.id, db=db, limit=1)
-        if not existing_messages:
+        return session, job, not existing_messages
+
+    def get_or_create_job_session(self, user_id: int, job_id: int, db: Session) -> ChatSession:
+        """
+        Get existing chat session for a job or create a new one.
+        
+        Also sets the job's topic_field_id to connect the chat session with the roadmap.
+        If a new session is created, generates and stores a job-specific greeting.
+
+        Args:
+            user_id: User ID
+            job_id: Career tree node ID (job, must be a leaf node)
+            db: Database session
+
+        Returns:
+            ChatSession object
+        """
+        session, job, needs_greeting = self._open_job_session(user_id, job_id, db)
+        if needs_greeting:
             try:
                 self._generate_and_store_greeting(session.id, job, db)
             except Exception as e:
@@ -134,13 +186,26 @@ class ChatService:
         
         return session
 
-    def get_or_create_topic_field_session(
+    async def aget_or_create_job_session(self, user_id: int, job_id: int, db: Session) -> ChatSession:
+        """Awaitable version of get_or_create_job_session() (greeting LLM call runs off the event loop)."""
+        session, job, needs_greeting = self._open_job_session(user_id, job_id, db)
+        if needs_greeting:
+            try:
+                await self._agenerate_and_store_greeting(session.id, job, db)
+            except Exception as e:
+                # Log error but don't fail session creation
+                logger.error(
+                    f"Failed to generate greeting for job session {session.id}: {e}. "
+                    f"Session created without greeting."
+                )
+
+        return session
+
+    def _open_topic_field_session(
         self, user_id: int, topic_field_id: int, db: Session
-    ) -> ChatSession:
+    ) -> tuple[ChatSession, TopicField, bool]:
         """
-        Get existing chat session for a topic field or create a new one.
-        
-        If a new session is created or existing session has no messages, generates and stores a topic-field-specific greeting.
+        Get or create the chat session for a topic field.
 
         Args:
             user_id: User ID
@@ -148,7 +213,7 @@ class ChatService:
             db: Database session
 
         Returns:
-            ChatSession object
+            Tuple of (session, topic_field, needs_greeting)
         """
         # Get topic field
         topic_field = db.query(TopicField).filter(TopicField.id == topic_field_id).first()
@@ -162,9 +227,28 @@ class ChatService:
             db=db,
         )
 
-        # Check if there are any messages - if not, generate greeting
+        # Check if there are any messages - if not, a greeting is needed
         existing_messages = ChatService.get_messages(session.id, db=db, limit=1)
-        if not existing_messages:
+        return session, topic_field, not existing_messages
+
+    def get_or_create_topic_field_session(
+        self, user_id: int, topic_field_id: int, db: Session
+    ) -> ChatSession:
+        """
+        Get existing chat session for a topic field or create a new one.
+        
+        If a new session is created or existing session has no messages, generates and stores a topic-field-specific greeting.
+
+        Args:
+            user_id: User ID
+            topic_field_id: Topic field ID
+            db: Database session
+
+        Returns:
+            ChatSession object
+        """
+        session, topic_field, needs_greeting = self._open_topic_field_session(user_id, topic_field_id, db)
+        if needs_greeting:
             try:
                 self._generate_and_store_topic_field_greeting(session.id, topic_field, db)
             except Exception as e:
@@ -176,6 +260,23 @@ class ChatService:
 
         return session
 
+    async def aget_or_create_topic_field_session(
+        self, user_id: int, topic_field_id: int, db: Session
+    ) -> ChatSession:
+        """Awaitable version of get_or_create_topic_field_session() (greeting LLM call runs off the event loop)."""
+        session, topic_field, needs_greeting = self._open_topic_field_session(user_id, topic_field_id, db)
+        if needs_greeting:
+            try:
+                await self._agenerate_and_store_topic_field_greeting(session.id, topic_field, db)
+            except Exception as e:
+                # Log error but don't fail session creation
+                logger.error(
+                    f"Failed to generate greeting for topic field session {session.id}: {e}. "
+                    f"Session created without greeting."
+                )
+
+        return session
+
     @staticmethod
     def get_session(session_id: int, user_id: Optional[int], db: Session) -> ChatSession:
         """
@@ -202,6 +303,156 @@ class ChatService:
 
         return session
 
+    @staticmethod
+    def list_sessions(
+        user_id: int,
+        db: Session,
+        topic_field_id: Optional[int] = None,
+        limit: int = 100,
+        offset: int = 0,
+        cursor: Optional[str] = None,
+    ) -> tuple[List[ChatSessionResponse], Optional[str]]:
+        """
+        List a user's chat sessions (most recently updated first) with topic field, job and message count.
+
+        Runs a fixed number of queries regardless of the page size: the sessions with
+        their topic field and job (joined) plus one grouped message count.
+
+        Args:
+            user_id: User ID
+            db: Database session
+            topic_field_id: Optional filter by topic field
+            limit: Maximum number of sessions
+            offset: Pagination offset
+            cursor: Keyset cursor on (updated_at, id) from the previous page
+
+        Returns:
+            Tuple of (ChatSessionResponse objects, next_cursor or None on the last page)
+
+        Raises:
+            ValidationError: If the cursor is invalid
+        """
+        query = (
+            db.query(ChatSession)
+            .options(joinedload(ChatSession.topic_field), joinedload(ChatSession.career_tree_node))
+            .filter(ChatSession.user_id == user_id)
+        )
+        if topic_field_id:
+            query = query.filter(ChatSession.topic_field_id == topic_field_id)
+
+        sessions, next_cursor = keyset_paginate(
+            query,
+            ChatSession.updated_at,
+            ChatSession.id,
+            limit=limit,
+            cursor=cursor,
+            offset=offset,
+            descending=True,
+        )
+        message_counts = ChatService.count_messages([session.id for session in sessions], db)
+
+        responses = [ChatService._session_response(session, message_counts[session.id]) for session in sessions]
+        return responses, next_cursor
+
+    @staticmethod
+    def _session_response(session: ChatSession, message_count: int) -> ChatSessionResponse:
+        """Build the API response for a session whose topic field and job are already loaded."""
+        job = session.career_tree_node
+        job_response = None
+        if job:
+            job_response = CareerTreeNodeResponse(
+                id=job.id,
+                name=job.name,
+                description=job.description,
+                is_leaf=job.is_leaf,
+                level=job.level,
+                topic_field=None,
+                questions=None,
+                children=[],
+            )
+
+        topic_field = session.topic_field
+        return ChatSessionResponse(
+            id=session.id,
+            user_id=session.user_id,
+            topic_field_id=session.topic_field_id,
+            career_tree_node_id=session.career_tree_node_id,
+            created_at=session.created_at,
+            updated_at=session.updated_at,
+            topic_field=TopicFieldResponse.model_validate(topic_field) if topic_field else None,
+            job=job_response,
+            message_count=message_count,
+        )
+
+    @staticmethod
+    def count_messages(session_ids: Iterable[int], db: Session) -> Dict[int, int]:
+        """
+        Count the messages of several sessions with one grouped query.
+
+        Args:
+            session_ids: Session IDs
+            db: Database session
+
+        Returns:
+            Dict of session ID -> message count (0 for sessions without messages)
+        """
+        session_ids = list(session_ids)
+        if not session_ids:
+            return {}
+
+        rows = (
+            db.query(ChatMessage.session_id, func.count(ChatMessage.id))
+            .filter(ChatMessage.session_id.in_(session_ids))
+            .group_by(ChatMessage.session_id)
+            .all()
+        )
+        counts = {session_id: 0 for session_id in session_ids}
+        counts.update(rows)
+        return counts
+
+    @staticmethod
+    def count_session_messages(session_id: int, db: Session) -> int:
+        """
+        Count the messages of a session.
+
+        Args:
+            session_id: Session ID
+            db: Database session
+
+        Returns:
+            Number of messages in the session
+        """
+        return ChatService.count_messages([session_id], db)[session_id]
+
+    @staticmethod
+    def get_messages_page(
+        session_id: int,
+        db: Session,
+        limit: int = 50,
+        offset: int = 0,
+        cursor: Optional[str] = None,
+    ) -> tuple[List[ChatMessage], Optional[str]]:
+        """
+        Get one page of chat messages (chronological) with keyset pagination on (created_at, id).
+
+        Args:
+            session_id: Session ID
+            db: Database session
+            limit: Maximum number of messages to return
+            offset: Offset for pagination (applied after the cursor)
+            cursor: Cursor returned with the previous page
+
+        Returns:
+            Tuple of (messages, next_cursor or None on the last page)
+
+        Raises:
+            ValidationError: If the cursor is invalid
+        """
+        query = db.query(ChatMessage).filter(ChatMessage.session_id == session_id)
+        return keyset_paginate(
+            query, ChatMessage.created_at, ChatMessage.id, limit=limit, cursor=cursor, offset=offset
+        )
+
     @staticmethod
     def get_messages(session_id: int, db: Session, limit: int = 50, offset: int = 0) -> List[ChatMessage]:
         """
@@ -219,13 +470,58 @@ class ChatService:
         messages = (
             db.query(ChatMessage)
             .filter(ChatMessage.session_id == session_id)
-            .order_by(ChatMessage.created_at.asc())
+            .order_by(ChatMessage.created_at.asc(), ChatMessage.id.asc())
             .offset(offset)
             .limit(limit)
             .all()
         )
         return messages
 
+    @staticmethod
+    def _job_fallback_greeting(job: CareerTreeNode) -> str:
+        """Fallback greeting for a job chat session (used if LLM generation fails)."""
+        job_name = job.name
+        return f"""Hallo! 👋 Ich bin dein persönlicher Assistent für den Beruf "{job_name}".
+
+Ich helfe dir dabei, alles über diesen spannenden Karriereweg zu erfahren - von den benötigten Skills über Tools und Technologien bis hin zu Einstiegsmöglichkeiten.
+
+Worüber möchtest du mehr erfahren?"""
+
+    @staticmethod
+    def _topic_field_fallback_greeting(topic_field: TopicField) -> str:
+        """Fallback greeting for a topic field chat session (used if LLM generation fails)."""
+        topic_name = topic_field.name
+        return f"""Hallo! 👋 Ich bin dein persönlicher Assistent für das Themenfeld "{topic_name}".
+
+Ich helfe dir dabei, alles über dieses spannende Themenfeld zu erfahren - von den benötigten Skills über Tools und Technologien bis hin zu Einstiegsmöglichkeiten.
+
+Worüber möchtest du mehr erfahren?"""
+
+    @staticmethod
+    def _greeting_request(greeting_prompt: str) -> dict:
+        """Build LLM chat arguments for a greeting prompt."""
+        return {
+            "system_prompt": GREETING_SYSTEM_PROMPT,
+            "messages": [{"role": "user", "content": greeting_prompt}],
+            "temperature": 0.9,  # Higher temperature for more creativity
+            "max_tokens": 200,  # Short greeting
+        }
+
+    def _store_greeting(self, session_id: int, greeting_content: str, db: Session) -> ChatMessage:
+        """Save greeting as assistant message."""
+        greeting_message = ChatMessage(
+            session_id=session_id,
+            role="assistant",
+            content=greeting_content,
+        )
+        db.add(greeting_message)
+        db.commit()
+        db.refresh(greeting_message)
+        self.history_cache.invalidate(session_id)
+
+        logger.info(f"Successfully stored greeting for session {session_id}")
+        return greeting_message
+
     def _generate_and_store_greeting(
         self,
         session_id: int,
@@ -247,45 +543,37 @@ class ChatService:
             If LLM generation fails, a fallback greeting is used.
         """
         try:
-            # Generate greeting prompt
-            greeting_prompt = generate_job_greeting_prompt(job)
-
-            # Call LLM with higher temperature for creativity
             logger.info(f"Generating greeting for job chat session {session_id} (job: {job.name})")
             greeting_content = self.llm_service.chat(
-                system_prompt="Du bist ein kreativer Texter, der witzige und einladende Begrüßungen für Chat-Assistenten schreibt.",
-                messages=[{"role": "user", "content": greeting_prompt}],
-                temperature=0.9,  # Higher temperature for more creativity
-                max_tokens=200,  # Short greeting
+                **ChatService._greeting_request(generate_job_greeting_prompt(job))
+            ).strip()
+        except Exception as e:
+            logger.warning(
+                f"Failed to generate LLM greeting for session {session_id}: {e}. Using fallback greeting."
             )
+            greeting_content = ChatService._job_fallback_greeting(job)
 
-            # Clean up the greeting (remove any extra formatting)
-            greeting_content = greeting_content.strip()
+        return self._store_greeting(session_id, greeting_content, db)
 
+    async def _agenerate_and_store_greeting(
+        self,
+        session_id: int,
+        job: CareerTreeNode,
+        db: Session,
+    ) -> ChatMessage:
+        """Awaitable version of _generate_and_store_greeting()."""
+        try:
+            logger.info(f"Generating greeting for job chat session {session_id} (job: {job.name})")
+            greeting_content = (
+                await self.llm_service.achat(**ChatService._greeting_request(generate_job_greeting_prompt(job)))
+            ).strip()
         except Exception as e:
             logger.warning(
                 f"Failed to generate LLM greeting for session {session_id}: {e}. Using fallback greeting."
             )
-            # Fallback greeting
-            job_name = job.name
-            greeting_content = f"""Hallo! 👋 Ich bin dein persönlicher Assistent für den Beruf "{job_name}".
-
-Ich helfe dir dabei, alles über diesen spannenden Karriereweg zu erfahren - von den benötigten Skills über Tools und Technologien bis hin zu Einstiegsmöglichkeiten.
-
-Worüber möchtest du mehr erfahren?"""
-
-        # Save greeting as assistant message
-        greeting_message = ChatMessage(
-            session_id=session_id,
-            role="assistant",
-            content=greeting_content,
-        )
-        db.add(greeting_message)
-        db.commit()
-        db.refresh(greeting_message)
+            greeting_content = ChatService._job_fallback_greeting(job)
 
-        logger.info(f"Successfully stored greeting for session {session_id}")
-        return greeting_message
+        return self._store_greeting(session_id, greeting_content, db)
 
     def _generate_and_store_topic_field_greeting(
         self,
@@ -308,66 +596,63 @@ Worüber möchtest du mehr erfahren?"""
             If LLM generation fails, a fallback greeting is used.
         """
         try:
-            # Generate greeting prompt
-            greeting_prompt = generate_topic_field_greeting_prompt(topic_field)
-
-            # Call LLM with higher temperature for creativity
             logger.info(f"Generating greeting for topic field chat session {session_id} (topic: {topic_field.name})")
             greeting_content = self.llm_service.chat(
-                system_prompt="Du bist ein kreativer Texter, der witzige und einladende Begrüßungen für Chat-Assistenten schreibt.",
-                messages=[{"role": "user", "content": greeting_prompt}],
-                temperature=0.9,  # Higher temperature for more creativity
-                max_tokens=200,  # Short greeting
+                **ChatService._greeting_request(generate_topic_field_greeting_prompt(topic_field))
+            ).strip()
+        except Exception as e:
+            logger.warning(
+                f"Failed to generate LLM greeting for session {session_id}: {e}. Using fallback greeting."
             )
+            greeting_content = ChatService._topic_field_fallback_greeting(topic_field)
 
-            # Clean up the greeting (remove any extra formatting)
-            greeting_content = greeting_content.strip()
+        return self._store_greeting(session_id, greeting_content, db)
 
+    async def _agenerate_and_store_topic_field_greeting(
+        self,
+        session_id: int,
+        topic_field: TopicField,
+        db: Session,
+    ) -> ChatMessage:
+        """Awaitable version of _generate_and_store_topic_field_greeting()."""
+        try:
+            logger.info(f"Generating greeting for topic field chat session {session_id} (topic: {topic_field.name})")
+            greeting_content = (
+                await self.llm_service.achat(
+                    **ChatService._greeting_request(generate_topic_field_greeting_prompt(topic_field))
+                )
+            ).strip()
         except Exception as e:
             logger.warning(
                 f"Failed to generate LLM greeting for session {session_id}: {e}. Using fallback greeting."
             )
-            # Fallback greeting
-            topic_name = topic_field.name
-            greeting_content = f"""Hallo! 👋 Ich bin dein persönlicher Assistent für das Themenfeld "{topic_name}".
-
-Ich helfe dir dabei, alles über dieses spannende Themenfeld zu erfahren - von den benötigten Skills über Tools und Technologien bis hin zu Einstiegsmöglichkeiten.
-
-Worüber möchtest du mehr erfahren?"""
-
-        # Save greeting as assistant message
-        greeting_message = ChatMessage(
-            session_id=session_id,
-            role="assistant",
-            content=greeting_content,
-        )
-        db.add(greeting_message)
-        db.commit()
-        db.refresh(greeting_message)
+            greeting_content = ChatService._topic_field_fallback_greeting(topic_field)
 
-        logger.info(f"Successfully stored greeting for session {session_id}")
-        return greeting_message
+        return self._store_greeting(session_id, greeting_content, db)
 
-    def send_message(
+    def _prepare_message(
         self,
         session_id: int,
         user_message_content: str,
-        topic_field: Optional[TopicField] = None,
-        job: Optional[CareerTreeNode] = None,
-        db: Session = None,
-    ) -> tuple[ChatMessage, ChatMessage]:
+        topic_field: Optional[TopicField],
+        job: Optional[CareerTreeNode],
+        db: Session,
+    ) -> tuple[ChatSession, ChatMessage, ChatContext]:
         """
-        Send a user message and get LLM response.
+        Store the user message and build the LLM request for it.
+
+        Only the newest turns that fit into CHAT_CONTEXT_TOKEN_BUDGET are sent;
+        older turns reach the model through the session's rolling summary.
 
         Args:
             session_id: Chat session ID
             user_message_content: User message content
-            topic_field: Optional topic field for context (for backward compatibility)
+            topic_field: Optional topic field for context
             job: Optional job (career tree node) for context
             db: Database session
 
         Returns:
-            Tuple of (user_message, assistant_message)
+            Tuple of (session, user_message, context)
 
         Raises:
             NotFoundError: If session not found
@@ -391,55 +676,9 @@ Worüber möchtest du mehr erfahren?"""
             role="user",
             content=user_message_content,
         )
+        # Not flushed yet: an INSERT would hold SQLite's write lock for the whole LLM call.
+        # The message is committed together with the reply.
         db.add(user_message)
-        db.flush()
-
-        # Get recent message history (for context)
-        recent_messages = ChatService.get_messages(session_id, db=db, limit=settings.MAX_CHAT_HISTORY_MESSAGES)
-
-        # Build message history for LLM (format: [{"role": "user", "content": "..."}, ...])
-        # AWS Bedrock requires the first message to have role "user"
-        llm_messages = []
-        
-        # Track if we've seen the first user message (to handle greeting at start)
-        found_first_user = False
-        
-        for msg in recent_messages:
-            # Skip the current user message if it's already in history (shouldn't happen, but be safe)
-            if msg.id == user_message.id:
-                continue
-            
-            # If this is the first user message, mark it and always include it
-            if msg.role == "user" and not found_first_user:
-                found_first_user = True
-                llm_messages.append({"role": msg.role, "content": msg.content})
-            # After finding the first user message, include all subsequent messages
-            elif found_first_user:
-                llm_messages.append({"role": msg.role, "content": msg.content})
-            # Before the first user message, skip assistant messages (like greeting)
-            # This ensures we comply with Bedrock's requirement while keeping greeting in DB for display
-            elif msg.role == "assistant":
-                logger.debug(
-                    f"Skipping assistant message before first user message "
-                    f"(message ID: {msg.id}) to comply with Bedrock requirement. "
-                    f"The greeting remains in the database for display."
-                )
-
-        # Always add current user message at the end (it's the message we're responding to)
-        llm_messages.append({"role": "user", "content": user_message_content})
-        
-        # Final safety check: ensure first message is always "user" (required by AWS Bedrock)
-        if not llm_messages or llm_messages[0].get("role") != "user":
-            logger.warning(
-                "Message history validation failed. Ensuring first message is 'user'. "
-                "This should not happen in normal operation."
-            )
-            # Remove all non-user messages from the start
-            while llm_messages and llm_messages[0].get("role") != "user":
-                llm_messages.pop(0)
-            # If still empty or first is not user, use only the current user message
-            if not llm_messages or llm_messages[0].get("role") != "user":
-                llm_messages = [{"role": "user", "content": user_message_content}]
 
         # Get system prompt (prefer job-based prompt)
         if job:
@@ -447,37 +686,297 @@ Worüber möchtest du mehr erfahren?"""
         else:
             system_prompt = get_chat_system_prompt(topic_field)
 
-        try:
-            # Call LLM
-            logger.info(f"Sending message to LLM for session {session_id}")
-            assistant_content = self.llm_service.chat(
-                system_prompt=system_prompt,
-                messages=llm_messages,
-                temperature=settings.CHAT_TEMPERATURE,
-            )
+        history, truncated = self._load_history(session, db)
 
-            # Save assistant message
-            assistant_message = ChatMessage(
-                session_id=session_id,
-                role="assistant",
-                content=assistant_content,
-            )
-            db.add(assistant_message)
+        context = build_chat_context(
+            history,
+            user_message_content,
+            system_prompt,
+            summary=session.summary,
+            truncated=truncated,
+        )
+        context.scope = f"job:{job.id}" if job else f"topic_field:{topic_field.id}"
+        logger.debug(
+            f"Chat context for session {session_id}: {len(context.messages)} messages, "
+            f"~{context.estimated_tokens} tokens"
+        )
+        return session, user_message, context
 
-            # Update session updated_at
-            from datetime import datetime
+    @staticmethod
+    def _history_version(session: ChatSession) -> HistoryVersion:
+        """Version of a session's history as seen by the history cache."""
+        return session.updated_at, session.summarized_until_message_id
 
-            session.updated_at = datetime.utcnow()
+    def _load_history(self, session: ChatSession, db: Session) -> tuple[List[Dict[str, str]], bool]:
+        """
+        Load the newest unsummarized messages of a session in LLM format.
 
-            db.commit()
-            db.refresh(user_message)
-            db.refresh(assistant_message)
+        Served from the history cache while the session row is unchanged.
+
+        Returns:
+            Tuple of (messages, truncated); truncated is True if older unsummarized
+            messages exist beyond MAX_CHAT_HISTORY_MESSAGES
+        """
+        version = ChatService._history_version(session)
+        cached = self.history_cache.get(session.id, version)
+        if cached is not None:
+            return cached.messages, cached.truncated
+
+        # Newest unsummarized turns (one extra row tells whether older ones were cut off)
+        history_limit = settings.MAX_CHAT_HISTORY_MESSAGES
+        query = db.query(ChatMessage.role, ChatMessage.content).filter(ChatMessage.session_id == session.id)
+        if session.summarized_until_message_id is not None:
+            query = query.filter(ChatMessage.id > session.summarized_until_message_id)
+        rows = query.order_by(ChatMessage.created_at.desc(), ChatMessage.id.desc()).limit(history_limit + 1).all()
+
+        truncated = len(rows) > history_limit
+        history = [{"role": role, "content": content} for role, content in reversed(rows[:history_limit])]
+        self.history_cache.set(session.id, history, truncated, version)
+        return history, truncated
+
+    def _cached_response(self, context: ChatContext, user_message_content: str) -> Optional[str]:
+        """Answer to a similar first question in the same topic field/job, if cached."""
+        if self.response_cache is None or not context.first_turn:
+            return None
+        return self.response_cache.lookup(context.scope, user_message_content)
+
+    def _remember_response(
+        self,
+        context: ChatContext,
+        user_message_content: str,
+        assistant_content: str,
+        truncated: bool = False,
+    ) -> None:
+        """
+        Cache a first-turn answer for similar questions in the same topic field/job.
+
+        Call only after the turn has been committed, so the cache never serves an
+        answer that was not persisted. Truncated answers are not cached.
+        """
+        if self.response_cache is None or not context.first_turn:
+            return
+        if truncated or assistant_content.startswith(TRUNCATED_MARKER):
+            return
+        self.response_cache.store(context.scope, user_message_content, assistant_content)
+
+    def _schedule_summary(self, session_id: int, context: ChatContext) -> None:
+        """Fold turns that no longer fit into the context window into the session summary (background)."""
+        if context.needs_summary:
+            self.summary_refresher.schedule(session_id, self.llm_service)
+
+    def _store_assistant_message(
+        self,
+        session: ChatSession,
+        user_message: ChatMessage,
+        assistant_content: str,
+        db: Session,
+    ) -> tuple[ChatMessage, ChatMessage]:
+        """
+        Save the assistant reply, commit the turn and write it through to the history cache.
+
+        Returns:
+            Tuple of (user_message, assistant_message)
+        """
+        assistant_message = ChatMessage(
+            session_id=session.id,
+            role="assistant",
+            content=assistant_content,
+        )
+        db.add(assistant_message)
+
+        # Update session updated_at
+        previous_version = ChatService._history_version(session)
+        updated_at = datetime.utcnow()
+        session.updated_at = updated_at
+
+        db.commit()
+        db.refresh(user_message)
+        db.refresh(assistant_message)
+
+        self.history_cache.append(
+            session.id,
+            previous_version,
+            [
+                {"role": "user", "content": user_message.content},
+                {"role": "assistant", "content": assistant_content},
+            ],
+            (updated_at, previous_version[1]),
+        )
+
+        logger.info(f"Successfully processed message for session {session.id}")
+        return user_message, assistant_message
+
+    def send_message(
+        self,
+        session_id: int,
+        user_message_content: str,
+        topic_field: Optional[TopicField] = None,
+        job: Optional[CareerTreeNode] = None,
+        db: Session = None,
+    ) -> tuple[ChatMessage, ChatMessage]:
+        """
+        Send a user message and get LLM response.
+
+        Args:
+            session_id: Chat session ID
+            user_message_content: User message content
+            topic_field: Optional topic field for context (for backward compatibility)
+            job: Optional job (career tree node) for context
+            db: Database session
+
+        Returns:
+            Tuple of (user_message, assistant_message)
+
+        Raises:
+            NotFoundError: If session not found
+            ValueError: If neither topic_field nor job is provided
+        """
+        session, user_message, context = self._prepare_message(session_id, user_message_content, topic_field, job, db)
+
+        try:
+            assistant_content = self._cached_response(context, user_message_content)
+            from_cache = assistant_content is not None
+            if from_cache:
+                logger.info(f"Answering message for session {session_id} from the response cache")
+            else:
+                # Call LLM
+                logger.info(f"Sending message to LLM for session {session_id}")
+                assistant_content = self.llm_service.chat(
+                    system_prompt=context.system_prompt,
+                    messages=context.messages,
+                    temperature=settings.CHAT_TEMPERATURE,
+                )
+            result = self._store_assistant_message(session, user_message, assistant_content, db)
+            if not from_cache:
+                self._remember_response(context, user_message_content, assistant_content)
+            self._schedule_summary(session.id, context)
+            return result
+
+        except Exception as e:
+            logger.error(f"Failed to process chat message: {e}")
+            db.rollback()
+            raise
 
-            logger.info(f"Successfully processed message for session {session_id}")
-            return user_message, assistant_message
+    async def asend_message(
+        self,
+        session_id: int,
+        user_message_content: str,
+        topic_field: Optional[TopicField] = None,
+        job: Optional[CareerTreeNode] = None,
+        db: Session = None,
+    ) -> tuple[ChatMessage, ChatMessage]:
+        """
+        Awaitable version of send_message().
+
+        The Bedrock call runs in the LLM worker pool, so the event loop can serve
+        other chats while this one is generating.
+        """
+        session, user_message, context = self._prepare_message(session_id, user_message_content, topic_field, job, db)
+
+        try:
+            assistant_content = self._cached_response(context, user_message_content)
+            from_cache = assistant_content is not None
+            if from_cache:
+                logger.info(f"Answering message for session {session_id} from the response cache")
+            else:
+                logger.info(f"Sending message to LLM for session {session_id}")
+                assistant_content = await self.llm_service.achat(
+                    system_prompt=context.system_prompt,
+                    messages=context.messages,
+                    temperature=settings.CHAT_TEMPERATURE,
+                )
+            result = self._store_assistant_message(session, user_message, assistant_content, db)
+            if not from_cache:
+                self._remember_response(context, user_message_content, assistant_content)
+            self._schedule_summary(session.id, context)
+            return result
 
         except Exception as e:
             logger.error(f"Failed to process chat message: {e}")
             db.rollback()
             raise
 
+    def stream_message(
+        self,
+        session_id: int,
+        user_message_content: str,
+        topic_field: Optional[TopicField] = None,
+        job: Optional[CareerTreeNode] = None,
+        db: Session = None,
+    ) -> AsyncIterator[Dict[str, Any]]:
+        """
+        Send a user message and stream the LLM response.
+
+        The user message is stored and the LLM request prepared before this method
+        returns, so lookup errors surface immediately. The returned iterator yields
+        ``{"type": "token", "text": ...}`` events while the model generates and a final
+        ``{"type": "done", "user_message": ..., "assistant_message": ...}`` event once
+        the assembled reply has been persisted.
+
+        Args:
+            session_id: Chat session ID
+            user_message_content: User message content
+            topic_field: Optional topic field for context
+            job: Optional job (career tree node) for context
+            db: Database session (must stay open until the iterator is exhausted)
+
+        Returns:
+            Async iterator of stream events
+
+        Raises:
+            NotFoundError: If session not found
+            ValueError: If neither topic_field nor job is provided
+        """
+        session, user_message, context = self._prepare_message(session_id, user_message_content, topic_field, job, db)
+        return self._astream_reply(session, user_message, context, db)
+
+    async def _astream_reply(
+        self,
+        session: ChatSession,
+        user_message: ChatMessage,
+        context: ChatContext,
+        db: Session,
+    ) -> AsyncIterator[Dict[str, Any]]:
+        """Stream the LLM reply for a prepared message and persist it when complete."""
+        parts: List[str] = []
+        stop_reason = None
+        completed = False
+        try:
+            cached = self._cached_response(context, user_message.content)
+            if cached is not None:
+                logger.info(f"Answering message for session {session.id} from the response cache")
+                parts.append(cached)
+                yield {"type": "token", "text": cached}
+            else:
+                logger.info(f"Streaming LLM response for session {session.id}")
+                async for item in self.llm_service.astream_chat(
+                    system_prompt=context.system_prompt,
+                    messages=context.messages,
+                    temperature=settings.CHAT_TEMPERATURE,
+                ):
+                    if isinstance(item, StreamEnd):
+                        stop_reason = item.stop_reason
+                        continue
+                    parts.append(item)
+                    yield {"type": "token", "text": item}
+
+            assistant_content = "".join(parts)
+            user_message, assistant_message = self._store_assistant_message(
+                session, user_message, assistant_content, db
+            )
+            completed = True
+            if cached is None:
+                self._remember_response(
+                    context, user_message.content, assistant_content, truncated=stop_reason == "max_tokens"
+                )
+            self._schedule_summary(session.id, context)
+            yield {"type": "done", "user_message": user_message, "assistant_message": assistant_message}
+
+        except Exception as e:
+            logger.error(f"Failed to stream chat message: {e}")
+            raise
+
+        finally:
+            # Client disconnected or the LLM failed: do not keep a half-finished turn
+            if not completed:
+                db.rollback()
@@ -0,0 +1,232 @@
+"""Local emulator of the Bedrock runtime for offline benchmarks and soak tests."""
+
+import io
+import json
+import random
+import re
+import threading
+import time
+from dataclasses import dataclass
+from typing import Any, Dict, Iterator, Optional, Tuple
+
+from botocore.exceptions import ClientError
+
+from api.core.config import get_settings
+
+settings = get_settings()
+
+CHAT_REPLY = (
+    "Gute Frage! Für diesen Berufsweg solltest du zuerst die Grundlagen in Programmierung "
+    "und Datenbanken festigen, dann ein eigenes Projekt umsetzen und früh nach einem "
+    "Praktikum suchen. Welche Module hast du bereits abgeschlossen?"
+)
+
+_WORDS = re.compile(r"\S+\s*")
+
+
+def canned_roadmap() -> Dict[str, Any]:
+    """A small roadmap that satisfies ROADMAP_JSON_SCHEMA (semester -> course -> project -> career)."""
+    skills = [{"skill": "Python", "impact": 8}, {"skill": "SQL", "impact": 5}]
+    top_skills = [
+        {"skill": "Python", "score": 95},
+        {"skill": "SQL", "score": 80},
+        {"skill": "Git", "score": 75},
+        {"skill": "Testing", "score": 70},
+        {"skill": "Cloud", "score": 60},
+    ]
+
+    def item(item_id, parent_id, level, item_type, title, **extra):
+        return {
+            "id": item_id,
+            "item_type": item_type,
+            "title": title,
+            "description": f"{title} (Emulator)",
+            "semester": 1,
+            "is_semester_break": False,
+            "order": 1,
+            "parent_id": parent_id,
+            "level": level,
+            "is_leaf": False,
+            "is_career_goal": False,
+            "module_id": None,
+            "is_important": False,
+            "skill_impact": skills,
+            **extra,
+        }
+
+    return {
+        "name": "Emulator-Roadmap",
+        "description": "Roadmap des lokalen Bedrock-Emulators",
+        "items": [
+            item(1, None, 0, "SKILL", "Semester 1"),
+            item(2, 1, 1, "COURSE", "Online-Kurs Python"),
+            item(3, 2, 2, "PROJECT", "Eigenes Web-Projekt", is_important=True),
+            item(
+                4, 3, 3, "CAREER", "Software Engineer",
+                is_leaf=True, is_career_goal=True, top_skills=top_skills,
+            ),
+        ],
+        "current_skills": [{"skill": s["skill"], "score": 30} for s in top_skills],
+    }
+
+
+def estimate_tokens(text: str) -> int:
+    """Rough token count (4 characters per token), good enough for usage numbers."""
+    return max(1, len(text) // 4)
+
+
+def stream_events(text: str, input_tokens: int, stop_reason: str = "end_turn") -> Iterator[Dict[str, Any]]:
+    """Anthropic streaming events for a reply, one delta per word."""
+    words = _WORDS.findall(text)
+    yield {"type": "message_start", "message": {"usage": {"input_tokens": input_tokens, "output_tokens": 1}}}
+    yield {"type": "content_block_start", "index": 0, "content_block": {"type": "text", "text": ""}}
+    for word in words:
+        yield {"type": "content_block_delta", "index": 0, "delta": {"type": "text_delta", "text": word}}
+    yield {"type": "content_block_stop", "index": 0}
+    yield {"type": "message_delta", "delta": {"stop_reason": stop_reason}, "usage": {"output_tokens": len(words)}}
+    yield {"type": "message_stop"}
+
+
+@dataclass
+class EmulatorConfig:
+    """Simulated model behaviour."""
+
+    latency_ms: float = 300.0  # time to first token (whole response for invoke_model)
+    jitter_ms: float = 100.0  # uniform +/- jitter on the latency
+    tokens_per_second: float = 50.0  # streaming rate after the first token (0 = no delay)
+    throttle_rate: float = 0.0  # share of calls failing with ThrottlingException
+    truncate_rate: float = 0.0  # share of replies cut off with stop_reason "max_tokens"
+    roadmap_model: Optional[str] = None  # model answered with a roadmap (defaults to BEDROCK_MODEL_ROADMAP)
+
+    @classmethod
+    def from_settings(cls) -> "EmulatorConfig":
+        """Create the configuration from the LLM_EMULATOR_* settings."""
+        return cls(
+            latency_ms=settings.LLM_EMULATOR_LATENCY_MS,
+            jitter_ms=settings.LLM_EMULATOR_JITTER_MS,
+            tokens_per_second=settings.LLM_EMULATOR_TOKENS_PER_SECOND,
+            throttle_rate=settings.LLM_EMULATOR_THROTTLE_RATE,
+            truncate_rate=settings.LLM_EMULATOR_TRUNCATE_RATE,
+        )
+
+
+class _EventStream:
+    """Iterable like botocore's EventStream: yields {"chunk": {"bytes": ...}} at the emulated rate."""
+
+    def __init__(self, events: Iterator[Dict[str, Any]], delay: float):
+        self._events = events
+        self._delay = delay
+        self._closed = False
+
+    def __iter__(self) -> Iterator[Dict[str, Any]]:
+        for event in self._events:
+            if self._closed:
+                return
+            if self._delay and event["type"] == "content_block_delta":
+                time.sleep(self._delay)
+            yield {"chunk": {"bytes": json.dumps(event).encode()}}
+
+    def close(self) -> None:
+        self._closed = True
+
+
+class BedrockEmulator:
+    """
+    In-process stand-in for a bedrock-runtime client (see llm_registry.LLMBackend).
+
+    Answers the roadmap model with a schema-valid roadmap and every other model
+    with a canned chat reply, with the configured latency and streaming rate.
+    Throttling is raised as the same ClientError boto3 raises, and replies longer
+    than the request's max_tokens (or picked by truncate_rate) end with
+    stop_reason "max_tokens", so LLMService's error and truncation handling runs
+    exactly as against Bedrock.
+    """
+
+    def __init__(self, config: Optional[EmulatorConfig] = None, seed: Optional[int] = None):
+        """
+        Initialize the emulator.
+
+        Args:
+            config: Simulated behaviour (defaults to the LLM_EMULATOR_* settings)
+            seed: Optional random seed for reproducible throttling/truncation
+        """
+        self.config = config or EmulatorConfig.from_settings()
+        self._random = random.Random(seed)
+        self._lock = threading.Lock()
+        self._stats = {"invocations": 0, "streams": 0, "throttled": 0, "truncated": 0}
+
+    def _chance(self, rate: float) -> bool:
+        with self._lock:
+            return rate > 0 and self._random.random() < rate
+
+    def _count(self, name: str) -> None:
+        with self._lock:
+            self._stats[name] += 1
+
+    def _latency(self) -> float:
+        config = self.config
+        with self._lock:
+            jitter = self._random.uniform(-config.jitter_ms, config.jitter_ms)
+        return max(0.0, config.latency_ms + jitter) / 1000
+
+    def _throttle(self, operation: str) -> None:
+        if self._chance(self.config.throttle_rate):
+            self._count("throttled")
+            raise ClientError(
+                {
+                    "Error": {"Code": "ThrottlingException", "Message": "Too many requests, please wait."},
+                    "ResponseMetadata": {"HTTPStatusCode": 429},
+                },
+                operation,
+            )
+
+    def _reply(self, model_id: str, request: Dict[str, Any]) -> Tuple[str, str]:
+        """Reply text and stop reason for a request."""
+        if model_id == (self.config.roadmap_model or settings.BEDROCK_MODEL_ROADMAP):
+            text = json.dumps(canned_roadmap(), ensure_ascii=False)
+        else:
+            text = CHAT_REPLY
+
+        limit = int(request.get("max_tokens") or 0) * 4
+        if limit and len(text) > limit:
+            text = text[:limit]
+        elif self._chance(self.config.truncate_rate):
+            text = text[: max(1, len(text) // 2)]
+        else:
+            return text, "end_turn"
+        self._count("truncated")
+        return text, "max_tokens"
+
+    def invoke_model(self, modelId: str, body: str, **kwargs: Any) -> Dict[str, Any]:
+        """Emulate InvokeModel (response body is a file-like object, like botocore's StreamingBody)."""
+        self._count("invocations")
+        self._throttle("InvokeModel")
+        request = json.loads(body)
+        text, stop_reason = self._reply(modelId, request)
+        time.sleep(self._latency())
+        response = {
+            "id": "msg_emulator",
+            "type": "message",
+            "role": "assistant",
+            "model": modelId,
+            "content": [{"type": "text", "text": text}],
+            "stop_reason": stop_reason,
+            "usage": {"input_tokens": estimate_tokens(body), "output_tokens": estimate_tokens(text)},
+        }
+        return {"body": io.BytesIO(json.dumps(response).encode()), "contentType": "application/json"}
+
+    def invoke_model_with_response_stream(self, modelId: str, body: str, **kwargs: Any) -> Dict[str, Any]:
+        """Emulate InvokeModelWithResponseStream (events arrive at tokens_per_second)."""
+        self._count("streams")
+        self._throttle("InvokeModelWithResponseStream")
+        request = json.loads(body)
+        text, stop_reason = self._reply(modelId, request)
+        time.sleep(self._latency())
+        rate = self.config.tokens_per_second
+        events = stream_events(text, estimate_tokens(body), stop_reason)
+        return {"body": _EventStream(events, 1 / rate if rate > 0 else 0.0), "contentType": "application/json"}
+
+    def stats(self) -> Dict[str, int]:
+        """Return call, throttling and truncation counters."""
+        with self._lock:
+            return dict(self._stats)
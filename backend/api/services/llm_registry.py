@@ -0,0 +1,287 @@
+"""Process-wide registry of Bedrock clients shared by all LLM calls."""
+
+import itertools
+import logging
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Dict, List, Optional, Protocol
+
+import boto3
+from botocore.config import Config
+from botocore.exceptions import ClientError
+
+from api.core.config import get_settings
+from api.services.llm_resilience import LLMResilience
+
+logger = logging.getLogger(__name__)
+settings = get_settings()
+
+
+class LLMBackend(Protocol):
+    """
+    The part of the bedrock-runtime client API that LLMService uses.
+
+    Any object with these methods can serve LLM calls: a boto3 client
+    (LLM_BACKEND=bedrock) or the local BedrockEmulator (LLM_BACKEND=emulator).
+    Errors must be raised as botocore ClientError/BotoCoreError.
+    """
+
+    def invoke_model(self, modelId: str, body: str, **kwargs: Any) -> Dict[str, Any]:
+        """Return {"body": <readable JSON response>}."""
+        ...
+
+    def invoke_model_with_response_stream(self, modelId: str, body: str, **kwargs: Any) -> Dict[str, Any]:
+        """Return {"body": <iterable of {"chunk": {"bytes": ...}} events>}."""
+        ...
+
+
+def create_bedrock_client() -> Optional[Any]:
+    """
+    Create a new Bedrock runtime client.
+
+    Uses explicit credentials if provided, otherwise the AWS standard credential chain
+    (aws configure, IAM role, environment variables, etc.).
+
+    Returns:
+        boto3 bedrock-runtime client, or None if the client could not be created
+    """
+    try:
+        client_kwargs = {
+            "service_name": "bedrock-runtime",
+            "region_name": settings.AWS_REGION,
+            "config": Config(
+                max_pool_connections=settings.BEDROCK_MAX_POOL_CONNECTIONS,
+                connect_timeout=settings.BEDROCK_CONNECT_TIMEOUT,
+                read_timeout=settings.BEDROCK_READ_TIMEOUT,
+                tcp_keepalive=True,
+                # Retries are done by LLMResilience; botocore's own would multiply them
+                retries={"total_max_attempts": 1, "mode": "standard"},
+            ),
+        }
+        if settings.BEDROCK_ENDPOINT_URL:
+            client_kwargs["endpoint_url"] = settings.BEDROCK_ENDPOINT_URL
+
+        # Only add explicit credentials if both are provided
+        # Otherwise, boto3 will use the standard credential chain
+        if settings.AWS_ACCESS_KEY_ID and settings.AWS_SECRET_ACCESS_KEY:
+            logger.info("Using explicit AWS credentials from config")
+            client_kwargs["aws_access_key_id"] = settings.AWS_ACCESS_KEY_ID
+            client_kwargs["aws_secret_access_key"] = settings.AWS_SECRET_ACCESS_KEY
+        else:
+            logger.info(
+                f"Using AWS standard credential chain (aws configure, IAM role, etc.) "
+                f"for region {settings.AWS_REGION}"
+            )
+
+        client = boto3.client(**client_kwargs)
+        logger.info(f"Bedrock client initialized successfully for region {settings.AWS_REGION}")
+        return client
+
+    except ClientError as e:
+        error_code = e.response.get("Error", {}).get("Code", "Unknown")
+        error_msg = e.response.get("Error", {}).get("Message", str(e))
+        logger.error(
+            f"Failed to initialize Bedrock client: {error_code} - {error_msg}. "
+            f"Please check your AWS credentials and Bedrock model access."
+        )
+        return None
+    except Exception as e:
+        logger.error(
+            f"Failed to initialize Bedrock client: {e}. "
+            f"Please ensure AWS credentials are configured via 'aws configure' or environment variables."
+        )
+        # For development, we might not have AWS credentials yet
+        return None
+
+
+def create_llm_client() -> Optional[LLMBackend]:
+    """
+    Create the LLM backend selected by LLM_BACKEND.
+
+    Returns:
+        Bedrock runtime client or BedrockEmulator, or None if no client could be created
+    """
+    if settings.LLM_BACKEND == "emulator":
+        from api.services.llm_emulator import BedrockEmulator
+
+        logger.info("Using the local Bedrock emulator (LLM_BACKEND=emulator)")
+        return BedrockEmulator()
+    return create_bedrock_client()
+
+
+def _connection_pool_stats(client: Any) -> Dict[str, int]:
+    """
+    Read connection counters from a boto3 client's urllib3 pools.
+
+    botocore does not expose its HTTP pools publicly, so this is best-effort and
+    returns zeros if the internals are not available.
+    """
+    opened = 0
+    requests = 0
+    try:
+        manager = client._endpoint.http_session._manager
+        for key in list(manager.pools.keys()):
+            pool = manager.pools.get(key)
+            if pool is None:
+                continue
+            opened += getattr(pool, "num_connections", 0)
+            requests += getattr(pool, "num_requests", 0)
+    except AttributeError:
+        pass
+    return {"opened": opened, "requests": requests}
+
+
+class LLMClientRegistry:
+    """
+    Pool of long-lived Bedrock clients plus the worker pool for blocking calls.
+
+    Created once at application startup (see main.lifespan) and shared by all
+    requests, so no request pays for client construction or a cold connection pool.
+    Also owns the resilience layer (retries, circuit breakers, in-flight limit),
+    so breaker state is shared by every call in the process.
+    """
+
+    def __init__(
+        self,
+        pool_size: Optional[int] = None,
+        max_workers: Optional[int] = None,
+        client_factory: Optional[Callable[[], Optional[LLMBackend]]] = None,
+        resilience: Optional[LLMResilience] = None,
+    ):
+        """
+        Initialize the registry.
+
+        Args:
+            pool_size: Number of Bedrock clients to round-robin over (defaults to config)
+            max_workers: Worker threads for blocking LLM calls (defaults to config; at least
+                the resilience layer's max_inflight)
+            client_factory: Callable creating a client (defaults to create_llm_client)
+            resilience: Retry/circuit breaker layer (defaults to one configured from settings)
+        """
+        self.resilience = resilience or LLMResilience()
+        self.pool_size = max(1, pool_size or settings.LLM_CLIENT_POOL_SIZE)
+        # Calls take an in-flight slot before they are submitted, so with a worker per
+        # slot an admitted call never waits in the executor queue
+        self.max_workers = max(1, max_workers or settings.LLM_MAX_CONCURRENCY, self.resilience.max_inflight)
+        self._client_factory = client_factory or create_llm_client
+        self._clients: List[Any] = []
+        self._round_robin = itertools.count()
+        self._lock = threading.Lock()
+        self._service = None
+        self._closed = False
+        self.executor = ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix="bedrock")
+
+        self._clients_created = 0
+        self._client_acquisitions = 0
+        self._service_acquisitions = 0
+
+    def acquire_client(self) -> Optional[Any]:
+        """
+        Get a Bedrock client from the pool (round-robin, created on first use).
+
+        Returns:
+            boto3 bedrock-runtime client, or None if no client could be created
+        """
+        with self._lock:
+            self._client_acquisitions += 1
+            if len(self._clients) < self.pool_size:
+                client = self._client_factory()
+                if client is None:
+                    # No credentials/config yet - retry on the next acquisition
+                    return None
+                self._clients.append(client)
+                self._clients_created += 1
+                return client
+            return self._clients[next(self._round_robin) % len(self._clients)]
+
+    def get_service(self):
+        """Get the shared LLMService bound to this registry."""
+        from api.services.llm_service import LLMService
+
+        with self._lock:
+            self._service_acquisitions += 1
+            if self._service is None:
+                self._service = LLMService(registry=self)
+            return self._service
+
+    def stats(self) -> Dict[str, Any]:
+        """
+        Get client and connection reuse statistics.
+
+        Returns:
+            Dictionary with client pool, HTTP connection and resilience counters
+        """
+        with self._lock:
+            clients = list(self._clients)
+            stats = {
+                "pool_size": self.pool_size,
+                "max_workers": self.max_workers,
+                "clients_created": self._clients_created,
+                "client_acquisitions": self._client_acquisitions,
+                "client_reuses": max(0, self._client_acquisitions - self._clients_created),
+                "service_acquisitions": self._service_acquisitions,
+            }
+
+        opened = 0
+        requests = 0
+        for client in clients:
+            pool_stats = _connection_pool_stats(client)
+            opened += pool_stats["opened"]
+            requests += pool_stats["requests"]
+        stats["connections"] = {
+            "opened": opened,
+            "requests": requests,
+            "reused": max(0, requests - opened),
+        }
+        stats["resilience"] = self.resilience.stats()
+        return stats
+
+    def close(self) -> None:
+        """Wait for in-flight calls and release all clients."""
+        with self._lock:
+            if self._closed:
+                return
+            self._closed = True
+            clients, self._clients = self._clients, []
+        self.executor.shutdown(wait=True)
+        for client in clients:
+            close = getattr(client, "close", None)
+            if callable(close):
+                try:
+                    close()
+                except Exception as e:
+                    logger.warning(f"Failed to close Bedrock client: {e}")
+
+
+_registry: Optional[LLMClientRegistry] = None
+_registry_lock = threading.Lock()
+
+
+def init_llm_registry(**kwargs: Any) -> LLMClientRegistry:
+    """Create the process-wide registry (called from the application lifespan)."""
+    global _registry
+    with _registry_lock:
+        if _registry is None:
+            _registry = LLMClientRegistry(**kwargs)
+            logger.info(
+                f"LLM client registry started (pool_size={_registry.pool_size}, "
+                f"max_workers={_registry.max_workers})"
+            )
+        return _registry
+
+
+def get_llm_registry() -> LLMClientRegistry:
+    """Get the process-wide registry, creating it if the lifespan has not run (scripts, tests)."""
+    if _registry is None:
+        return init_llm_registry()
+    return _registry
+
+
+def close_llm_registry() -> None:
+    """Close the process-wide registry (called on application shutdown)."""
+    global _registry
+    with _registry_lock:
+        registry, _registry = _registry, None
+    if registry is not None:
+        registry.close()
+        logger.info("LLM client registry closed")
@@ -0,0 +1,481 @@
+"""Retries, circuit breakers and a concurrency limit around Bedrock calls."""
+
+import asyncio
+import logging
+import math
+import random
+import threading
+import time
+from typing import Any, Awaitable, Callable, Dict, Optional, TypeVar
+
+from botocore.exceptions import (
+    BotoCoreError,
+    ClientError,
+    ConnectionClosedError,
+    ConnectTimeoutError,
+    EndpointConnectionError,
+    ReadTimeoutError,
+)
+
+from api.core.config import get_settings
+from api.core.exceptions import ServiceUnavailableError
+
+logger = logging.getLogger(__name__)
+settings = get_settings()
+
+T = TypeVar("T")
+
+# How often a waiting async call re-checks the limiter (seconds)
+_ACQUIRE_POLL_INTERVAL = 0.02
+
+# Error classes (see classify_error)
+THROTTLED = "throttled"
+TRANSIENT = "transient"
+TIMEOUT = "timeout"
+FATAL = "fatal"
+
+_THROTTLING_CODES = {"ThrottlingException", "TooManyRequestsException", "ServiceQuotaExceededException"}
+_TRANSIENT_CODES = {
+    "ModelNotReadyException",
+    "ServiceUnavailableException",
+    "InternalServerException",
+    "ModelTimeoutException",
+}
+_CONNECTION_ERRORS = (EndpointConnectionError, ConnectTimeoutError, ConnectionClosedError)
+
+
+def classify_error(error: BaseException) -> str:
+    """
+    Classify a Bedrock call failure.
+
+    Args:
+        error: Exception raised by the Bedrock client
+
+    Returns:
+        THROTTLED or TRANSIENT (retried, counted by the circuit breaker),
+        TIMEOUT (counted but not retried: the call already took the whole read timeout)
+        or FATAL (request or configuration errors, neither retried nor counted)
+    """
+    if isinstance(error, ClientError):
+        code = error.response.get("Error", {}).get("Code", "")
+        status = error.response.get("ResponseMetadata", {}).get("HTTPStatusCode") or 0
+        if code in _THROTTLING_CODES or status == 429:
+            return THROTTLED
+        if code in _TRANSIENT_CODES or status >= 500:
+            return TRANSIENT
+        return FATAL
+    if isinstance(error, ReadTimeoutError):
+        return TIMEOUT
+    if isinstance(error, _CONNECTION_ERRORS):
+        return TRANSIENT
+    return FATAL
+
+
+class CircuitBreaker:
+    """
+    Per-model circuit breaker (closed -> open -> half-open -> closed).
+
+    After failure_threshold consecutive throttled, transient or timed-out calls
+    the breaker opens and rejects calls for reset_seconds. Then a single probe
+    call is let through: success closes the breaker, failure opens it again.
+    """
+
+    CLOSED = "closed"
+    OPEN = "open"
+    HALF_OPEN = "half_open"
+
+    def __init__(self, failure_threshold: int, reset_seconds: float, clock: Callable[[], float] = time.monotonic):
+        """
+        Initialize the breaker.
+
+        Args:
+            failure_threshold: Consecutive failures that open the breaker
+            reset_seconds: Time the breaker stays open before a probe call
+            clock: Monotonic clock (injectable for tests)
+        """
+        self.failure_threshold = max(1, failure_threshold)
+        self.reset_seconds = reset_seconds
+        self._clock = clock
+        self._lock = threading.Lock()
+        self._state = self.CLOSED
+        self._failures = 0
+        self._opened_at = 0.0
+        self._probing = False
+        self._times_opened = 0
+
+    @property
+    def state(self) -> str:
+        """Current state (an open breaker reports half-open once its reset time has passed)."""
+        with self._lock:
+            if self._state == self.OPEN and self._clock() - self._opened_at >= self.reset_seconds:
+                return self.HALF_OPEN
+            return self._state
+
+    def allow(self) -> bool:
+        """
+        Check whether a call may go to the model now.
+
+        Returns:
+            True if the call may proceed (in half-open state only for the one probe call)
+        """
+        with self._lock:
+            if self._state == self.CLOSED:
+                return True
+            if self._state == self.OPEN:
+                if self._clock() - self._opened_at < self.reset_seconds:
+                    return False
+                self._state = self.HALF_OPEN
+                self._probing = False
+            if self._probing:
+                return False
+            self._probing = True
+            return True
+
+    def retry_after(self) -> float:
+        """Seconds until the breaker lets a probe call through."""
+        with self._lock:
+            if self._state != self.OPEN:
+                return 0.0
+            return max(0.0, self.reset_seconds - (self._clock() - self._opened_at))
+
+    def release_probe(self) -> None:
+        """Give back the probe permit of a call that never reached the model."""
+        with self._lock:
+            self._probing = False
+
+    def record_success(self) -> None:
+        """Record a call that reached the model (closes a half-open breaker)."""
+        with self._lock:
+            self._state = self.CLOSED
+            self._failures = 0
+            self._probing = False
+
+    def record_failure(self) -> None:
+        """Record a throttled, transient or timed-out call."""
+        with self._lock:
+            self._failures += 1
+            if self._state == self.HALF_OPEN or self._failures >= self.failure_threshold:
+                if self._state != self.OPEN:
+                    self._times_opened += 1
+                self._state = self.OPEN
+                self._opened_at = self._clock()
+                self._probing = False
+
+    def stats(self) -> Dict[str, Any]:
+        """Return state and counters."""
+        state = self.state
+        with self._lock:
+            return {"state": state, "consecutive_failures": self._failures, "times_opened": self._times_opened}
+
+
+class LLMResilience:
+    """
+    Runs Bedrock calls with classified retries, circuit breakers and a concurrency limit.
+
+    - Throttled and transient failures (ThrottlingException, ModelNotReadyException,
+      5xx, connection errors) are retried with exponential backoff and full jitter;
+      request errors are raised at once.
+    - Each model has its own circuit breaker, so a throttled roadmap model does not
+      stop chat. While a breaker is open, calls fail immediately.
+    - A global limiter bounds the calls in flight to Bedrock. A call that cannot get
+      a slot within acquire_timeout is rejected. A slot is taken per attempt and
+      given back during the backoff.
+
+    Rejected and exhausted calls raise ServiceUnavailableError (503 with Retry-After),
+    so under throttling the API sheds load instead of queueing doomed calls.
+    Owned by the LLMClientRegistry and shared by all LLMService instances.
+
+    acall() is the variant for the event loop: it waits for a slot and sleeps the
+    backoff on the loop and hands only the single attempt to the worker pool, so no
+    worker thread waits for a slot or sleeps. call() does both in the calling thread
+    and is meant for scripts and synchronous callers outside the worker pool.
+    """
+
+    def __init__(
+        self,
+        max_attempts: Optional[int] = None,
+        base_delay: Optional[float] = None,
+        max_delay: Optional[float] = None,
+        failure_threshold: Optional[int] = None,
+        reset_seconds: Optional[float] = None,
+        max_inflight: Optional[int] = None,
+        acquire_timeout: Optional[float] = None,
+        sleep: Callable[[float], None] = time.sleep,
+        async_sleep: Callable[[float], Awaitable[None]] = asyncio.sleep,
+        clock: Callable[[], float] = time.monotonic,
+        seed: Optional[int] = None,
+    ):
+        """
+        Initialize the resilience layer (all limits default to config).
+
+        Args:
+            max_attempts: Attempts per call for retryable errors (1 = no retries)
+            base_delay: Backoff before the first retry, doubled per retry (seconds)
+            max_delay: Upper bound of a single backoff (seconds)
+            failure_threshold: Consecutive failures that open a model's circuit breaker
+            reset_seconds: Time a breaker stays open before a probe call (seconds)
+            max_inflight: Concurrent Bedrock calls (0 = unlimited)
+            acquire_timeout: Time a call may wait for a slot before it is rejected (seconds)
+            sleep: Sleep function used for backoff in call() (injectable for tests)
+            async_sleep: Sleep coroutine used for backoff in acall() (injectable for tests)
+            clock: Monotonic clock for the circuit breakers (injectable for tests)
+            seed: Optional random seed for reproducible jitter
+        """
+        self.max_attempts = max(1, max_attempts if max_attempts is not None else settings.LLM_RETRY_MAX_ATTEMPTS)
+        self.base_delay = base_delay if base_delay is not None else settings.LLM_RETRY_BASE_DELAY
+        self.max_delay = max_delay if max_delay is not None else settings.LLM_RETRY_MAX_DELAY
+        self.failure_threshold = (
+            failure_threshold if failure_threshold is not None else settings.LLM_CIRCUIT_FAILURE_THRESHOLD
+        )
+        self.reset_seconds = reset_seconds if reset_seconds is not None else settings.LLM_CIRCUIT_RESET_SECONDS
+        self.max_inflight = max(0, max_inflight if max_inflight is not None else settings.LLM_MAX_INFLIGHT)
+        self.acquire_timeout = acquire_timeout if acquire_timeout is not None else settings.LLM_ACQUIRE_TIMEOUT
+        self._sleep = sleep
+        self._async_sleep = async_sleep
+        self._clock = clock
+        self._random = random.Random(seed)
+        self._limiter = threading.BoundedSemaphore(self.max_inflight) if self.max_inflight else None
+        self._lock = threading.Lock()
+        self._breakers: Dict[str, CircuitBreaker] = {}
+        self._inflight = 0
+        self._stats = {"calls": 0, "retries": 0, "rejected_open": 0, "rejected_busy": 0, "exhausted": 0}
+
+    def breaker(self, model_id: str) -> CircuitBreaker:
+        """Get the circuit breaker of a model (created on first use)."""
+        with self._lock:
+            breaker = self._breakers.get(model_id)
+            if breaker is None:
+                breaker = CircuitBreaker(self.failure_threshold, self.reset_seconds, self._clock)
+                self._breakers[model_id] = breaker
+            return breaker
+
+    def backoff(self, retry: int) -> float:
+        """
+        Backoff before a retry (exponential with full jitter).
+
+        Args:
+            retry: Number of the retry (1 = first retry)
+
+        Returns:
+            Delay in seconds, uniformly drawn from [0, min(max_delay, base_delay * 2^(retry-1))]
+        """
+        ceiling = min(self.max_delay, self.base_delay * 2 ** (retry - 1))
+        with self._lock:
+            return self._random.uniform(0, ceiling)
+
+    def _count(self, name: str) -> None:
+        with self._lock:
+            self._stats[name] += 1
+
+    def _reject_busy(self) -> ServiceUnavailableError:
+        self._count("rejected_busy")
+        return ServiceUnavailableError("The AI assistant is busy, please retry shortly", "LLM_OVERLOADED")
+
+    def _acquired(self) -> None:
+        with self._lock:
+            self._inflight += 1
+
+    def _acquire(self) -> None:
+        if self._limiter is not None and not self._limiter.acquire(timeout=self.acquire_timeout):
+            raise self._reject_busy()
+        self._acquired()
+
+    async def _async_acquire(self) -> None:
+        # Polls instead of blocking, so waiting for a slot never occupies a thread
+        if self._limiter is not None and not self._limiter.acquire(blocking=False):
+            deadline = time.monotonic() + self.acquire_timeout
+            while not self._limiter.acquire(blocking=False):
+                if time.monotonic() >= deadline:
+                    raise self._reject_busy()
+                await asyncio.sleep(_ACQUIRE_POLL_INTERVAL)
+        self._acquired()
+
+    def release(self) -> None:
+        """Give back an in-flight slot (only needed for calls made with keep_slot=True)."""
+        with self._lock:
+            self._inflight -= 1
+        if self._limiter is not None:
+            self._limiter.release()
+
+    def _reject_open(self, breaker: CircuitBreaker) -> ServiceUnavailableError:
+        self._count("rejected_open")
+        return ServiceUnavailableError(
+            "The AI assistant is temporarily unavailable, please retry later",
+            "LLM_CIRCUIT_OPEN",
+            retry_after=max(1, math.ceil(breaker.retry_after())),
+        )
+
+    def _failed_attempt(self, breaker: CircuitBreaker, model_id: str, attempt: int, error: BaseException) -> float:
+        """
+        Record a failed attempt and decide whether to retry it.
+
+        Returns:
+            Backoff before the next attempt, or -1 if the error is to be raised unchanged
+
+        Raises:
+            ServiceUnavailableError: If retryable errors persist after max_attempts
+        """
+        kind = classify_error(error)
+        if kind == FATAL:
+            # Bedrock answered; the request itself is wrong
+            breaker.record_success()
+            return -1
+        breaker.record_failure()
+        if kind == TIMEOUT:
+            return -1
+        if attempt >= self.max_attempts:
+            self._count("exhausted")
+            logger.warning(f"Bedrock call to {model_id} failed after {attempt} attempts ({kind}): {error}")
+            raise ServiceUnavailableError(
+                "The AI assistant is overloaded, please retry shortly",
+                "LLM_THROTTLED" if kind == THROTTLED else "LLM_UNAVAILABLE",
+                retry_after=max(1, math.ceil(self.max_delay)),
+            ) from error
+        delay = self.backoff(attempt)
+        logger.info(f"Bedrock call to {model_id} {kind} (attempt {attempt}), retrying in {delay:.2f}s: {error}")
+        self._count("retries")
+        return delay
+
+    def call(self, model_id: str, func: Callable[[], T], keep_slot: bool = False) -> T:
+        """
+        Run a blocking Bedrock call with retries, the model's circuit breaker and the limiter.
+
+        Waits for a slot and sleeps the backoff in the calling thread; use acall()
+        on the event loop.
+
+        Args:
+            model_id: Bedrock model ID (selects the circuit breaker)
+            func: Call to run; raises botocore errors on failure
+            keep_slot: Keep the in-flight slot after a successful call (e.g. while a
+                response stream is read); the caller must then call release()
+
+        Returns:
+            Result of func
+
+        Raises:
+            ServiceUnavailableError: If the breaker is open, no slot is free in time,
+                or retryable errors persist after max_attempts
+            ClientError, BotoCoreError: Fatal and timed-out errors, unchanged
+        """
+        breaker = self.breaker(model_id)
+        self._count("calls")
+        attempt = 1
+        while True:
+            if not breaker.allow():
+                raise self._reject_open(breaker)
+
+            try:
+                self._acquire()
+            except ServiceUnavailableError:
+                breaker.release_probe()
+                raise
+            holding = True
+            try:
+                result = func()
+            except (ClientError, BotoCoreError) as e:
+                delay = self._failed_attempt(breaker, model_id, attempt, e)
+                if delay < 0:
+                    raise
+            except Exception:
+                # Not a Bedrock error (e.g. an unreadable response): says nothing about the model's health,
+                # but a half-open breaker must not keep waiting for this probe forever
+                breaker.release_probe()
+                raise
+            else:
+                breaker.record_success()
+                holding = not keep_slot
+                return result
+            finally:
+                if holding:
+                    self.release()
+
+            self._sleep(delay)
+            attempt += 1
+
+    async def acall(
+        self,
+        model_id: str,
+        func: Callable[[], T],
+        run: Callable[[Callable[[], T]], Awaitable[T]],
+        keep_slot: bool = False,
+    ) -> T:
+        """
+        Awaitable version of call() for the event loop.
+
+        The slot is taken and the backoff slept on the event loop; only the attempt
+        itself is handed to run (the worker pool). A call that finds no free slot is
+        rejected before it occupies a worker thread.
+
+        Args:
+            model_id: Bedrock model ID (selects the circuit breaker)
+            func: Blocking call to run; raises botocore errors on failure
+            run: Coroutine function running func off the event loop
+            keep_slot: Keep the in-flight slot after a successful call; the caller
+                must then call release()
+
+        Returns:
+            Result of func
+
+        Raises:
+            ServiceUnavailableError: If the breaker is open, no slot is free in time,
+                or retryable errors persist after max_attempts
+            ClientError, BotoCoreError: Fatal and timed-out errors, unchanged
+        """
+        breaker = self.breaker(model_id)
+        self._count("calls")
+        attempt = 1
+        while True:
+            if not breaker.allow():
+                raise self._reject_open(breaker)
+
+            try:
+                await self._async_acquire()
+            except BaseException:
+                breaker.release_probe()
+                raise
+            holding = True
+            try:
+                result = await run(func)
+            except (ClientError, BotoCoreError) as e:
+                delay = self._failed_attempt(breaker, model_id, attempt, e)
+                if delay < 0:
+                    raise
+            except BaseException:
+                # Not a Bedrock error, or the caller was cancelled: free a half-open breaker's probe
+                breaker.release_probe()
+                raise
+            else:
+                breaker.record_success()
+                holding = not keep_slot
+                return result
+            finally:
+                if holding:
+                    self.release()
+
+            await self._async_sleep(delay)
+            attempt += 1
+
+    def record_stream_error(self, model_id: str, error: BaseException) -> None:
+        """
+        Count an error raised while reading a response stream.
+
+        Streams are not retried once text has been delivered, but throttling or
+        service errors inside the stream still count towards the model's breaker.
+        """
+        if classify_error(error) != FATAL:
+            self.breaker(model_id).record_failure()
+
+    def stats(self) -> Dict[str, Any]:
+        """
+        Get retry, rejection and circuit breaker statistics.
+
+        Returns:
+            Dictionary with call counters, in-flight calls and the state of each breaker
+        """
+        with self._lock:
+            stats: Dict[str, Any] = dict(self._stats)
+            stats["inflight"] = self._inflight
+            stats["max_inflight"] = self.max_inflight
+            breakers = dict(self._breakers)
+        stats["breakers"] = {model_id: breaker.stats() for model_id, breaker in breakers.items()}
+        return stats
@@ -1,18 +1,82 @@
 """LLM Service for AWS Bedrock integration."""
 
+import asyncio
+import functools
 import json
 import logging
-from typing import Any, Dict, List, Optional
+import threading
+from contextlib import contextmanager
+from dataclasses import dataclass
+from typing import Any, AsyncIterator, Callable, Dict, Iterator, List, Optional, TypeVar, Union
 
-import boto3
 from botocore.exceptions import BotoCoreError, ClientError
 
 from api.core.config import get_settings
-from api.core.exceptions import LLMError
+from api.core.exceptions import LLMError, ServiceUnavailableError
+from api.prompts.prompt_blocks import Prompt, prompt_text
+from api.services.llm_registry import LLMClientRegistry, get_llm_registry
 
 logger = logging.getLogger(__name__)
 settings = get_settings()
 
+# Prefix of replies cut off at max_tokens (see _invoke_model)
+TRUNCATED_MARKER = "__TRUNCATED__"
+
+
+@dataclass(frozen=True)
+class StreamEnd:
+    """Last item of astream_chat(): why the model stopped ("end_turn", "max_tokens", ...)."""
+
+    stop_reason: Optional[str]
+
+T = TypeVar("T")
+
+# Usage fields reported by the Anthropic Messages API
+USAGE_FIELDS = ("input_tokens", "output_tokens", "cache_read_input_tokens", "cache_creation_input_tokens")
+
+
+class LLMUsageMetrics:
+    """Thread-safe token usage per model, including prompt-cache reads and writes."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._models: Dict[str, Dict[str, int]] = {}
+
+    def record(self, model_id: str, usage: Optional[Dict[str, Any]]) -> None:
+        """Record the usage block of one model response."""
+        with self._lock:
+            stats = self._models.setdefault(model_id, {"requests": 0, **{name: 0 for name in USAGE_FIELDS}})
+            stats["requests"] += 1
+            for name in USAGE_FIELDS:
+                stats[name] += int((usage or {}).get(name) or 0)
+
+    def snapshot(self) -> Dict[str, Dict[str, float]]:
+        """Return the totals per model and the share of prompt tokens read from the cache."""
+        with self._lock:
+            result = {}
+            for model_id, stats in self._models.items():
+                prompt_tokens = (
+                    stats["input_tokens"] + stats["cache_read_input_tokens"] + stats["cache_creation_input_tokens"]
+                )
+                result[model_id] = {
+                    **stats,
+                    "cache_hit_ratio": stats["cache_read_input_tokens"] / prompt_tokens if prompt_tokens else 0.0,
+                }
+            return result
+
+    def reset(self) -> None:
+        """Drop all recorded usage."""
+        with self._lock:
+            self._models.clear()
+
+
+_usage_metrics = LLMUsageMetrics()
+
+
+def get_llm_usage_metrics() -> LLMUsageMetrics:
+    """Get the process-wide LLM token usage metrics."""
+    return _usage_metrics
+
 
 class LLMService:
     """Service for interacting with AWS Bedrock LLM models."""
@@ -21,65 +85,249 @@ class LLMService:
         self,
         model_id_chat: Optional[str] = None,
         model_id_roadmap: Optional[str] = None,
+        bedrock_client: Optional[Any] = None,
+        registry: Optional[LLMClientRegistry] = None,
     ):
         """
-        Initialize LLM Service with AWS Bedrock client.
+        Initialize LLM Service.
+
+        Constructing the service is cheap: Bedrock clients are owned by the
+        process-wide LLMClientRegistry and reused across requests.
 
         Args:
             model_id_chat: Bedrock model ID for chat (defaults to config)
             model_id_roadmap: Bedrock model ID for roadmap generation (defaults to config)
+            bedrock_client: Optional fixed Bedrock runtime client (bypasses the registry pool)
+            registry: Optional client registry (defaults to the process-wide registry)
         """
         self.model_id_chat = model_id_chat or settings.BEDROCK_MODEL_CHAT
         self.model_id_roadmap = model_id_roadmap or settings.BEDROCK_MODEL_ROADMAP
+        self._bedrock_client = bedrock_client
+        self.registry = registry if registry is not None else get_llm_registry()
+
+    @property
+    def bedrock_client(self) -> Optional[Any]:
+        """Bedrock runtime client for the next call (fixed client or one from the registry pool)."""
+        if self._bedrock_client is not None:
+            return self._bedrock_client
+        return self.registry.acquire_client()
+
+    async def _run_blocking(self, func: Callable[..., T], *args: Any, **kwargs: Any) -> T:
+        """Run a blocking LLM call in the registry's worker pool and await its result."""
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self.registry.executor, functools.partial(func, *args, **kwargs))
+
+    def _require_client(self) -> Any:
+        """
+        Get a Bedrock client or fail with a helpful configuration error.
 
-        # Initialize Bedrock client
-        # Use explicit credentials if provided, otherwise use AWS standard credential chain
-        # (aws configure, IAM role, environment variables, etc.)
-        try:
-            client_kwargs = {
-                "service_name": "bedrock-runtime",
-                "region_name": settings.AWS_REGION,
-            }
-
-            # Only add explicit credentials if both are provided
-            # Otherwise, boto3 will use the standard credential chain
-            if settings.AWS_ACCESS_KEY_ID and settings.AWS_SECRET_ACCESS_KEY:
-                logger.info("Using explicit AWS credentials from config")
-                client_kwargs["aws_access_key_id"] = settings.AWS_ACCESS_KEY_ID
-                client_kwargs["aws_secret_access_key"] = settings.AWS_SECRET_ACCESS_KEY
-            else:
-                logger.info(
-                    f"Using AWS standard credential chain (aws configure, IAM role, etc.) "
-                    f"for region {settings.AWS_REGION}"
-                )
+        Raises:
+            LLMError: If no client could be created
+        """
+        bedrock_client = self.bedrock_client
+        if not bedrock_client:
+            raise LLMError(
+                "Bedrock client not initialized. "
+                "Please configure AWS credentials using 'aws configure' or set AWS_ACCESS_KEY_ID and "
+                "AWS_SECRET_ACCESS_KEY environment variables. "
+                "Also ensure Bedrock model access is enabled in AWS Console."
+            )
+        return bedrock_client
 
-            self.bedrock_client = boto3.client(**client_kwargs)
+    @staticmethod
+    def _format_content(prompt: Prompt, prompt_caching: bool) -> Any:
+        """
+        Format a system prompt or message content for the Messages API.
 
-            # Test the client by checking if we can access the service
-            # This will raise an exception if credentials are invalid
-            logger.info(f"Bedrock client initialized successfully for region {settings.AWS_REGION}")
+        Prompt blocks become text content blocks; blocks marked for caching get a
+        cache_control checkpoint. Without prompt caching, blocks are sent as one
+        plain string.
+        """
+        if isinstance(prompt, str):
+            return prompt
+        if not prompt_caching:
+            return prompt_text(prompt)
+
+        content = []
+        for block in prompt:
+            item: Dict[str, Any] = {"type": "text", "text": block.text}
+            if block.cache:
+                item["cache_control"] = {"type": "ephemeral"}
+            content.append(item)
+        return content
+
+    @staticmethod
+    def _build_request_body(
+        messages: List[Dict[str, Any]],
+        system_prompt: Optional[Prompt],
+        temperature: float,
+        max_tokens: int,
+        prompt_caching: Optional[bool] = None,
+    ) -> Dict[str, Any]:
+        """Build the Anthropic Messages request body for Bedrock."""
+        caching = settings.BEDROCK_PROMPT_CACHING if prompt_caching is None else prompt_caching
+
+        # Format messages for Claude API
+        # Claude uses "user" and "assistant" roles
+        formatted_messages = []
+        for msg in messages:
+            formatted_messages.append(
+                {
+                    "role": msg.get("role", "user"),
+                    "content": LLMService._format_content(msg.get("content", ""), caching),
+                }
+            )
 
-        except ClientError as e:
-            error_code = e.response.get("Error", {}).get("Code", "Unknown")
-            error_msg = e.response.get("Error", {}).get("Message", str(e))
-            logger.error(
-                f"Failed to initialize Bedrock client: {error_code} - {error_msg}. "
-                f"Please check your AWS credentials and Bedrock model access."
+        # Prepare request body
+        body = {
+            "anthropic_version": "bedrock-2023-05-31",
+            "max_tokens": max_tokens,
+            "temperature": temperature,
+            "messages": formatted_messages,
+        }
+
+        if system_prompt:
+            body["system"] = LLMService._format_content(system_prompt, caching)
+
+        return body
+
+    @staticmethod
+    def _client_error(e: ClientError) -> LLMError:
+        """Translate a Bedrock ClientError into an LLMError with a helpful message."""
+        error_code = e.response.get("Error", {}).get("Code", "Unknown")
+        error_msg = e.response.get("Error", {}).get("Message", str(e))
+        logger.error(f"Bedrock API error: {error_code} - {error_msg}")
+
+        # Provide helpful error messages for common errors
+        if error_code == "AccessDeniedException":
+            return LLMError(
+                f"AWS Bedrock access denied: {error_msg}. "
+                "Please check IAM permissions and ensure Bedrock model access is enabled in AWS Console."
+            )
+        elif error_code == "ValidationException":
+            return LLMError(f"AWS Bedrock validation error: {error_msg}")
+        elif error_code == "ModelNotReadyException":
+            return LLMError(
+                f"Bedrock model not ready: {error_msg}. "
+                "The model may still be initializing. Please try again in a few moments."
             )
-            self.bedrock_client = None
+        else:
+            return LLMError(f"AWS Bedrock API error ({error_code}): {error_msg}")
+
+    @staticmethod
+    def _botocore_error(e: BotoCoreError) -> LLMError:
+        """Translate a botocore error (credentials, networking) into an LLMError."""
+        logger.error(f"Boto3 error: {e}")
+        error_msg = str(e)
+        if "Unable to locate credentials" in error_msg or "NoCredentialsError" in error_msg:
+            return LLMError(
+                "AWS credentials not found. "
+                "Please configure credentials using 'aws configure' or set AWS_ACCESS_KEY_ID and "
+                "AWS_SECRET_ACCESS_KEY environment variables."
+            )
+        return LLMError(f"Boto3 error: {e}")
+
+    @staticmethod
+    @contextmanager
+    def _bedrock_errors() -> Iterator[None]:
+        """Translate errors of a Bedrock call into LLMError (ServiceUnavailableError is kept for the 503)."""
+        try:
+            yield
+
+        except ServiceUnavailableError:
+            raise
+
+        except ClientError as e:
+            raise LLMService._client_error(e)
+
+        except BotoCoreError as e:
+            raise LLMService._botocore_error(e)
+
+        except json.JSONDecodeError as e:
+            logger.error(f"Failed to parse Bedrock response: {e}")
+            raise LLMError("Failed to parse response from Bedrock API")
+
         except Exception as e:
-            logger.error(
-                f"Failed to initialize Bedrock client: {e}. "
-                f"Please ensure AWS credentials are configured via 'aws configure' or environment variables."
+            logger.error(f"Unexpected error in LLM service: {e}")
+            raise LLMError(f"Unexpected error: {e}")
+
+    def _model_request(
+        self,
+        model_id: str,
+        messages: List[Dict[str, Any]],
+        system_prompt: Optional[Prompt],
+        temperature: float,
+        max_tokens: int,
+        stream: bool = False,
+    ) -> Callable[[], Any]:
+        """
+        Build a single blocking Bedrock call (one attempt, run by LLMResilience).
+
+        Returns:
+            Callable returning the raw response body (or, with stream=True, the
+            response whose "body" is the event stream)
+
+        Raises:
+            LLMError: If no client could be created
+        """
+        bedrock_client = self._require_client()
+        body = json.dumps(self._build_request_body(messages, system_prompt, temperature, max_tokens))
+        if stream:
+            return lambda: bedrock_client.invoke_model_with_response_stream(
+                modelId=model_id,
+                body=body,
+                contentType="application/json",
+                accept="application/json",
             )
-            # For development, we might not have AWS credentials yet
-            self.bedrock_client = None
+        return lambda: bedrock_client.invoke_model(
+            modelId=model_id,
+            body=body,
+            contentType="application/json",
+            accept="application/json",
+        )["body"].read()
+
+    @staticmethod
+    def _parse_response(model_id: str, raw_response: Any, max_tokens: int) -> str:
+        """
+        Extract the text of a Bedrock response.
+
+        Returns:
+            Response text, prefixed with TRUNCATED_MARKER if the model hit max_tokens
+        """
+        response_body = json.loads(raw_response)
+        get_llm_usage_metrics().record(model_id, response_body.get("usage"))
+        content = response_body.get("content", [])
+
+        if not content:
+            raise LLMError("Empty response from Bedrock API")
+
+        # Check if response was truncated (stop_reason indicates why generation stopped)
+        stop_reason = response_body.get("stop_reason")
+        was_truncated = stop_reason == "max_tokens"
+        if was_truncated:
+            logger.warning(
+                f"Response was truncated due to max_tokens limit ({max_tokens}). "
+                f"Response may be incomplete."
+            )
+
+        # Extract text from response
+        text_content = ""
+        for block in content:
+            if block.get("type") == "text":
+                text_content += block.get("text", "")
+
+        # Store truncation flag in response for later handling
+        # We'll attach it as metadata (hack: prefix with special marker)
+        if was_truncated:
+            text_content = f"{TRUNCATED_MARKER}{text_content}"
+
+        return text_content
 
     def _invoke_model(
         self,
         model_id: str,
         messages: List[Dict[str, Any]],
-        system_prompt: Optional[str] = None,
+        system_prompt: Optional[Prompt] = None,
         temperature: float = 0.7,
         max_tokens: int = 4096,
     ) -> str:
@@ -88,8 +336,8 @@ class LLMService:
 
         Args:
             model_id: Bedrock model ID
-            messages: List of messages (format: [{"role": "user", "content": "..."}])
-            system_prompt: Optional system prompt
+            messages: List of messages (format: [{"role": "user", "content": "..."}]; content may be prompt blocks)
+            system_prompt: Optional system prompt (text or prompt blocks)
             temperature: Sampling temperature
             max_tokens: Maximum tokens in response
 
@@ -98,118 +346,216 @@ class LLMService:
 
         Raises:
             LLMError: If API call fails
+            ServiceUnavailableError: If Bedrock stays throttled/unavailable, the model's circuit
+                is open or no in-flight slot is free
         """
-        if not self.bedrock_client:
-            raise LLMError(
-                "Bedrock client not initialized. "
-                "Please configure AWS credentials using 'aws configure' or set AWS_ACCESS_KEY_ID and "
-                "AWS_SECRET_ACCESS_KEY environment variables. "
-                "Also ensure Bedrock model access is enabled in AWS Console."
-            )
+        request = self._model_request(model_id, messages, system_prompt, temperature, max_tokens)
+        with self._bedrock_errors():
+            # Retried on throttling and transient errors, see LLMResilience
+            raw_response = self.registry.resilience.call(model_id, request)
+            return self._parse_response(model_id, raw_response, max_tokens)
 
-        try:
-            # Format messages for Claude API
-            # Claude uses "user" and "assistant" roles
-            formatted_messages = []
-            for msg in messages:
-                formatted_messages.append(
-                    {
-                        "role": msg.get("role", "user"),
-                        "content": msg.get("content", ""),
-                    }
-                )
+    async def _ainvoke_model(
+        self,
+        model_id: str,
+        messages: List[Dict[str, Any]],
+        system_prompt: Optional[Prompt] = None,
+        temperature: float = 0.7,
+        max_tokens: int = 4096,
+    ) -> str:
+        """
+        Awaitable version of _invoke_model().
 
-            # Prepare request body
-            body = {
-                "anthropic_version": "bedrock-2023-05-31",
-                "max_tokens": max_tokens,
-                "temperature": temperature,
-                "messages": formatted_messages,
-            }
+        Only the Bedrock attempt runs in the worker pool; waiting for an in-flight
+        slot and retry backoff happen on the event loop (see LLMResilience.acall).
+        """
+        request = self._model_request(model_id, messages, system_prompt, temperature, max_tokens)
+        with self._bedrock_errors():
+            raw_response = await self.registry.resilience.acall(model_id, request, self._run_blocking)
+            return self._parse_response(model_id, raw_response, max_tokens)
 
-            if system_prompt:
-                body["system"] = system_prompt
+    def _read_stream(self, model_id: str, response: Dict[str, Any], max_tokens: int) -> Iterator[str]:
+        """
+        Read an opened Bedrock response stream.
 
-            # Invoke model
-            response = self.bedrock_client.invoke_model(
-                modelId=model_id,
-                body=json.dumps(body),
-                contentType="application/json",
-                accept="application/json",
-            )
+        The stream was opened with an in-flight slot kept (LLMResilience keep_slot=True);
+        the slot is given back once the stream is exhausted, fails or is closed.
 
-            # Parse response
-            response_body = json.loads(response["body"].read())
-            content = response_body.get("content", [])
+        Yields:
+            Text deltas in the order the model produces them
 
-            if not content:
-                raise LLMError("Empty response from Bedrock API")
+        Returns:
+            Stop reason of the model (None if the stream ended without one)
 
-            # Check if response was truncated (stop_reason indicates why generation stopped)
-            stop_reason = response_body.get("stop_reason")
-            was_truncated = stop_reason == "max_tokens"
-            if was_truncated:
-                logger.warning(
-                    f"Response was truncated due to max_tokens limit ({max_tokens}). "
-                    f"Response may be incomplete."
-                )
+        Raises:
+            LLMError: If the stream fails mid-way
+        """
+        resilience = self.registry.resilience
+        event_stream = response["body"]
+        usage: Dict[str, Any] = {}
+        stop_reason = None
+        try:
+            for event in event_stream:
+                chunk = event.get("chunk")
+                if not chunk:
+                    continue
+                payload = json.loads(chunk["bytes"])
+                event_type = payload.get("type")
+                if event_type == "content_block_delta":
+                    delta = payload.get("delta", {})
+                    if delta.get("type") == "text_delta" and delta.get("text"):
+                        yield delta["text"]
+                elif event_type == "message_start":
+                    # Prompt token counts (including cache reads/writes) arrive with the first event
+                    usage.update(payload.get("message", {}).get("usage") or {})
+                elif event_type == "message_delta":
+                    usage.update(payload.get("usage") or {})
+                    stop_reason = payload.get("delta", {}).get("stop_reason") or stop_reason
+                    if stop_reason == "max_tokens":
+                        logger.warning(
+                            f"Streamed response was truncated due to max_tokens limit ({max_tokens}). "
+                            f"Response may be incomplete."
+                        )
+        except ClientError as e:
+            # Errors raised inside the event stream (e.g. throttling, model errors)
+            resilience.record_stream_error(model_id, e)
+            raise self._client_error(e)
+        except BotoCoreError as e:
+            resilience.record_stream_error(model_id, e)
+            raise self._botocore_error(e)
+        except json.JSONDecodeError as e:
+            logger.error(f"Failed to parse Bedrock stream event: {e}")
+            raise LLMError("Failed to parse streamed response from Bedrock API")
+        finally:
+            try:
+                if usage:
+                    get_llm_usage_metrics().record(model_id, usage)
+                close = getattr(event_stream, "close", None)
+                if callable(close):
+                    close()
+            finally:
+                resilience.release()
+        return stop_reason
+
+    def _invoke_model_stream(
+        self,
+        model_id: str,
+        messages: List[Dict[str, Any]],
+        system_prompt: Optional[Prompt] = None,
+        temperature: float = 0.7,
+        max_tokens: int = 4096,
+    ) -> Iterator[str]:
+        """
+        Invoke AWS Bedrock model with a streaming response.
 
-            # Extract text from response
-            text_content = ""
-            for block in content:
-                if block.get("type") == "text":
-                    text_content += block.get("text", "")
+        Args:
+            model_id: Bedrock model ID
+            messages: List of messages (format: [{"role": "user", "content": "..."}]; content may be prompt blocks)
+            system_prompt: Optional system prompt (text or prompt blocks)
+            temperature: Sampling temperature
+            max_tokens: Maximum tokens in response
 
-            # Store truncation flag in response for later handling
-            # We'll attach it as metadata (hack: prefix with special marker)
-            if was_truncated:
-                text_content = f"__TRUNCATED__{text_content}"
+        Yields:
+            Text deltas in the order the model produces them
 
-            return text_content
+        Returns:
+            Stop reason of the model (generator return value)
 
+        Raises:
+            LLMError: If API call fails (also mid-stream)
+            ServiceUnavailableError: If the stream cannot be opened because Bedrock stays
+                throttled/unavailable, the model's circuit is open or no in-flight slot is free
+        """
+        request = self._model_request(model_id, messages, system_prompt, temperature, max_tokens, stream=True)
+        try:
+            # Only opening the stream is retried; once text has been yielded a retry would repeat it.
+            # The in-flight slot is kept until the stream has been read (see _read_stream)
+            response = self.registry.resilience.call(model_id, request, keep_slot=True)
         except ClientError as e:
-            error_code = e.response.get("Error", {}).get("Code", "Unknown")
-            error_msg = e.response.get("Error", {}).get("Message", str(e))
-            logger.error(f"Bedrock API error: {error_code} - {error_msg}")
-
-            # Provide helpful error messages for common errors
-            if error_code == "AccessDeniedException":
-                raise LLMError(
-                    f"AWS Bedrock access denied: {error_msg}. "
-                    "Please check IAM permissions and ensure Bedrock model access is enabled in AWS Console."
-                )
-            elif error_code == "ValidationException":
-                raise LLMError(f"AWS Bedrock validation error: {error_msg}")
-            elif error_code == "ModelNotReadyException":
-                raise LLMError(
-                    f"Bedrock model not ready: {error_msg}. "
-                    "The model may still be initializing. Please try again in a few moments."
-                )
-            else:
-                raise LLMError(f"AWS Bedrock API error ({error_code}): {error_msg}")
-
+            raise self._client_error(e)
         except BotoCoreError as e:
-            logger.error(f"Boto3 error: {e}")
-            error_msg = str(e)
-            if "Unable to locate credentials" in error_msg or "NoCredentialsError" in error_msg:
-                raise LLMError(
-                    "AWS credentials not found. "
-                    "Please configure credentials using 'aws configure' or set AWS_ACCESS_KEY_ID and "
-                    "AWS_SECRET_ACCESS_KEY environment variables."
-                )
-            raise LLMError(f"Boto3 error: {e}")
+            raise self._botocore_error(e)
 
-        except json.JSONDecodeError as e:
-            logger.error(f"Failed to parse Bedrock response: {e}")
-            raise LLMError("Failed to parse response from Bedrock API")
+        return (yield from self._read_stream(model_id, response, max_tokens))
 
-        except Exception as e:
-            logger.error(f"Unexpected error in LLM service: {e}")
-            raise LLMError(f"Unexpected error: {e}")
+    async def _ainvoke_model_stream(
+        self,
+        model_id: str,
+        messages: List[Dict[str, Any]],
+        system_prompt: Optional[Prompt] = None,
+        temperature: float = 0.7,
+        max_tokens: int = 4096,
+    ) -> AsyncIterator[Union[str, StreamEnd]]:
+        """
+        Async iterator version of _invoke_model_stream().
+
+        The stream is opened like _ainvoke_model() (slot and backoff on the event loop);
+        the blocking event stream is then read in the worker pool and each delta is
+        handed to the event loop as soon as it arrives. Closing the iterator early
+        (e.g. the client disconnected) stops reading the Bedrock stream.
+
+        Yields:
+            Text deltas, then a StreamEnd with the model's stop reason
+        """
+        request = self._model_request(model_id, messages, system_prompt, temperature, max_tokens, stream=True)
+        resilience = self.registry.resilience
+        try:
+            response = await resilience.acall(model_id, request, self._run_blocking, keep_slot=True)
+        except ClientError as e:
+            raise self._client_error(e)
+        except BotoCoreError as e:
+            raise self._botocore_error(e)
+
+        loop = asyncio.get_running_loop()
+        queue: asyncio.Queue = asyncio.Queue()
+        stop = threading.Event()
+        finished = object()
+
+        def publish(item: Any) -> None:
+            try:
+                loop.call_soon_threadsafe(queue.put_nowait, item)
+            except RuntimeError:
+                # Event loop already closed - nobody is listening anymore
+                stop.set()
+
+        def produce() -> None:
+            stream = self._read_stream(model_id, response, max_tokens)
+            try:
+                while True:
+                    try:
+                        text = next(stream)
+                    except StopIteration as end:
+                        publish(StreamEnd(end.value))
+                        break
+                    if stop.is_set():
+                        break
+                    publish(text)
+            except Exception as e:
+                publish(e)
+            finally:
+                stream.close()
+                publish(finished)
+
+        try:
+            loop.run_in_executor(self.registry.executor, produce)
+        except RuntimeError:
+            # Worker pool already shut down: the stream is never read
+            resilience.release()
+            raise
+        try:
+            while True:
+                item = await queue.get()
+                if item is finished:
+                    break
+                if isinstance(item, Exception):
+                    raise item
+                yield item
+        finally:
+            stop.set()
 
     def chat(
         self,
-        system_prompt: str,
+        system_prompt: Prompt,
         messages: List[Dict[str, str]],
         temperature: Optional[float] = None,
         max_tokens: Optional[int] = None,
@@ -218,7 +564,7 @@ class LLMService:
         Generate chat response using Claude Haiku.
 
         Args:
-            system_prompt: System prompt for the conversation
+            system_prompt: System prompt for the conversation (text or prompt blocks)
             messages: List of message dicts with 'role' and 'content' keys
             temperature: Sampling temperature (defaults to config)
             max_tokens: Maximum tokens in response (defaults to 2048)
@@ -237,9 +583,97 @@ class LLMService:
             max_tokens=max_tok,
         )
 
+    async def achat(
+        self,
+        system_prompt: Prompt,
+        messages: List[Dict[str, str]],
+        temperature: Optional[float] = None,
+        max_tokens: Optional[int] = None,
+    ) -> str:
+        """
+        Awaitable version of chat().
+
+        The blocking Bedrock call runs in the LLM worker pool so the event loop
+        keeps serving other requests while the model generates.
+        """
+        temp = temperature if temperature is not None else settings.CHAT_TEMPERATURE
+        max_tok = max_tokens if max_tokens is not None else 2048
+
+        return await self._ainvoke_model(
+            model_id=self.model_id_chat,
+            messages=messages,
+            system_prompt=system_prompt,
+            temperature=temp,
+            max_tokens=max_tok,
+        )
+
+    def stream_chat(
+        self,
+        system_prompt: Prompt,
+        messages: List[Dict[str, str]],
+        temperature: Optional[float] = None,
+        max_tokens: Optional[int] = None,
+    ) -> Iterator[str]:
+        """
+        Generate a chat response token by token using Claude Haiku.
+
+        Args:
+            system_prompt: System prompt for the conversation (text or prompt blocks)
+            messages: List of message dicts with 'role' and 'content' keys
+            temperature: Sampling temperature (defaults to config)
+            max_tokens: Maximum tokens in response (defaults to 2048)
+
+        Yields:
+            Response text deltas
+
+        Returns:
+            Stop reason of the model, e.g. "max_tokens" for a truncated reply (generator return value)
+        """
+        temp = temperature if temperature is not None else settings.CHAT_TEMPERATURE
+        max_tok = max_tokens if max_tokens is not None else 2048
+
+        stop_reason = yield from self._invoke_model_stream(
+            model_id=self.model_id_chat,
+            messages=messages,
+            system_prompt=system_prompt,
+            temperature=temp,
+            max_tokens=max_tok,
+        )
+        return stop_reason
+
+    async def astream_chat(
+        self,
+        system_prompt: Prompt,
+        messages: List[Dict[str, str]],
+        temperature: Optional[float] = None,
+        max_tokens: Optional[int] = None,
+    ) -> AsyncIterator[Union[str, StreamEnd]]:
+        """
+        Async iterator version of stream_chat().
+
+        The blocking event stream is read in the LLM worker pool and each delta is
+        handed to the event loop as soon as it arrives. Closing the iterator early
+        (e.g. the client disconnected) stops reading the Bedrock stream.
+
+        Yields:
+            Response text deltas, then a StreamEnd whose stop_reason is "max_tokens"
+            if the reply was truncated
+        """
+        temp = temperature if temperature is not None else settings.CHAT_TEMPERATURE
+        max_tok = max_tokens if max_tokens is not None else 2048
+
+        async for item in self._ainvoke_model_stream(
+            model_id=self.model_id_chat,
+            messages=messages,
+            system_prompt=system_prompt,
+            temperature=temp,
+            max_tokens=max_tok,
+        ):
+            yield item
+
     def generate_roadmap(
         self,
-        prompt: str,
+        prompt: Prompt,
         response_schema: Optional[Dict[str, Any]] = None,
         temperature: Optional[float] = None,
     ) -> Dict[str, Any]:
@@ -247,7 +681,7 @@ class LLMService:
         Generate roadmap using Claude Sonnet with structured output.
 
         Args:
-            prompt: Prompt for roadmap generation
+            prompt: Prompt for roadmap generation (text or prompt blocks; cached blocks first)
             response_schema: Optional JSON schema for structured output
             temperature: Sampling temperature (defaults to config)
 
@@ -267,13 +701,28 @@ class LLMService:
             temperature=temp,
             max_tokens=8192,  # Increased from 4096 to handle large roadmaps
         )
+        return self._parse_roadmap_response(response_text)
+
+    @staticmethod
+    def _parse_roadmap_response(response_text: str) -> Dict[str, Any]:
+        """
+        Parse the roadmap JSON of a model response, repairing truncated output.
+
+        Args:
+            response_text: Response text (may carry TRUNCATED_MARKER)
 
+        Returns:
+            Parsed JSON response as dictionary
+
+        Raises:
+            LLMError: If the response is not valid JSON even after repair
+        """
         # Parse JSON response
         try:
             # Check if response was marked as truncated
-            was_truncated = response_text.startswith("__TRUNCATED__")
+            was_truncated = response_text.startswith(TRUNCATED_MARKER)
             if was_truncated:
-                response_text = response_text[13:]  # Remove marker
+                response_text = response_text[len(TRUNCATED_MARKER):]  # Remove marker
                 logger.warning("Processing truncated response - attempting to salvage partial JSON")
 
             # Try to extract JSON from response (sometimes LLM adds markdown)
@@ -376,3 +825,24 @@ class LLMService:
             logger.error(f"Error position: line {e.lineno}, column {e.colno}")
             raise LLMError(f"Failed to parse JSON response from LLM: {e}")
 
+    async def agenerate_roadmap(
+        self,
+        prompt: Prompt,
+        response_schema: Optional[Dict[str, Any]] = None,
+        temperature: Optional[float] = None,
+    ) -> Dict[str, Any]:
+        """
+        Awaitable version of generate_roadmap().
+
+        The blocking Bedrock call runs in the LLM worker pool.
+        """
+        temp = temperature if temperature is not None else settings.ROADMAP_TEMPERATURE
+
+        response_text = await self._ainvoke_model(
+            model_id=self.model_id_roadmap,
+            messages=[{"role": "user", "content": prompt}],
+            system_prompt=None,
+            temperature=temp,
+            max_tokens=8192,
+        )
+        return self._parse_roadmap_response(response_text)
@@ -0,0 +1,321 @@
+"""In-process job queue for background roadmap generation."""
+
+import asyncio
+import logging
+from datetime import datetime, timedelta
+from typing import Callable, List, Optional
+
+from sqlalchemy import or_
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session
+
+from api.core.config import get_settings
+from api.core.exceptions import NotFoundError, UniPilotException, ValidationError
+from api.services.llm_registry import get_llm_registry
+from api.services.llm_service import LLMService
+from api.services.roadmap_service import RoadmapService
+from database.base import SessionLocal
+from database.models import CareerTreeNode, RoadmapJob, RoadmapJobStatus, StudyProgram, UserProfile
+
+logger = logging.getLogger(__name__)
+settings = get_settings()
+
+ACTIVE_STATUSES = (RoadmapJobStatus.QUEUED, RoadmapJobStatus.RUNNING)
+
+
+class RoadmapJobQueue:
+    """
+    Queue of RoadmapJob rows processed by a pool of asyncio workers.
+
+    The RoadmapJob table is the source of truth; the in-memory queue only carries
+    job IDs. Requests enqueue and return immediately, workers run the (long) LLM
+    call and record the outcome so clients can poll the job status. Workers claim
+    a job with a conditional update, so with several API processes each job runs
+    once even if more than one process has its ID queued.
+    """
+
+    def __init__(
+        self,
+        session_factory: Callable[[], Session] = SessionLocal,
+        num_workers: Optional[int] = None,
+        llm_service: Optional[LLMService] = None,
+        stale_after: Optional[float] = None,
+    ):
+        """
+        Initialize the queue.
+
+        Args:
+            session_factory: Factory for database sessions used by the workers
+            num_workers: Number of concurrent workers (defaults to config)
+            llm_service: Optional LLM service (defaults to the shared service from the registry)
+            stale_after: Seconds after which a RUNNING job counts as abandoned (defaults to config)
+        """
+        self.session_factory = session_factory
+        self.num_workers = max(1, num_workers or settings.ROADMAP_JOB_WORKERS)
+        self.llm_service = llm_service
+        self.stale_after = stale_after if stale_after is not None else settings.ROADMAP_JOB_STALE_SECONDS
+        self._queue: Optional[asyncio.Queue] = None
+        self._workers: List[asyncio.Task] = []
+
+    @property
+    def running(self) -> bool:
+        """Whether the workers have been started."""
+        return bool(self._workers)
+
+    async def start(self) -> None:
+        """Start the workers and resume jobs left unfinished by a previous process."""
+        if self.running:
+            return
+        self._queue = asyncio.Queue()
+        for job_id in self._recover_unfinished_jobs():
+            self._queue.put_nowait(job_id)
+        self._workers = [
+            asyncio.create_task(self._worker(i), name=f"roadmap-job-worker-{i}") for i in range(self.num_workers)
+        ]
+        logger.info(f"Roadmap job queue started with {self.num_workers} workers")
+
+    async def stop(self) -> None:
+        """Stop the workers. Unfinished jobs stay in the table and resume on next start."""
+        workers, self._workers = self._workers, []
+        for worker in workers:
+            worker.cancel()
+        await asyncio.gather(*workers, return_exceptions=True)
+        self._queue = None
+
+    def _recover_unfinished_jobs(self) -> List[int]:
+        """
+        Reset abandoned jobs and return all job IDs that still need processing.
+
+        Only RUNNING jobs started more than stale_after ago are reset; younger ones
+        may belong to a live worker of another process. QUEUED jobs are picked up
+        as well - the claim in process() keeps them from running twice.
+        """
+        db = self.session_factory()
+        try:
+            cutoff = datetime.utcnow() - timedelta(seconds=self.stale_after)
+            reset = (
+                db.query(RoadmapJob)
+                .filter(
+                    RoadmapJob.status == RoadmapJobStatus.RUNNING,
+                    or_(RoadmapJob.started_at.is_(None), RoadmapJob.started_at < cutoff),
+                )
+                .update(
+                    {RoadmapJob.status: RoadmapJobStatus.QUEUED, RoadmapJob.started_at: None},
+                    synchronize_session=False,
+                )
+            )
+            db.commit()
+            job_ids = [
+                job_id
+                for (job_id,) in db.query(RoadmapJob.id)
+                .filter(RoadmapJob.status == RoadmapJobStatus.QUEUED)
+                .order_by(RoadmapJob.id)
+            ]
+            if job_ids:
+                logger.info(f"Resuming {len(job_ids)} unfinished roadmap job(s) ({reset} abandoned while running)")
+            return job_ids
+        except Exception as e:
+            db.rollback()
+            logger.warning(f"Could not recover unfinished roadmap jobs: {e}")
+            return []
+        finally:
+            db.close()
+
+    @staticmethod
+    def _active_job(topic_field_id: int, db: Session) -> Optional[RoadmapJob]:
+        """Get the queued or running job of a topic field."""
+        return (
+            db.query(RoadmapJob)
+            .filter(RoadmapJob.topic_field_id == topic_field_id, RoadmapJob.status.in_(ACTIVE_STATUSES))
+            .order_by(RoadmapJob.id)
+            .first()
+        )
+
+    def enqueue_for_job(self, user_id: int, job: CareerTreeNode, db: Session) -> RoadmapJob:
+        """
+        Enqueue roadmap generation for a job (career tree leaf node).
+
+        Requests for a topic field that already has a queued or running job are
+        deduplicated onto that job. If the roadmap already exists, a finished job
+        pointing at it is returned without any generation work.
+
+        Args:
+            user_id: ID of the requesting user (profile used as generation context)
+            job: Career tree node (must be a leaf node)
+            db: Database session
+
+        Returns:
+            The RoadmapJob tracking the generation
+
+        Raises:
+            ValidationError: If the node is not a leaf node
+        """
+        if not job.is_leaf:
+            raise ValidationError("Job must be a leaf node", "NOT_A_JOB")
+
+        topic_field = RoadmapService.ensure_job_topic_field(job, db)
+        db.commit()
+
+        active = self._active_job(topic_field.id, db)
+        if active:
+            logger.info(f"Roadmap job {active.id} already active for topic field {topic_field.id}")
+            return active
+
+        roadmap_job = RoadmapJob(
+            topic_field_id=topic_field.id,
+            career_tree_node_id=job.id,
+            user_id=user_id,
+            status=RoadmapJobStatus.QUEUED,
+        )
+        existing = RoadmapService.get_roadmap(topic_field.id, db)
+        if existing:
+            roadmap_job.status = RoadmapJobStatus.DONE
+            roadmap_job.roadmap_id = existing.id
+            roadmap_job.finished_at = datetime.utcnow()
+
+        db.add(roadmap_job)
+        try:
+            db.commit()
+        except IntegrityError:
+            # A concurrent request inserted the active job first (uq_roadmap_jobs_active_topic_field_id)
+            db.rollback()
+            active = self._active_job(topic_field.id, db)
+            if active is None:
+                raise
+            logger.info(f"Roadmap job {active.id} already active for topic field {topic_field.id}")
+            return active
+        db.refresh(roadmap_job)
+
+        if roadmap_job.status == RoadmapJobStatus.QUEUED:
+            if self._queue is not None:
+                self._queue.put_nowait(roadmap_job.id)
+            else:
+                logger.warning(f"Roadmap job queue not running - job {roadmap_job.id} will run on next start")
+        return roadmap_job
+
+    @staticmethod
+    def get_job(job_id: int, user_id: Optional[int], db: Session) -> RoadmapJob:
+        """
+        Get a roadmap job.
+
+        Args:
+            job_id: Roadmap job ID
+            user_id: Optional user ID to verify ownership
+            db: Database session
+
+        Returns:
+            RoadmapJob object
+
+        Raises:
+            NotFoundError: If job not found (or not owned by the user)
+        """
+        query = db.query(RoadmapJob).filter(RoadmapJob.id == job_id)
+        if user_id is not None:
+            query = query.filter(RoadmapJob.user_id == user_id)
+        roadmap_job = query.first()
+        if not roadmap_job:
+            raise NotFoundError(f"Roadmap job with id {job_id} not found")
+        return roadmap_job
+
+    async def _worker(self, index: int) -> None:
+        """Process job IDs from the queue until cancelled."""
+        while True:
+            job_id = await self._queue.get()
+            try:
+                await self.process(job_id)
+            except Exception as e:
+                logger.error(f"Roadmap job worker {index} failed on job {job_id}: {e}")
+            finally:
+                self._queue.task_done()
+
+    async def process(self, job_id: int) -> RoadmapJobStatus:
+        """
+        Run one roadmap job and record its outcome.
+
+        Args:
+            job_id: Roadmap job ID
+
+        Returns:
+            Final job status
+        """
+        db = self.session_factory()
+        try:
+            # Claim the job atomically: another process may have the same job ID queued
+            claimed = (
+                db.query(RoadmapJob)
+                .filter(RoadmapJob.id == job_id, RoadmapJob.status == RoadmapJobStatus.QUEUED)
+                .update(
+                    {RoadmapJob.status: RoadmapJobStatus.RUNNING, RoadmapJob.started_at: datetime.utcnow()},
+                    synchronize_session=False,
+                )
+            )
+            db.commit()
+            roadmap_job = db.query(RoadmapJob).filter(RoadmapJob.id == job_id).first()
+            if not claimed or not roadmap_job:
+                return roadmap_job.status if roadmap_job else RoadmapJobStatus.FAILED
+
+            try:
+                roadmap = await self._generate(roadmap_job, db)
+                roadmap_job.status = RoadmapJobStatus.DONE
+                roadmap_job.roadmap_id = roadmap.id
+                roadmap_job.error = None
+            except Exception as e:
+                db.rollback()
+                logger.warning(f"Roadmap job {job_id} failed: {e}")
+                roadmap_job.status = RoadmapJobStatus.FAILED
+                roadmap_job.error = e.message if isinstance(e, UniPilotException) else str(e)
+
+            roadmap_job.finished_at = datetime.utcnow()
+            db.commit()
+            return roadmap_job.status
+        finally:
+            db.close()
+
+    async def _generate(self, roadmap_job: RoadmapJob, db: Session):
+        """Load the generation context for a job and generate its roadmap."""
+        job = db.query(CareerTreeNode).filter(CareerTreeNode.id == roadmap_job.career_tree_node_id).first()
+        if not job:
+            raise NotFoundError(f"Job with id {roadmap_job.career_tree_node_id} not found")
+
+        profile = db.query(UserProfile).filter(UserProfile.user_id == roadmap_job.user_id).first()
+        if not profile or not profile.study_program_id:
+            raise NotFoundError(f"User profile with study program for user {roadmap_job.user_id} not found")
+
+        study_program = db.query(StudyProgram).filter(StudyProgram.id == profile.study_program_id).first()
+        if not study_program:
+            raise NotFoundError(f"Study program with id {profile.study_program_id} not found")
+
+        llm_service = self.llm_service or get_llm_registry().get_service()
+        roadmap_service = RoadmapService(llm_service=llm_service)
+        return await roadmap_service.agenerate_roadmap_for_job(
+            user_profile=profile,
+            job=job,
+            study_program=study_program,
+            db=db,
+        )
+
+
+_queue: Optional[RoadmapJobQueue] = None
+
+
+def init_roadmap_job_queue(**kwargs) -> RoadmapJobQueue:
+    """Create the process-wide roadmap job queue (called from the application lifespan)."""
+    global _queue
+    if _queue is None:
+        _queue = RoadmapJobQueue(**kwargs)
+    return _queue
+
+
+def get_roadmap_job_queue() -> RoadmapJobQueue:
+    """Get the process-wide roadmap job queue, creating it if needed."""
+    if _queue is None:
+        return init_roadmap_job_queue()
+    return _queue
+
+
+async def close_roadmap_job_queue() -> None:
+    """Stop the process-wide roadmap job queue (called on application shutdown)."""
+    global _queue
+    queue, _queue = _queue, None
+    if queue is not None:
+        await queue.stop()
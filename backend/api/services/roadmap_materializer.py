@@ -0,0 +1,198 @@
+"""Bulk persistence of LLM-generated roadmap items."""
+
+import json
+import logging
+from typing import Any, Dict, List, Optional
+
+from sqlalchemy import func, insert, select
+from sqlalchemy.orm import Session
+
+from api.core.exceptions import ValidationError
+from api.models.roadmap import SkillImpact, TopSkill
+from database.models import RoadmapItem, RoadmapItemSkill, RoadmapItemType
+
+logger = logging.getLogger(__name__)
+
+ITEM_TYPE_VALUES = {item_type.value for item_type in RoadmapItemType}
+
+
+class RoadmapMaterializer:
+    """
+    Turn the parsed LLM item list into RoadmapItem rows with one bulk INSERT.
+
+    Parent links are resolved in memory: the LLM's item-local "id" values are mapped
+    to pre-allocated database IDs through a dict, so no row has to be flushed to
+    learn its ID and no second fix-up pass over the database is needed.
+    """
+
+    @staticmethod
+    def validated_skills(raw_skills: Any, schema: type, label: str) -> List[Any]:
+        """
+        Validate skill entries from the LLM response, dropping invalid ones.
+
+        Args:
+            raw_skills: List of skill dicts from the LLM (or None)
+            schema: Pydantic model to validate each entry with (TopSkill or SkillImpact)
+            label: Description of the data for log messages
+
+        Returns:
+            List of validated schema instances
+        """
+        if not raw_skills:
+            return []
+        if not isinstance(raw_skills, list):
+            logger.warning(f"Ignoring {label}: expected a list, got {type(raw_skills).__name__}")
+            return []
+
+        skills = []
+        for raw_skill in raw_skills:
+            try:
+                skills.append(schema(**raw_skill))
+            except (TypeError, ValueError) as e:
+                logger.warning(f"Ignoring invalid entry in {label}: {e}")
+        return skills
+
+    @staticmethod
+    def _item_type(item_data: Dict[str, Any]) -> RoadmapItemType:
+        """Normalize item_type (handle invalid values from LLM)."""
+        item_type_str = str(item_data.get("item_type") or "").upper()
+        # Fix common LLM mistakes
+        if item_type_str == "SEMESTER_BREAK":
+            # Semester breaks should use COURSE or PROJECT type
+            logger.warning(
+                f"Fixed invalid item_type 'SEMESTER_BREAK' -> 'COURSE' for item: {item_data.get('title')}"
+            )
+            item_type_str = "COURSE"
+        elif item_type_str not in ITEM_TYPE_VALUES:
+            # Default to COURSE if unknown
+            logger.warning(
+                f"Invalid item_type '{item_type_str}' -> defaulting to 'COURSE' for item: {item_data.get('title')}"
+            )
+            item_type_str = "COURSE"
+        return RoadmapItemType(item_type_str)
+
+    @staticmethod
+    def _top_skills_json(item_data: Dict[str, Any]) -> Optional[str]:
+        """Serialize top_skills for leaf nodes (is_career_goal=true)."""
+        if not (item_data.get("is_career_goal", False) and item_data.get("is_leaf", False)):
+            return None
+        top_skills = item_data.get("top_skills")
+        if not top_skills:
+            return None
+        try:
+            return json.dumps(top_skills, ensure_ascii=False)
+        except (TypeError, ValueError) as e:
+            logger.warning(f"Failed to serialize top_skills for item {item_data.get('title')}: {e}")
+            return None
+
+    @staticmethod
+    def _resolve_parents(items_data: List[Dict[str, Any]]) -> List[Optional[int]]:
+        """
+        Resolve each item's parent to an index into items_data.
+
+        The LLM's parent_id refers to the item-local "id" of another item. If it
+        cannot be resolved (missing ids, unknown id, or a parent that is not above
+        the item), the nearest preceding item one level up is used instead.
+
+        Returns:
+            Parent index per item (None for root items)
+        """
+        index_by_llm_id: Dict[Any, int] = {}
+        for index, item_data in enumerate(items_data):
+            llm_id = item_data.get("id")
+            if llm_id is not None and llm_id not in index_by_llm_id:
+                index_by_llm_id[llm_id] = index
+
+        parents: List[Optional[int]] = []
+        last_index_at_level: Dict[int, int] = {}
+        for index, item_data in enumerate(items_data):
+            level = item_data.get("level", 0)
+            llm_parent_id = item_data.get("parent_id")
+
+            parent_index = None
+            if llm_parent_id is not None:
+                candidate = index_by_llm_id.get(llm_parent_id)
+                if candidate is not None and candidate != index and items_data[candidate].get("level", 0) < level:
+                    parent_index = candidate
+                else:
+                    parent_index = last_index_at_level.get(level - 1)
+            parents.append(parent_index)
+            last_index_at_level[level] = index
+        return parents
+
+    @staticmethod
+    def materialize(roadmap_id: int, items_data: List[Dict[str, Any]], db: Session) -> int:
+        """
+        Validate the LLM items and insert them (plus their skill impacts) in bulk.
+
+        Must run in the transaction that inserted the roadmap: that INSERT holds
+        SQLite's write lock, so the pre-allocated IDs cannot be taken concurrently.
+
+        Args:
+            roadmap_id: ID of the (flushed) roadmap the items belong to
+            items_data: Item dicts from the LLM response
+            db: Database session
+
+        Returns:
+            Number of created items
+
+        Raises:
+            ValidationError: If an item is invalid (e.g. missing semester)
+        """
+        if not isinstance(items_data, list):
+            raise ValidationError("Items must be a list", "INVALID_ITEMS")
+        if not items_data:
+            return 0
+
+        parents = RoadmapMaterializer._resolve_parents(items_data)
+
+        # Pre-allocate database IDs in list order
+        first_id = db.execute(select(func.coalesce(func.max(RoadmapItem.id), 0))).scalar_one() + 1
+        item_rows: List[Dict[str, Any]] = []
+        skill_rows: List[Dict[str, Any]] = []
+
+        for index, item_data in enumerate(items_data):
+            # Validate semester - MUST NEVER be null
+            semester = item_data.get("semester")
+            if semester is None:
+                raise ValidationError(
+                    f"Semester must not be null for item: {item_data.get('title')}. "
+                    "Every roadmap item must have a valid semester value."
+                )
+
+            item_id = first_id + index
+            parent_index = parents[index]
+            item_rows.append(
+                {
+                    "id": item_id,
+                    "roadmap_id": roadmap_id,
+                    "parent_id": first_id + parent_index if parent_index is not None else None,
+                    "item_type": RoadmapMaterializer._item_type(item_data),
+                    "title": item_data["title"],
+                    "description": item_data.get("description") or "",
+                    "semester": semester,
+                    "is_semester_break": item_data.get("is_semester_break", False),
+                    "order": item_data.get("order", 0),
+                    "level": item_data.get("level", 0),
+                    "is_leaf": item_data.get("is_leaf", False),
+                    "is_career_goal": item_data.get("is_career_goal", False),
+                    "module_id": item_data.get("module_id"),
+                    "is_important": item_data.get("is_important", False),
+                    "top_skills": RoadmapMaterializer._top_skills_json(item_data),
+                }
+            )
+
+            skill_impacts = RoadmapMaterializer.validated_skills(
+                item_data.get("skill_impact"), SkillImpact, f"skill_impact of item {item_data.get('title')}"
+            )
+            skill_rows.extend(
+                {"item_id": item_id, "skill": impact.skill, "impact": impact.impact} for impact in skill_impacts
+            )
+
+        # Parents before children (keeps the insert valid with foreign key enforcement on)
+        item_rows.sort(key=lambda row: row["level"])
+
+        db.execute(insert(RoadmapItem), item_rows)
+        if skill_rows:
+            db.execute(insert(RoadmapItemSkill), skill_rows)
+        return len(item_rows)
@@ -0,0 +1,309 @@
+"""Staged roadmap generation pipeline.
+
+A generation runs through a fixed sequence of stages that share one
+RoadmapGenerationContext:
+
+    context gather -> prompt -> LLM -> validate -> materialize
+
+Topic-field and job roadmaps only differ in the context they start with (the
+prompt stage picks the template), so every variant goes through the same code.
+Each stage is timed; timings are kept on the context and aggregated per stage
+in StageMetrics.
+"""
+
+import logging
+import threading
+import time
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Optional, Sequence
+
+from sqlalchemy.orm import Session
+
+from api.core.exceptions import ValidationError
+from api.models.roadmap import TopSkill
+from api.prompts.prompt_blocks import Prompt
+from api.prompts.roadmap_prompts import generate_roadmap_prompt, generate_roadmap_prompt_for_job
+from api.services.llm_service import LLMService
+from api.services.roadmap_materializer import RoadmapMaterializer
+from database.models import (
+    CareerTreeNode,
+    Module,
+    Roadmap,
+    RoadmapCurrentSkill,
+    StudyProgram,
+    TopicField,
+    UserModuleProgress,
+    UserProfile,
+)
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class RoadmapGenerationContext:
+    """State shared by the stages of one roadmap generation."""
+
+    user_profile: Optional[UserProfile]
+    study_program: Optional[StudyProgram]
+    topic_field: TopicField
+    job: Optional[CareerTreeNode] = None
+    available_modules: List[Module] = field(default_factory=list)
+    completed_modules: List[Module] = field(default_factory=list)
+    prompt: Optional[Prompt] = None
+    llm_response: Optional[Dict[str, Any]] = None
+    roadmap_data: Optional[Dict[str, Any]] = None
+    current_skills: List[TopSkill] = field(default_factory=list)
+    roadmap: Optional[Roadmap] = None
+    item_count: int = 0
+    timings: Dict[str, float] = field(default_factory=dict)
+
+
+class PipelineStage:
+    """
+    One step of the roadmap pipeline.
+
+    Subclasses implement run(); stages that can wait without blocking the event
+    loop (e.g. the LLM call) additionally override arun().
+    """
+
+    name = "stage"
+
+    def run(self, context: RoadmapGenerationContext, db: Session) -> None:
+        """Execute the stage, reading from and writing to the context."""
+        raise NotImplementedError
+
+    async def arun(self, context: RoadmapGenerationContext, db: Session) -> None:
+        """Awaitable version of run() (defaults to running inline)."""
+        self.run(context, db)
+
+
+class ContextStage(PipelineStage):
+    """Gather the user's available and completed modules."""
+
+    name = "context"
+
+    def run(self, context: RoadmapGenerationContext, db: Session) -> None:
+        # Completed modules for this user (one query, the IDs are reused below)
+        completed_modules = (
+            db.query(Module)
+            .join(UserModuleProgress, UserModuleProgress.module_id == Module.id)
+            .filter(
+                UserModuleProgress.user_id == context.user_profile.user_id,
+                UserModuleProgress.completed == True,
+            )
+            .all()
+        )
+        completed_module_ids = [module.id for module in completed_modules]
+
+        # All modules for study program, excluding completed ones
+        query = db.query(Module).filter(Module.study_program_id == context.study_program.id)
+        if completed_module_ids:
+            query = query.filter(Module.id.notin_(completed_module_ids))
+
+        context.available_modules = query.all()
+        context.completed_modules = completed_modules
+
+        logger.info(
+            f"Found {len(context.available_modules)} available (not completed) modules "
+            f"and {len(completed_modules)} completed modules "
+            f"for user {context.user_profile.user_id} in study program {context.study_program.id}"
+        )
+
+
+class PromptStage(PipelineStage):
+    """Build the generation prompt for a topic field or a job."""
+
+    name = "prompt"
+
+    def run(self, context: RoadmapGenerationContext, db: Session) -> None:
+        if context.job is not None:
+            context.prompt = generate_roadmap_prompt_for_job(
+                context.study_program,
+                context.user_profile,
+                context.job,
+                context.available_modules,
+                context.completed_modules,
+            )
+        else:
+            context.prompt = generate_roadmap_prompt(
+                context.study_program,
+                context.user_profile,
+                context.topic_field,
+                context.available_modules,
+                context.completed_modules,
+            )
+
+
+class LLMStage(PipelineStage):
+    """Call the LLM with the prepared prompt."""
+
+    name = "llm"
+
+    def __init__(self, llm_service: LLMService):
+        self.llm_service = llm_service
+
+    def _log_start(self, context: RoadmapGenerationContext) -> None:
+        if context.job is not None:
+            logger.info(f"Generating roadmap for job {context.job.id} ({context.job.name}) using LLM...")
+        else:
+            logger.info(f"Generating roadmap for topic field {context.topic_field.id} using LLM...")
+
+    def run(self, context: RoadmapGenerationContext, db: Session) -> None:
+        self._log_start(context)
+        context.llm_response = self.llm_service.generate_roadmap(context.prompt)
+
+    async def arun(self, context: RoadmapGenerationContext, db: Session) -> None:
+        self._log_start(context)
+        context.llm_response = await self.llm_service.agenerate_roadmap(context.prompt)
+
+
+class ValidateStage(PipelineStage):
+    """Check the structure of the LLM response."""
+
+    name = "validate"
+
+    def run(self, context: RoadmapGenerationContext, db: Session) -> None:
+        llm_response = context.llm_response
+        if not isinstance(llm_response, dict):
+            raise ValidationError("LLM returned invalid response format", "INVALID_LLM_RESPONSE")
+
+        roadmap_data = llm_response.get("roadmap") or llm_response  # Support both nested and flat structure
+
+        if "name" not in roadmap_data or "items" not in roadmap_data:
+            raise ValidationError(
+                "LLM response missing required fields: 'name' or 'items'",
+                "INVALID_LLM_RESPONSE",
+            )
+
+        context.roadmap_data = roadmap_data
+        context.current_skills = RoadmapMaterializer.validated_skills(
+            roadmap_data.get("current_skills"), TopSkill, "current_skills"
+        )
+
+
+class MaterializeStage(PipelineStage):
+    """Persist the roadmap, its current skills and items in one transaction."""
+
+    name = "materialize"
+
+    def run(self, context: RoadmapGenerationContext, db: Session) -> None:
+        roadmap_data = context.roadmap_data
+
+        # Create roadmap (current_skills are stored as rows in roadmap_current_skills)
+        roadmap = Roadmap(
+            topic_field_id=context.topic_field.id,
+            name=roadmap_data["name"],
+            description=roadmap_data.get("description") or "",
+        )
+        roadmap.current_skill_levels = [
+            RoadmapCurrentSkill(skill=current.skill, score=current.score) for current in context.current_skills
+        ]
+        db.add(roadmap)
+        db.flush()  # Get roadmap.id
+
+        # Bulk insert items with parent links resolved in memory
+        context.item_count = RoadmapMaterializer.materialize(roadmap.id, roadmap_data["items"], db)
+
+        db.commit()
+        db.refresh(roadmap)
+        context.roadmap = roadmap
+
+        logger.info(f"Successfully generated roadmap {roadmap.id} with {context.item_count} items")
+
+
+class StageMetrics:
+    """Thread-safe per-stage timing aggregates (count, total, max, errors)."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._stages: Dict[str, Dict[str, float]] = {}
+
+    def record(self, stage: str, seconds: float, failed: bool = False) -> None:
+        """Record one stage execution."""
+        with self._lock:
+            stats = self._stages.setdefault(
+                stage, {"count": 0, "errors": 0, "total_seconds": 0.0, "max_seconds": 0.0}
+            )
+            stats["count"] += 1
+            stats["total_seconds"] += seconds
+            stats["max_seconds"] = max(stats["max_seconds"], seconds)
+            if failed:
+                stats["errors"] += 1
+
+    def snapshot(self) -> Dict[str, Dict[str, float]]:
+        """Return the aggregates per stage, including the average duration."""
+        with self._lock:
+            return {
+                stage: {**stats, "avg_seconds": stats["total_seconds"] / stats["count"]}
+                for stage, stats in self._stages.items()
+            }
+
+    def reset(self) -> None:
+        """Drop all recorded timings."""
+        with self._lock:
+            self._stages.clear()
+
+
+_stage_metrics = StageMetrics()
+
+
+def get_stage_metrics() -> StageMetrics:
+    """Get the process-wide roadmap pipeline stage metrics."""
+    return _stage_metrics
+
+
+def default_stages(llm_service: LLMService) -> List[PipelineStage]:
+    """Build the standard stage sequence."""
+    return [ContextStage(), PromptStage(), LLMStage(llm_service), ValidateStage(), MaterializeStage()]
+
+
+class RoadmapPipeline:
+    """Runs the stages in order and records how long each one takes."""
+
+    def __init__(self, stages: Sequence[PipelineStage], metrics: Optional[StageMetrics] = None):
+        self.stages = list(stages)
+        self.metrics = metrics or get_stage_metrics()
+
+    def _record(self, context: RoadmapGenerationContext, stage: PipelineStage, started: float, failed: bool) -> None:
+        elapsed = time.perf_counter() - started
+        context.timings[stage.name] = elapsed
+        self.metrics.record(stage.name, elapsed, failed=failed)
+
+    def _log_timings(self, context: RoadmapGenerationContext) -> None:
+        timings = ", ".join(f"{name}={seconds:.3f}s" for name, seconds in context.timings.items())
+        logger.info(f"Roadmap pipeline for topic field {context.topic_field.id} finished: {timings}")
+
+    def run(self, context: RoadmapGenerationContext, db: Session) -> RoadmapGenerationContext:
+        """
+        Run all stages synchronously.
+
+        Args:
+            context: Generation context (inputs set, outputs filled in by the stages)
+            db: Database session
+
+        Returns:
+            The same context, with roadmap and timings set
+        """
+        for stage in self.stages:
+            started = time.perf_counter()
+            try:
+                stage.run(context, db)
+            except Exception:
+                self._record(context, stage, started, failed=True)
+                raise
+            self._record(context, stage, started, failed=False)
+        self._log_timings(context)
+        return context
+
+    async def arun(self, context: RoadmapGenerationContext, db: Session) -> RoadmapGenerationContext:
+        """Awaitable version of run() (stages may await, e.g. the LLM call)."""
+        for stage in self.stages:
+            started = time.perf_counter()
+            try:
+                await stage.arun(context, db)
+            except Exception:
+                self._record(context, stage, started, failed=True)
+                raise
+            self._record(context, stage, started, failed=False)
+        self._log_timings(context)
+        return context
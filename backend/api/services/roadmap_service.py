@@ -2,15 +2,36 @@
 
 import json
 import logging
-from typing import Dict, List, Optional
+from collections import defaultdict
+from typing import Any, Dict, List, Optional
 
-from sqlalchemy.orm import Session
+from sqlalchemy.orm import Session, selectinload
 
 from api.core.exceptions import LLMError, NotFoundError, ValidationError
-from api.models.roadmap import RoadmapItemCreate, RoadmapItemTreeResponse, RoadmapResponse
-from api.prompts.roadmap_prompts import generate_roadmap_prompt, generate_roadmap_prompt_for_job
+from api.models.roadmap import (
+    RoadmapItemCreate,
+    RoadmapItemResponse,
+    RoadmapItemTreeResponse,
+    RoadmapResponse,
+    SkillImpact,
+    TopSkill,
+)
 from api.services.llm_service import LLMService
-from database.models import CareerTreeNode, Module, Roadmap, RoadmapItem, RoadmapItemType, StudyProgram, TopicField, UserProfile
+from api.services.roadmap_pipeline import (
+    PipelineStage,
+    RoadmapGenerationContext,
+    RoadmapPipeline,
+    default_stages,
+)
+from api.services.single_flight import SingleFlight, get_single_flight
+from database.models import (
+    CareerTreeNode,
+    Roadmap,
+    RoadmapItem,
+    StudyProgram,
+    TopicField,
+    UserProfile,
+)
 
 logger = logging.getLogger(__name__)
 
@@ -18,9 +39,23 @@ logger = logging.getLogger(__name__)
 class RoadmapService:
     """Service for roadmap operations."""
 
-    def __init__(self, llm_service: Optional[LLMService] = None):
-        """Initialize roadmap service with optional LLM service."""
+    def __init__(
+        self,
+        llm_service: Optional[LLMService] = None,
+        single_flight: Optional[SingleFlight] = None,
+        stages: Optional[List[PipelineStage]] = None,
+    ):
+        """
+        Initialize roadmap service.
+
+        Args:
+            llm_service: LLM service (a new one is created if omitted)
+            single_flight: Single-flight coordinator for concurrent generations
+            stages: Generation pipeline stages (defaults to default_stages())
+        """
         self.llm_service = llm_service or LLMService()
+        self.single_flight = single_flight or get_single_flight()
+        self.pipeline = RoadmapPipeline(stages if stages is not None else default_stages(self.llm_service))
 
     @staticmethod
     def get_roadmap(topic_field_id: int, db: Session) -> Optional[Roadmap]:
@@ -37,12 +72,66 @@ class RoadmapService:
         return db.query(Roadmap).filter(Roadmap.topic_field_id == topic_field_id).first()
 
     @staticmethod
-    def build_tree_from_items(items: List[RoadmapItem]) -> Optional[RoadmapItemTreeResponse]:
+    def _parse_item_fields(item: RoadmapItem) -> Dict[str, Any]:
+        """
+        Convert a RoadmapItem into response fields, parsing its stored top_skills JSON once.
+
+        The result is used for both the flat item list and the tree node of the item.
+
+        Args:
+            item: RoadmapItem object
+
+        Returns:
+            Keyword arguments for RoadmapItemResponse / RoadmapItemTreeResponse
+        """
+        # Parse top_skills from JSON string if present
+        top_skills = None
+        if item.top_skills:
+            try:
+                top_skills_data = json.loads(item.top_skills)
+                top_skills = [TopSkill(**skill) for skill in top_skills_data]
+            except (json.JSONDecodeError, TypeError, ValueError) as e:
+                logger.warning(f"Failed to parse top_skills for item {item.id}: {e}")
+
+        skill_impact = [
+            SkillImpact(skill=impact.skill, impact=impact.impact) for impact in item.skill_impacts
+        ] or None
+
+        return {
+            "id": item.id,
+            "roadmap_id": item.roadmap_id,
+            "parent_id": item.parent_id,
+            "item_type": item.item_type,
+            "title": item.title,
+            "description": item.description,
+            "semester": item.semester,
+            "is_semester_break": item.is_semester_break,
+            "order": item.order,
+            "level": item.level,
+            "is_leaf": item.is_leaf,
+            "is_career_goal": item.is_career_goal,
+            "module_id": item.module_id,
+            "is_important": item.is_important,
+            "top_skills": top_skills,
+            "skill_impact": skill_impact,
+            "created_at": item.created_at,
+        }
+
+    @staticmethod
+    def build_tree_from_items(
+        items: List[RoadmapItem],
+        item_fields: Optional[Dict[int, Dict[str, Any]]] = None,
+    ) -> Optional[RoadmapItemTreeResponse]:
         """
         Build hierarchical tree structure from flat list of roadmap items.
 
+        Children are indexed by parent in one pass and the tree is built iteratively,
+        so the cost is linear in the number of items and deep trees cannot hit the
+        recursion limit.
+
         Args:
             items: List of RoadmapItem objects
+            item_fields: Optional pre-parsed response fields by item ID (see _parse_item_fields)
 
         Returns:
             Root RoadmapItemTreeResponse node or None if no items
@@ -50,75 +139,38 @@ class RoadmapService:
         if not items:
             return None
 
-        # Create map of all items by ID
-        item_map: Dict[int, RoadmapItem] = {item.id: item for item in items}
+        if item_fields is None:
+            item_fields = {item.id: RoadmapService._parse_item_fields(item) for item in items}
 
-        # Find root items (parent_id is None)
-        root_items = [item for item in items if item.parent_id is None]
+        # Index children by parent ID (root items are stored under None)
+        children_by_parent: Dict[Optional[int], List[RoadmapItem]] = defaultdict(list)
+        for item in items:
+            children_by_parent[item.parent_id].append(item)
 
+        root_items = children_by_parent.get(None)
         if not root_items:
             # If no explicit root, use item with lowest level
             root_items = [min(items, key=lambda x: x.level)]
 
-        # Build tree recursively
-        def build_node(item: RoadmapItem) -> RoadmapItemTreeResponse:
-            # Find children of this item
-            children_items = [
-                child for child in items if child.parent_id == item.id
-            ]
+        # Build tree from first root (if multiple roots, use first)
+        root_item = root_items[0]
+        root_node = RoadmapItemTreeResponse(**item_fields[root_item.id], children=[])
+        visited = {root_item.id}
+        stack = [(root_item, root_node)]
+        while stack:
+            item, node = stack.pop()
             # Sort children by order and level
-            children_items.sort(key=lambda x: (x.order, x.level))
-
-            # Convert to response model
-            children_responses = [build_node(child) for child in children_items]
-
-            from api.models.roadmap import (
-                TopSkill,
-                SkillImpact,
-                parse_skill_data_from_description,
-            )
-
-            # Parse top_skills from JSON string if present
-            top_skills = None
-            if item.top_skills:
-                try:
-                    top_skills_data = json.loads(item.top_skills)
-                    top_skills = [TopSkill(**skill) for skill in top_skills_data]
-                except (json.JSONDecodeError, TypeError, ValueError) as e:
-                    logger.warning(f"Failed to parse top_skills for item {item.id}: {e}")
-
-            # Parse skill_impact from description
-            skill_impact = None
-            skill_data = parse_skill_data_from_description(item.description)
-            if skill_data and "skill_impact" in skill_data:
-                try:
-                    skill_impact = [SkillImpact(**impact) for impact in skill_data["skill_impact"]]
-                except (TypeError, ValueError) as e:
-                    logger.warning(f"Failed to parse skill_impact for item {item.id}: {e}")
-
-            return RoadmapItemTreeResponse(
-                id=item.id,
-                roadmap_id=item.roadmap_id,
-                parent_id=item.parent_id,
-                item_type=item.item_type,  # Pydantic should handle enum conversion  # Convert enum to value
-                title=item.title,
-                description=item.description,
-                semester=item.semester,
-                is_semester_break=item.is_semester_break,
-                order=item.order,
-                level=item.level,
-                is_leaf=item.is_leaf,
-                is_career_goal=item.is_career_goal,
-                module_id=item.module_id,
-                is_important=item.is_important,
-                top_skills=top_skills,
-                skill_impact=skill_impact,
-                created_at=item.created_at,
-                children=children_responses,
-            )
+            children_items = sorted(children_by_parent.get(item.id, ()), key=lambda x: (x.order, x.level))
+            for child in children_items:
+                if child.id in visited:
+                    # Malformed parent links (cycles) must not loop forever
+                    continue
+                visited.add(child.id)
+                child_node = RoadmapItemTreeResponse(**item_fields[child.id], children=[])
+                node.children.append(child_node)
+                stack.append((child, child_node))
 
-        # Build tree from first root (if multiple roots, use first)
-        return build_node(root_items[0])
+        return root_node
 
     @staticmethod
     def get_roadmap_with_tree(topic_field_id: int, db: Session) -> Optional[RoadmapResponse]:
@@ -136,71 +188,33 @@ class RoadmapService:
         if not roadmap:
             return None
 
-        # Load all items for this roadmap
-        items = db.query(RoadmapItem).filter(RoadmapItem.roadmap_id == roadmap.id).all()
-
-        # Build tree structure
-        tree_root = RoadmapService.build_tree_from_items(items)
+        # Load all items for this roadmap (skill impacts in one extra query)
+        items = (
+            db.query(RoadmapItem)
+            .options(selectinload(RoadmapItem.skill_impacts))
+            .filter(RoadmapItem.roadmap_id == roadmap.id)
+            .all()
+        )
 
-        # Convert items to flat list of responses
-        from api.models.roadmap import RoadmapItemResponse
+        # Parse each item once; flat list and tree share the parsed fields
+        item_fields = {item.id: RoadmapService._parse_item_fields(item) for item in items}
 
-        from api.models.roadmap import (
-            TopSkill,
-            SkillImpact,
-            parse_skill_data_from_description,
-            parse_current_skills_from_description,
-        )
+        # Build tree structure
+        tree_root = RoadmapService.build_tree_from_items(items, item_fields)
 
         items_response = []
         target_skills = None  # Will be extracted from leaf nodes
-        
+
         for item in items:
-            # Parse top_skills from JSON string if present
-            top_skills = None
-            if item.top_skills:
-                try:
-                    top_skills_data = json.loads(item.top_skills)
-                    top_skills = [TopSkill(**skill) for skill in top_skills_data]
-                    # Extract target_skills from first leaf node found
-                    if item.is_career_goal and item.is_leaf and target_skills is None:
-                        target_skills = top_skills
-                except (json.JSONDecodeError, TypeError, ValueError) as e:
-                    logger.warning(f"Failed to parse top_skills for item {item.id}: {e}")
-
-            # Parse skill_impact from description
-            skill_impact = None
-            skill_data = parse_skill_data_from_description(item.description)
-            if skill_data and "skill_impact" in skill_data:
-                try:
-                    skill_impact = [SkillImpact(**impact) for impact in skill_data["skill_impact"]]
-                except (TypeError, ValueError) as e:
-                    logger.warning(f"Failed to parse skill_impact for item {item.id}: {e}")
-
-            items_response.append(
-                RoadmapItemResponse(
-                    id=item.id,
-                    roadmap_id=item.roadmap_id,
-                    parent_id=item.parent_id,
-                    item_type=item.item_type,  # Pydantic should handle enum conversion
-                    title=item.title,
-                    description=item.description,
-                    semester=item.semester,
-                    is_semester_break=item.is_semester_break,
-                    order=item.order,
-                    level=item.level,
-                    is_leaf=item.is_leaf,
-                    is_career_goal=item.is_career_goal,
-                    module_id=item.module_id,
-                    is_important=item.is_important,
-                    top_skills=top_skills,
-                    skill_impact=skill_impact,
-                    created_at=item.created_at,
-                )
-            )
+            fields = item_fields[item.id]
+            # Extract target_skills from first leaf node found
+            if fields["top_skills"] and item.is_career_goal and item.is_leaf and target_skills is None:
+                target_skills = fields["top_skills"]
+            items_response.append(RoadmapItemResponse(**fields))
 
-        # Parse current_skills from roadmap description
-        current_skills = parse_current_skills_from_description(roadmap.description)
+        current_skills = [
+            TopSkill(skill=current.skill, score=current.score) for current in roadmap.current_skill_levels
+        ] or None
 
         return RoadmapResponse(
             id=roadmap.id,
@@ -215,6 +229,93 @@ class RoadmapService:
             current_skills=current_skills,
         )
 
+    @staticmethod
+    def ensure_job_topic_field(job: CareerTreeNode, db: Session) -> TopicField:
+        """
+        Get or create the topic field a job's roadmap is stored under.
+
+        Args:
+            job: Career tree node (job)
+            db: Database session
+
+        Returns:
+            The job's topic field (created and linked if it did not exist)
+        """
+        # Get or create a topic field for this job (for backward compatibility with Roadmap model)
+        # We'll use the job's topic_field if it exists, or create a unique one for this job
+        topic_field = job.topic_field
+        if not topic_field:
+            # Create a unique topic field for this job
+            topic_field = TopicField(
+                name=f"Roadmap für {job.name}",
+                description=job.description or f"Roadmap für den Beruf {job.name}",
+            )
+            db.add(topic_field)
+            db.flush()
+            
+            # Update job's topic_field_id to link it to this topic field
+            # This ensures each job has a unique topic_field_id
+            job.topic_field_id = topic_field.id
+            db.flush()
+        return topic_field
+
+    @staticmethod
+    def _raise_generation_error(e: Exception, db: Session, message: str) -> None:
+        """Roll back and re-raise a roadmap generation failure as LLMError/ValidationError."""
+        db.rollback()
+        if isinstance(e, json.JSONDecodeError):
+            logger.error(f"Failed to parse LLM response as JSON: {e}")
+            raise LLMError("LLM returned invalid JSON", "JSON_PARSE_ERROR")
+        if isinstance(e, ValueError):
+            logger.error(f"Invalid data in LLM response: {e}")
+            raise ValidationError(f"Invalid roadmap data: {str(e)}", "INVALID_ROADMAP_DATA")
+        logger.error(f"{message}: {e}")
+        if isinstance(e, (LLMError, ValidationError)):
+            raise e
+        raise LLMError(f"{message}: {str(e)}", "GENERATION_FAILED")
+
+    def _run_pipeline(self, context: RoadmapGenerationContext, db: Session, error_message: str) -> Roadmap:
+        """Run the generation pipeline unless the topic field already has a roadmap."""
+        existing = RoadmapService.get_roadmap(context.topic_field.id, db)
+        if existing:
+            logger.warning(f"Roadmap for topic field {context.topic_field.id} already exists. Returning existing.")
+            return existing
+
+        try:
+            return self.pipeline.run(context, db).roadmap
+        except Exception as e:
+            RoadmapService._raise_generation_error(e, db, error_message)
+
+    async def _arun_pipeline(self, context: RoadmapGenerationContext, db: Session, error_message: str) -> Roadmap:
+        """Awaitable version of _run_pipeline()."""
+        existing = RoadmapService.get_roadmap(context.topic_field.id, db)
+        if existing:
+            logger.warning(f"Roadmap for topic field {context.topic_field.id} already exists. Returning existing.")
+            return existing
+
+        try:
+            return (await self.pipeline.arun(context, db)).roadmap
+        except Exception as e:
+            RoadmapService._raise_generation_error(e, db, error_message)
+
+    @staticmethod
+    def _job_context(
+        user_profile: UserProfile,
+        job: CareerTreeNode,
+        study_program: StudyProgram,
+        db: Session,
+    ) -> RoadmapGenerationContext:
+        """Validate the job and build its generation context."""
+        # Verify job is a leaf node
+        if not job.is_leaf:
+            raise ValidationError("Job must be a leaf node", "NOT_A_JOB")
+
+        # Roadmaps are stored per topic field (could add job_id to Roadmap model later)
+        topic_field = RoadmapService.ensure_job_topic_field(job, db)
+        # Commit a newly created topic field now, so SQLite's write lock is not held during the LLM call
+        db.commit()
+        return RoadmapGenerationContext(user_profile, study_program, topic_field, job=job)
+
     def generate_roadmap(
         self,
         user_profile: UserProfile,
@@ -239,253 +340,32 @@ class RoadmapService:
             LLMError: If LLM generation fails
             ValidationError: If generated data is invalid
         """
-        # Check if roadmap already exists
+        context = RoadmapGenerationContext(user_profile, study_program, topic_field)
+        return self._run_pipeline(context, db, "Failed to generate roadmap")
+
+    async def agenerate_roadmap(
+        self,
+        user_profile: UserProfile,
+        topic_field: TopicField,
+        study_program: StudyProgram,
+        db: Session,
+    ) -> Roadmap:
+        """
+        Awaitable version of generate_roadmap() (the LLM call runs off the event loop).
+
+        Concurrent calls for the same topic field share one generation (see SingleFlight).
+        """
         existing = RoadmapService.get_roadmap(topic_field.id, db)
         if existing:
-            logger.warning(f"Roadmap for topic field {topic_field.id} already exists. Returning existing.")
             return existing
 
-        # Get available modules for study program that the user has NOT completed
-        # Exclude modules where UserModuleProgress.completed = True for this user
-        from database.models import UserModuleProgress
-        from sqlalchemy import not_
-        
-        # Get IDs of completed modules for this user
-        completed_module_ids_subquery = (
-            db.query(UserModuleProgress.module_id)
-            .filter(
-                UserModuleProgress.user_id == user_profile.user_id,
-                UserModuleProgress.completed == True,
-            )
-        )
-        
-        # Get completed modules for the user
-        completed_module_ids = [row[0] for row in completed_module_ids_subquery.all()]
-        completed_modules = (
-            db.query(Module)
-            .filter(Module.id.in_(completed_module_ids))
-            .all() if completed_module_ids else []
-        )
-        
-        # Get all modules for study program, excluding completed ones
-        available_modules = (
-            db.query(Module)
-            .filter(Module.study_program_id == study_program.id)
-            .filter(not_(Module.id.in_(completed_module_ids_subquery)))
-            .all()
-        )
-        
-        logger.info(
-            f"Found {len(available_modules)} available (not completed) modules "
-            f"and {len(completed_modules)} completed modules "
-            f"for user {user_profile.user_id} in study program {study_program.id}"
-        )
-
-        # Generate prompt with completed modules
-        prompt = generate_roadmap_prompt(study_program, user_profile, topic_field, available_modules, completed_modules)
-
-        try:
-            # Call LLM service
-            logger.info(f"Generating roadmap for topic field {topic_field.id} using LLM...")
-            llm_response = self.llm_service.generate_roadmap(prompt)
-
-            # Validate response structure
-            if not isinstance(llm_response, dict):
-                raise ValidationError("LLM returned invalid response format", "INVALID_LLM_RESPONSE")
-
-            roadmap_data = llm_response.get("roadmap") or llm_response  # Support both nested and flat structure
-
-            if "name" not in roadmap_data or "items" not in roadmap_data:
-                raise ValidationError(
-                    "LLM response missing required fields: 'name' or 'items'",
-                    "INVALID_LLM_RESPONSE",
-                )
+        async def generate() -> int:
+            context = RoadmapGenerationContext(user_profile, study_program, topic_field)
+            roadmap = await self._arun_pipeline(context, db, "Failed to generate roadmap")
+            return roadmap.id
 
-            # Process current_skills from LLM response
-            current_skills = roadmap_data.get("current_skills")
-            roadmap_description = roadmap_data.get("description") or ""
-            
-            # Store current_skills in description with placeholder
-            if current_skills:
-                try:
-                    current_skills_json = json.dumps({"current_skills": current_skills}, ensure_ascii=False)
-                    roadmap_description += f"\n\n__CURRENT_SKILLS_START__\n{current_skills_json}\n__CURRENT_SKILLS_END__"
-                except (TypeError, ValueError) as e:
-                    logger.warning(f"Failed to serialize current_skills: {e}")
-
-            # Create roadmap
-            roadmap = Roadmap(
-                topic_field_id=topic_field.id,
-                name=roadmap_data["name"],
-                description=roadmap_description,
-            )
-            db.add(roadmap)
-            db.flush()  # Get roadmap.id
-
-            # Process items (need to create them in order to handle parent_id references)
-            items_data = roadmap_data["items"]
-            if not isinstance(items_data, list):
-                raise ValidationError("Items must be a list", "INVALID_ITEMS")
-
-            # First pass: Create all items without parent_id references (use temporary ID mapping)
-            temp_id_to_db_id: Dict[int, int] = {}  # Maps LLM-provided ID to database ID
-            items_to_create: List[Dict] = []
-
-            for item_data in items_data:
-                # Extract parent_id (might be from LLM's temporary ID system)
-                llm_parent_id = item_data.get("parent_id")
-
-                items_to_create.append(
-                    {
-                        "data": item_data,
-                        "llm_parent_id": llm_parent_id,
-                    }
-                )
-
-            # Sort items by level (root items first)
-            items_to_create.sort(key=lambda x: x["data"].get("level", 0))
-
-            # Create items in levels (parent before children)
-            created_items: Dict[int, RoadmapItem] = {}  # Maps database ID to RoadmapItem
-
-            for item_info in items_to_create:
-                item_data = item_info["data"]
-                llm_parent_id = item_info["llm_parent_id"]
-
-                # Determine parent_id
-                parent_id = None
-                if llm_parent_id is not None:
-                    # Try to find parent by matching order/level/title
-                    # This is a simplification - in production, you might want a more robust matching
-                    for created_item in created_items.values():
-                        if (
-                            created_item.level == (item_data.get("level", 0) - 1)
-                            and created_item.title == item_data.get("title", "")
-                        ):
-                            parent_id = created_item.id
-                            break
-
-                # Normalize item_type (handle invalid values from LLM)
-                item_type_str = item_data.get("item_type", "").upper()
-                # Fix common LLM mistakes
-                if item_type_str == "SEMESTER_BREAK":
-                    # Semester breaks should use COURSE or PROJECT type
-                    item_type_str = "COURSE"
-                    logger.warning(
-                        f"Fixed invalid item_type 'SEMESTER_BREAK' -> 'COURSE' for item: {item_data.get('title')}"
-                    )
-                elif item_type_str not in [e.value for e in RoadmapItemType]:
-                    # Default to COURSE if unknown
-                    logger.warning(
-                        f"Invalid item_type '{item_type_str}' -> defaulting to 'COURSE' for item: {item_data.get('title')}"
-                    )
-                    item_type_str = "COURSE"
-
-                # Validate semester - MUST NEVER be null
-                semester = item_data.get("semester")
-                if semester is None:
-                    raise ValidationError(
-                        f"Semester must not be null for item: {item_data.get('title')}. "
-                        "Every roadmap item must have a valid semester value."
-                    )
-
-                # Process top_skills for leaf nodes (is_career_goal=true)
-                top_skills_json = None
-                if item_data.get("is_career_goal", False) and item_data.get("is_leaf", False):
-                    top_skills = item_data.get("top_skills")
-                    if top_skills:
-                        try:
-                            # Validate and store as JSON string
-                            top_skills_json = json.dumps(top_skills, ensure_ascii=False)
-                        except (TypeError, ValueError) as e:
-                            logger.warning(
-                                f"Failed to serialize top_skills for item {item_data.get('title')}: {e}"
-                            )
-
-                # Process skill_impact for all items
-                skill_impact = item_data.get("skill_impact")
-                item_description = item_data.get("description") or ""
-                
-                # Store skill_impact in description with placeholder
-                if skill_impact:
-                    try:
-                        skill_impact_json = json.dumps({"skill_impact": skill_impact}, ensure_ascii=False)
-                        item_description += f"\n\n__SKILL_DATA_START__\n{skill_impact_json}\n__SKILL_DATA_END__"
-                    except (TypeError, ValueError) as e:
-                        logger.warning(
-                            f"Failed to serialize skill_impact for item {item_data.get('title')}: {e}"
-                        )
-
-                # Create roadmap item
-                roadmap_item = RoadmapItem(
-                    roadmap_id=roadmap.id,
-                    parent_id=parent_id,
-                    item_type=RoadmapItemType(item_type_str),
-                    title=item_data["title"],
-                    description=item_description,
-                    semester=semester,
-                    is_semester_break=item_data.get("is_semester_break", False),
-                    order=item_data.get("order", 0),
-                    level=item_data.get("level", 0),
-                    is_leaf=item_data.get("is_leaf", False),
-                    is_career_goal=item_data.get("is_career_goal", False),
-                    module_id=item_data.get("module_id"),
-                    is_important=item_data.get("is_important", False),
-                    top_skills=top_skills_json,
-                )
-                db.add(roadmap_item)
-                db.flush()
-                created_items[roadmap_item.id] = roadmap_item
-
-            # Second pass: Update parent_id references if they weren't set correctly
-            # This handles cases where LLM provided IDs that don't match our database IDs
-            # We'll match by order and level within siblings
-            for item_info in items_to_create:
-                item_data = item_info["data"]
-                llm_parent_id = item_info["llm_parent_id"]
-
-                if llm_parent_id is None:
-                    continue
-
-                # Find matching item in created_items
-                target_item = None
-                for created_item in created_items.values():
-                    if (
-                        created_item.title == item_data.get("title")
-                        and created_item.level == item_data.get("level", 0)
-                        and created_item.order == item_data.get("order", 0)
-                    ):
-                        target_item = created_item
-                        break
-
-                if target_item and target_item.parent_id is None:
-                    # Find parent by matching level-1 item with appropriate order
-                    parent_level = target_item.level - 1
-                    for created_item in created_items.values():
-                        if created_item.level == parent_level and created_item.roadmap_id == target_item.roadmap_id:
-                            # Simple heuristic: assign first matching parent at correct level
-                            # In production, you might want more sophisticated matching
-                            target_item.parent_id = created_item.id
-                            break
-
-            db.commit()
-            db.refresh(roadmap)
-
-            logger.info(f"Successfully generated roadmap {roadmap.id} with {len(created_items)} items")
-            return roadmap
-
-        except json.JSONDecodeError as e:
-            logger.error(f"Failed to parse LLM response as JSON: {e}")
-            raise LLMError("LLM returned invalid JSON", "JSON_PARSE_ERROR")
-        except ValueError as e:
-            logger.error(f"Invalid data in LLM response: {e}")
-            raise ValidationError(f"Invalid roadmap data: {str(e)}", "INVALID_ROADMAP_DATA")
-        except Exception as e:
-            logger.error(f"Failed to generate roadmap: {e}")
-            db.rollback()
-            if isinstance(e, (LLMError, ValidationError)):
-                raise
-            raise LLMError(f"Failed to generate roadmap: {str(e)}", "GENERATION_FAILED")
+        roadmap_id = await self.single_flight.run(RoadmapService.generation_key(topic_field.id), db, generate)
+        return db.get(Roadmap, roadmap_id)
 
     def generate_roadmap_for_job(
         self,
@@ -511,271 +391,43 @@ class RoadmapService:
             LLMError: If LLM generation fails
             ValidationError: If generated data is invalid
         """
-        # Verify job is a leaf node
-        if not job.is_leaf:
-            raise ValidationError("Job must be a leaf node", "NOT_A_JOB")
-
-        # Get or create a topic field for this job (for backward compatibility with Roadmap model)
-        # We'll use the job's topic_field if it exists, or create a unique one for this job
-        from database.models import TopicField
-
-        topic_field = job.topic_field
-        if not topic_field:
-            # Create a unique topic field for this job
-            topic_field = TopicField(
-                name=f"Roadmap für {job.name}",
-                description=job.description or f"Roadmap für den Beruf {job.name}",
-            )
-            db.add(topic_field)
-            db.flush()
-            
-            # Update job's topic_field_id to link it to this topic field
-            # This ensures each job has a unique topic_field_id
-            job.topic_field_id = topic_field.id
-            db.flush()
+        context = RoadmapService._job_context(user_profile, job, study_program, db)
+        return self._run_pipeline(context, db, "Failed to generate roadmap for job")
 
-        # Check if roadmap already exists for this job
-        # We'll use topic_field_id for now, but could add job_id to Roadmap model later
-        existing = RoadmapService.get_roadmap(topic_field.id, db)
-        if existing:
-            logger.warning(f"Roadmap for job {job.id} already exists. Returning existing.")
-            return existing
-
-        # Get available modules for study program that the user has NOT completed
-        from database.models import UserModuleProgress
-        from sqlalchemy import not_
-
-        # Get IDs of completed modules for this user
-        completed_module_ids_subquery = (
-            db.query(UserModuleProgress.module_id)
-            .filter(
-                UserModuleProgress.user_id == user_profile.user_id,
-                UserModuleProgress.completed == True,
-            )
-        )
-
-        # Get completed modules for the user
-        completed_module_ids = [row[0] for row in completed_module_ids_subquery.all()]
-        completed_modules = (
-            db.query(Module)
-            .filter(Module.id.in_(completed_module_ids))
-            .all() if completed_module_ids else []
-        )
-
-        # Get all modules for study program, excluding completed ones
-        available_modules = (
-            db.query(Module)
-            .filter(Module.study_program_id == study_program.id)
-            .filter(not_(Module.id.in_(completed_module_ids_subquery)))
-            .all()
-        )
+    async def agenerate_roadmap_for_job(
+        self,
+        user_profile: UserProfile,
+        job: CareerTreeNode,
+        study_program: StudyProgram,
+        db: Session,
+    ) -> Roadmap:
+        """
+        Awaitable version of generate_roadmap_for_job() (the LLM call runs off the event loop).
 
-        logger.info(
-            f"Found {len(available_modules)} available (not completed) modules "
-            f"and {len(completed_modules)} completed modules "
-            f"for user {user_profile.user_id} in study program {study_program.id}"
-        )
+        Concurrent calls for the same job (or its topic field) share one generation.
+        """
+        if job.topic_field_id:
+            existing = RoadmapService.get_roadmap(job.topic_field_id, db)
+            if existing:
+                return existing
 
-        # Generate prompt for job with completed modules
-        prompt = generate_roadmap_prompt_for_job(study_program, user_profile, job, available_modules, completed_modules)
+        async def generate() -> int:
+            context = RoadmapService._job_context(user_profile, job, study_program, db)
+            roadmap = await self._arun_pipeline(context, db, "Failed to generate roadmap for job")
+            return roadmap.id
 
-        try:
-            # Call LLM service
-            logger.info(f"Generating roadmap for job {job.id} ({job.name}) using LLM...")
-            llm_response = self.llm_service.generate_roadmap(prompt)
-            logger.info(f"LLM response: {llm_response}")
-
-            # Validate response structure
-            if not isinstance(llm_response, dict):
-                raise ValidationError("LLM returned invalid response format", "INVALID_LLM_RESPONSE")
-
-            roadmap_data = llm_response.get("roadmap") or llm_response  # Support both nested and flat structure
-
-            if "name" not in roadmap_data or "items" not in roadmap_data:
-                raise ValidationError(
-                    "LLM response missing required fields: 'name' or 'items'",
-                    "INVALID_LLM_RESPONSE",
-                )
-
-            # Process current_skills from LLM response
-            current_skills = roadmap_data.get("current_skills")
-            roadmap_description = roadmap_data.get("description") or ""
-            
-            # Store current_skills in description with placeholder
-            if current_skills:
-                try:
-                    current_skills_json = json.dumps({"current_skills": current_skills}, ensure_ascii=False)
-                    roadmap_description += f"\n\n__CURRENT_SKILLS_START__\n{current_skills_json}\n__CURRENT_SKILLS_END__"
-                except (TypeError, ValueError) as e:
-                    logger.warning(f"Failed to serialize current_skills: {e}")
-
-            # Create roadmap
-            roadmap = Roadmap(
-                topic_field_id=topic_field.id,
-                name=roadmap_data["name"],
-                description=roadmap_description,
-            )
-            db.add(roadmap)
-            db.flush()  # Get roadmap.id
-
-            # Process items (same logic as generate_roadmap)
-            items_data = roadmap_data["items"]
-            if not isinstance(items_data, list):
-                raise ValidationError("Items must be a list", "INVALID_ITEMS")
-
-            # First pass: Create all items without parent_id references (use temporary ID mapping)
-            temp_id_to_db_id: Dict[int, int] = {}  # Maps LLM-provided ID to database ID
-            items_to_create: List[Dict] = []
-
-            for item_data in items_data:
-                # Extract parent_id (might be from LLM's temporary ID system)
-                llm_parent_id = item_data.get("parent_id")
-
-                items_to_create.append(
-                    {
-                        "data": item_data,
-                        "llm_parent_id": llm_parent_id,
-                    }
-                )
-
-            # Sort items by level (root items first)
-            items_to_create.sort(key=lambda x: x["data"].get("level", 0))
-
-            # Create items in levels (parent before children)
-            created_items: Dict[int, RoadmapItem] = {}  # Maps database ID to RoadmapItem
-
-            for item_info in items_to_create:
-                item_data = item_info["data"]
-                llm_parent_id = item_info["llm_parent_id"]
-
-                # Determine parent_id
-                parent_id = None
-                if llm_parent_id is not None:
-                    # Try to find parent by matching order/level/title
-                    for created_item in created_items.values():
-                        if (
-                            created_item.level == (item_data.get("level", 0) - 1)
-                            and created_item.title == item_data.get("title", "")
-                        ):
-                            parent_id = created_item.id
-                            break
-
-                # Normalize item_type (handle invalid values from LLM)
-                item_type_str = item_data.get("item_type", "").upper()
-                # Fix common LLM mistakes
-                if item_type_str == "SEMESTER_BREAK":
-                    # Semester breaks should use COURSE or PROJECT type
-                    item_type_str = "COURSE"
-                    logger.warning(
-                        f"Fixed invalid item_type 'SEMESTER_BREAK' -> 'COURSE' for item: {item_data.get('title')}"
-                    )
-                elif item_type_str not in [e.value for e in RoadmapItemType]:
-                    # Default to COURSE if unknown
-                    logger.warning(
-                        f"Invalid item_type '{item_type_str}' -> defaulting to 'COURSE' for item: {item_data.get('title')}"
-                    )
-                    item_type_str = "COURSE"
-
-                # Validate semester - MUST NEVER be null
-                semester = item_data.get("semester")
-                if semester is None:
-                    raise ValidationError(
-                        f"Semester must not be null for item: {item_data.get('title')}. "
-                        "Every roadmap item must have a valid semester value."
-                    )
-
-                # Process top_skills for leaf nodes (is_career_goal=true)
-                top_skills_json = None
-                if item_data.get("is_career_goal", False) and item_data.get("is_leaf", False):
-                    top_skills = item_data.get("top_skills")
-                    if top_skills:
-                        try:
-                            # Validate and store as JSON string
-                            top_skills_json = json.dumps(top_skills, ensure_ascii=False)
-                        except (TypeError, ValueError) as e:
-                            logger.warning(
-                                f"Failed to serialize top_skills for item {item_data.get('title')}: {e}"
-                            )
-
-                # Process skill_impact for all items
-                skill_impact = item_data.get("skill_impact")
-                item_description = item_data.get("description") or ""
-                
-                # Store skill_impact in description with placeholder
-                if skill_impact:
-                    try:
-                        skill_impact_json = json.dumps({"skill_impact": skill_impact}, ensure_ascii=False)
-                        item_description += f"\n\n__SKILL_DATA_START__\n{skill_impact_json}\n__SKILL_DATA_END__"
-                    except (TypeError, ValueError) as e:
-                        logger.warning(
-                            f"Failed to serialize skill_impact for item {item_data.get('title')}: {e}"
-                        )
-
-                # Create roadmap item
-                roadmap_item = RoadmapItem(
-                    roadmap_id=roadmap.id,
-                    parent_id=parent_id,
-                    item_type=RoadmapItemType(item_type_str),
-                    title=item_data["title"],
-                    description=item_description,
-                    semester=semester,
-                    is_semester_break=item_data.get("is_semester_break", False),
-                    order=item_data.get("order", 0),
-                    level=item_data.get("level", 0),
-                    is_leaf=item_data.get("is_leaf", False),
-                    is_career_goal=item_data.get("is_career_goal", False),
-                    module_id=item_data.get("module_id"),
-                    is_important=item_data.get("is_important", False),
-                    top_skills=top_skills_json,
-                )
-                db.add(roadmap_item)
-                db.flush()
-                created_items[roadmap_item.id] = roadmap_item
-
-            # Second pass: Update parent_id references if they weren't set correctly
-            for item_info in items_to_create:
-                item_data = item_info["data"]
-                llm_parent_id = item_info["llm_parent_id"]
-
-                if llm_parent_id is None:
-                    continue
+        key = RoadmapService.generation_key(topic_field_id=job.topic_field_id, job_id=job.id)
+        roadmap_id = await self.single_flight.run(key, db, generate)
+        return db.get(Roadmap, roadmap_id)
 
-                # Find matching item in created_items
-                target_item = None
-                for created_item in created_items.values():
-                    if (
-                        created_item.title == item_data.get("title")
-                        and created_item.level == item_data.get("level", 0)
-                        and created_item.order == item_data.get("order", 0)
-                    ):
-                        target_item = created_item
-                        break
-
-                if target_item and target_item.parent_id is None:
-                    # Find parent by matching level-1 item with appropriate order
-                    parent_level = target_item.level - 1
-                    for created_item in created_items.values():
-                        if created_item.level == parent_level and created_item.roadmap_id == target_item.roadmap_id:
-                            # Simple heuristic: assign first matching parent at correct level
-                            target_item.parent_id = created_item.id
-                            break
-
-            db.commit()
-            db.refresh(roadmap)
-
-            logger.info(f"Successfully generated roadmap {roadmap.id} for job {job.id} with {len(created_items)} items")
-            return roadmap
-
-        except json.JSONDecodeError as e:
-            logger.error(f"Failed to parse LLM response as JSON: {e}")
-            raise LLMError("LLM returned invalid JSON", "JSON_PARSE_ERROR")
-        except ValueError as e:
-            logger.error(f"Invalid data in LLM response: {e}")
-            raise ValidationError(f"Invalid roadmap data: {str(e)}", "INVALID_ROADMAP_DATA")
-        except Exception as e:
-            logger.error(f"Failed to generate roadmap for job: {e}")
-            db.rollback()
-            if isinstance(e, (LLMError, ValidationError)):
-                raise
-            raise LLMError(f"Failed to generate roadmap for job: {str(e)}", "GENERATION_FAILED")
+    @staticmethod
+    def generation_key(topic_field_id: Optional[int] = None, job_id: Optional[int] = None) -> str:
+        """
+        Single-flight key for a roadmap generation.
 
+        Roadmaps are stored per topic field, so the topic field is the key whenever it
+        is known; jobs without a topic field yet are keyed by the job ID.
+        """
+        if topic_field_id is not None:
+            return f"topic_field:{topic_field_id}"
+        return f"job:{job_id}"
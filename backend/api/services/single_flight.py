@@ -0,0 +1,183 @@
+"""Single-flight coordination for expensive generation work."""
+
+import asyncio
+import logging
+import uuid
+from datetime import datetime, timedelta
+from typing import Awaitable, Callable, Dict, Optional, TypeVar
+
+from sqlalchemy.exc import IntegrityError, SQLAlchemyError
+from sqlalchemy.orm import Session
+
+from api.core.config import get_settings
+from database.models import GenerationLock
+
+logger = logging.getLogger(__name__)
+settings = get_settings()
+
+T = TypeVar("T")
+
+
+class SingleFlight:
+    """
+    Run at most one execution per key at a time.
+
+    Within a process, concurrent callers with the same key await the one in-flight
+    execution and receive its result (or exception). Across worker processes, the
+    leader additionally holds a row in the generation_locks table; leaders of other
+    processes wait for that row to disappear before running, so their work (which
+    re-checks for an existing result first) finds the finished result instead of
+    generating it again. The leader renews the row's expiry while it runs, so a
+    generation slowed down by LLM retries never looks abandoned.
+    """
+
+    def __init__(self, lock_ttl: Optional[float] = None, poll_interval: Optional[float] = None):
+        """
+        Initialize the coordinator.
+
+        Args:
+            lock_ttl: Seconds after which a lock row is considered abandoned (defaults to config)
+            poll_interval: Seconds between lock checks while another process holds it (defaults to config)
+        """
+        self.lock_ttl = lock_ttl if lock_ttl is not None else settings.GENERATION_LOCK_TTL
+        self.poll_interval = poll_interval if poll_interval is not None else settings.GENERATION_LOCK_POLL_INTERVAL
+        self.owner = uuid.uuid4().hex
+        self._inflight: Dict[str, asyncio.Future] = {}
+
+    def in_flight(self, key: str) -> bool:
+        """Whether an execution for key is currently running in this process."""
+        return key in self._inflight
+
+    async def run(self, key: str, db: Session, func: Callable[[], Awaitable[T]]) -> T:
+        """
+        Run func once for all concurrent callers with the same key.
+
+        Args:
+            key: Deduplication key (e.g. "topic_field:5")
+            db: Database session whose database holds the lock rows
+            func: Coroutine function performing the work
+
+        Returns:
+            Result of the (shared) execution
+        """
+        inflight = self._inflight.get(key)
+        if inflight is not None:
+            logger.info(f"Waiting for in-flight generation '{key}'")
+            return await asyncio.shield(inflight)
+
+        future = asyncio.get_running_loop().create_future()
+        self._inflight[key] = future
+        try:
+            await self._acquire(key, db)
+            heartbeat = asyncio.ensure_future(self._heartbeat(key, db))
+            try:
+                result = await func()
+            finally:
+                heartbeat.cancel()
+                self._release(key, db)
+            future.set_result(result)
+            return result
+        except asyncio.CancelledError:
+            future.cancel()
+            raise
+        except BaseException as e:
+            future.set_exception(e)
+            # Mark retrieved so a leader without followers does not log "exception never retrieved"
+            future.exception()
+            raise
+        finally:
+            del self._inflight[key]
+
+    def _lock_session(self, db: Session) -> Session:
+        """Separate session for lock rows so lock commits are independent of the caller's work."""
+        return Session(bind=db.get_bind())
+
+    async def _acquire(self, key: str, db: Session) -> None:
+        """Insert the lock row for key, waiting while another process holds it."""
+        while True:
+            if self._try_acquire(key, db):
+                return
+            await asyncio.sleep(self.poll_interval)
+
+    def _try_acquire(self, key: str, db: Session) -> bool:
+        """Try once to insert the lock row (taking over an expired one)."""
+        now = datetime.utcnow()
+        lock_db = self._lock_session(db)
+        try:
+            # Abandoned locks (crashed process) can be taken over
+            lock_db.query(GenerationLock).filter(
+                GenerationLock.key == key, GenerationLock.expires_at < now
+            ).delete(synchronize_session=False)
+            lock_db.add(
+                GenerationLock(
+                    key=key,
+                    owner=self.owner,
+                    acquired_at=now,
+                    expires_at=now + timedelta(seconds=self.lock_ttl),
+                )
+            )
+            lock_db.commit()
+            return True
+        except IntegrityError:
+            lock_db.rollback()
+            logger.debug(f"Generation '{key}' is running in another process - waiting")
+            return False
+        except SQLAlchemyError as e:
+            # e.g. generation_locks not migrated yet: keep in-process deduplication only
+            lock_db.rollback()
+            logger.warning(f"Cross-process generation lock unavailable for '{key}': {e}")
+            return True
+        finally:
+            lock_db.close()
+
+    async def _heartbeat(self, key: str, db: Session) -> None:
+        """Renew the lock row every third of the TTL until cancelled."""
+        while True:
+            await asyncio.sleep(self.lock_ttl / 3)
+            self._renew(key, db)
+
+    def _renew(self, key: str, db: Session) -> None:
+        """Push back the expiry of this process's lock row for key."""
+        lock_db = self._lock_session(db)
+        try:
+            renewed = (
+                lock_db.query(GenerationLock)
+                .filter(GenerationLock.key == key, GenerationLock.owner == self.owner)
+                .update(
+                    {GenerationLock.expires_at: datetime.utcnow() + timedelta(seconds=self.lock_ttl)},
+                    synchronize_session=False,
+                )
+            )
+            lock_db.commit()
+            if not renewed:
+                logger.warning(f"Generation lock '{key}' was taken over by another process")
+        except SQLAlchemyError as e:
+            lock_db.rollback()
+            logger.warning(f"Failed to renew generation lock '{key}': {e}")
+        finally:
+            lock_db.close()
+
+    def _release(self, key: str, db: Session) -> None:
+        """Delete this process's lock row for key."""
+        lock_db = self._lock_session(db)
+        try:
+            lock_db.query(GenerationLock).filter(
+                GenerationLock.key == key, GenerationLock.owner == self.owner
+            ).delete(synchronize_session=False)
+            lock_db.commit()
+        except Exception as e:
+            lock_db.rollback()
+            logger.warning(f"Failed to release generation lock '{key}' (expires after TTL): {e}")
+        finally:
+            lock_db.close()
+
+
+_single_flight: Optional[SingleFlight] = None
+
+
+def get_single_flight() -> SingleFlight:
+    """Get the process-wide single-flight coordinator."""
+    global _single_flight
+    if _single_flight is None:
+        _single_flight = SingleFlight()
+    return _single_flight
@@ -0,0 +1 @@
+"""Micro-benchmarks for hot paths (run from backend/: python -m benchmarks.<module>)."""
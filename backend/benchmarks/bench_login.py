@@ -0,0 +1,141 @@
+#!/usr/bin/env python3
+"""Benchmark login throughput and event-loop responsiveness under concurrency.
+
+Compares the previous login path (bcrypt verified inline in the async handler,
+blocking the event loop) with AuthService.alogin_user, which verifies in the
+bounded hashing pool. Both run the same number of concurrent logins against an
+in-memory SQLite database; a ticker coroutine measures how long the event loop
+was stalled (what every other request on the worker would have waited).
+
+Usage (from backend/):
+    python -m benchmarks.bench_login --logins 64 --concurrency 16
+"""
+
+import argparse
+import asyncio
+import time
+from typing import Awaitable, Callable, Dict, List
+
+from sqlalchemy import create_engine
+from sqlalchemy.orm import Session, sessionmaker
+from sqlalchemy.pool import StaticPool
+
+from api.core.exceptions import ServiceUnavailableError
+from api.core.password_hasher import PasswordHasher
+from api.core.security import hash_password
+from api.services import auth_service
+from api.services.auth_service import AuthService
+from database.base import Base
+from database.models import User
+
+EMAIL = "bench@example.com"
+PASSWORD = "benchpassword123"
+
+
+def make_session_factory() -> sessionmaker:
+    """Create an in-memory database with one user."""
+    engine = create_engine(
+        "sqlite:///:memory:", connect_args={"check_same_thread": False}, poolclass=StaticPool
+    )
+    Base.metadata.create_all(bind=engine)
+    session_factory = sessionmaker(bind=engine)
+    with session_factory() as db:
+        db.add(User(email=EMAIL, password_hash=hash_password(PASSWORD), first_name="Bench", last_name="User"))
+        db.commit()
+    return session_factory
+
+
+async def legacy_login(db: Session) -> None:
+    """Previous handler: bcrypt runs on the event loop."""
+    AuthService.login_user(EMAIL, PASSWORD, db)
+
+
+async def pooled_login(db: Session) -> None:
+    """Current handler: bcrypt runs in the hashing pool."""
+    await AuthService.alogin_user(EMAIL, PASSWORD, db)
+
+
+async def run(
+    login: Callable[[Session], Awaitable[None]],
+    session_factory: sessionmaker,
+    logins: int,
+    concurrency: int,
+) -> Dict[str, float]:
+    """Run logins with a fixed number of concurrent clients and measure loop stalls."""
+    remaining = iter(range(logins))
+    latencies: List[float] = []
+    rejected = 0
+    max_stall = 0.0
+    done = asyncio.Event()
+
+    async def ticker() -> None:
+        nonlocal max_stall
+        interval = 0.005
+        while not done.is_set():
+            start = time.perf_counter()
+            await asyncio.sleep(interval)
+            max_stall = max(max_stall, time.perf_counter() - start - interval)
+
+    async def client() -> None:
+        nonlocal rejected
+        for _ in remaining:
+            start = time.perf_counter()
+            with session_factory() as db:
+                try:
+                    await login(db)
+                except ServiceUnavailableError:
+                    rejected += 1
+                    continue
+            latencies.append(time.perf_counter() - start)
+
+    tick = asyncio.ensure_future(ticker())
+    start = time.perf_counter()
+    await asyncio.gather(*(client() for _ in range(concurrency)))
+    elapsed = time.perf_counter() - start
+    done.set()
+    await tick
+
+    latencies.sort()
+    return {
+        "throughput": len(latencies) / elapsed,
+        "p50": latencies[len(latencies) // 2] if latencies else 0.0,
+        "max_stall": max_stall,
+        "rejected": rejected,
+    }
+
+
+def report(name: str, result: Dict[str, float]) -> None:
+    print(
+        f"  {name:<28} {result['throughput']:7.1f} logins/s   p50 {result['p50'] * 1000:7.1f} ms   "
+        f"max loop stall {result['max_stall'] * 1000:7.1f} ms   rejected {int(result['rejected'])}"
+    )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--logins", type=int, default=64, help="Total logins per implementation")
+    parser.add_argument("--concurrency", type=int, default=16, help="Concurrent clients")
+    parser.add_argument("--workers", type=int, default=0, help="Hashing pool workers (0 = one per CPU core)")
+    parser.add_argument("--max-queue", type=int, default=64, help="Hashing pool queue limit")
+    args = parser.parse_args()
+
+    session_factory = make_session_factory()
+    hasher = PasswordHasher(max_workers=args.workers, max_queue=args.max_queue)
+    auth_service.get_password_hasher = lambda: hasher
+
+    try:
+        legacy = asyncio.run(run(legacy_login, session_factory, args.logins, args.concurrency))
+        pooled = asyncio.run(run(pooled_login, session_factory, args.logins, args.concurrency))
+    finally:
+        hasher.close()
+
+    print(
+        f"Login, {args.logins} logins with {args.concurrency} concurrent clients "
+        f"(hashing pool: {hasher.max_workers} workers, queue {hasher.max_queue})"
+    )
+    report("legacy (bcrypt on loop):", legacy)
+    report("current (hashing pool):", pooled)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,145 @@
+#!/usr/bin/env python3
+"""Benchmark roadmap tree building on large synthetic roadmaps.
+
+Compares the previous quadratic builder (child scan per node, JSON re-parsed per
+node and again for the flat list) with RoadmapService.build_tree_from_items plus
+the shared parsed fields used by get_roadmap_with_tree.
+
+Usage (from backend/):
+    python -m benchmarks.bench_roadmap_tree --items 5000
+"""
+
+import argparse
+import json
+import sys
+import time
+from datetime import datetime
+from typing import Callable, List
+
+from api.models.roadmap import (
+    RoadmapItemResponse,
+    RoadmapItemTreeResponse,
+    SkillImpact,
+    TopSkill,
+    parse_skill_data_from_description,
+)
+from api.services.roadmap_service import RoadmapService
+from database.models import RoadmapItem, RoadmapItemSkill, RoadmapItemType
+
+
+def make_items(count: int, semesters: int = 8) -> List[RoadmapItem]:
+    """Create a synthetic roadmap: root -> semesters -> items -> career goal leaves."""
+    created_at = datetime.utcnow()
+    skill_block = json.dumps({"skill_impact": [{"skill": "Python", "impact": 40}, {"skill": "SQL", "impact": 20}]})
+    top_skills = json.dumps([{"skill": "Python", "score": 90}, {"skill": "SQL", "score": 70}])
+
+    items = [
+        RoadmapItem(
+            id=1, roadmap_id=1, parent_id=None, item_type=RoadmapItemType.SKILL, title="Root",
+            description="Root", semester=1, order=0, level=0, is_semester_break=False,
+            is_leaf=False, is_career_goal=False, is_important=False, created_at=created_at,
+        )
+    ]
+    semester_ids = []
+    for semester in range(1, semesters + 1):
+        semester_ids.append(len(items) + 1)
+        items.append(
+            RoadmapItem(
+                id=len(items) + 1, roadmap_id=1, parent_id=1, item_type=RoadmapItemType.SKILL,
+                title=f"Semester {semester}", description=f"Semester {semester}", semester=semester,
+                order=semester, level=1, is_semester_break=False, is_leaf=False,
+                is_career_goal=False, is_important=False, created_at=created_at,
+            )
+        )
+
+    parents = []
+    while len(items) < count:
+        item_id = len(items) + 1
+        is_goal = bool(parents) and item_id % 10 == 0
+        parent_id = parents[item_id % len(parents)] if is_goal else semester_ids[item_id % semesters]
+        items.append(
+            RoadmapItem(
+                id=item_id, roadmap_id=1, parent_id=parent_id,
+                item_type=RoadmapItemType.CAREER if is_goal else RoadmapItemType.COURSE,
+                title=f"Item {item_id}",
+                description=f"Item {item_id}\n\n__SKILL_DATA_START__\n{skill_block}\n__SKILL_DATA_END__",
+                semester=1 + item_id % semesters, order=item_id, level=3 if is_goal else 2,
+                is_semester_break=False, is_leaf=is_goal, is_career_goal=is_goal, is_important=False,
+                top_skills=top_skills if is_goal else None, created_at=created_at,
+                skill_impacts=[RoadmapItemSkill(skill="Python", impact=40), RoadmapItemSkill(skill="SQL", impact=20)],
+            )
+        )
+        if not is_goal:
+            parents.append(item_id)
+    return items
+
+
+def legacy_build(items: List[RoadmapItem]):
+    """Previous implementation: recursive, O(n^2) child scan, markers regex-parsed per node and per flat item."""
+
+    def parse(item):
+        top_skills = [TopSkill(**s) for s in json.loads(item.top_skills)] if item.top_skills else None
+        skill_data = parse_skill_data_from_description(item.description)
+        skill_impact = [SkillImpact(**i) for i in skill_data["skill_impact"]] if skill_data else None
+        return top_skills, skill_impact
+
+    def fields(item):
+        top_skills, skill_impact = parse(item)
+        return dict(
+            id=item.id, roadmap_id=item.roadmap_id, parent_id=item.parent_id, item_type=item.item_type,
+            title=item.title, description=item.description, semester=item.semester,
+            is_semester_break=item.is_semester_break, order=item.order, level=item.level, is_leaf=item.is_leaf,
+            is_career_goal=item.is_career_goal, module_id=item.module_id, is_important=item.is_important,
+            top_skills=top_skills, skill_impact=skill_impact, created_at=item.created_at,
+        )
+
+    def build_node(item):
+        children_items = [child for child in items if child.parent_id == item.id]
+        children_items.sort(key=lambda x: (x.order, x.level))
+        children = [build_node(child) for child in children_items]
+        return RoadmapItemTreeResponse(**fields(item), children=children)
+
+    root = [item for item in items if item.parent_id is None][0]
+    tree = build_node(root)
+    flat = [RoadmapItemResponse(**fields(item)) for item in items]
+    return tree, flat
+
+
+def current_build(items: List[RoadmapItem]):
+    """Current implementation as used by get_roadmap_with_tree."""
+    item_fields = {item.id: RoadmapService._parse_item_fields(item) for item in items}
+    tree = RoadmapService.build_tree_from_items(items, item_fields)
+    flat = [RoadmapItemResponse(**item_fields[item.id]) for item in items]
+    return tree, flat
+
+
+def best_of(func: Callable, items: List[RoadmapItem], repeat: int) -> float:
+    """Best wall-clock time of several runs, in seconds."""
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func(items)
+        timings.append(time.perf_counter() - start)
+    return min(timings)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--items", type=int, default=5000, help="Items per synthetic roadmap")
+    parser.add_argument("--repeat", type=int, default=3, help="Runs per implementation (best is reported)")
+    args = parser.parse_args()
+
+    sys.setrecursionlimit(max(sys.getrecursionlimit(), 10000))  # legacy builder is recursive
+    items = make_items(args.items)
+
+    legacy = best_of(legacy_build, items, args.repeat)
+    current = best_of(current_build, items, args.repeat)
+
+    print(f"Roadmap tree build, {len(items)} items (best of {args.repeat})")
+    print(f"  legacy  (quadratic, recursive): {legacy * 1000:9.1f} ms")
+    print(f"  current (indexed, iterative):   {current * 1000:9.1f} ms")
+    print(f"  speedup: {legacy / current:.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,18 +1,33 @@
 """Database models and utilities for Uni Pilot."""
 
-from database.base import Base, SessionLocal, create_tables, drop_tables, engine, get_db
+from database.base import (
+    Base,
+    ReadSessionLocal,
+    SessionLocal,
+    create_tables,
+    drop_tables,
+    engine,
+    get_db,
+    get_read_db,
+    read_engine,
+)
 from database.models import (
     CareerTreeRelationship,
     CareerTreeNode,
     ChatMessage,
     ChatSession,
+    GenerationLock,
     Module,
     ModuleImport,
     ModuleType,
     Recommendation,
     Roadmap,
+    RoadmapCurrentSkill,
     RoadmapItem,
+    RoadmapItemSkill,
     RoadmapItemType,
+    RoadmapJob,
+    RoadmapJobStatus,
     StudyProgram,
     TopicField,
     University,
@@ -26,8 +41,11 @@ from database.models import (
 __all__ = [
     "Base",
     "SessionLocal",
+    "ReadSessionLocal",
     "engine",
+    "read_engine",
     "get_db",
+    "get_read_db",
     "create_tables",
     "drop_tables",
     # Models
@@ -42,10 +60,15 @@ __all__ = [
     "CareerTreeRelationship",
     "Roadmap",
     "RoadmapItem",
+    "RoadmapItemSkill",
     "RoadmapItemType",
+    "RoadmapCurrentSkill",
+    "RoadmapJob",
+    "RoadmapJobStatus",
     "Recommendation",
     "ChatSession",
     "ChatMessage",
+    "GenerationLock",
     "UserQuestion",
     "ModuleImport",
     "UserModuleProgress",
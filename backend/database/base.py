@@ -4,25 +4,120 @@ IMPORTANT: This module is configured to use SQLite only.
 Do not change the database backend without explicit permission.
 """
 
-from sqlalchemy import create_engine
+from sqlalchemy import create_engine, event
+from sqlalchemy.engine import Engine
 from sqlalchemy.orm import declarative_base, sessionmaker
-from sqlalchemy.pool import StaticPool
+from sqlalchemy.pool import QueuePool
+
+from api.core.config import get_settings
+
+settings = get_settings()
 
 # SQLite database URL - DO NOT CHANGE without permission
 # This project uses SQLite as the database backend
 DATABASE_URL = "sqlite:///uni_pilot.db"
 
-# Create engine with SQLite-specific configuration
-# SQLite-specific settings are required and should not be changed for other databases
-engine = create_engine(
-    DATABASE_URL,
-    connect_args={"check_same_thread": False},  # Required for SQLite
-    poolclass=StaticPool,  # Required for SQLite (doesn't support connection pooling)
-    echo=False,  # Set to True for SQL query logging
-)
+# Same database file, opened read-only (SQLite URI filename with mode=ro)
+READ_DATABASE_URL = "sqlite:///file:uni_pilot.db?mode=ro&uri=true"
+
+
+def apply_sqlite_pragmas(dbapi_connection, connection_record) -> None:
+    """
+    Configure a new SQLite connection (connect event handler).
+
+    WAL lets readers run concurrently with the single writer; the other pragmas
+    trade a little durability (synchronous=NORMAL) and memory for throughput.
+    All values come from Settings (SQLITE_*).
+    """
+    cursor = dbapi_connection.cursor()
+    try:
+        cursor.execute(f"PRAGMA journal_mode={settings.SQLITE_JOURNAL_MODE}")
+        cursor.execute(f"PRAGMA synchronous={settings.SQLITE_SYNCHRONOUS}")
+        cursor.execute(f"PRAGMA busy_timeout={int(settings.SQLITE_BUSY_TIMEOUT_MS)}")
+        cursor.execute(f"PRAGMA cache_size={int(settings.SQLITE_CACHE_SIZE)}")
+        cursor.execute(f"PRAGMA mmap_size={int(settings.SQLITE_MMAP_SIZE)}")
+        cursor.execute(f"PRAGMA foreign_keys={'ON' if settings.SQLITE_FOREIGN_KEYS else 'OFF'}")
+    finally:
+        cursor.close()
+
+
+def apply_read_only_pragmas(dbapi_connection, connection_record) -> None:
+    """
+    Configure a new read-only SQLite connection (connect event handler).
+
+    journal_mode and foreign_keys are left alone (they need write access or only
+    matter for writes); query_only additionally rejects writes at the statement level.
+    """
+    cursor = dbapi_connection.cursor()
+    try:
+        cursor.execute("PRAGMA query_only=ON")
+        cursor.execute(f"PRAGMA busy_timeout={int(settings.SQLITE_BUSY_TIMEOUT_MS)}")
+        cursor.execute(f"PRAGMA cache_size={int(settings.SQLITE_CACHE_SIZE)}")
+        cursor.execute(f"PRAGMA mmap_size={int(settings.SQLITE_MMAP_SIZE)}")
+    finally:
+        cursor.close()
+
+
+def create_sqlite_engine(url: str = DATABASE_URL) -> Engine:
+    """
+    Create a tuned SQLite engine.
+
+    Connections come from a QueuePool, so each concurrently running request (thread)
+    has its own connection instead of sharing one through StaticPool.
+
+    Args:
+        url: SQLite database URL
 
-# Create session factory
+    Returns:
+        Engine with the SQLite pragmas applied on connect
+    """
+    sqlite_engine = create_engine(
+        url,
+        # Pooled connections are handed to whichever thread checks them out next
+        connect_args={"check_same_thread": False, "timeout": settings.SQLITE_BUSY_TIMEOUT_MS / 1000},
+        poolclass=QueuePool,
+        pool_size=settings.SQLITE_POOL_SIZE,
+        max_overflow=settings.SQLITE_MAX_OVERFLOW,
+        pool_timeout=settings.SQLITE_POOL_TIMEOUT,
+        echo=False,  # Set to True for SQL query logging
+    )
+    event.listen(sqlite_engine, "connect", apply_sqlite_pragmas)
+    return sqlite_engine
+
+
+def create_read_only_engine(url: str = READ_DATABASE_URL) -> Engine:
+    """
+    Create an engine with a separate pool of read-only SQLite connections.
+
+    In WAL mode these readers never wait for the writer, so catalog reads do not
+    queue behind roadmap inserts. The database file must already exist.
+
+    Args:
+        url: SQLite URI with mode=ro
+
+    Returns:
+        Engine with query_only connections
+    """
+    read_engine = create_engine(
+        url,
+        connect_args={"check_same_thread": False, "timeout": settings.SQLITE_BUSY_TIMEOUT_MS / 1000},
+        poolclass=QueuePool,
+        pool_size=settings.SQLITE_READ_POOL_SIZE,
+        max_overflow=settings.SQLITE_READ_MAX_OVERFLOW,
+        pool_timeout=settings.SQLITE_POOL_TIMEOUT,
+        echo=False,
+    )
+    event.listen(read_engine, "connect", apply_read_only_pragmas)
+    return read_engine
+
+
+# Create engines with SQLite-specific configuration
+engine = create_sqlite_engine()
+read_engine = create_read_only_engine()
+
+# Create session factories
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+ReadSessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=read_engine)
 
 # Create declarative base for models
 Base = declarative_base()
@@ -37,6 +132,15 @@ def get_db():
         db.close()
 
 
+def get_read_db():
+    """Get read-only database session (dependency for FastAPI GET endpoints)."""
+    db = ReadSessionLocal()
+    try:
+        yield db
+    finally:
+        db.close()
+
+
 def create_tables():
     """Create all database tables."""
     Base.metadata.create_all(bind=engine)
@@ -45,4 +149,3 @@ def create_tables():
 def drop_tables():
     """Drop all database tables."""
     Base.metadata.drop_all(bind=engine)
-
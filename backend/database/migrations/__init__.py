@@ -0,0 +1,87 @@
+"""Schema migrations for existing SQLite databases.
+
+New databases get the full schema from ``create_tables()``. Each module in this
+package upgrades an existing database in place and is safe to run repeatedly:
+
+    python -m database.migrations.<module>
+
+``upgrade_all()`` runs all of them in order; the application calls it on
+startup (DB_AUTO_MIGRATE), so an existing uni_pilot.db never lags behind the models.
+Data migrations that are expensive to re-check (full table scans) record their
+completion in the ``schema_migrations`` table and are skipped afterwards.
+"""
+
+import logging
+from datetime import datetime
+from typing import Optional
+
+from sqlalchemy import text
+from sqlalchemy.engine import Engine
+from sqlalchemy.exc import OperationalError
+
+logger = logging.getLogger(__name__)
+
+
+def _ensure_migrations_table(engine: Engine) -> None:
+    with engine.begin() as conn:
+        conn.exec_driver_sql(
+            "CREATE TABLE IF NOT EXISTS schema_migrations (name VARCHAR(100) PRIMARY KEY, applied_at DATETIME NOT NULL)"
+        )
+
+
+def migration_applied(engine: Engine, name: str) -> bool:
+    """Check whether a data migration has been recorded as completed."""
+    _ensure_migrations_table(engine)
+    with engine.connect() as conn:
+        row = conn.execute(text("SELECT 1 FROM schema_migrations WHERE name = :name"), {"name": name}).first()
+    return row is not None
+
+
+def mark_migration_applied(engine: Engine, name: str) -> None:
+    """Record a data migration as completed (idempotent)."""
+    _ensure_migrations_table(engine)
+    with engine.begin() as conn:
+        conn.execute(
+            text("INSERT OR IGNORE INTO schema_migrations (name, applied_at) VALUES (:name, :applied_at)"),
+            {"name": name, "applied_at": datetime.utcnow()},
+        )
+
+
+def _upgrade(engine: Engine) -> None:
+    from database.base import Base
+    from database.migrations import (
+        add_chat_summary,
+        add_generation_locks,
+        add_indexes,
+        add_roadmap_jobs,
+        normalize_skill_data,
+    )
+
+    # Missing tables first (a new database gets everything here), then in-place upgrades
+    Base.metadata.create_all(bind=engine)
+    add_roadmap_jobs.upgrade(engine)
+    add_generation_locks.upgrade(engine)
+    normalize_skill_data.upgrade(engine)
+    added = add_chat_summary.upgrade(engine)
+    created = add_indexes.upgrade(engine)
+    if added or created:
+        logger.info(f"Database migrated (columns added: {added}, indexes created: {created})")
+
+
+def upgrade_all(engine: Optional[Engine] = None) -> None:
+    """
+    Bring a database to the current schema.
+
+    Several API processes may start at once; if another process is migrating
+    concurrently (duplicate column/index), the upgrade is re-run once after it.
+
+    Args:
+        engine: Engine of the database (defaults to the application database)
+    """
+    if engine is None:
+        from database.base import engine
+    try:
+        _upgrade(engine)
+    except OperationalError as e:
+        logger.warning(f"Database migration raced with another process ({e}), retrying")
+        _upgrade(engine)
@@ -0,0 +1,46 @@
+#!/usr/bin/env python3
+"""Migration to add the rolling summary columns to chat_sessions."""
+
+import sys
+from typing import List
+
+from sqlalchemy import inspect
+from sqlalchemy.engine import Engine
+
+from database.base import engine as default_engine
+
+COLUMNS = {
+    "summary": "TEXT",
+    "summarized_until_message_id": "INTEGER",
+}
+
+
+def upgrade(engine: Engine = default_engine) -> List[str]:
+    """
+    Add the missing summary columns to chat_sessions.
+
+    Returns:
+        Names of the added columns
+    """
+    existing = {column["name"] for column in inspect(engine).get_columns("chat_sessions")}
+    added = []
+    with engine.begin() as conn:
+        for name, column_type in COLUMNS.items():
+            if name not in existing:
+                conn.exec_driver_sql(f"ALTER TABLE chat_sessions ADD COLUMN {name} {column_type}")
+                added.append(name)
+    return added
+
+
+if __name__ == "__main__":
+    print("=" * 60)
+    print("Chat Summary Migration")
+    print("=" * 60)
+    try:
+        added = upgrade()
+        for name in added:
+            print(f"  + chat_sessions.{name}")
+        print("\n✓ chat_sessions is up to date")
+    except Exception as e:
+        print(f"\n❌ Migration failed: {e}")
+        sys.exit(1)
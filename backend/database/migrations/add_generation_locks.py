@@ -0,0 +1,26 @@
+#!/usr/bin/env python3
+"""Migration to add the generation_locks table (cross-process single-flight generation)."""
+
+import sys
+
+from sqlalchemy.engine import Engine
+
+from database.base import engine as default_engine
+from database.models import GenerationLock
+
+
+def upgrade(engine: Engine = default_engine) -> None:
+    """Create the generation_locks table if it does not exist."""
+    GenerationLock.__table__.create(bind=engine, checkfirst=True)
+
+
+if __name__ == "__main__":
+    print("=" * 60)
+    print("Generation Locks Migration")
+    print("=" * 60)
+    try:
+        upgrade()
+        print("\n✓ generation_locks table is up to date")
+    except Exception as e:
+        print(f"\n❌ Migration failed: {e}")
+        sys.exit(1)
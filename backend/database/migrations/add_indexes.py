@@ -0,0 +1,71 @@
+#!/usr/bin/env python3
+"""Migration to add secondary indexes for the hot query paths (foreign keys, filters, sort orders)."""
+
+import sys
+from typing import List
+
+from sqlalchemy import inspect
+from sqlalchemy.engine import Engine
+
+from database.base import engine as default_engine
+from database.models import (
+    CareerTreeNode,
+    CareerTreeRelationship,
+    ChatMessage,
+    ChatSession,
+    Module,
+    Roadmap,
+    RoadmapItem,
+    StudyProgram,
+    UserQuestion,
+)
+
+INDEXED_MODELS = [
+    ChatMessage,
+    ChatSession,
+    RoadmapItem,
+    Roadmap,
+    Module,
+    CareerTreeNode,
+    CareerTreeRelationship,
+    StudyProgram,
+    UserQuestion,
+]
+
+
+def upgrade(engine: Engine = default_engine) -> List[str]:
+    """
+    Create the model indexes that do not exist yet.
+
+    Returns:
+        Names of the created indexes
+    """
+    inspector = inspect(engine)
+    created = []
+    for model in INDEXED_MODELS:
+        table = model.__table__
+        existing = {index["name"] for index in inspector.get_indexes(table.name)}
+        for index in sorted(table.indexes, key=lambda index: index.name):
+            if index.name not in existing:
+                index.create(bind=engine)
+                created.append(index.name)
+    if created:
+        # Refresh the planner statistics so SQLite picks the new indexes (a full scan,
+        # so not on every startup)
+        with engine.begin() as conn:
+            conn.exec_driver_sql("ANALYZE")
+    return created
+
+
+if __name__ == "__main__":
+    print("=" * 60)
+    print("Secondary Indexes Migration")
+    print("=" * 60)
+    try:
+        created = upgrade()
+        for name in created:
+            print(f"  + {name}")
+        print(f"\n✓ Indexes are up to date ({len(created)} created)")
+    except Exception as e:
+        print(f"\n❌ Migration failed: {e}")
+        sys.exit(1)
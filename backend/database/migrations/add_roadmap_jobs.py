@@ -0,0 +1,45 @@
+#!/usr/bin/env python3
+"""Migration to add the roadmap_jobs table (background roadmap generation)."""
+
+import sys
+
+from sqlalchemy import inspect
+from sqlalchemy.engine import Engine
+
+from database.base import engine as default_engine
+from database.models import RoadmapJob
+
+ACTIVE_INDEX = "uq_roadmap_jobs_active_topic_field_id"
+
+
+def upgrade(engine: Engine = default_engine) -> None:
+    """
+    Create the roadmap_jobs table and its indexes if they do not exist.
+
+    Before the unique index on active jobs is added to an existing table, all but
+    the oldest active job per topic field are marked FAILED.
+    """
+    RoadmapJob.__table__.create(bind=engine, checkfirst=True)
+    if ACTIVE_INDEX in {index["name"] for index in inspect(engine).get_indexes("roadmap_jobs")}:
+        return
+    with engine.begin() as conn:
+        conn.exec_driver_sql(
+            "UPDATE roadmap_jobs SET status = 'FAILED', error = 'Duplicate of an active job' "
+            "WHERE status IN ('QUEUED', 'RUNNING') AND id NOT IN ("
+            "SELECT MIN(id) FROM roadmap_jobs WHERE status IN ('QUEUED', 'RUNNING') GROUP BY topic_field_id)"
+        )
+    for index in RoadmapJob.__table__.indexes:
+        if index.name == ACTIVE_INDEX:
+            index.create(bind=engine)
+
+
+if __name__ == "__main__":
+    print("=" * 60)
+    print("Roadmap Jobs Migration")
+    print("=" * 60)
+    try:
+        upgrade()
+        print("\n✓ roadmap_jobs table is up to date")
+    except Exception as e:
+        print(f"\n❌ Migration failed: {e}")
+        sys.exit(1)
@@ -0,0 +1,104 @@
+#!/usr/bin/env python3
+"""Migration to move skill data out of description markers into their own tables.
+
+Older roadmaps store skill_impact in RoadmapItem.description between
+__SKILL_DATA_START__/__SKILL_DATA_END__ and current_skills in Roadmap.description
+between __CURRENT_SKILLS_START__/__CURRENT_SKILLS_END__. This migration creates
+roadmap_item_skills and roadmap_current_skills, backfills them from the markers
+and strips the markers from the descriptions. Running it again is a no-op: the
+completed backfill is recorded in schema_migrations, so later startups skip the
+table scans (backfill() can still be called directly).
+"""
+
+import re
+import sys
+from typing import Optional
+
+from sqlalchemy.engine import Engine
+from sqlalchemy.orm import Session
+
+from api.models.roadmap import SkillImpact, TopSkill, parse_current_skills_from_description, parse_skill_data_from_description
+from database.base import engine as default_engine
+from database.migrations import mark_migration_applied, migration_applied
+from database.models import Roadmap, RoadmapCurrentSkill, RoadmapItem, RoadmapItemSkill
+
+MIGRATION_NAME = "normalize_skill_data"
+
+SKILL_DATA_PATTERN = re.compile(r"\s*__SKILL_DATA_START__.*?__SKILL_DATA_END__", re.DOTALL)
+CURRENT_SKILLS_PATTERN = re.compile(r"\s*__CURRENT_SKILLS_START__.*?__CURRENT_SKILLS_END__", re.DOTALL)
+
+
+def strip_marker(description: Optional[str], pattern: re.Pattern) -> Optional[str]:
+    """Remove a marker block (and the whitespace before it) from a description."""
+    if description is None:
+        return None
+    return pattern.sub("", description).rstrip()
+
+
+def backfill(db: Session) -> tuple[int, int]:
+    """
+    Backfill skill tables from description markers.
+
+    Args:
+        db: Database session
+
+    Returns:
+        Tuple of (migrated_items, migrated_roadmaps)
+    """
+    migrated_items = 0
+    items = db.query(RoadmapItem).filter(RoadmapItem.description.contains("__SKILL_DATA_START__")).all()
+    for item in items:
+        skill_data = parse_skill_data_from_description(item.description) or {}
+        if not item.skill_impacts:
+            for raw_impact in skill_data.get("skill_impact") or []:
+                try:
+                    impact = SkillImpact(**raw_impact)
+                except (TypeError, ValueError):
+                    continue
+                item.skill_impacts.append(RoadmapItemSkill(skill=impact.skill, impact=impact.impact))
+        item.description = strip_marker(item.description, SKILL_DATA_PATTERN)
+        migrated_items += 1
+
+    migrated_roadmaps = 0
+    roadmaps = db.query(Roadmap).filter(Roadmap.description.contains("__CURRENT_SKILLS_START__")).all()
+    for roadmap in roadmaps:
+        if not roadmap.current_skill_levels:
+            for current in parse_current_skills_from_description(roadmap.description) or []:
+                if isinstance(current, TopSkill):
+                    roadmap.current_skill_levels.append(RoadmapCurrentSkill(skill=current.skill, score=current.score))
+        roadmap.description = strip_marker(roadmap.description, CURRENT_SKILLS_PATTERN)
+        migrated_roadmaps += 1
+
+    db.commit()
+    return migrated_items, migrated_roadmaps
+
+
+def upgrade(engine: Engine = default_engine) -> tuple[int, int]:
+    """
+    Create the skill tables and backfill them from existing descriptions (once per database).
+
+    Returns:
+        Tuple of (migrated_items, migrated_roadmaps); (0, 0) if the backfill already ran
+    """
+    RoadmapItemSkill.__table__.create(bind=engine, checkfirst=True)
+    RoadmapCurrentSkill.__table__.create(bind=engine, checkfirst=True)
+    if migration_applied(engine, MIGRATION_NAME):
+        return 0, 0
+    with Session(bind=engine) as db:
+        migrated = backfill(db)
+    # New code never writes markers, so once the backfill has run there is nothing left to scan for
+    mark_migration_applied(engine, MIGRATION_NAME)
+    return migrated
+
+
+if __name__ == "__main__":
+    print("=" * 60)
+    print("Skill Data Normalization Migration")
+    print("=" * 60)
+    try:
+        items, roadmaps = upgrade()
+        print(f"\n✓ Migrated skill_impact of {items} roadmap items")
+        print(f"✓ Migrated current_skills of {roadmaps} roadmaps")
+    except Exception as e:
+        print(f"\n❌ Migration failed: {e}")
+        sys.exit(1)
@@ -9,9 +9,11 @@ from sqlalchemy import (
     DateTime,
     Enum,
     ForeignKey,
+    Index,
     Integer,
     String,
     Text,
+    text,
 )
 from sqlalchemy.orm import relationship
 from sqlalchemy.sql import func
@@ -37,6 +39,13 @@ class RoadmapItemType(PyEnum):
     CAREER = "CAREER"  # Beruf (für Leaf Nodes mit is_career_goal = True)
 
 
+class RoadmapJobStatus(PyEnum):
+    QUEUED = "QUEUED"
+    RUNNING = "RUNNING"
+    DONE = "DONE"
+    FAILED = "FAILED"
+
+
 # Models
 class User(Base):
     """User model - Basis-Entität für alle Nutzer."""
@@ -86,7 +95,7 @@ class StudyProgram(Base):
 
     id = Column(Integer, primary_key=True, autoincrement=True)
     name = Column(String(255), nullable=False)
-    university_id = Column(Integer, ForeignKey("universities.id", ondelete="CASCADE"), nullable=False)
+    university_id = Column(Integer, ForeignKey("universities.id", ondelete="CASCADE"), nullable=False, index=True)
     degree_type = Column(String(50), nullable=True)
     created_at = Column(DateTime(timezone=True), server_default=func.now(), nullable=False)
 
@@ -153,7 +162,9 @@ class Module(Base):
     name = Column(String(255), nullable=False)
     description = Column(Text, nullable=True)
     module_type = Column(Enum(ModuleType), nullable=False)
-    study_program_id = Column(Integer, ForeignKey("study_programs.id", ondelete="CASCADE"), nullable=False)
+    study_program_id = Column(
+        Integer, ForeignKey("study_programs.id", ondelete="CASCADE"), nullable=False, index=True
+    )
     semester = Column(Integer, nullable=True)
     created_at = Column(DateTime(timezone=True), server_default=func.now(), nullable=False)
 
@@ -172,7 +183,9 @@ class CareerTreeNode(Base):
     id = Column(Integer, primary_key=True, autoincrement=True)
     name = Column(String(255), nullable=False)
     description = Column(Text, nullable=True)
-    study_program_id = Column(Integer, ForeignKey("study_programs.id", ondelete="CASCADE"), nullable=False)
+    study_program_id = Column(
+        Integer, ForeignKey("study_programs.id", ondelete="CASCADE"), nullable=False, index=True
+    )
     topic_field_id = Column(Integer, ForeignKey("topic_fields.id", ondelete="SET NULL"), nullable=True)
     is_leaf = Column(Boolean, default=False, nullable=False)
     level = Column(Integer, default=0, nullable=False)
@@ -203,7 +216,10 @@ class CareerTreeRelationship(Base):
     __tablename__ = "career_tree_relationships"
 
     parent_id = Column(Integer, ForeignKey("career_tree_nodes.id", ondelete="CASCADE"), primary_key=True)
-    child_id = Column(Integer, ForeignKey("career_tree_nodes.id", ondelete="CASCADE"), primary_key=True)
+    # The primary key (parent_id, child_id) covers parent lookups; child lookups need their own index
+    child_id = Column(
+        Integer, ForeignKey("career_tree_nodes.id", ondelete="CASCADE"), primary_key=True, index=True
+    )
 
     # Relationships
     parent = relationship("CareerTreeNode", foreign_keys=[parent_id], back_populates="child_relationships")
@@ -216,7 +232,7 @@ class Roadmap(Base):
     __tablename__ = "roadmaps"
 
     id = Column(Integer, primary_key=True, autoincrement=True)
-    topic_field_id = Column(Integer, ForeignKey("topic_fields.id", ondelete="CASCADE"), nullable=False)
+    topic_field_id = Column(Integer, ForeignKey("topic_fields.id", ondelete="CASCADE"), nullable=False, index=True)
     name = Column(String(255), nullable=False)
     description = Column(Text, nullable=True)
     created_at = Column(DateTime(timezone=True), server_default=func.now(), nullable=False)
@@ -230,6 +246,12 @@ class Roadmap(Base):
     # Relationships
     topic_field = relationship("TopicField", back_populates="roadmaps")
     items = relationship("RoadmapItem", back_populates="roadmap", cascade="all, delete-orphan")
+    current_skill_levels = relationship(
+        "RoadmapCurrentSkill",
+        back_populates="roadmap",
+        cascade="all, delete-orphan",
+        order_by="RoadmapCurrentSkill.id",
+    )
 
 
 class RoadmapItem(Base):
@@ -238,8 +260,8 @@ class RoadmapItem(Base):
     __tablename__ = "roadmap_items"
 
     id = Column(Integer, primary_key=True, autoincrement=True)
-    roadmap_id = Column(Integer, ForeignKey("roadmaps.id", ondelete="CASCADE"), nullable=False)
-    parent_id = Column(Integer, ForeignKey("roadmap_items.id", ondelete="CASCADE"), nullable=True)
+    roadmap_id = Column(Integer, ForeignKey("roadmaps.id", ondelete="CASCADE"), nullable=False, index=True)
+    parent_id = Column(Integer, ForeignKey("roadmap_items.id", ondelete="CASCADE"), nullable=True, index=True)
     item_type = Column(Enum(RoadmapItemType), nullable=False)
     title = Column(String(255), nullable=False)
     description = Column(Text, nullable=True)
@@ -260,6 +282,83 @@ class RoadmapItem(Base):
     module = relationship("Module", back_populates="roadmap_items")
     roadmap_progress = relationship("UserRoadmapItem", back_populates="roadmap_item", cascade="all, delete-orphan")
     recommendations = relationship("Recommendation", back_populates="roadmap_item")
+    skill_impacts = relationship(
+        "RoadmapItemSkill",
+        back_populates="roadmap_item",
+        cascade="all, delete-orphan",
+        order_by="RoadmapItemSkill.id",
+    )
+
+
+class RoadmapItemSkill(Base):
+    """RoadmapItemSkill model - Einfluss eines Roadmap-Items auf einen Skill (skill_impact)."""
+
+    __tablename__ = "roadmap_item_skills"
+
+    id = Column(Integer, primary_key=True, autoincrement=True)
+    item_id = Column(Integer, ForeignKey("roadmap_items.id", ondelete="CASCADE"), nullable=False, index=True)
+    skill = Column(String(255), nullable=False)
+    impact = Column(Integer, nullable=False)  # 0-100
+
+    # Relationships
+    roadmap_item = relationship("RoadmapItem", back_populates="skill_impacts")
+
+
+class RoadmapCurrentSkill(Base):
+    """RoadmapCurrentSkill model - Ist-Skill-Stand des Users zum Zeitpunkt der Roadmap-Generierung."""
+
+    __tablename__ = "roadmap_current_skills"
+
+    id = Column(Integer, primary_key=True, autoincrement=True)
+    roadmap_id = Column(Integer, ForeignKey("roadmaps.id", ondelete="CASCADE"), nullable=False, index=True)
+    skill = Column(String(255), nullable=False)
+    score = Column(Integer, nullable=False)  # 0-100
+
+    # Relationships
+    roadmap = relationship("Roadmap", back_populates="current_skill_levels")
+
+
+class RoadmapJob(Base):
+    """RoadmapJob model - Hintergrund-Auftrag zur Roadmap-Generierung (ein aktiver Job pro Themenfeld)."""
+
+    __tablename__ = "roadmap_jobs"
+
+    id = Column(Integer, primary_key=True, autoincrement=True)
+    topic_field_id = Column(Integer, ForeignKey("topic_fields.id", ondelete="CASCADE"), nullable=False, index=True)
+    career_tree_node_id = Column(Integer, ForeignKey("career_tree_nodes.id", ondelete="SET NULL"), nullable=True)
+    user_id = Column(Integer, ForeignKey("users.id", ondelete="CASCADE"), nullable=False)  # Auftraggeber (Profil-Kontext)
+    status = Column(Enum(RoadmapJobStatus), default=RoadmapJobStatus.QUEUED, nullable=False)
+    roadmap_id = Column(Integer, ForeignKey("roadmaps.id", ondelete="SET NULL"), nullable=True)
+    error = Column(Text, nullable=True)
+    created_at = Column(DateTime(timezone=True), server_default=func.now(), nullable=False)
+    started_at = Column(DateTime(timezone=True), nullable=True)
+    finished_at = Column(DateTime(timezone=True), nullable=True)
+
+    # Relationships
+    topic_field = relationship("TopicField")
+    career_tree_node = relationship("CareerTreeNode")
+    roadmap = relationship("Roadmap")
+
+    __table_args__ = (
+        # Höchstens ein aktiver Job pro Themenfeld (auch bei parallelen Anfragen mehrerer Prozesse)
+        Index(
+            "uq_roadmap_jobs_active_topic_field_id",
+            "topic_field_id",
+            unique=True,
+            sqlite_where=text("status IN ('QUEUED', 'RUNNING')"),
+        ),
+    )
+
+
+class GenerationLock(Base):
+    """GenerationLock model - Lock-Zeile für prozessübergreifende Single-Flight-Generierung."""
+
+    __tablename__ = "generation_locks"
+
+    key = Column(String(100), primary_key=True)  # z.B. "topic_field:5" oder "job:12"
+    owner = Column(String(64), nullable=False)  # Zufälliges Token des haltenden Prozesses
+    acquired_at = Column(DateTime, nullable=False)
+    expires_at = Column(DateTime, nullable=False)  # Danach darf ein anderer Prozess den Lock übernehmen
 
 
 class Recommendation(Base):
@@ -290,6 +389,9 @@ class ChatSession(Base):
     user_id = Column(Integer, ForeignKey("users.id", ondelete="CASCADE"), nullable=False)
     topic_field_id = Column(Integer, ForeignKey("topic_fields.id", ondelete="CASCADE"), nullable=True)
     career_tree_node_id = Column(Integer, ForeignKey("career_tree_nodes.id", ondelete="CASCADE"), nullable=True)
+    # Rolling summary of older turns that no longer fit into the LLM context window
+    summary = Column(Text, nullable=True)
+    summarized_until_message_id = Column(Integer, nullable=True)  # last message covered by summary
     created_at = Column(DateTime(timezone=True), server_default=func.now(), nullable=False)
     updated_at = Column(
         DateTime(timezone=True),
@@ -304,8 +406,14 @@ class ChatSession(Base):
     career_tree_node = relationship("CareerTreeNode", foreign_keys=[career_tree_node_id])
     messages = relationship("ChatMessage", back_populates="session", cascade="all, delete-orphan")
 
-    # Composite index hint (will be created via migration/__init__)
-    __table_args__ = ({"sqlite_autoincrement": True},)
+    __table_args__ = (
+        # Session list of a user, newest first
+        Index("ix_chat_sessions_user_id_updated_at", "user_id", "updated_at"),
+        # Session lookup per user and topic field / job
+        Index("ix_chat_sessions_user_id_topic_field_id", "user_id", "topic_field_id"),
+        Index("ix_chat_sessions_user_id_career_tree_node_id", "user_id", "career_tree_node_id"),
+        {"sqlite_autoincrement": True},
+    )
 
 
 class ChatMessage(Base):
@@ -322,6 +430,9 @@ class ChatMessage(Base):
     # Relationships
     session = relationship("ChatSession", back_populates="messages")
 
+    # Message history of a session in chronological order
+    __table_args__ = (Index("ix_chat_messages_session_id_created_at", "session_id", "created_at"),)
+
 
 class UserQuestion(Base):
     """UserQuestion model - Fragen, die der User beantwortet hat."""
@@ -339,6 +450,9 @@ class UserQuestion(Base):
     user = relationship("User", back_populates="user_questions")
     career_tree_node = relationship("CareerTreeNode", back_populates="user_questions")
 
+    # Answered questions of a user, newest first
+    __table_args__ = (Index("ix_user_questions_user_id_created_at", "user_id", "created_at"),)
+
 
 class ModuleImport(Base):
     """ModuleImport model - Historie und Metadaten für den Import von Modulen."""
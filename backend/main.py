@@ -2,6 +2,7 @@
 
 import logging
 import sys
+from contextlib import asynccontextmanager
 
 from fastapi import FastAPI, Request, status
 from fastapi.exceptions import RequestValidationError
@@ -9,8 +10,20 @@ from fastapi.middleware.cors import CORSMiddleware
 from fastapi.responses import JSONResponse
 
 from api.core.config import get_settings
-from api.core.exceptions import AuthenticationError, LLMError, NotFoundError, UniPilotException, ValidationError
-from api.routers import auth, chat, example, health, modules, onboarding, roadmaps, users, skills
+from api.core.exceptions import (
+    AuthenticationError,
+    LLMError,
+    NotFoundError,
+    ServiceUnavailableError,
+    UniPilotException,
+    ValidationError,
+)
+from api.core.pagination import NEXT_CURSOR_HEADER
+from api.core.password_hasher import close_password_hasher, init_password_hasher
+from api.routers import auth, chat, example, health, modules, onboarding, roadmap_jobs, roadmaps, users, skills
+from api.services.llm_registry import close_llm_registry, init_llm_registry
+from api.services.roadmap_job_queue import close_roadmap_job_queue, init_roadmap_job_queue
+from database.migrations import upgrade_all
 
 # Configure logging before creating the app
 settings = get_settings()
@@ -28,10 +41,27 @@ logging.basicConfig(
 logger = logging.getLogger(__name__)
 logger.info(f"Logging configured with level: {settings.LOG_LEVEL}")
 
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """Create shared resources on startup and release them on shutdown."""
+    if settings.DB_AUTO_MIGRATE:
+        upgrade_all()
+    app.state.password_hasher = init_password_hasher()
+    app.state.llm_registry = init_llm_registry()
+    app.state.roadmap_job_queue = init_roadmap_job_queue()
+    await app.state.roadmap_job_queue.start()
+    yield
+    await close_roadmap_job_queue()
+    close_llm_registry()
+    close_password_hasher()
+
+
 app = FastAPI(
     title="Uni Pilot API",
     description="API for Uni Pilot - A career roadmap application for university students",
     version="1.0.0",
+    lifespan=lifespan,
 )
 
 app.add_middleware(
@@ -40,6 +70,7 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=[NEXT_CURSOR_HEADER],  # lets browsers read the pagination cursor
 )
 
 
@@ -59,6 +90,7 @@ async def root():
 async def unipilot_exception_handler(request: Request, exc: UniPilotException):
     """Handle custom UniPilot exceptions."""
     status_code = status.HTTP_500_INTERNAL_SERVER_ERROR
+    headers = None
 
     if isinstance(exc, NotFoundError):
         status_code = status.HTTP_404_NOT_FOUND
@@ -68,10 +100,14 @@ async def unipilot_exception_handler(request: Request, exc: UniPilotException):
         status_code = status.HTTP_401_UNAUTHORIZED
     elif isinstance(exc, LLMError):
         status_code = status.HTTP_500_INTERNAL_SERVER_ERROR
+    elif isinstance(exc, ServiceUnavailableError):
+        status_code = status.HTTP_503_SERVICE_UNAVAILABLE
+        headers = {"Retry-After": str(exc.retry_after)}
 
     return JSONResponse(
         status_code=status_code,
         content={"detail": exc.message, "error_code": exc.error_code},
+        headers=headers,
     )
 
 
@@ -106,6 +142,7 @@ app.include_router(users.router)
 app.include_router(onboarding.router)
 app.include_router(modules.router)
 app.include_router(roadmaps.router)
+app.include_router(roadmap_jobs.router)
 app.include_router(chat.router)
 app.include_router(example.router)
 app.include_router(skills.router)
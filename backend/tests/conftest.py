@@ -1,12 +1,20 @@
 """Pytest fixtures and configuration for Uni Pilot tests."""
 
+from unittest.mock import AsyncMock, MagicMock
+
 import pytest
 from fastapi.testclient import TestClient
-from sqlalchemy import create_engine
+from sqlalchemy import create_engine, event
 from sqlalchemy.orm import sessionmaker
 from sqlalchemy.pool import StaticPool
 
-from database.base import Base, get_db
+from api.core.config import get_settings
+from api.core.principal_cache import get_principal_cache
+from api.dependencies import get_llm_service
+from api.services.chat_context import init_chat_summary_refresher
+from api.services.chat_history_cache import get_chat_history_cache
+from api.services.roadmap_job_queue import init_roadmap_job_queue
+from database.base import Base, apply_sqlite_pragmas, get_db, get_read_db
 from database.models import (
     CareerTreeNode,
     CareerTreeRelationship,
@@ -33,10 +41,18 @@ test_engine = create_engine(
     poolclass=StaticPool,
     echo=False,
 )
+# Same pragmas as production (foreign keys etc.; WAL does not apply to :memory:)
+event.listen(test_engine, "connect", apply_sqlite_pragmas)
 
 # Create test session factory
 TestSessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=test_engine)
 
+# The app lifespan must not migrate uni_pilot.db; tests use the in-memory database
+get_settings().DB_AUTO_MIGRATE = False
+
+# Background chat summaries must write to the test database
+init_chat_summary_refresher(session_factory=TestSessionLocal)
+
 
 @pytest.fixture(scope="function")
 def test_db_session():
@@ -53,11 +69,14 @@ def test_db_session():
         db.close()
         # Drop all tables after test
         Base.metadata.drop_all(bind=test_engine)
+        # Session and user IDs restart in the next test's database
+        get_chat_history_cache().clear()
+        get_principal_cache().clear()
 
 
 @pytest.fixture(scope="function")
 def test_db(test_db_session):
-    """Dependency override for get_db in FastAPI."""
+    """Dependency override for get_db and get_read_db in FastAPI."""
     def override_get_db():
         try:
             yield test_db_session
@@ -71,11 +90,31 @@ def test_db(test_db_session):
 def client(test_db):
     """FastAPI test client with database override."""
     app.dependency_overrides[get_db] = test_db
+    app.dependency_overrides[get_read_db] = test_db  # in-memory test database has no read-only pool
+    # Background roadmap workers use the test database (the app lifespan starts them)
+    init_roadmap_job_queue(session_factory=TestSessionLocal)
     with TestClient(app) as test_client:
         yield test_client
     app.dependency_overrides.clear()
 
 
+@pytest.fixture(scope="function")
+def mock_llm_service():
+    """Mocked LLM service injected through the get_llm_service dependency."""
+    llm_service = MagicMock()
+    llm_service.chat.return_value = "This is a mock LLM response"
+    llm_service.achat = AsyncMock(return_value="This is a mock LLM response")
+
+    async def astream_chat(**kwargs):
+        for text in ["This is ", "a mock ", "LLM response"]:
+            yield text
+
+    llm_service.astream_chat = MagicMock(side_effect=astream_chat)
+    app.dependency_overrides[get_llm_service] = lambda: llm_service
+    yield llm_service
+    app.dependency_overrides.pop(get_llm_service, None)
+
+
 @pytest.fixture(scope="function")
 def test_user(test_db_session):
     """Create a test user."""
@@ -0,0 +1 @@
+"""Load tests: user journeys against the full API with a local fake Bedrock server."""
@@ -0,0 +1,183 @@
+#!/usr/bin/env python3
+"""Local stand-in for the Bedrock runtime API.
+
+Serves the in-process BedrockEmulator (api/services/llm_emulator.py) over HTTP:
+InvokeModel and InvokeModelWithResponseStream answer like Bedrock does for
+Anthropic models, with configurable latency, streaming rate, throttling and
+truncation. Unlike LLM_BACKEND=emulator, requests go through boto3 and a real
+HTTP connection pool, so the API can be load tested end to end without AWS
+credentials or cost.
+
+Point the API at it with BEDROCK_ENDPOINT_URL (boto3 still signs requests, so
+dummy AWS_ACCESS_KEY_ID/AWS_SECRET_ACCESS_KEY must be set):
+
+    python -m tests.load.fake_bedrock --port 8089 --latency-ms 800
+    BEDROCK_ENDPOINT_URL=http://127.0.0.1:8089 AWS_ACCESS_KEY_ID=fake \\
+        AWS_SECRET_ACCESS_KEY=fake uvicorn main:app
+"""
+
+import argparse
+import base64
+import binascii
+import json
+import re
+import struct
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Dict, List, Optional
+from urllib.parse import unquote
+
+from botocore.exceptions import ClientError
+
+from api.services.llm_emulator import BedrockEmulator, EmulatorConfig
+
+_PATH = re.compile(r"^/model/(?P<model_id>[^/]+)/(?P<action>invoke|invoke-with-response-stream)$")
+
+
+def encode_event(payload: bytes) -> bytes:
+    """Encode one response-stream chunk in the AWS event stream format."""
+    body = json.dumps({"bytes": base64.b64encode(payload).decode()}).encode()
+    headers = b""
+    for name, value in ((":event-type", "chunk"), (":content-type", "application/json"), (":message-type", "event")):
+        raw_name, raw_value = name.encode(), value.encode()
+        headers += bytes([len(raw_name)]) + raw_name + b"\x07" + struct.pack(">H", len(raw_value)) + raw_value
+    prelude = struct.pack(">II", 12 + len(headers) + len(body) + 4, len(headers))
+    message = prelude + struct.pack(">I", binascii.crc32(prelude)) + headers + body
+    return message + struct.pack(">I", binascii.crc32(message))
+
+
+class FakeBedrockServer:
+    """Threaded HTTP server speaking the Bedrock runtime protocol."""
+
+    def __init__(self, host: str = "127.0.0.1", port: int = 0, config: Optional[EmulatorConfig] = None):
+        """
+        Initialize the server (not started yet).
+
+        Args:
+            host: Interface to bind
+            port: Port to bind (0 = pick a free port)
+            config: Simulated model behaviour
+        """
+        self.emulator = BedrockEmulator(config or EmulatorConfig())
+        self._lock = threading.Lock()
+        self.requests: Dict[str, int] = {}
+        self._httpd = ThreadingHTTPServer((host, port), self._handler_class())
+        self._httpd.daemon_threads = True
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def url(self) -> str:
+        """Base URL to use as BEDROCK_ENDPOINT_URL."""
+        host, port = self._httpd.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def start(self) -> "FakeBedrockServer":
+        """Serve in a background thread."""
+        self._thread = threading.Thread(target=self._httpd.serve_forever, name="fake-bedrock", daemon=True)
+        self._thread.start()
+        return self
+
+    def serve_forever(self) -> None:
+        """Serve in the calling thread until interrupted."""
+        try:
+            self._httpd.serve_forever()
+        finally:
+            self._httpd.server_close()
+
+    def stop(self) -> None:
+        """Stop serving and release the port."""
+        self._httpd.shutdown()
+        self._httpd.server_close()
+
+    def _handler_class(self):
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"  # keep-alive, like Bedrock
+
+            def log_message(self, format, *args):
+                pass
+
+            def _send(self, status: int, body: bytes, headers: Optional[Dict[str, str]] = None) -> None:
+                self.send_response(status)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(body)))
+                for name, value in (headers or {}).items():
+                    self.send_header(name, value)
+                self.end_headers()
+                self.wfile.write(body)
+
+            def do_POST(self):
+                match = _PATH.match(self.path)
+                length = int(self.headers.get("Content-Length") or 0)
+                raw = self.rfile.read(length)
+                if match is None:
+                    self._send(404, json.dumps({"message": f"Unknown path {self.path}"}).encode())
+                    return
+
+                model_id, action = unquote(match["model_id"]), match["action"]
+                with server._lock:
+                    server.requests[action] = server.requests.get(action, 0) + 1
+                try:
+                    if action == "invoke":
+                        response = server.emulator.invoke_model(modelId=model_id, body=raw.decode())
+                    else:
+                        response = server.emulator.invoke_model_with_response_stream(
+                            modelId=model_id, body=raw.decode()
+                        )
+                except ClientError as e:
+                    error = e.response["Error"]
+                    status = e.response.get("ResponseMetadata", {}).get("HTTPStatusCode", 400)
+                    # boto3 reads the error code from this header (REST-JSON protocol)
+                    self._send(
+                        status, json.dumps({"message": error["Message"]}).encode(), {"x-amzn-ErrorType": error["Code"]}
+                    )
+                    return
+
+                if action == "invoke":
+                    self._send(200, response["body"].read())
+                    return
+
+                self.send_response(200)
+                self.send_header("Content-Type", "application/vnd.amazon.eventstream")
+                self.send_header("Transfer-Encoding", "chunked")
+                self.end_headers()
+                for event in response["body"]:
+                    chunk = encode_event(event["chunk"]["bytes"])
+                    self.wfile.write(f"{len(chunk):x}\r\n".encode() + chunk + b"\r\n")
+                    self.wfile.flush()
+                self.wfile.write(b"0\r\n\r\n")
+
+        return Handler
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8089)
+    parser.add_argument("--latency-ms", type=float, default=500.0, help="Time to first byte")
+    parser.add_argument("--jitter-ms", type=float, default=100.0, help="Uniform +/- jitter on the latency")
+    parser.add_argument("--tokens-per-second", type=float, default=50.0, help="Streaming rate (0 = no delay)")
+    parser.add_argument("--throttle-rate", type=float, default=0.0, help="Share of calls answered with 429")
+    parser.add_argument("--truncate-rate", type=float, default=0.0, help="Share of replies cut off at max_tokens")
+    parser.add_argument("--roadmap-model", default=None, help="Model ID answered with a roadmap")
+    args = parser.parse_args(argv)
+
+    config = EmulatorConfig(
+        latency_ms=args.latency_ms,
+        jitter_ms=args.jitter_ms,
+        tokens_per_second=args.tokens_per_second,
+        throttle_rate=args.throttle_rate,
+        truncate_rate=args.truncate_rate,
+        roadmap_model=args.roadmap_model,
+    )
+    server = FakeBedrockServer(args.host, args.port, config)
+    print(f"Fake Bedrock listening on {server.url} (latency {args.latency_ms:.0f}±{args.jitter_ms:.0f} ms)")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()
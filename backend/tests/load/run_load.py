@@ -0,0 +1,377 @@
+#!/usr/bin/env python3
+"""Load test the API with realistic user journeys.
+
+Each virtual user registers, logs in, completes onboarding (university, study
+program, career tree), selects a topic field and a job, opens the job chat and
+sends a few messages. Journeys run with a fixed number of concurrent users;
+latencies are reported per endpoint (p50/p95/p99) together with error counts
+and written to a JSON file so runs can be compared.
+
+Against a running API (started with BEDROCK_ENDPOINT_URL pointing at
+tests.load.fake_bedrock):
+    python -m tests.load.run_load --base-url http://localhost:8000 --users 50 --concurrency 10
+
+Self-contained (fake Bedrock + API on a migrated copy of uni_pilot.db):
+    python -m tests.load.run_load --spawn-api --users 50 --concurrency 10 --bedrock-latency-ms 800
+"""
+
+import argparse
+import asyncio
+import json
+import math
+import os
+import random
+import shutil
+import subprocess
+import sys
+import tempfile
+import time
+import uuid
+from collections import defaultdict
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+import httpx
+
+from api.services.llm_emulator import EmulatorConfig
+from tests.load.fake_bedrock import FakeBedrockServer
+
+BACKEND_DIR = Path(__file__).resolve().parents[2]
+CHAT_QUESTIONS = [
+    "Welche Skills brauche ich für diesen Beruf?",
+    "Welche Module sollte ich im nächsten Semester belegen?",
+    "Lohnt sich ein Praktikum schon im Bachelor?",
+    "Welche Projekte eignen sich für mein Portfolio?",
+]
+
+
+def percentile(sorted_values: List[float], p: float) -> float:
+    """Nearest-rank percentile of an ascending list (0.0 if empty)."""
+    if not sorted_values:
+        return 0.0
+    rank = max(1, math.ceil(p / 100 * len(sorted_values)))
+    return sorted_values[min(rank, len(sorted_values)) - 1]
+
+
+class Recorder:
+    """Collects latencies and errors per endpoint."""
+
+    def __init__(self):
+        self.latencies: Dict[str, List[float]] = defaultdict(list)
+        self.errors: Dict[str, Dict[str, int]] = defaultdict(lambda: defaultdict(int))
+
+    def record(self, endpoint: str, seconds: float, error: Optional[str] = None) -> None:
+        self.latencies[endpoint].append(seconds)
+        if error is not None:
+            self.errors[endpoint][error] += 1
+
+    def summary(self) -> Dict[str, Dict[str, Any]]:
+        """Per-endpoint count, error count and latency percentiles in milliseconds."""
+        result = {}
+        for endpoint, values in sorted(self.latencies.items()):
+            ordered = sorted(values)
+            result[endpoint] = {
+                "count": len(ordered),
+                "errors": sum(self.errors[endpoint].values()),
+                "error_types": dict(self.errors[endpoint]),
+                "mean_ms": round(sum(ordered) / len(ordered) * 1000, 1),
+                "p50_ms": round(percentile(ordered, 50) * 1000, 1),
+                "p95_ms": round(percentile(ordered, 95) * 1000, 1),
+                "p99_ms": round(percentile(ordered, 99) * 1000, 1),
+                "max_ms": round(ordered[-1] * 1000, 1),
+            }
+        return result
+
+
+class JourneyError(Exception):
+    """A journey step failed; the rest of the journey is skipped."""
+
+
+class Journey:
+    """One virtual user walking through the app."""
+
+    def __init__(self, client: httpx.AsyncClient, recorder: Recorder, chat_turns: int, stream: bool):
+        self.client = client
+        self.recorder = recorder
+        self.chat_turns = chat_turns
+        self.stream = stream
+        self.headers: Dict[str, str] = {}
+
+    async def call(self, method: str, endpoint: str, path: Optional[str] = None, **kwargs: Any) -> Any:
+        """Send a request, record it under the endpoint template and return the JSON body."""
+        start = time.perf_counter()
+        try:
+            response = await self.client.request(method, path or endpoint, headers=self.headers, **kwargs)
+        except httpx.HTTPError as e:
+            self.recorder.record(f"{method} {endpoint}", time.perf_counter() - start, type(e).__name__)
+            raise JourneyError(f"{method} {endpoint}: {e}")
+        elapsed = time.perf_counter() - start
+        if response.status_code >= 400:
+            self.recorder.record(f"{method} {endpoint}", elapsed, str(response.status_code))
+            raise JourneyError(f"{method} {endpoint}: HTTP {response.status_code}")
+        self.recorder.record(f"{method} {endpoint}", elapsed)
+        return response.json()
+
+    async def stream_message(self, session_id: int, content: str) -> None:
+        """Send a chat message via SSE, recording time to first token and to the end of the stream."""
+        endpoint = "POST /api/v1/chat/sessions/{id}/messages/stream"
+        start = time.perf_counter()
+        first_token = None
+        error = None
+        try:
+            async with self.client.stream(
+                "POST", f"/api/v1/chat/sessions/{session_id}/messages/stream",
+                headers=self.headers, json={"content": content},
+            ) as response:
+                if response.status_code >= 400:
+                    error = str(response.status_code)
+                else:
+                    async for line in response.aiter_lines():
+                        if first_token is None and line.startswith("event: token"):
+                            first_token = time.perf_counter() - start
+                        elif line.startswith("event: error"):
+                            error = "stream_error"
+        except httpx.HTTPError as e:
+            error = type(e).__name__
+        self.recorder.record(endpoint, time.perf_counter() - start, error)
+        if first_token is not None:
+            self.recorder.record(f"{endpoint} (first token)", first_token)
+        if error is not None:
+            raise JourneyError(f"{endpoint}: {error}")
+
+    async def run(self) -> None:
+        email = f"load-{uuid.uuid4().hex[:12]}@example.com"
+        password = "loadtest-password"
+        await self.call(
+            "POST", "/api/v1/auth/register",
+            json={"email": email, "password": password, "first_name": "Load", "last_name": "Test"},
+        )
+        token = await self.call("POST", "/api/v1/auth/login", json={"email": email, "password": password})
+        self.headers = {"Authorization": f"Bearer {token['access_token']}"}
+
+        universities = (await self.call("GET", "/api/v1/universities"))["items"]
+        random.shuffle(universities)
+        for university in universities:  # like a user browsing until their program shows up
+            programs = await self.call(
+                "GET", "/api/v1/universities/{id}/study-programs",
+                f"/api/v1/universities/{university['id']}/study-programs",
+            )
+            if programs["items"]:
+                break
+        else:
+            raise JourneyError("onboarding: no university with study programs")
+        program = random.choice(programs["items"])
+        await self.call(
+            "PUT", "/api/v1/users/me/profile",
+            json={"university_id": university["id"], "study_program_id": program["id"], "current_semester": 3},
+        )
+
+        tree = await self.call(
+            "GET", "/api/v1/study-programs/{id}/career-tree", f"/api/v1/study-programs/{program['id']}/career-tree"
+        )
+        paths = leaf_paths(tree.get("nodes"))
+        if not paths:
+            raise JourneyError(f"onboarding: study program {program['id']} has no career tree")
+        path = random.choice(paths)
+        topic_field_id = next((n["topic_field_id"] for n in reversed(path) if n.get("topic_field_id")), None)
+        if topic_field_id is not None:
+            await self.call("PUT", "/api/v1/users/me/profile/topic-field", json={"topic_field_id": topic_field_id})
+        job_id = path[-1]["id"]
+        profile = await self.call("PUT", "/api/v1/users/me/profile/job", json={"job_id": job_id})
+        if profile.get("roadmap_job_id"):
+            await self.call(
+                "GET", "/api/v1/roadmap-jobs/{id}", f"/api/v1/roadmap-jobs/{profile['roadmap_job_id']}"
+            )
+
+        session = await self.call("POST", "/api/v1/jobs/{id}/chat/sessions", f"/api/v1/jobs/{job_id}/chat/sessions")
+        for turn in range(self.chat_turns):
+            content = CHAT_QUESTIONS[turn % len(CHAT_QUESTIONS)]
+            if self.stream:
+                await self.stream_message(session["id"], content)
+            else:
+                await self.call(
+                    "POST", "/api/v1/chat/sessions/{id}/messages",
+                    f"/api/v1/chat/sessions/{session['id']}/messages", json={"content": content},
+                )
+
+
+def leaf_paths(node: Optional[Dict[str, Any]], prefix: Optional[List[Dict[str, Any]]] = None) -> List[List[Dict]]:
+    """All root-to-leaf paths of a career tree."""
+    if not node:
+        return []
+    path = (prefix or []) + [node]
+    if node.get("is_leaf") or not node.get("children"):
+        return [path] if node.get("is_leaf") else []
+    return [p for child in node["children"] for p in leaf_paths(child, path)]
+
+
+async def run_load(
+    base_url: str, users: int, concurrency: int, chat_turns: int, stream: bool, timeout: float
+) -> Dict[str, Any]:
+    """Run all journeys and return the report."""
+    recorder = Recorder()
+    semaphore = asyncio.Semaphore(concurrency)
+    outcomes: Dict[str, int] = defaultdict(int)
+    failures: Dict[str, int] = defaultdict(int)
+    limits = httpx.Limits(max_connections=concurrency * 2, max_keepalive_connections=concurrency * 2)
+
+    async with httpx.AsyncClient(base_url=base_url, timeout=timeout, limits=limits) as client:
+
+        async def one_user() -> None:
+            async with semaphore:
+                try:
+                    await Journey(client, recorder, chat_turns, stream).run()
+                    outcomes["completed"] += 1
+                except JourneyError as e:
+                    outcomes["failed"] += 1
+                    failures[str(e).split(":")[0]] += 1
+
+        start = time.perf_counter()
+        await asyncio.gather(*(one_user() for _ in range(users)))
+        duration = time.perf_counter() - start
+
+    endpoints = recorder.summary()
+    total_requests = sum(stats["count"] for name, stats in endpoints.items() if not name.endswith("(first token)"))
+    return {
+        "started_at": datetime.now(timezone.utc).isoformat(),
+        "config": {
+            "base_url": base_url,
+            "users": users,
+            "concurrency": concurrency,
+            "chat_turns": chat_turns,
+            "stream": stream,
+        },
+        "duration_s": round(duration, 2),
+        "requests_per_second": round(total_requests / duration, 1) if duration else 0.0,
+        "journeys": {"completed": outcomes["completed"], "failed": outcomes["failed"], "failed_at": dict(failures)},
+        "endpoints": endpoints,
+    }
+
+
+def print_report(report: Dict[str, Any]) -> None:
+    journeys = report["journeys"]
+    print(
+        f"\n{journeys['completed']} journeys completed, {journeys['failed']} failed in {report['duration_s']} s "
+        f"({report['requests_per_second']} req/s)"
+    )
+    print(f"{'endpoint':<62} {'count':>6} {'err':>5} {'p50':>8} {'p95':>8} {'p99':>8}")
+    for endpoint, stats in report["endpoints"].items():
+        print(
+            f"{endpoint:<62} {stats['count']:>6} {stats['errors']:>5} "
+            f"{stats['p50_ms']:>8.1f} {stats['p95_ms']:>8.1f} {stats['p99_ms']:>8.1f}"
+        )
+    for step, count in journeys["failed_at"].items():
+        print(f"  failed at {step}: {count}")
+
+
+def prepare_database(directory: Path) -> None:
+    """Copy uni_pilot.db into directory and bring the copy to the current schema."""
+    from database.base import create_sqlite_engine
+    from database.migrations import upgrade_all
+
+    shutil.copy(BACKEND_DIR / "uni_pilot.db", directory / "uni_pilot.db")
+    engine = create_sqlite_engine(f"sqlite:///{directory / 'uni_pilot.db'}")
+    try:
+        upgrade_all(engine)
+    finally:
+        engine.dispose()
+
+
+def spawn_api(directory: Path, port: int, bedrock_url: str, workers: int) -> subprocess.Popen:
+    """Start uvicorn on the database copy in directory and wait until it answers."""
+    env = {
+        **os.environ,
+        "PYTHONPATH": str(BACKEND_DIR),
+        "BEDROCK_ENDPOINT_URL": bedrock_url,
+        "AWS_ACCESS_KEY_ID": "fake",
+        "AWS_SECRET_ACCESS_KEY": "fake",
+        "LOG_LEVEL": "WARNING",
+    }
+    process = subprocess.Popen(
+        [sys.executable, "-m", "uvicorn", "main:app", "--port", str(port), "--workers", str(workers),
+         "--log-level", "warning"],
+        cwd=directory,  # the database path is relative to the working directory
+        env=env,
+    )
+    deadline = time.monotonic() + 30
+    while time.monotonic() < deadline:
+        if process.poll() is not None:
+            raise RuntimeError(f"API exited with code {process.returncode}")
+        try:
+            if httpx.get(f"http://127.0.0.1:{port}/health", timeout=1).status_code == 200:
+                return process
+        except httpx.HTTPError:
+            pass
+        time.sleep(0.2)
+    process.terminate()
+    raise RuntimeError("API did not start within 30 s")
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--base-url", default="http://localhost:8000", help="API to load (ignored with --spawn-api)")
+    parser.add_argument("--users", type=int, default=20, help="Journeys in total")
+    parser.add_argument("--concurrency", type=int, default=5, help="Journeys running at the same time")
+    parser.add_argument("--chat-turns", type=int, default=3, help="Chat messages per journey")
+    parser.add_argument("--stream", action="store_true", help="Use the SSE chat endpoint")
+    parser.add_argument("--timeout", type=float, default=120.0, help="Request timeout in seconds")
+    parser.add_argument("--output", default=None, help="JSON report path (default: load-<timestamp>.json)")
+    parser.add_argument("--spawn-api", action="store_true", help="Start fake Bedrock and the API locally")
+    parser.add_argument("--api-port", type=int, default=8765)
+    parser.add_argument("--api-workers", type=int, default=1)
+    parser.add_argument("--bedrock-latency-ms", type=float, default=500.0)
+    parser.add_argument("--bedrock-jitter-ms", type=float, default=100.0)
+    parser.add_argument("--bedrock-tokens-per-second", type=float, default=50.0)
+    parser.add_argument("--bedrock-throttle-rate", type=float, default=0.0, help="Share of Bedrock calls throttled")
+    args = parser.parse_args(argv)
+
+    bedrock = None
+    api = None
+    workdir = None
+    base_url = args.base_url
+    try:
+        if args.spawn_api:
+            bedrock = FakeBedrockServer(
+                config=EmulatorConfig(
+                    latency_ms=args.bedrock_latency_ms,
+                    jitter_ms=args.bedrock_jitter_ms,
+                    tokens_per_second=args.bedrock_tokens_per_second,
+                    throttle_rate=args.bedrock_throttle_rate,
+                )
+            ).start()
+            workdir = Path(tempfile.mkdtemp(prefix="uni-pilot-load-"))
+            prepare_database(workdir)
+            api = spawn_api(workdir, args.api_port, bedrock.url, args.api_workers)
+            base_url = f"http://127.0.0.1:{args.api_port}"
+            print(f"API on {base_url}, fake Bedrock on {bedrock.url}")
+
+        report = asyncio.run(
+            run_load(base_url, args.users, args.concurrency, args.chat_turns, args.stream, args.timeout)
+        )
+        if bedrock is not None:
+            report["config"]["bedrock"] = {
+                "latency_ms": args.bedrock_latency_ms,
+                "jitter_ms": args.bedrock_jitter_ms,
+                "tokens_per_second": args.bedrock_tokens_per_second,
+                "throttle_rate": args.bedrock_throttle_rate,
+                "requests": dict(bedrock.requests),
+                **bedrock.emulator.stats(),
+            }
+    finally:
+        if api is not None:
+            api.terminate()
+            api.wait(timeout=30)
+        if bedrock is not None:
+            bedrock.stop()
+        if workdir is not None:
+            shutil.rmtree(workdir, ignore_errors=True)
+
+    print_report(report)
+    output = Path(args.output or f"load-{datetime.now().strftime('%Y%m%d-%H%M%S')}.json")
+    output.write_text(json.dumps(report, indent=2, ensure_ascii=False))
+    print(f"\nReport written to {output}")
+
+
+if __name__ == "__main__":
+    main()
@@ -235,3 +235,85 @@ def test_login_with_roadmap_credentials_form_data(client, test_db_session):
     assert data["user"]["email"] == "testuser@example.com"
     assert data["user"]["id"] == user.id
 
+
+
+def test_access_token_contains_iat(test_user):
+    """Test that access tokens carry an issued-at claim."""
+    from api.core.security import create_access_token, decode_token
+
+    payload = decode_token(create_access_token(data={"sub": str(test_user.id)}))
+
+    assert isinstance(payload["iat"], int)
+    assert payload["exp"] > payload["iat"]
+
+
+def test_get_current_user_served_from_principal_cache(authenticated_client, test_user, test_db_session):
+    """Test that repeated requests with the same token skip the user lookup."""
+    from sqlalchemy import event
+
+    from api.core.principal_cache import get_principal_cache
+
+    assert authenticated_client.get("/api/v1/auth/me").status_code == 200
+
+    statements = []
+    engine = test_db_session.get_bind()
+
+    def record(conn, cursor, statement, parameters, context, executemany):
+        statements.append(statement)
+
+    event.listen(engine, "before_cursor_execute", record)
+    try:
+        response = authenticated_client.get("/api/v1/auth/me")
+    finally:
+        event.remove(engine, "before_cursor_execute", record)
+
+    assert response.status_code == 200
+    assert response.json()["email"] == test_user.email
+    assert not any("FROM users" in statement for statement in statements)
+    assert get_principal_cache().stats()["hits"] >= 1
+
+
+def test_principal_cache_invalidated_on_user_delete(authenticated_client, test_user, test_db_session):
+    """Test that a deleted user's cached token stops authenticating."""
+    assert authenticated_client.get("/api/v1/auth/me").status_code == 200
+
+    test_db_session.delete(test_user)
+    test_db_session.commit()
+
+    assert authenticated_client.get("/api/v1/auth/me").status_code == 401
+
+
+def test_principal_cache_invalidated_on_password_change(authenticated_client, test_user, test_db_session):
+    """Test that updating a user drops their cached principals."""
+    from api.core.principal_cache import get_principal_cache
+    from api.core.security import hash_password
+
+    assert authenticated_client.get("/api/v1/auth/me").status_code == 200
+    assert get_principal_cache().stats()["size"] == 1
+
+    test_user.password_hash = hash_password("newpassword123")
+    test_db_session.commit()
+
+    assert get_principal_cache().stats()["size"] == 0
+    assert authenticated_client.get("/api/v1/auth/me").status_code == 200
+
+
+def test_login_returns_503_when_hashing_pool_is_full(client, test_user, monkeypatch):
+    """Test that a saturated hashing pool answers with 503 and Retry-After."""
+    from api.core.password_hasher import PasswordHasher
+    from api.services import auth_service
+
+    hasher = PasswordHasher(max_workers=1, max_queue=0)
+    monkeypatch.setattr(hasher, "_pending", 1)  # the only worker is busy
+    monkeypatch.setattr(auth_service, "get_password_hasher", lambda: hasher)
+    try:
+        response = client.post(
+            "/api/v1/auth/login",
+            json={"email": test_user.email, "password": "testpassword123"},
+        )
+    finally:
+        hasher.close()
+
+    assert response.status_code == 503
+    assert response.headers["Retry-After"] == "1"
+    assert response.json()["error_code"] == "HASHING_BUSY"
@@ -1,9 +1,16 @@
 """Tests for Chat API endpoints."""
 
-from unittest.mock import MagicMock, patch
+import json
 
 import pytest
 
+from api.dependencies import get_llm_service
+from api.services import chat_response_cache, chat_service
+from api.services.chat_response_cache import ChatResponseCache
+from api.services.llm_emulator import CHAT_REPLY, BedrockEmulator, EmulatorConfig
+from api.services.llm_service import LLMService
+from main import app
+
 
 def test_create_chat_session(authenticated_client, test_user, test_topic_field):
     """Test creating a chat session."""
@@ -39,7 +46,7 @@ def test_get_chat_messages_empty(authenticated_client, test_user, test_topic_fie
     assert response.json() == []
 
 
-def test_get_chat_messages(authenticated_client, test_user, test_topic_field):
+def test_get_chat_messages(authenticated_client, test_user, test_topic_field, mock_llm_service):
     """Test getting chat messages."""
     # Create session first
     create_response = authenticated_client.post(
@@ -48,35 +55,24 @@ def test_get_chat_messages(authenticated_client, test_user, test_topic_field):
     session_id = create_response.json()["id"]
 
     # Send a message (which creates messages)
-    with patch("api.services.chat_service.LLMService") as mock_llm:
-        mock_llm_instance = MagicMock()
-        mock_llm_instance.chat.return_value = "Mock response"
-        mock_llm.return_value = mock_llm_instance
-
-        send_response = authenticated_client.post(
-            f"/api/v1/chat/sessions/{session_id}/messages",
-            json={"content": "Test question?"},
-        )
+    send_response = authenticated_client.post(
+        f"/api/v1/chat/sessions/{session_id}/messages",
+        json={"content": "Test question?"},
+    )
 
-        # Get messages
-        response = authenticated_client.get(f"/api/v1/chat/sessions/{session_id}/messages")
+    # Get messages
+    response = authenticated_client.get(f"/api/v1/chat/sessions/{session_id}/messages")
 
-        assert response.status_code == 200
-        messages = response.json()
-        assert isinstance(messages, list)
-        # Should have at least user message
-        if send_response.status_code == 200:
-            assert len(messages) >= 1
+    assert response.status_code == 200
+    messages = response.json()
+    assert isinstance(messages, list)
+    # Should have at least user message
+    if send_response.status_code == 200:
+        assert len(messages) >= 1
 
 
-@patch("api.services.chat_service.LLMService")
-def test_send_message_mock_llm(mock_llm_service_class, authenticated_client, test_user, test_topic_field):
+def test_send_message_mock_llm(authenticated_client, test_user, test_topic_field, mock_llm_service):
     """Test sending message with mocked LLM."""
-    # Setup mock
-    mock_llm_service = MagicMock()
-    mock_llm_service.chat.return_value = "This is a mock LLM response"
-    mock_llm_service_class.return_value = mock_llm_service
-
     # Create session
     create_response = authenticated_client.post(
         f"/api/v1/topic-fields/{test_topic_field.id}/chat/sessions"
@@ -98,6 +94,76 @@ def test_send_message_mock_llm(mock_llm_service_class, authenticated_client, tes
         assert "mock" in data["assistant_message"]["content"].lower()
 
 
+def test_stream_message_mock_llm(authenticated_client, test_user, test_topic_field, mock_llm_service):
+    """Test streaming a message as Server-Sent Events and persisting the reply."""
+    create_response = authenticated_client.post(
+        f"/api/v1/topic-fields/{test_topic_field.id}/chat/sessions"
+    )
+    session_id = create_response.json()["id"]
+
+    with authenticated_client.stream(
+        "POST",
+        f"/api/v1/chat/sessions/{session_id}/messages/stream",
+        json={"content": "Test question?"},
+    ) as response:
+        assert response.status_code == 200
+        assert response.headers["content-type"].startswith("text/event-stream")
+        body = "".join(response.iter_text())
+
+    events = [
+        (block.split("\n")[0][len("event: "):], json.loads(block.split("\n")[1][len("data: "):]))
+        for block in body.strip().split("\n\n")
+    ]
+    tokens = [data["text"] for event, data in events if event == "token"]
+    assert tokens == ["This is ", "a mock ", "LLM response"]
+
+    event, data = events[-1]
+    assert event == "done"
+    assert data["user_message"]["content"] == "Test question?"
+    assert data["assistant_message"]["content"] == "This is a mock LLM response"
+
+    messages = authenticated_client.get(f"/api/v1/chat/sessions/{session_id}/messages").json()
+    assert messages[-1]["content"] == "This is a mock LLM response"
+
+
+def test_truncated_streamed_answer_is_not_cached(authenticated_client, test_topic_field, monkeypatch):
+    """Test that a first answer streamed with stop_reason max_tokens is stored but not reused for similar questions."""
+    config = EmulatorConfig(latency_ms=0, jitter_ms=0, tokens_per_second=0, truncate_rate=1.0)
+    emulator = BedrockEmulator(config, seed=1)
+    app.dependency_overrides[get_llm_service] = lambda: LLMService(bedrock_client=emulator)
+    cache = ChatResponseCache(max_entries=10, ttl_seconds=60, threshold=0.8)
+    monkeypatch.setattr(chat_service.settings, "CHAT_RESPONSE_CACHE_ENABLED", True)
+    monkeypatch.setattr(chat_response_cache, "_cache", cache)
+    try:
+        session_id = authenticated_client.post(f"/api/v1/topic-fields/{test_topic_field.id}/chat/sessions").json()["id"]
+        with authenticated_client.stream(
+            "POST",
+            f"/api/v1/chat/sessions/{session_id}/messages/stream",
+            json={"content": "Welche Skills brauche ich?"},
+        ) as response:
+            assert response.status_code == 200
+            body = "".join(response.iter_text())
+    finally:
+        app.dependency_overrides.pop(get_llm_service, None)
+
+    last_event = body.strip().split("\n\n")[-1]
+    assert last_event.startswith("event: done")
+    assistant_content = json.loads(last_event.split("\n")[1][len("data: "):])["assistant_message"]["content"]
+    assert assistant_content == CHAT_REPLY[: len(CHAT_REPLY) // 2]
+    assert emulator.stats()["streams"] == 1
+    assert cache.stats()["size"] == 0
+
+
+def test_stream_message_session_not_found_404(authenticated_client, mock_llm_service):
+    """Test streaming to a non-existent session fails before the stream starts."""
+    response = authenticated_client.post(
+        "/api/v1/chat/sessions/99999/messages/stream",
+        json={"content": "Test?"},
+    )
+
+    assert response.status_code == 404
+
+
 def test_send_message_session_not_found_404(authenticated_client):
     """Test sending message to non-existent session."""
     response = authenticated_client.post(
@@ -121,6 +187,134 @@ def test_get_user_chat_sessions(authenticated_client, test_user, test_topic_fiel
     assert len(data) >= 1
 
 
+def test_get_user_chat_sessions_message_count(authenticated_client, test_db_session, test_topic_field):
+    """Test that message_count counts all messages of a session."""
+    from database.models import ChatMessage
+
+    session_id = authenticated_client.post(f"/api/v1/topic-fields/{test_topic_field.id}/chat/sessions").json()["id"]
+    existing = test_db_session.query(ChatMessage).filter(ChatMessage.session_id == session_id).count()
+    test_db_session.add_all(
+        ChatMessage(session_id=session_id, role="user", content=f"Message {i}") for i in range(60)
+    )
+    test_db_session.commit()
+
+    response = authenticated_client.get("/api/v1/users/me/chat/sessions")
+
+    assert response.status_code == 200
+    assert response.json()[0]["message_count"] == existing + 60
+
+
+def test_get_user_chat_sessions_query_count(authenticated_client, test_db_session, test_user, test_career_tree_node):
+    """Test that listing sessions runs a fixed number of queries, independent of the page size."""
+    from sqlalchemy import event
+
+    from database.models import ChatMessage, ChatSession, TopicField
+
+    def add_sessions(count):
+        for i in range(count):
+            topic_field = TopicField(name=f"Topic {i}", description="Topic")
+            test_db_session.add(topic_field)
+            test_db_session.flush()
+            session = ChatSession(
+                user_id=test_user.id,
+                topic_field_id=topic_field.id,
+                career_tree_node_id=test_career_tree_node.id,
+            )
+            test_db_session.add(session)
+            test_db_session.flush()
+            test_db_session.add(ChatMessage(session_id=session.id, role="user", content="Hi"))
+        test_db_session.commit()
+
+    def count_queries():
+        statements = []
+
+        def before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+            statements.append(statement)
+
+        engine = test_db_session.get_bind()
+        event.listen(engine, "before_cursor_execute", before_cursor_execute)
+        try:
+            response = authenticated_client.get("/api/v1/users/me/chat/sessions")
+        finally:
+            event.remove(engine, "before_cursor_execute", before_cursor_execute)
+        assert response.status_code == 200
+        return response.json(), len(statements)
+
+    # Resolve the current user once; later requests use the cached principal
+    assert authenticated_client.get("/api/v1/users/me/chat/sessions").status_code == 200
+
+    add_sessions(2)
+    data, few_queries = count_queries()
+    assert len(data) == 2
+
+    add_sessions(8)
+    data, many_queries = count_queries()
+    assert len(data) == 10
+    assert all(item["job"]["name"] == test_career_tree_node.name for item in data)
+    assert all(item["topic_field"]["name"].startswith("Topic") for item in data)
+    assert all(item["message_count"] == 1 for item in data)
+
+    # Sessions with joined topic field/job + grouped message count
+    assert few_queries == many_queries == 2
+
+
+def test_get_chat_messages_cursor_pagination(authenticated_client, test_db_session, test_topic_field):
+    """Test paging through messages with the X-Next-Cursor header."""
+    from database.models import ChatMessage
+
+    session_id = authenticated_client.post(f"/api/v1/topic-fields/{test_topic_field.id}/chat/sessions").json()["id"]
+    test_db_session.query(ChatMessage).filter(ChatMessage.session_id == session_id).delete()
+    test_db_session.add_all(
+        ChatMessage(session_id=session_id, role="user", content=f"Message {i}") for i in range(7)
+    )
+    test_db_session.commit()
+
+    url = f"/api/v1/chat/sessions/{session_id}/messages?limit=3"
+    first = authenticated_client.get(url)
+    second = authenticated_client.get(f"{url}&cursor={first.headers['X-Next-Cursor']}")
+    third = authenticated_client.get(f"{url}&cursor={second.headers['X-Next-Cursor']}")
+
+    contents = [message["content"] for page in (first, second, third) for message in page.json()]
+    assert contents == [f"Message {i}" for i in range(7)]
+    assert "X-Next-Cursor" not in third.headers
+    # Offset pagination keeps working
+    offset_page = authenticated_client.get(f"{url}&offset=3")
+    assert [message["content"] for message in offset_page.json()] == ["Message 3", "Message 4", "Message 5"]
+
+
+def test_get_chat_messages_invalid_cursor_400(authenticated_client, test_topic_field):
+    """Test that a malformed cursor returns 400."""
+    session_id = authenticated_client.post(f"/api/v1/topic-fields/{test_topic_field.id}/chat/sessions").json()["id"]
+
+    response = authenticated_client.get(f"/api/v1/chat/sessions/{session_id}/messages?cursor=bogus")
+
+    assert response.status_code == 400
+
+
+def test_get_user_chat_sessions_cursor_pagination(authenticated_client, test_db_session, test_user):
+    """Test paging through sessions (most recently updated first) with the cursor."""
+    from database.models import ChatSession, TopicField
+
+    for i in range(5):
+        topic_field = TopicField(name=f"Topic {i}", description="Topic")
+        test_db_session.add(topic_field)
+        test_db_session.flush()
+        test_db_session.add(ChatSession(user_id=test_user.id, topic_field_id=topic_field.id))
+    test_db_session.commit()
+
+    first = authenticated_client.get("/api/v1/users/me/chat/sessions?limit=2")
+    ids = [item["id"] for item in first.json()]
+    cursor = first.headers.get("X-Next-Cursor")
+    while cursor:
+        page = authenticated_client.get(f"/api/v1/users/me/chat/sessions?limit=2&cursor={cursor}")
+        ids.extend(item["id"] for item in page.json())
+        cursor = page.headers.get("X-Next-Cursor")
+
+    all_ids = [item["id"] for item in authenticated_client.get("/api/v1/users/me/chat/sessions").json()]
+    assert ids == all_ids
+    assert len(ids) == 5
+
+
 def test_get_user_chat_sessions_filtered(authenticated_client, test_user, test_topic_field):
     """Test getting user's chat sessions filtered by topic field."""
     # Create a session first
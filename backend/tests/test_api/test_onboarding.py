@@ -1,5 +1,7 @@
 """Tests for Onboarding API endpoints."""
 
+import time
+
 import pytest
 
 
@@ -137,3 +139,71 @@ def test_get_user_questions(authenticated_client, test_user):
     assert "items" in data
     assert "total" in data
 
+
+
+def test_get_user_questions_cursor_pagination(authenticated_client, test_db_session, test_user):
+    """Test paging through user questions (newest first) with next_cursor."""
+    from database.models import UserQuestion
+
+    test_db_session.add_all(
+        UserQuestion(user_id=test_user.id, question_text=f"Question {i}", answer=True) for i in range(5)
+    )
+    test_db_session.commit()
+
+    texts = []
+    url = "/api/v1/users/me/questions?limit=2"
+    data = authenticated_client.get(url).json()
+    texts.extend(item["question_text"] for item in data["items"])
+    while data["next_cursor"]:
+        data = authenticated_client.get(f"{url}&cursor={data['next_cursor']}").json()
+        texts.extend(item["question_text"] for item in data["items"])
+
+    assert data["total"] == 5
+    assert texts == [f"Question {i}" for i in reversed(range(5))]
+
+
+def test_select_job_queues_roadmap_generation(authenticated_client, test_db_session, test_user, test_study_program, test_career_tree_node):
+    """Test that selecting a job returns immediately with a pollable roadmap job."""
+    from unittest.mock import AsyncMock, MagicMock
+
+    from api.services.roadmap_job_queue import get_roadmap_job_queue
+    from database.models import UserProfile
+
+    test_db_session.add(UserProfile(user_id=test_user.id, study_program_id=test_study_program.id, current_semester=1))
+    test_db_session.commit()
+
+    queue = get_roadmap_job_queue()
+    queue.llm_service = MagicMock()
+    queue.llm_service.agenerate_roadmap = AsyncMock(
+        return_value={
+            "name": "Mock Roadmap",
+            "items": [{"item_type": "SKILL", "title": "Semester 1", "semester": 1, "level": 0, "order": 1}],
+        }
+    )
+
+    response = authenticated_client.put(
+        "/api/v1/users/me/profile/job",
+        json={"job_id": test_career_tree_node.id},
+    )
+
+    assert response.status_code == 200
+    roadmap_job_id = response.json()["roadmap_job_id"]
+    assert roadmap_job_id is not None
+
+    for _ in range(100):
+        job_response = authenticated_client.get(f"/api/v1/roadmap-jobs/{roadmap_job_id}")
+        assert job_response.status_code == 200
+        if job_response.json()["status"] in ("DONE", "FAILED"):
+            break
+        time.sleep(0.05)
+
+    data = job_response.json()
+    assert data["status"] == "DONE"
+    assert data["roadmap_id"] is not None
+
+
+def test_get_roadmap_job_not_found_404(authenticated_client):
+    """Test getting a non-existent roadmap job."""
+    response = authenticated_client.get("/api/v1/roadmap-jobs/99999")
+
+    assert response.status_code == 404
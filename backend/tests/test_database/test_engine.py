@@ -0,0 +1,84 @@
+"""Tests for the tuned SQLite engine profile."""
+
+import threading
+
+import pytest
+from sqlalchemy import text
+from sqlalchemy.exc import OperationalError
+
+from database.base import create_read_only_engine, create_sqlite_engine, get_db
+
+
+def test_sqlite_pragmas_applied(tmp_path):
+    """Every pooled connection gets the configured pragmas."""
+    engine = create_sqlite_engine(f"sqlite:///{tmp_path / 'pragmas.db'}")
+    try:
+        with engine.connect() as conn:
+            assert conn.execute(text("PRAGMA journal_mode")).scalar() == "wal"
+            assert conn.execute(text("PRAGMA synchronous")).scalar() == 1  # NORMAL
+            assert conn.execute(text("PRAGMA foreign_keys")).scalar() == 1
+            assert conn.execute(text("PRAGMA busy_timeout")).scalar() == 5000
+            assert conn.execute(text("PRAGMA cache_size")).scalar() == -64000
+    finally:
+        engine.dispose()
+
+
+def test_readers_run_concurrently_with_writer(tmp_path):
+    """A reader on another connection is not blocked by an open write transaction."""
+    engine = create_sqlite_engine(f"sqlite:///{tmp_path / 'concurrency.db'}")
+    try:
+        with engine.begin() as conn:
+            conn.execute(text("CREATE TABLE items (id INTEGER PRIMARY KEY, name TEXT)"))
+            conn.execute(text("INSERT INTO items (name) VALUES ('committed')"))
+
+        results = []
+        with engine.connect() as writer:
+            writer.begin()
+            writer.execute(text("INSERT INTO items (name) VALUES ('pending')"))
+
+            def read():
+                with engine.connect() as reader:
+                    results.append(reader.execute(text("SELECT name FROM items")).scalars().all())
+
+            thread = threading.Thread(target=read)
+            thread.start()
+            thread.join(timeout=2)
+            writer.rollback()
+
+        # The reader saw the last committed snapshot without waiting for the writer
+        assert results == [["committed"]]
+    finally:
+        engine.dispose()
+
+
+def test_read_only_engine_rejects_writes(tmp_path):
+    """The read pool sees committed data but cannot write."""
+    path = tmp_path / "readonly.db"
+    engine = create_sqlite_engine(f"sqlite:///{path}")
+    read_engine = create_read_only_engine(f"sqlite:///file:{path}?mode=ro&uri=true")
+    try:
+        with engine.begin() as conn:
+            conn.execute(text("CREATE TABLE items (id INTEGER PRIMARY KEY, name TEXT)"))
+            conn.execute(text("INSERT INTO items (name) VALUES ('catalog')"))
+
+        with read_engine.connect() as conn:
+            assert conn.execute(text("PRAGMA query_only")).scalar() == 1
+            assert conn.execute(text("SELECT name FROM items")).scalars().all() == ["catalog"]
+            with pytest.raises(OperationalError):
+                conn.execute(text("INSERT INTO items (name) VALUES ('write')"))
+    finally:
+        read_engine.dispose()
+        engine.dispose()
+
+
+def test_get_routes_use_read_only_sessions():
+    """GET endpoints depend on get_read_db, never on the writer session directly."""
+    from fastapi.routing import APIRoute
+
+    from main import app
+
+    for route in app.routes:
+        if not isinstance(route, APIRoute) or "GET" not in route.methods:
+            continue
+        calls = {dependency.call for dependency in route.dependant.dependencies}
+        assert get_db not in calls, route.path
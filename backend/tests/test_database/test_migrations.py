@@ -0,0 +1,134 @@
+"""Tests for schema migrations on existing databases."""
+
+import json
+import shutil
+from pathlib import Path
+from unittest.mock import MagicMock
+
+from sqlalchemy import event, inspect
+
+from database.base import create_sqlite_engine
+from database.migrations import add_chat_summary, add_indexes, add_roadmap_jobs, normalize_skill_data, upgrade_all
+from database.models import Roadmap, RoadmapItem, RoadmapItemType, RoadmapJob, RoadmapJobStatus
+
+
+def test_normalize_skill_data_backfills_markers(test_db_session, test_topic_field):
+    """Test that skill markers in descriptions are moved into the skill tables."""
+    skill_json = json.dumps({"skill_impact": [{"skill": "Python", "impact": 30}]})
+    current_json = json.dumps({"current_skills": [{"skill": "Python", "score": 10}]})
+    roadmap = Roadmap(
+        topic_field_id=test_topic_field.id,
+        name="Legacy Roadmap",
+        description=f"Intro\n\n__CURRENT_SKILLS_START__\n{current_json}\n__CURRENT_SKILLS_END__",
+    )
+    test_db_session.add(roadmap)
+    test_db_session.flush()
+    item = RoadmapItem(
+        roadmap_id=roadmap.id,
+        item_type=RoadmapItemType.COURSE,
+        title="Legacy Item",
+        description=f"Learn Python\n\n__SKILL_DATA_START__\n{skill_json}\n__SKILL_DATA_END__",
+        semester=1,
+        order=1,
+    )
+    test_db_session.add(item)
+    test_db_session.commit()
+
+    assert normalize_skill_data.backfill(test_db_session) == (1, 1)
+    # Idempotent: markers are gone, nothing left to migrate
+    assert normalize_skill_data.backfill(test_db_session) == (0, 0)
+
+    test_db_session.refresh(item)
+    test_db_session.refresh(roadmap)
+    assert item.description == "Learn Python"
+    assert [(s.skill, s.impact) for s in item.skill_impacts] == [("Python", 30)]
+    assert roadmap.description == "Intro"
+    assert [(s.skill, s.score) for s in roadmap.current_skill_levels] == [("Python", 10)]
+
+
+def test_normalize_skill_data_backfills_once(test_db_session, monkeypatch):
+    """Test that the backfill's table scans are skipped once it has been recorded as completed."""
+    engine = test_db_session.get_bind()
+    test_db_session.close()
+    assert normalize_skill_data.upgrade(engine) == (0, 0)
+
+    backfill = MagicMock(return_value=(1, 1))
+    monkeypatch.setattr(normalize_skill_data, "backfill", backfill)
+    assert normalize_skill_data.upgrade(engine) == (0, 0)
+    backfill.assert_not_called()
+
+
+def test_add_indexes_creates_missing_indexes(test_db_session):
+    """Test that the index migration only creates indexes an existing database lacks."""
+    engine = test_db_session.get_bind()
+    test_db_session.close()
+    with engine.begin() as conn:
+        conn.exec_driver_sql("DROP INDEX ix_chat_messages_session_id_created_at")
+        conn.exec_driver_sql("DROP INDEX ix_roadmap_items_parent_id")
+
+    statements = []
+
+    def record(conn, cursor, statement, *args):
+        statements.append(statement)
+
+    event.listen(engine, "before_cursor_execute", record)
+    try:
+        assert add_indexes.upgrade(engine) == ["ix_chat_messages_session_id_created_at", "ix_roadmap_items_parent_id"]
+        assert statements[-1] == "ANALYZE"
+
+        statements.clear()
+        assert add_indexes.upgrade(engine) == []
+        # Nothing created: the statistics are not refreshed again
+        assert "ANALYZE" not in statements
+    finally:
+        event.remove(engine, "before_cursor_execute", record)
+
+
+def test_add_chat_summary_adds_missing_columns(test_db_session):
+    """Test that the chat summary migration adds its columns once."""
+    engine = test_db_session.get_bind()
+    test_db_session.close()
+    with engine.begin() as conn:
+        conn.exec_driver_sql("ALTER TABLE chat_sessions DROP COLUMN summary")
+        conn.exec_driver_sql("ALTER TABLE chat_sessions DROP COLUMN summarized_until_message_id")
+
+    assert add_chat_summary.upgrade(engine) == ["summary", "summarized_until_message_id"]
+    assert add_chat_summary.upgrade(engine) == []
+
+
+def test_add_roadmap_jobs_enforces_one_active_job(test_db_session, test_user, test_topic_field):
+    """Test that the migration resolves duplicate active jobs before adding the unique index."""
+    engine = test_db_session.get_bind()
+    with engine.begin() as conn:
+        conn.exec_driver_sql(f"DROP INDEX {add_roadmap_jobs.ACTIVE_INDEX}")
+    jobs = [RoadmapJob(topic_field_id=test_topic_field.id, user_id=test_user.id) for _ in range(2)]
+    test_db_session.add_all(jobs)
+    test_db_session.commit()
+    job_ids = [job.id for job in jobs]
+    test_db_session.close()
+
+    add_roadmap_jobs.upgrade(engine)
+    add_roadmap_jobs.upgrade(engine)
+
+    statuses = [test_db_session.get(RoadmapJob, job_id).status for job_id in job_ids]
+    assert statuses == [RoadmapJobStatus.QUEUED, RoadmapJobStatus.FAILED]
+    assert add_roadmap_jobs.ACTIVE_INDEX in {index["name"] for index in inspect(engine).get_indexes("roadmap_jobs")}
+
+
+def test_upgrade_all_migrates_shipped_database(tmp_path):
+    """Test that a copy of the repository database reaches the current schema and stays there."""
+    path = tmp_path / "uni_pilot.db"
+    shutil.copy(Path(__file__).resolve().parents[2] / "uni_pilot.db", path)
+    engine = create_sqlite_engine(f"sqlite:///{path}")
+    try:
+        upgrade_all(engine)
+        upgrade_all(engine)
+
+        inspector = inspect(engine)
+        assert {"roadmap_jobs", "generation_locks", "roadmap_item_skills", "roadmap_current_skills"} <= set(
+            inspector.get_table_names()
+        )
+        columns = {column["name"] for column in inspector.get_columns("chat_sessions")}
+        assert {"summary", "summarized_until_message_id"} <= columns
+    finally:
+        engine.dispose()
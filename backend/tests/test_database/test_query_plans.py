@@ -0,0 +1,80 @@
+"""Query-plan regression tests: hot queries must use their indexes."""
+
+import pytest
+from sqlalchemy import literal, tuple_
+from sqlalchemy.dialects import sqlite
+
+from database.models import (
+    CareerTreeNode,
+    CareerTreeRelationship,
+    ChatMessage,
+    ChatSession,
+    Module,
+    Roadmap,
+    RoadmapItem,
+    UserQuestion,
+)
+
+
+def _query_plan(db, query) -> str:
+    """EXPLAIN QUERY PLAN for an ORM query, as one string."""
+    compiled = query.statement.compile(dialect=sqlite.dialect(), compile_kwargs={"literal_binds": True})
+    rows = db.connection().exec_driver_sql(f"EXPLAIN QUERY PLAN {compiled}").all()
+    return "\n".join(row[-1] for row in rows)
+
+
+@pytest.mark.parametrize(
+    "build_query, index_name",
+    [
+        (
+            lambda db: db.query(ChatMessage)
+            .filter(ChatMessage.session_id == 1)
+            .order_by(ChatMessage.created_at.asc(), ChatMessage.id.asc()),
+            "ix_chat_messages_session_id_created_at",
+        ),
+        (
+            # Keyset page after a cursor position
+            lambda db: db.query(ChatMessage)
+            .filter(
+                ChatMessage.session_id == 1,
+                tuple_(ChatMessage.created_at, ChatMessage.id) > tuple_(literal("2024-01-01 00:00:00"), literal(5)),
+            )
+            .order_by(ChatMessage.created_at.asc(), ChatMessage.id.asc()),
+            "ix_chat_messages_session_id_created_at",
+        ),
+        (
+            lambda db: db.query(ChatSession).filter(ChatSession.user_id == 1).order_by(ChatSession.updated_at.desc()),
+            "ix_chat_sessions_user_id_updated_at",
+        ),
+        (
+            lambda db: db.query(ChatSession).filter(ChatSession.user_id == 1, ChatSession.topic_field_id == 2),
+            "ix_chat_sessions_user_id_topic_field_id",
+        ),
+        (
+            lambda db: db.query(ChatSession).filter(ChatSession.user_id == 1, ChatSession.career_tree_node_id == 2),
+            "ix_chat_sessions_user_id_career_tree_node_id",
+        ),
+        (lambda db: db.query(RoadmapItem).filter(RoadmapItem.roadmap_id == 1), "ix_roadmap_items_roadmap_id"),
+        (lambda db: db.query(RoadmapItem).filter(RoadmapItem.parent_id == 1), "ix_roadmap_items_parent_id"),
+        (lambda db: db.query(Roadmap).filter(Roadmap.topic_field_id == 1), "ix_roadmaps_topic_field_id"),
+        (lambda db: db.query(Module).filter(Module.study_program_id == 1), "ix_modules_study_program_id"),
+        (
+            lambda db: db.query(CareerTreeNode).filter(CareerTreeNode.study_program_id == 1),
+            "ix_career_tree_nodes_study_program_id",
+        ),
+        (
+            lambda db: db.query(CareerTreeRelationship).filter(CareerTreeRelationship.child_id == 1),
+            "ix_career_tree_relationships_child_id",
+        ),
+        (
+            lambda db: db.query(UserQuestion).filter(UserQuestion.user_id == 1).order_by(UserQuestion.created_at.desc()),
+            "ix_user_questions_user_id_created_at",
+        ),
+    ],
+)
+def test_hot_queries_use_indexes(test_db_session, build_query, index_name):
+    """The query is answered through the index, without a full scan or temp sort."""
+    plan = _query_plan(test_db_session, build_query(test_db_session))
+
+    assert index_name in plan
+    assert "USE TEMP B-TREE" not in plan
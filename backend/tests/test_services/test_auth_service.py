@@ -132,3 +132,22 @@ def test_login_user_not_found(test_db_session):
             db=test_db_session,
         )
 
+
+
+async def test_alogin_user_matches_sync_login(test_db_session, test_user):
+    """Test that the pooled login accepts and rejects the same credentials."""
+    user, token = await AuthService.alogin_user(test_user.email, "testpassword123", test_db_session)
+    assert user.id == test_user.id
+    assert token
+
+    with pytest.raises(AuthenticationError):
+        await AuthService.alogin_user(test_user.email, "wrongpassword", test_db_session)
+
+
+async def test_aregister_user_hashes_password(test_db_session):
+    """Test that registration through the hashing pool stores a verifiable hash."""
+    from api.core.security import verify_password
+
+    user = await AuthService.aregister_user("pooled@example.com", "password123", "Pool", "User", test_db_session)
+
+    assert verify_password("password123", user.password_hash)
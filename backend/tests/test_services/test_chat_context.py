@@ -0,0 +1,158 @@
+"""Tests for the token-budgeted chat context and rolling summary."""
+
+from unittest.mock import AsyncMock, MagicMock
+
+from api.prompts.prompt_blocks import PromptBlock, prompt_text
+from api.services.chat_context import ChatSummaryRefresher, build_chat_context, estimate_tokens
+from api.services.chat_service import ChatService
+from database.models import ChatMessage, ChatSession
+from tests.conftest import TestSessionLocal
+
+
+def _add_turns(db, session_id, count, content_size=40):
+    """Add alternating user/assistant messages (oldest first)."""
+    messages = []
+    for i in range(count):
+        role = "user" if i % 2 == 0 else "assistant"
+        message = ChatMessage(session_id=session_id, role=role, content=f"{i:03d} " + "x" * content_size)
+        db.add(message)
+        messages.append(message)
+    db.commit()
+    return messages
+
+
+def _session(db, user, topic_field):
+    return ChatService.get_or_create_session(user_id=user.id, topic_field_id=topic_field.id, db=db)
+
+
+def test_estimate_tokens():
+    """Test the per-message token estimate."""
+    assert estimate_tokens("") == 4
+    assert estimate_tokens("x" * 400) == 104
+
+
+def test_build_chat_context_keeps_newest_turns_within_budget():
+    """Test that the newest contiguous turns are kept and the first message is a user turn."""
+    history = [{"role": "user" if i % 2 == 0 else "assistant", "content": f"{i}" + "x" * 35} for i in range(10)]
+
+    context = build_chat_context(history, "Frage?", "System", token_budget=55)
+
+    # Each history message costs 13 tokens, the current one 6: three fit, the leading assistant is dropped
+    assert [m["content"] for m in context.messages[:-1]] == [history[i]["content"] for i in (8, 9)]
+    assert context.messages[0]["role"] == "user"
+    assert context.messages[-1] == {"role": "user", "content": "Frage?"}
+    assert context.estimated_tokens == 6 + 2 * 13
+    assert context.needs_summary is True
+    assert context.system_prompt == [PromptBlock("System", cache=True)]
+
+
+def test_build_chat_context_adds_summary_to_system_prompt():
+    """Test that the rolling summary is part of the system prompt and the budget."""
+    history = [{"role": "user", "content": "Hallo"}, {"role": "assistant", "content": "Hi"}]
+
+    context = build_chat_context(history, "Weiter", "System", summary="Interessiert an ML.", token_budget=1000)
+
+    # The stable prompt stays a cacheable prefix, the summary follows it
+    assert context.system_prompt[0] == PromptBlock("System", cache=True)
+    assert "Interessiert an ML." in prompt_text(context.system_prompt)
+    assert len(context.messages) == 3
+    assert context.needs_summary is False
+
+
+def test_send_message_sends_newest_history(test_db_session, test_user, test_topic_field):
+    """Test that the newest (not the oldest) messages of a long session reach the LLM."""
+    session = _session(test_db_session, test_user, test_topic_field)
+    messages = _add_turns(test_db_session, session.id, 60)
+
+    llm_service = MagicMock()
+    llm_service.chat.return_value = "Antwort"
+    refresher = MagicMock()
+    chat_service = ChatService(llm_service=llm_service, summary_refresher=refresher)
+    chat_service.send_message(session.id, "Neue Frage", db=test_db_session)
+
+    sent = llm_service.chat.call_args.kwargs["messages"]
+    assert sent[-1] == {"role": "user", "content": "Neue Frage"}
+    assert sent[-2]["content"] == messages[-1].content
+    assert messages[0].content not in [m["content"] for m in sent]
+    refresher.schedule.assert_called_once_with(session.id, llm_service)
+
+
+def test_send_message_short_session_skips_summary(test_db_session, test_user, test_topic_field):
+    """Test that no summary is scheduled while the whole history fits."""
+    session = _session(test_db_session, test_user, test_topic_field)
+    _add_turns(test_db_session, session.id, 4)
+
+    llm_service = MagicMock()
+    llm_service.chat.return_value = "Antwort"
+    refresher = MagicMock()
+    ChatService(llm_service=llm_service, summary_refresher=refresher).send_message(
+        session.id, "Neue Frage", db=test_db_session
+    )
+
+    assert len(llm_service.chat.call_args.kwargs["messages"]) == 5
+    refresher.schedule.assert_not_called()
+
+
+async def test_refresh_summarizes_older_turns(test_db_session, test_user, test_topic_field):
+    """Test that a refresh stores the summary without touching the session's activity timestamp."""
+    session = _session(test_db_session, test_user, test_topic_field)
+    messages = _add_turns(test_db_session, session.id, 60, content_size=400)
+    updated_at = test_db_session.query(ChatSession.updated_at).filter(ChatSession.id == session.id).scalar()
+
+    llm_service = MagicMock()
+    llm_service.achat = AsyncMock(return_value=" Studierende/r interessiert sich für ML. ")
+    refresher = ChatSummaryRefresher(session_factory=TestSessionLocal)
+
+    assert await refresher.arefresh(session.id, llm_service) is True
+
+    test_db_session.expire_all()
+    stored = test_db_session.query(ChatSession).filter(ChatSession.id == session.id).one()
+    assert stored.summary == "Studierende/r interessiert sich für ML."
+    assert stored.updated_at == updated_at
+    cut = stored.summarized_until_message_id
+    assert messages[0].id <= cut < messages[-1].id
+    # The kept window starts with a user turn
+    assert next(m for m in messages if m.id > cut).role == "user"
+
+    prompt = llm_service.achat.call_args.kwargs["messages"][0]["content"]
+    assert messages[0].content in prompt
+    assert messages[-1].content not in prompt
+
+    # Summarized turns are no longer sent; the summary is
+    sync_llm = MagicMock()
+    sync_llm.chat.return_value = "Antwort"
+    ChatService(llm_service=sync_llm, summary_refresher=MagicMock()).send_message(
+        session.id, "Neue Frage", db=test_db_session
+    )
+    kwargs = sync_llm.chat.call_args.kwargs
+    assert "Studierende/r interessiert sich für ML." in prompt_text(kwargs["system_prompt"])
+    assert all(m["content"] != messages[0].content for m in kwargs["messages"])
+
+
+def test_refresh_strips_truncation_marker(test_db_session, test_user, test_topic_field):
+    """Test that a summary cut off at max_tokens is stored without the truncation marker."""
+    session = _session(test_db_session, test_user, test_topic_field)
+    _add_turns(test_db_session, session.id, 60, content_size=400)
+
+    llm_service = MagicMock()
+    llm_service.chat.return_value = "__TRUNCATED__Studierende/r interessiert sich für"
+    refresher = ChatSummaryRefresher(session_factory=TestSessionLocal)
+
+    assert refresher.refresh(session.id, llm_service) is True
+
+    test_db_session.expire_all()
+    stored = test_db_session.query(ChatSession).filter(ChatSession.id == session.id).one()
+    assert stored.summary == "Studierende/r interessiert sich für"
+
+
+async def test_refresh_noop_when_history_fits(test_db_session, test_user, test_topic_field):
+    """Test that a short session is not summarized."""
+    session = _session(test_db_session, test_user, test_topic_field)
+    _add_turns(test_db_session, session.id, 4)
+
+    llm_service = MagicMock()
+    llm_service.achat = AsyncMock()
+    refresher = ChatSummaryRefresher(session_factory=TestSessionLocal)
+
+    assert await refresher.arefresh(session.id, llm_service) is False
+    llm_service.achat.assert_not_awaited()
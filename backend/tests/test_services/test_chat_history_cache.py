@@ -0,0 +1,134 @@
+"""Tests for the per-session chat history cache."""
+
+import time
+from datetime import datetime
+from unittest.mock import MagicMock
+
+from api.services.chat_history_cache import ChatHistoryCache, get_chat_history_cache
+from api.services.chat_service import ChatService
+from database.models import ChatMessage, User
+
+V1 = (datetime(2025, 1, 1, 12, 0, 0), None)
+V2 = (datetime(2025, 1, 1, 12, 0, 1), None)
+
+
+def _turn(text):
+    return [{"role": "user", "content": text}, {"role": "assistant", "content": f"Re: {text}"}]
+
+
+def test_get_requires_matching_version():
+    """Test that entries are only served for the session version they were built for."""
+    cache = ChatHistoryCache(max_sessions=10, ttl_seconds=60)
+    cache.set(1, _turn("a"), False, V1)
+
+    assert cache.get(1, V1).messages == _turn("a")
+    assert cache.get(1, V2) is None
+    assert cache.get(1, V1) is None  # stale entry was dropped
+    assert cache.stats()["hits"] == 1
+
+
+def test_lru_and_ttl_eviction(monkeypatch):
+    """Test that the least recently used entry is evicted and expired entries miss."""
+    cache = ChatHistoryCache(max_sessions=2, ttl_seconds=60)
+    cache.set(1, [], False, V1)
+    cache.set(2, [], False, V1)
+    cache.get(1, V1)
+    cache.set(3, [], False, V1)
+
+    assert cache.get(2, V1) is None
+    assert cache.get(1, V1) is not None
+    assert cache.stats()["evictions"] == 1
+
+    now = time.monotonic()
+    monkeypatch.setattr("api.services.chat_history_cache.time.monotonic", lambda: now + 61)
+    assert cache.get(1, V1) is None
+
+
+def test_append_caps_history(monkeypatch):
+    """Test write-through keeps at most MAX_CHAT_HISTORY_MESSAGES and marks the history truncated."""
+    monkeypatch.setattr("api.services.chat_history_cache.settings.MAX_CHAT_HISTORY_MESSAGES", 4)
+    cache = ChatHistoryCache(max_sessions=10, ttl_seconds=60)
+    cache.set(1, _turn("a") + _turn("b"), False, V1)
+
+    assert cache.append(1, V1, _turn("c"), V2) is True
+    entry = cache.get(1, V2)
+    assert entry.messages == _turn("b") + _turn("c")
+    assert entry.truncated is True
+
+    # A writer that saw an older version drops the entry instead of extending it
+    assert cache.append(1, V1, _turn("d"), V2) is False
+    assert cache.get(1, V2) is None
+
+
+def test_send_message_serves_history_from_cache(test_db_session, test_user, test_topic_field):
+    """Test that the second turn of a session reuses the written-through history."""
+    session = ChatService.get_or_create_session(
+        user_id=test_user.id, topic_field_id=test_topic_field.id, db=test_db_session
+    )
+    llm_service = MagicMock()
+    llm_service.chat.side_effect = ["Antwort 1", "Antwort 2"]
+    cache = ChatHistoryCache(max_sessions=10, ttl_seconds=60)
+    chat_service = ChatService(llm_service=llm_service, summary_refresher=MagicMock(), history_cache=cache)
+
+    chat_service.send_message(session.id, "Frage 1", db=test_db_session)
+    chat_service.send_message(session.id, "Frage 2", db=test_db_session)
+
+    assert cache.stats()["misses"] == 1
+    assert cache.stats()["hits"] == 1
+    assert llm_service.chat.call_args.kwargs["messages"] == [
+        {"role": "user", "content": "Frage 1"},
+        {"role": "assistant", "content": "Antwort 1"},
+        {"role": "user", "content": "Frage 2"},
+    ]
+
+
+def test_message_written_elsewhere_is_not_missed(test_db_session, test_user, test_topic_field):
+    """Test that a turn stored by another process (updated_at bumped) invalidates the entry."""
+    session = ChatService.get_or_create_session(
+        user_id=test_user.id, topic_field_id=test_topic_field.id, db=test_db_session
+    )
+    llm_service = MagicMock()
+    llm_service.chat.return_value = "Antwort"
+    cache = ChatHistoryCache(max_sessions=10, ttl_seconds=60)
+    chat_service = ChatService(llm_service=llm_service, summary_refresher=MagicMock(), history_cache=cache)
+    chat_service.send_message(session.id, "Frage 1", db=test_db_session)
+
+    test_db_session.add(ChatMessage(session_id=session.id, role="user", content="Von woanders"))
+    test_db_session.add(ChatMessage(session_id=session.id, role="assistant", content="Antwort woanders"))
+    session.updated_at = datetime.utcnow()
+    test_db_session.commit()
+
+    chat_service.send_message(session.id, "Frage 2", db=test_db_session)
+    contents = [m["content"] for m in llm_service.chat.call_args.kwargs["messages"]]
+    assert "Von woanders" in contents
+
+
+def test_deleted_session_is_invalidated(test_db_session, test_user, test_topic_field):
+    """Test that deleting a session (via the user cascade) drops its cached history."""
+    session = ChatService.get_or_create_session(
+        user_id=test_user.id, topic_field_id=test_topic_field.id, db=test_db_session
+    )
+    session_id, version = session.id, (session.updated_at, None)
+    cache = get_chat_history_cache()
+    cache.set(session_id, _turn("a"), False, version)
+
+    test_db_session.delete(test_db_session.get(User, test_user.id))
+    test_db_session.commit()
+
+    assert cache.get(session_id, version) is None
+    assert cache.stats()["size"] == 0
+
+
+def test_stored_greeting_invalidates_injected_cache(test_db_session, test_user, test_topic_field):
+    """Test that storing a greeting drops the session's history from the service's own cache."""
+    session = ChatService.get_or_create_session(
+        user_id=test_user.id, topic_field_id=test_topic_field.id, db=test_db_session
+    )
+    version = (session.updated_at, None)
+    cache = ChatHistoryCache(max_sessions=10, ttl_seconds=60)
+    cache.set(session.id, [], False, version)
+    chat_service = ChatService(llm_service=MagicMock(), summary_refresher=MagicMock(), history_cache=cache)
+
+    chat_service._store_greeting(session.id, "Hallo!", test_db_session)
+
+    assert cache.get(session.id, version) is None
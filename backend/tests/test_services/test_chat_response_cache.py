@@ -0,0 +1,118 @@
+"""Tests for the first-turn chat response cache."""
+
+import time
+from unittest.mock import MagicMock
+
+import pytest
+
+from api.services.chat_response_cache import ChatResponseCache, normalize_question
+from api.services.chat_service import ChatService
+from database.models import ChatSession
+
+SCOPE = "topic_field:1"
+
+
+def test_normalize_question():
+    """Test that case, punctuation, whitespace and umlauts are normalized."""
+    assert normalize_question("  Welche Skills   brauche ich?? ") == "welche skills brauche ich"
+    assert normalize_question("Wie wichtig ist Mathe für KI?") == "wie wichtig ist mathe fuer ki"
+
+
+def test_lookup_by_similarity_within_scope():
+    """Test that near-identical questions hit and other scopes or questions miss."""
+    cache = ChatResponseCache(max_entries=10, ttl_seconds=60, threshold=0.7)
+    cache.store(SCOPE, "Welche Skills brauche ich?", "Python und SQL.")
+
+    assert cache.lookup(SCOPE, "welche skills brauche ich") == "Python und SQL."
+    assert cache.lookup(SCOPE, "Welche Skills brauch ich denn?") == "Python und SQL."
+    assert cache.lookup(SCOPE, "Wie finde ich ein Praktikum?") is None
+    assert cache.lookup("job:1", "Welche Skills brauche ich?") is None
+    assert cache.stats()["hits"] == 2
+
+
+def test_ttl_and_lru_eviction(monkeypatch):
+    """Test that expired answers are not served and the least recently used answer is evicted."""
+    cache = ChatResponseCache(max_entries=2, ttl_seconds=60, threshold=0.9)
+    cache.store(SCOPE, "Frage eins", "A")
+    cache.store(SCOPE, "Frage zwei", "B")
+    cache.lookup(SCOPE, "Frage eins")
+    cache.store(SCOPE, "Frage drei", "C")
+
+    assert cache.lookup(SCOPE, "Frage zwei") is None
+    assert cache.lookup(SCOPE, "Frage eins") == "A"
+
+    now = time.monotonic()
+    monkeypatch.setattr("api.services.chat_response_cache.time.monotonic", lambda: now + 61)
+    assert cache.lookup(SCOPE, "Frage eins") is None
+    assert cache.stats()["size"] == 0  # expired entries of the scope were removed during lookup
+
+
+def _new_session(db, user, topic_field):
+    session = ChatSession(user_id=user.id, topic_field_id=topic_field.id)
+    db.add(session)
+    db.commit()
+    return session
+
+
+def test_first_turn_answer_served_from_cache(test_db_session, test_user, test_topic_field):
+    """Test that a similar first question in another session of the topic field skips the LLM."""
+    llm_service = MagicMock()
+    llm_service.chat.side_effect = ["Python und SQL.", "Zweite Antwort"]
+    chat_service = ChatService(
+        llm_service=llm_service,
+        summary_refresher=MagicMock(),
+        response_cache=ChatResponseCache(max_entries=10, ttl_seconds=60, threshold=0.8),
+    )
+
+    first = _new_session(test_db_session, test_user, test_topic_field)
+    chat_service.send_message(first.id, "Welche Skills brauche ich?", db=test_db_session)
+
+    second = _new_session(test_db_session, test_user, test_topic_field)
+    _, assistant_message = chat_service.send_message(second.id, "welche Skills brauche ich", db=test_db_session)
+
+    assert assistant_message.content == "Python und SQL."
+    assert assistant_message.session_id == second.id
+    assert llm_service.chat.call_count == 1
+
+    # Follow-up turns depend on the conversation and always go to the LLM
+    _, follow_up = chat_service.send_message(second.id, "Welche Skills brauche ich?", db=test_db_session)
+    assert follow_up.content == "Zweite Antwort"
+    assert llm_service.chat.call_count == 2
+
+
+async def test_stream_first_turn_from_cache(test_db_session, test_user, test_topic_field):
+    """Test that a cache hit is streamed as a single token."""
+    cache = ChatResponseCache(max_entries=10, ttl_seconds=60, threshold=0.8)
+    cache.store(f"topic_field:{test_topic_field.id}", "Welche Skills brauche ich?", "Python und SQL.")
+    llm_service = MagicMock()
+    chat_service = ChatService(llm_service=llm_service, summary_refresher=MagicMock(), response_cache=cache)
+    session = _new_session(test_db_session, test_user, test_topic_field)
+
+    events = [
+        event
+        async for event in chat_service.stream_message(session.id, "Welche Skills brauche ich?", db=test_db_session)
+    ]
+
+    assert events[0] == {"type": "token", "text": "Python und SQL."}
+    assert events[-1]["assistant_message"].content == "Python und SQL."
+    llm_service.astream_chat.assert_not_called()
+
+
+def test_answer_is_cached_only_after_the_turn_is_stored(test_db_session, test_user, test_topic_field):
+    """Test that an answer whose commit failed is never served from the cache."""
+    cache = ChatResponseCache(max_entries=10, ttl_seconds=60, threshold=0.8)
+    llm_service = MagicMock()
+    llm_service.chat.return_value = "Python und SQL."
+    chat_service = ChatService(llm_service=llm_service, summary_refresher=MagicMock(), response_cache=cache)
+    chat_service._store_assistant_message = MagicMock(side_effect=RuntimeError("database is locked"))
+    session = _new_session(test_db_session, test_user, test_topic_field)
+
+    with pytest.raises(RuntimeError):
+        chat_service.send_message(session.id, "Welche Skills brauche ich?", db=test_db_session)
+
+    assert cache.stats()["size"] == 0
+
+
+def test_response_cache_disabled_by_default(test_db_session):
+    """Test that the cache is opt-in."""
+    assert ChatService(llm_service=MagicMock(), summary_refresher=MagicMock()).response_cache is None
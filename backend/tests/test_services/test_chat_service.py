@@ -1,6 +1,6 @@
 """Tests for Chat Service (with mocked LLM)."""
 
-from unittest.mock import MagicMock, patch
+from unittest.mock import AsyncMock, MagicMock, patch
 
 import pytest
 
@@ -137,6 +137,80 @@ def test_get_messages_with_limit(test_db_session, test_user, test_topic_field):
     assert len(messages) == 3
 
 
+def test_count_messages(test_db_session, test_user, test_topic_field, test_career_tree_node):
+    """Test counting messages of several sessions at once (beyond the get_messages default limit)."""
+    session = ChatService.get_or_create_session(
+        user_id=test_user.id,
+        topic_field_id=test_topic_field.id,
+        db=test_db_session,
+    )
+    empty_session = ChatSession(user_id=test_user.id, career_tree_node_id=test_career_tree_node.id)
+    test_db_session.add(empty_session)
+    test_db_session.add_all(
+        ChatMessage(session_id=session.id, role="user", content=f"Message {i}") for i in range(60)
+    )
+    test_db_session.commit()
+
+    counts = ChatService.count_messages([session.id, empty_session.id], test_db_session)
+
+    assert counts == {session.id: 60, empty_session.id: 0}
+    assert ChatService.count_session_messages(session.id, test_db_session) == 60
+    assert ChatService.count_messages([], test_db_session) == {}
+
+
+def test_get_messages_page_cursor(test_db_session, test_user, test_topic_field):
+    """Test walking a session's messages page by page with the keyset cursor."""
+    from datetime import datetime, timedelta
+
+    session = ChatService.get_or_create_session(
+        user_id=test_user.id,
+        topic_field_id=test_topic_field.id,
+        db=test_db_session,
+    )
+    # Same-second server timestamps and explicit fractional timestamps mixed
+    test_db_session.add_all(
+        ChatMessage(session_id=session.id, role="user", content=f"Message {i}") for i in range(15)
+    )
+    later = datetime.utcnow() + timedelta(seconds=5)
+    test_db_session.add_all(
+        ChatMessage(
+            session_id=session.id,
+            role="assistant",
+            content=f"Message {15 + i}",
+            created_at=later + timedelta(microseconds=i),
+        )
+        for i in range(10)
+    )
+    test_db_session.commit()
+
+    contents = []
+    cursor = None
+    pages = 0
+    while True:
+        messages, cursor = ChatService.get_messages_page(session.id, test_db_session, limit=10, cursor=cursor)
+        contents.extend(message.content for message in messages)
+        pages += 1
+        if cursor is None:
+            break
+
+    assert pages == 3
+    assert contents == [f"Message {i}" for i in range(25)]
+
+
+def test_get_messages_page_invalid_cursor(test_db_session, test_user, test_topic_field):
+    """Test that a malformed cursor is rejected."""
+    from api.core.exceptions import ValidationError
+
+    session = ChatService.get_or_create_session(
+        user_id=test_user.id,
+        topic_field_id=test_topic_field.id,
+        db=test_db_session,
+    )
+
+    with pytest.raises(ValidationError):
+        ChatService.get_messages_page(session.id, test_db_session, cursor="not-a-cursor")
+
+
 @patch("api.services.chat_service.LLMService")
 def test_send_message_mock_llm(mock_llm_service_class, test_db_session, test_user, test_topic_field):
     """Test sending message with mocked LLM service."""
@@ -167,3 +241,28 @@ def test_send_message_mock_llm(mock_llm_service_class, test_db_session, test_use
     # Verify LLM service was called
     mock_llm_service.chat.assert_called_once()
 
+
+async def test_asend_message_mock_llm(test_db_session, test_user, test_topic_field):
+    """Test sending message through the awaitable path with mocked LLM service."""
+    mock_llm_service = MagicMock()
+    mock_llm_service.achat = AsyncMock(return_value="This is an async mock response")
+
+    session = ChatService.get_or_create_session(
+        user_id=test_user.id,
+        topic_field_id=test_topic_field.id,
+        db=test_db_session,
+    )
+
+    chat_service = ChatService(llm_service=mock_llm_service)
+    user_message, assistant_message = await chat_service.asend_message(
+        session_id=session.id,
+        user_message_content="Test question?",
+        topic_field=test_topic_field,
+        db=test_db_session,
+    )
+
+    assert user_message.content == "Test question?"
+    assert assistant_message.content == "This is an async mock response"
+    mock_llm_service.achat.assert_awaited_once()
+    mock_llm_service.chat.assert_not_called()
+
@@ -0,0 +1,56 @@
+"""Tests for the load tests' fake Bedrock server, driven through boto3 and LLMService."""
+
+import pytest
+
+from api.services import llm_registry
+from api.services.llm_emulator import CHAT_REPLY, EmulatorConfig
+from api.services.llm_registry import LLMClientRegistry, create_bedrock_client
+from api.services.llm_service import LLMService
+from tests.load.fake_bedrock import FakeBedrockServer
+from tests.load.run_load import percentile
+
+
+@pytest.fixture
+def fake_llm_service(monkeypatch):
+    """LLMService whose Bedrock client talks to a local fake server via BEDROCK_ENDPOINT_URL."""
+    server = FakeBedrockServer(config=EmulatorConfig(latency_ms=0, jitter_ms=0, tokens_per_second=0)).start()
+    monkeypatch.setattr(llm_registry.settings, "BEDROCK_ENDPOINT_URL", server.url)
+    monkeypatch.setattr(llm_registry.settings, "AWS_ACCESS_KEY_ID", "fake")
+    monkeypatch.setattr(llm_registry.settings, "AWS_SECRET_ACCESS_KEY", "fake")
+    registry = LLMClientRegistry(pool_size=1, max_workers=2, client_factory=create_bedrock_client)
+    try:
+        yield LLMService(registry=registry), server
+    finally:
+        registry.close()
+        server.stop()
+
+
+def test_chat_and_stream_through_fake_bedrock(fake_llm_service):
+    """Test that InvokeModel and the event stream are understood by boto3."""
+    llm_service, server = fake_llm_service
+    messages = [{"role": "user", "content": "Hallo"}]
+
+    assert llm_service.chat("System", messages) == CHAT_REPLY
+    assert "".join(llm_service.stream_chat("System", messages)) == CHAT_REPLY
+    assert server.requests == {"invoke": 1, "invoke-with-response-stream": 1}
+
+
+def test_roadmap_model_gets_schema_valid_roadmap(fake_llm_service):
+    """Test that the roadmap model answers with a roadmap the service can parse."""
+    llm_service, _ = fake_llm_service
+
+    roadmap = llm_service.generate_roadmap("Erstelle eine Roadmap")
+
+    assert roadmap["name"]
+    assert [item["parent_id"] for item in roadmap["items"]] == [None, 1, 2, 3]
+    assert roadmap["items"][-1]["is_career_goal"] is True
+
+
+def test_percentile_nearest_rank():
+    """Test the percentile used in load test reports."""
+    values = [float(i) for i in range(1, 101)]
+
+    assert percentile(values, 50) == 50.0
+    assert percentile(values, 95) == 95.0
+    assert percentile(values, 99) == 99.0
+    assert percentile([], 99) == 0.0
@@ -0,0 +1,92 @@
+"""Tests for the local Bedrock emulator behind LLMService."""
+
+import pytest
+
+from api.core.exceptions import ServiceUnavailableError
+from api.services import llm_registry
+from api.services.llm_emulator import CHAT_REPLY, BedrockEmulator, EmulatorConfig
+from api.services.llm_registry import LLMClientRegistry, create_llm_client
+from api.services.llm_resilience import LLMResilience
+from api.services.llm_service import LLMService, get_llm_usage_metrics
+
+
+def _service(**config) -> LLMService:
+    emulator = BedrockEmulator(EmulatorConfig(latency_ms=0, jitter_ms=0, tokens_per_second=0, **config), seed=1)
+    return LLMService(bedrock_client=emulator)
+
+
+def test_llm_backend_setting_selects_emulator(monkeypatch):
+    """Test that LLM_BACKEND=emulator needs no AWS credentials."""
+    monkeypatch.setattr(llm_registry.settings, "LLM_BACKEND", "emulator")
+    registry = LLMClientRegistry(pool_size=1, max_workers=1)
+    try:
+        assert isinstance(create_llm_client(), BedrockEmulator)
+        assert isinstance(registry.acquire_client(), BedrockEmulator)
+    finally:
+        registry.close()
+
+
+def test_chat_and_stream_return_canned_reply():
+    """Test that invoke and streaming produce the same reply and record usage."""
+    get_llm_usage_metrics().reset()
+    llm_service = _service()
+    messages = [{"role": "user", "content": "Hallo"}]
+
+    assert llm_service.chat("System", messages) == CHAT_REPLY
+    deltas = list(llm_service.stream_chat("System", messages))
+
+    assert len(deltas) > 1
+    assert "".join(deltas) == CHAT_REPLY
+    assert get_llm_usage_metrics().snapshot()[llm_service.model_id_chat]["requests"] == 2
+
+
+def test_generate_roadmap_parses_canned_roadmap():
+    """Test that the roadmap model answers with a schema-valid roadmap."""
+    roadmap = _service().generate_roadmap("Erstelle eine Roadmap")
+
+    assert roadmap["items"][-1]["item_type"] == "CAREER"
+    assert roadmap["items"][-1]["top_skills"]
+
+
+def test_persistent_throttling_is_retried_then_shed():
+    """Test that emulated throttling is retried like Bedrock's and then answered with a 503 error."""
+    registry = LLMClientRegistry(
+        pool_size=1,
+        max_workers=1,
+        resilience=LLMResilience(max_attempts=2, base_delay=0, max_delay=0, failure_threshold=10),
+    )
+    emulator = BedrockEmulator(EmulatorConfig(latency_ms=0, jitter_ms=0, throttle_rate=1.0), seed=1)
+    llm_service = LLMService(bedrock_client=emulator, registry=registry)
+
+    try:
+        with pytest.raises(ServiceUnavailableError) as exc_info:
+            llm_service.chat("System", [{"role": "user", "content": "Hallo"}])
+        assert exc_info.value.error_code == "LLM_THROTTLED"
+        with pytest.raises(ServiceUnavailableError):
+            list(llm_service.stream_chat("System", [{"role": "user", "content": "Hallo"}]))
+        assert emulator.stats()["throttled"] == 4
+    finally:
+        registry.close()
+
+
+def test_reply_longer_than_max_tokens_is_truncated():
+    """Test that max_tokens cuts the reply and reports stop_reason max_tokens."""
+    llm_service = _service()
+
+    response = llm_service.chat("System", [{"role": "user", "content": "Hallo"}], max_tokens=5)
+
+    assert response == "__TRUNCATED__" + CHAT_REPLY[:20]
+    assert "".join(llm_service.stream_chat("System", [{"role": "user", "content": "Hallo"}], max_tokens=5)) == (
+        CHAT_REPLY[:20]
+    )
+
+
+def test_truncate_rate_cuts_roadmap_json():
+    """Test that a truncated roadmap goes through the JSON salvage path."""
+    llm_service = _service(truncate_rate=1.0)
+
+    roadmap = llm_service.generate_roadmap("Erstelle eine Roadmap")
+
+    # Half of the JSON survives: the salvaged roadmap keeps only the complete items
+    assert llm_service.bedrock_client.stats()["truncated"] == 1
+    assert 0 < len(roadmap["items"]) < 4
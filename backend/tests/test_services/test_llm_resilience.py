@@ -0,0 +1,301 @@
+"""Tests for retries, circuit breakers and the in-flight limit around Bedrock calls."""
+
+import asyncio
+import io
+import json
+import threading
+from unittest.mock import MagicMock
+
+import pytest
+from botocore.exceptions import ClientError, EndpointConnectionError, ReadTimeoutError
+
+from api.core.exceptions import LLMError, ServiceUnavailableError
+from api.services.llm_registry import LLMClientRegistry
+from api.services.llm_resilience import (
+    FATAL,
+    THROTTLED,
+    TIMEOUT,
+    TRANSIENT,
+    CircuitBreaker,
+    LLMResilience,
+    classify_error,
+)
+from api.services.llm_service import LLMService, StreamEnd
+
+
+def _client_error(code: str, status: int = 400) -> ClientError:
+    return ClientError(
+        {"Error": {"Code": code, "Message": code}, "ResponseMetadata": {"HTTPStatusCode": status}}, "InvokeModel"
+    )
+
+
+def _response(text: str = "Hallo") -> dict:
+    body = {"content": [{"type": "text", "text": text}], "stop_reason": "end_turn"}
+    return {"body": io.BytesIO(json.dumps(body).encode())}
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+def _resilience(**kwargs) -> LLMResilience:
+    options = {"max_attempts": 3, "base_delay": 0.5, "max_delay": 8.0, "failure_threshold": 5, "reset_seconds": 30}
+    options.update(kwargs)
+    return LLMResilience(sleep=options.pop("sleep", lambda delay: None), seed=1, **options)
+
+
+def test_classify_error():
+    """Test that throttling and service errors are retryable and request errors are not."""
+    assert classify_error(_client_error("ThrottlingException", 429)) == THROTTLED
+    assert classify_error(_client_error("ModelNotReadyException", 429)) == THROTTLED
+    assert classify_error(_client_error("ModelNotReadyException")) == TRANSIENT
+    assert classify_error(_client_error("InternalServerException", 500)) == TRANSIENT
+    assert classify_error(EndpointConnectionError(endpoint_url="http://bedrock")) == TRANSIENT
+    assert classify_error(ReadTimeoutError(endpoint_url="http://bedrock")) == TIMEOUT
+    assert classify_error(_client_error("ValidationException")) == FATAL
+    assert classify_error(_client_error("AccessDeniedException", 403)) == FATAL
+
+
+def test_throttled_call_is_retried_with_jittered_backoff():
+    """Test that throttling is retried with full-jitter delays below the exponential ceiling."""
+    delays = []
+    resilience = _resilience(max_attempts=4, sleep=delays.append)
+    func = MagicMock(side_effect=[_client_error("ThrottlingException", 429)] * 3 + ["ok"])
+
+    assert resilience.call("model", func) == "ok"
+
+    assert func.call_count == 4
+    assert len(delays) == 3
+    assert all(0 <= delay <= ceiling for delay, ceiling in zip(delays, [0.5, 1.0, 2.0]))
+    assert resilience.stats()["retries"] == 3
+
+
+def test_exhausted_retries_raise_service_unavailable():
+    """Test that persistent throttling ends in a 503 error with Retry-After."""
+    resilience = _resilience()
+    func = MagicMock(side_effect=_client_error("ThrottlingException", 429))
+
+    with pytest.raises(ServiceUnavailableError) as exc_info:
+        resilience.call("model", func)
+
+    assert func.call_count == 3
+    assert exc_info.value.error_code == "LLM_THROTTLED"
+    assert exc_info.value.retry_after == 8
+
+
+def test_fatal_and_timeout_errors_are_not_retried():
+    """Test that request errors and read timeouts are raised after one attempt."""
+    resilience = _resilience()
+    validation = MagicMock(side_effect=_client_error("ValidationException"))
+    timeout = MagicMock(side_effect=ReadTimeoutError(endpoint_url="http://bedrock"))
+
+    with pytest.raises(ClientError):
+        resilience.call("model", validation)
+    with pytest.raises(ReadTimeoutError):
+        resilience.call("model", timeout)
+
+    assert validation.call_count == 1
+    assert timeout.call_count == 1
+    assert resilience.breaker("model").stats()["consecutive_failures"] == 1
+
+
+def test_circuit_breaker_opens_and_recovers_after_probe():
+    """Test that the breaker rejects calls while open and closes after a successful probe."""
+    clock = FakeClock()
+    resilience = _resilience(max_attempts=1, failure_threshold=2, reset_seconds=30, clock=clock)
+    throttled = MagicMock(side_effect=_client_error("ThrottlingException", 429))
+
+    for _ in range(2):
+        with pytest.raises(ServiceUnavailableError):
+            resilience.call("roadmap-model", throttled)
+    assert resilience.breaker("roadmap-model").state == CircuitBreaker.OPEN
+
+    untouched = MagicMock(return_value="ok")
+    clock.now = 10
+    with pytest.raises(ServiceUnavailableError) as exc_info:
+        resilience.call("roadmap-model", untouched)
+    assert exc_info.value.error_code == "LLM_CIRCUIT_OPEN"
+    assert exc_info.value.retry_after == 20
+    assert untouched.call_count == 0
+    # Breakers are per model
+    assert resilience.call("chat-model", untouched) == "ok"
+
+    clock.now = 31
+    assert resilience.call("roadmap-model", untouched) == "ok"
+    assert resilience.breaker("roadmap-model").state == CircuitBreaker.CLOSED
+    assert resilience.stats()["breakers"]["roadmap-model"]["times_opened"] == 1
+
+
+def test_half_open_breaker_allows_a_single_probe():
+    """Test that only one call probes a half-open breaker and a failed probe reopens it."""
+    clock = FakeClock()
+    breaker = CircuitBreaker(failure_threshold=1, reset_seconds=5, clock=clock)
+    breaker.record_failure()
+
+    clock.now = 5
+    assert breaker.allow() is True
+    assert breaker.allow() is False
+
+    breaker.record_failure()
+    assert breaker.state == CircuitBreaker.OPEN
+    assert breaker.retry_after() == 5
+
+
+def test_unexpected_probe_error_releases_half_open_breaker():
+    """Test that a probe failing with a non-Bedrock error does not block the breaker forever."""
+    clock = FakeClock()
+    resilience = _resilience(max_attempts=1, failure_threshold=1, reset_seconds=5, clock=clock)
+    with pytest.raises(ServiceUnavailableError):
+        resilience.call("model", MagicMock(side_effect=_client_error("ThrottlingException", 429)))
+
+    clock.now = 5
+    with pytest.raises(KeyError):
+        resilience.call("model", MagicMock(side_effect=KeyError("body")))
+
+    assert resilience.call("model", lambda: "ok") == "ok"
+    assert resilience.breaker("model").state == CircuitBreaker.CLOSED
+
+
+def test_limiter_rejects_calls_when_all_slots_are_busy():
+    """Test that a call that gets no in-flight slot in time is shed with a 503 error."""
+    resilience = _resilience(max_inflight=1, acquire_timeout=0.01)
+    started, release = threading.Event(), threading.Event()
+
+    def slow_call():
+        started.set()
+        release.wait(5)
+        return "ok"
+
+    worker = threading.Thread(target=resilience.call, args=("model", slow_call))
+    worker.start()
+    try:
+        assert started.wait(5)
+        with pytest.raises(ServiceUnavailableError) as exc_info:
+            resilience.call("model", lambda: "never")
+        assert exc_info.value.error_code == "LLM_OVERLOADED"
+    finally:
+        release.set()
+        worker.join()
+
+    assert resilience.call("model", lambda: "ok") == "ok"
+    assert resilience.stats()["inflight"] == 0
+
+
+def test_llm_service_retries_model_not_ready():
+    """Test that LLMService recovers from ModelNotReadyException and keeps request errors as LLMError."""
+    registry = LLMClientRegistry(pool_size=1, max_workers=1, resilience=_resilience())
+    bedrock_client = MagicMock()
+    bedrock_client.invoke_model.side_effect = [_client_error("ModelNotReadyException"), _response("Hallo")]
+    llm_service = LLMService(bedrock_client=bedrock_client, registry=registry)
+    messages = [{"role": "user", "content": "Hi"}]
+
+    try:
+        assert llm_service.chat("System", messages) == "Hallo"
+        assert bedrock_client.invoke_model.call_count == 2
+
+        bedrock_client.invoke_model.side_effect = _client_error("ValidationException")
+        with pytest.raises(LLMError, match="validation error"):
+            llm_service.chat("System", messages)
+        assert bedrock_client.invoke_model.call_count == 3
+    finally:
+        registry.close()
+
+
+async def test_saturated_achat_is_shed_instead_of_queued():
+    """Test that achat() answers 503 (LLM_OVERLOADED) while every slot is busy instead of queueing in the pool."""
+    resilience = _resilience(max_inflight=1, acquire_timeout=0.05)
+    registry = LLMClientRegistry(pool_size=1, max_workers=1, resilience=resilience)
+    started, release = threading.Event(), threading.Event()
+
+    def slow_invoke_model(**kwargs):
+        started.set()
+        release.wait(5)
+        return _response("Hallo")
+
+    bedrock_client = MagicMock()
+    bedrock_client.invoke_model.side_effect = slow_invoke_model
+    llm_service = LLMService(bedrock_client=bedrock_client, registry=registry)
+    messages = [{"role": "user", "content": "Hi"}]
+
+    try:
+        first = asyncio.create_task(llm_service.achat("System", messages))
+        assert await asyncio.to_thread(started.wait, 5)
+
+        with pytest.raises(ServiceUnavailableError) as exc_info:
+            await asyncio.wait_for(llm_service.achat("System", messages), 2)
+        assert exc_info.value.error_code == "LLM_OVERLOADED"
+        assert bedrock_client.invoke_model.call_count == 1
+
+        release.set()
+        assert await first == "Hallo"
+        assert registry.resilience.stats()["inflight"] == 0
+    finally:
+        release.set()
+        registry.close()
+
+
+async def test_achat_backoff_does_not_hold_a_worker():
+    """Test that a throttled achat() waits out its backoff on the event loop, leaving the worker to other calls."""
+    backoff_started, resume = asyncio.Event(), asyncio.Event()
+
+    async def async_sleep(delay):
+        backoff_started.set()
+        await resume.wait()
+
+    registry = LLMClientRegistry(pool_size=1, max_workers=1, resilience=_resilience(async_sleep=async_sleep))
+    bedrock_client = MagicMock()
+    bedrock_client.invoke_model.side_effect = [
+        _client_error("ThrottlingException", 429),
+        _response("Zweite"),
+        _response("Erste"),
+    ]
+    llm_service = LLMService(bedrock_client=bedrock_client, registry=registry)
+    messages = [{"role": "user", "content": "Hi"}]
+
+    try:
+        first = asyncio.create_task(llm_service.achat("System", messages))
+        await asyncio.wait_for(backoff_started.wait(), 5)
+
+        assert await asyncio.wait_for(llm_service.achat("System", messages), 5) == "Zweite"
+
+        resume.set()
+        assert await first == "Erste"
+    finally:
+        resume.set()
+        registry.close()
+
+
+async def test_stream_holds_its_slot_until_read():
+    """Test that an open response stream counts as in flight until it has been read to the end."""
+    resilience = _resilience(max_inflight=1, acquire_timeout=0.05)
+    registry = LLMClientRegistry(pool_size=1, max_workers=1, resilience=resilience)
+    release = threading.Event()
+
+    def events():
+        for text in ["Hal", "lo"]:
+            event = {"type": "content_block_delta", "delta": {"type": "text_delta", "text": text}}
+            yield {"chunk": {"bytes": json.dumps(event).encode()}}
+            release.wait(5)
+
+    bedrock_client = MagicMock()
+    bedrock_client.invoke_model_with_response_stream.return_value = {"body": events()}
+    llm_service = LLMService(bedrock_client=bedrock_client, registry=registry)
+    messages = [{"role": "user", "content": "Hi"}]
+
+    try:
+        stream = llm_service.astream_chat("System", messages)
+        assert await stream.__anext__() == "Hal"
+        assert registry.resilience.stats()["inflight"] == 1
+        with pytest.raises(ServiceUnavailableError):
+            await llm_service.achat("System", messages)
+
+        release.set()
+        assert [item async for item in stream] == ["lo", StreamEnd(None)]
+        assert registry.resilience.stats()["inflight"] == 0
+    finally:
+        release.set()
+        registry.close()
@@ -0,0 +1,167 @@
+"""Tests for LLM Service (without AWS Bedrock)."""
+
+import io
+import json
+import threading
+from unittest.mock import MagicMock
+
+from api.prompts.prompt_blocks import PromptBlock
+from api.services.llm_registry import LLMClientRegistry
+from api.services.llm_service import LLMService, StreamEnd, get_llm_usage_metrics
+
+
+def _response(text: str) -> dict:
+    body = {"content": [{"type": "text", "text": text}], "stop_reason": "end_turn"}
+    return {"body": io.BytesIO(json.dumps(body).encode())}
+
+
+async def test_achat_runs_off_event_loop():
+    """Test that achat() runs the blocking Bedrock call in the LLM worker pool."""
+    bedrock_client = MagicMock()
+    llm_service = LLMService(bedrock_client=bedrock_client)
+    caller_thread = threading.get_ident()
+    call_threads = []
+
+    def fake_invoke_model(**kwargs):
+        call_threads.append(threading.get_ident())
+        return _response("Async response")
+
+    bedrock_client.invoke_model.side_effect = fake_invoke_model
+
+    response = await llm_service.achat(
+        system_prompt="System",
+        messages=[{"role": "user", "content": "Hello"}],
+    )
+
+    assert response == "Async response"
+    assert len(call_threads) == 1
+    assert call_threads[0] != caller_thread
+
+
+async def test_agenerate_roadmap_parses_json():
+    """Test that agenerate_roadmap() returns the parsed roadmap JSON."""
+    bedrock_client = MagicMock()
+    bedrock_client.invoke_model.return_value = _response('```json\n{"name": "Roadmap", "items": []}\n```')
+    llm_service = LLMService(bedrock_client=bedrock_client)
+
+    response = await llm_service.agenerate_roadmap("Prompt")
+
+    assert response == {"name": "Roadmap", "items": []}
+
+
+async def test_astream_chat_yields_text_deltas():
+    """Test that astream_chat() yields text deltas from the Bedrock event stream and then the stop reason."""
+    events = [
+        {"type": "message_start", "message": {}},
+        {"type": "content_block_delta", "delta": {"type": "text_delta", "text": "Hel"}},
+        {"type": "content_block_delta", "delta": {"type": "text_delta", "text": "lo"}},
+        {"type": "message_delta", "delta": {"stop_reason": "end_turn"}},
+    ]
+    bedrock_client = MagicMock()
+    bedrock_client.invoke_model_with_response_stream.return_value = {
+        "body": [{"chunk": {"bytes": json.dumps(event).encode()}} for event in events]
+    }
+    llm_service = LLMService(bedrock_client=bedrock_client)
+
+    chunks = [
+        text
+        async for text in llm_service.astream_chat(
+            system_prompt="System",
+            messages=[{"role": "user", "content": "Hello"}],
+        )
+    ]
+
+    assert chunks == ["Hel", "lo", StreamEnd("end_turn")]
+    request_body = json.loads(bedrock_client.invoke_model_with_response_stream.call_args.kwargs["body"])
+    assert request_body["system"] == "System"
+
+
+def test_registry_reuses_bedrock_clients():
+    """Test that the registry creates at most pool_size clients and reuses them."""
+    created = []
+
+    def fake_client_factory():
+        created.append(MagicMock())
+        return created[-1]
+
+    registry = LLMClientRegistry(pool_size=2, max_workers=2, client_factory=fake_client_factory)
+    try:
+        first = LLMService(registry=registry)
+        second = LLMService(registry=registry)
+        clients = [first.bedrock_client, second.bedrock_client, first.bedrock_client]
+
+        assert len(created) == 2
+        assert clients[0] is clients[2]
+        assert registry.get_service() is registry.get_service()
+
+        stats = registry.stats()
+        assert stats["clients_created"] == 2
+        assert stats["client_acquisitions"] == 3
+        assert stats["client_reuses"] == 1
+        assert stats["service_acquisitions"] == 2
+    finally:
+        registry.close()
+
+
+def test_request_body_marks_cacheable_blocks():
+    """Test that prompt blocks get cache_control checkpoints when prompt caching is enabled."""
+    prompt = [PromptBlock("Schema", cache=True), PromptBlock("Katalog", cache=True), PromptBlock("Anfrage")]
+
+    body = LLMService._build_request_body(
+        [{"role": "user", "content": prompt}], [PromptBlock("System", cache=True)], 0.1, 100, prompt_caching=True
+    )
+
+    assert body["system"] == [{"type": "text", "text": "System", "cache_control": {"type": "ephemeral"}}]
+    content = body["messages"][0]["content"]
+    assert [block["text"] for block in content] == ["Schema", "Katalog", "Anfrage"]
+    assert ["cache_control" in block for block in content] == [True, True, False]
+
+    plain = LLMService._build_request_body(
+        [{"role": "user", "content": prompt}], [PromptBlock("System", cache=True)], 0.1, 100, prompt_caching=False
+    )
+    assert plain["system"] == "System"
+    assert plain["messages"][0]["content"] == "Schema\n\nKatalog\n\nAnfrage"
+
+
+def test_usage_metrics_record_cache_tokens():
+    """Test that cache reads and writes are reported from the response usage."""
+    get_llm_usage_metrics().reset()
+    response_body = {
+        "content": [{"type": "text", "text": "Hi"}],
+        "usage": {"input_tokens": 20, "output_tokens": 5, "cache_read_input_tokens": 60},
+    }
+    bedrock_client = MagicMock()
+    bedrock_client.invoke_model.return_value = {"body": MagicMock(read=lambda: json.dumps(response_body))}
+    llm_service = LLMService(model_id_chat="chat-model", bedrock_client=bedrock_client)
+
+    assert llm_service.chat(system_prompt="System", messages=[{"role": "user", "content": "Hello"}]) == "Hi"
+
+    stats = get_llm_usage_metrics().snapshot()["chat-model"]
+    assert stats["requests"] == 1
+    assert stats["cache_read_input_tokens"] == 60
+    assert stats["cache_creation_input_tokens"] == 0
+    assert stats["cache_hit_ratio"] == 0.75
+    get_llm_usage_metrics().reset()
+
+
+def test_usage_metrics_from_stream_events():
+    """Test that streamed responses report usage from message_start and message_delta."""
+    events = [
+        {"type": "message_start", "message": {"usage": {"input_tokens": 10, "cache_creation_input_tokens": 30}}},
+        {"type": "content_block_delta", "delta": {"type": "text_delta", "text": "Hi"}},
+        {"type": "message_delta", "delta": {"stop_reason": "end_turn"}, "usage": {"output_tokens": 7}},
+    ]
+    bedrock_client = MagicMock()
+    bedrock_client.invoke_model_with_response_stream.return_value = {
+        "body": [{"chunk": {"bytes": json.dumps(event).encode()}} for event in events]
+    }
+    get_llm_usage_metrics().reset()
+    llm_service = LLMService(model_id_chat="stream-model", bedrock_client=bedrock_client)
+
+    assert list(llm_service.stream_chat(system_prompt="System", messages=[{"role": "user", "content": "Hi"}])) == ["Hi"]
+
+    stats = get_llm_usage_metrics().snapshot()["stream-model"]
+    assert (stats["requests"], stats["input_tokens"], stats["output_tokens"]) == (1, 10, 7)
+    assert stats["cache_creation_input_tokens"] == 30
+    assert stats["cache_hit_ratio"] == 0.0
+    get_llm_usage_metrics().reset()
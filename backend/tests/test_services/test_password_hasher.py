@@ -0,0 +1,69 @@
+"""Tests for the bounded password hashing pool."""
+
+import asyncio
+import threading
+
+import pytest
+
+from api.core.exceptions import ServiceUnavailableError
+from api.core.password_hasher import PasswordHasher
+
+
+async def test_hash_and_verify_roundtrip():
+    """Test that hashes made in the pool verify in the pool."""
+    hasher = PasswordHasher(max_workers=2, max_queue=2)
+    try:
+        password_hash = await hasher.hash("password123")
+
+        assert password_hash.startswith("$2")
+        assert await hasher.verify("password123", password_hash) is True
+        assert await hasher.verify("wrong", password_hash) is False
+        assert hasher.stats()["completed"] == 3
+        assert hasher.stats()["pending"] == 0
+    finally:
+        hasher.close()
+
+
+async def test_full_queue_rejects_with_service_unavailable():
+    """Test that calls beyond workers + queue fail fast instead of waiting."""
+    hasher = PasswordHasher(max_workers=1, max_queue=1)
+    release = threading.Event()
+    try:
+        running = asyncio.ensure_future(hasher.run(release.wait))
+        queued = asyncio.ensure_future(hasher.run(release.wait))
+        await asyncio.sleep(0)
+
+        with pytest.raises(ServiceUnavailableError) as exc_info:
+            await hasher.verify("password123", "$2b$12$invalid")
+        assert exc_info.value.error_code == "HASHING_BUSY"
+        assert hasher.stats()["rejected"] == 1
+
+        release.set()
+        assert await running is True
+        assert await queued is True
+        # Capacity is available again once the calls completed
+        assert await hasher.verify("password123", await hasher.hash("password123")) is True
+    finally:
+        release.set()
+        hasher.close()
+
+
+async def test_event_loop_not_blocked_while_hashing():
+    """Test that other coroutines run while bcrypt is busy."""
+    hasher = PasswordHasher(max_workers=1, max_queue=0)
+    ticks = 0
+
+    async def ticker():
+        nonlocal ticks
+        while True:
+            ticks += 1
+            await asyncio.sleep(0.001)
+
+    task = asyncio.ensure_future(ticker())
+    try:
+        await hasher.hash("password123")
+    finally:
+        task.cancel()
+        hasher.close()
+
+    assert ticks > 1
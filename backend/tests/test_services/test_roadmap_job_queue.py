@@ -0,0 +1,150 @@
+"""Tests for the background roadmap job queue (without LLM)."""
+
+from datetime import datetime, timedelta
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+from sqlalchemy.exc import IntegrityError
+
+from api.services.roadmap_job_queue import RoadmapJobQueue
+from database.models import Roadmap, RoadmapJob, RoadmapJobStatus, TopicField, UserProfile
+from tests.conftest import TestSessionLocal
+
+MOCK_ROADMAP = {
+    "name": "Mock Roadmap",
+    "description": "Generated by a mocked LLM",
+    "items": [
+        {"item_type": "SKILL", "title": "Semester 1", "semester": 1, "level": 0, "order": 1},
+    ],
+}
+
+
+@pytest.fixture
+def job_context(test_db_session, test_user, test_study_program, test_career_tree_node):
+    """User profile with study program plus a selectable job."""
+    profile = UserProfile(user_id=test_user.id, study_program_id=test_study_program.id, current_semester=1)
+    test_db_session.add(profile)
+    test_db_session.commit()
+    return test_user, test_career_tree_node
+
+
+def make_queue(llm_response=None, llm_error=None) -> RoadmapJobQueue:
+    """Create a queue bound to the test database with a mocked LLM."""
+    llm_service = MagicMock()
+    llm_service.agenerate_roadmap = AsyncMock(return_value=llm_response, side_effect=llm_error)
+    return RoadmapJobQueue(session_factory=TestSessionLocal, num_workers=1, llm_service=llm_service)
+
+
+def test_enqueue_deduplicates_per_topic_field(test_db_session, job_context):
+    """Test that concurrent requests for the same topic field share one job."""
+    user, job = job_context
+    queue = make_queue(MOCK_ROADMAP)
+
+    first = queue.enqueue_for_job(user.id, job, test_db_session)
+    second = queue.enqueue_for_job(user.id, job, test_db_session)
+
+    assert first.id == second.id
+    assert first.status == RoadmapJobStatus.QUEUED
+    assert test_db_session.query(RoadmapJob).count() == 1
+
+
+def test_enqueue_race_returns_the_winning_job(test_db_session, job_context, monkeypatch):
+    """Test that the unique index on active jobs resolves concurrent enqueues onto one job."""
+    user, job = job_context
+    queue = make_queue(MOCK_ROADMAP)
+    winner = queue.enqueue_for_job(user.id, job, test_db_session)
+
+    # The second request checked for an active job before the first one committed
+    real_active_job = RoadmapJobQueue._active_job
+    checks = iter([None])
+    monkeypatch.setattr(
+        RoadmapJobQueue, "_active_job", staticmethod(lambda *args: next(checks, None) or real_active_job(*args))
+    )
+
+    assert queue.enqueue_for_job(user.id, job, test_db_session).id == winner.id
+    assert test_db_session.query(RoadmapJob).count() == 1
+
+    test_db_session.add(RoadmapJob(topic_field_id=winner.topic_field_id, user_id=user.id))
+    with pytest.raises(IntegrityError):
+        test_db_session.commit()
+
+
+def test_recovery_resumes_only_abandoned_jobs(test_db_session, test_user):
+    """Test that startup recovery leaves jobs running in other processes alone."""
+    now = datetime.utcnow()
+    topic_fields = [TopicField(name=f"Topic {i}") for i in range(3)]
+    test_db_session.add_all(topic_fields)
+    test_db_session.flush()
+    running, abandoned, queued = (
+        RoadmapJob(
+            topic_field_id=topic_field.id,
+            user_id=test_user.id,
+            status=status,
+            started_at=started_at,
+        )
+        for topic_field, status, started_at in zip(
+            topic_fields,
+            [RoadmapJobStatus.RUNNING, RoadmapJobStatus.RUNNING, RoadmapJobStatus.QUEUED],
+            [now, now - timedelta(hours=2), None],
+        )
+    )
+    test_db_session.add_all([running, abandoned, queued])
+    test_db_session.commit()
+
+    queue = RoadmapJobQueue(session_factory=TestSessionLocal, num_workers=1, llm_service=MagicMock(), stale_after=600)
+
+    assert queue._recover_unfinished_jobs() == [abandoned.id, queued.id]
+    test_db_session.expire_all()
+    assert running.status == RoadmapJobStatus.RUNNING
+    assert abandoned.status == RoadmapJobStatus.QUEUED
+
+
+async def test_process_skips_job_claimed_elsewhere(test_db_session, job_context):
+    """Test that a job already running in another process is not generated again."""
+    user, job = job_context
+    queue = make_queue(MOCK_ROADMAP)
+    roadmap_job = queue.enqueue_for_job(user.id, job, test_db_session)
+    roadmap_job.status = RoadmapJobStatus.RUNNING
+    test_db_session.commit()
+
+    assert await queue.process(roadmap_job.id) == RoadmapJobStatus.RUNNING
+    queue.llm_service.agenerate_roadmap.assert_not_awaited()
+
+
+async def test_process_generates_roadmap(test_db_session, job_context):
+    """Test that processing a job generates the roadmap and marks the job DONE."""
+    user, job = job_context
+    queue = make_queue(MOCK_ROADMAP)
+    roadmap_job = queue.enqueue_for_job(user.id, job, test_db_session)
+
+    final_status = await queue.process(roadmap_job.id)
+
+    test_db_session.expire_all()
+    roadmap_job = test_db_session.get(RoadmapJob, roadmap_job.id)
+    assert final_status == RoadmapJobStatus.DONE
+    assert roadmap_job.roadmap_id is not None
+    assert roadmap_job.finished_at is not None
+    assert test_db_session.get(Roadmap, roadmap_job.roadmap_id).name == "Mock Roadmap"
+
+    # A new request for the same topic field reuses the existing roadmap
+    again = queue.enqueue_for_job(user.id, job, test_db_session)
+    assert again.status == RoadmapJobStatus.DONE
+    assert again.roadmap_id == roadmap_job.roadmap_id
+    queue.llm_service.agenerate_roadmap.assert_awaited_once()
+
+
+async def test_process_records_failure(test_db_session, job_context):
+    """Test that a failing generation marks the job FAILED with the error message."""
+    from api.core.exceptions import LLMError
+
+    user, job = job_context
+    queue = make_queue(llm_error=LLMError("Bedrock unavailable"))
+    roadmap_job = queue.enqueue_for_job(user.id, job, test_db_session)
+
+    final_status = await queue.process(roadmap_job.id)
+
+    test_db_session.expire_all()
+    roadmap_job = test_db_session.get(RoadmapJob, roadmap_job.id)
+    assert final_status == RoadmapJobStatus.FAILED
+    assert "Bedrock unavailable" in roadmap_job.error
+    assert roadmap_job.roadmap_id is None
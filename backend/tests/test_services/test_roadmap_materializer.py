@@ -0,0 +1,159 @@
+"""Tests for bulk materialization of generated roadmap items."""
+
+import pytest
+from sqlalchemy import event
+
+from api.core.exceptions import ValidationError
+from api.services.roadmap_materializer import RoadmapMaterializer
+from database.models import Roadmap, RoadmapItem, RoadmapItemSkill, RoadmapItemType
+
+
+def _item(llm_id, title, level, parent_id=None, **extra):
+    return {
+        "id": llm_id,
+        "item_type": "SKILL",
+        "title": title,
+        "description": f"{title} description",
+        "semester": 1,
+        "level": level,
+        "parent_id": parent_id,
+        **extra,
+    }
+
+
+@pytest.fixture
+def roadmap(test_db_session, test_topic_field):
+    roadmap = Roadmap(topic_field_id=test_topic_field.id, name="Bulk", description="")
+    test_db_session.add(roadmap)
+    test_db_session.flush()
+    return roadmap
+
+
+def _parents_by_title(db, roadmap_id):
+    items = db.query(RoadmapItem).filter(RoadmapItem.roadmap_id == roadmap_id).all()
+    titles = {item.id: item.title for item in items}
+    return {item.title: titles.get(item.parent_id) for item in items}
+
+
+def test_materialize_resolves_llm_ids(test_db_session, roadmap):
+    """parent_id references the LLM-local ids, regardless of list order."""
+    items = [
+        _item(10, "Career", 2, parent_id=7, item_type="CAREER", is_leaf=True, is_career_goal=True),
+        _item(3, "Semester", 0),
+        _item(7, "Module", 1, parent_id=3, skill_impact=[{"skill": "Python", "impact": 30}]),
+        # Same title as another item must not confuse the resolution
+        _item(8, "Module", 1, parent_id=3),
+    ]
+
+    count = RoadmapMaterializer.materialize(roadmap.id, items, test_db_session)
+    test_db_session.commit()
+
+    assert count == 4
+    items_by_id = {
+        item.id: item for item in test_db_session.query(RoadmapItem).filter(RoadmapItem.roadmap_id == roadmap.id)
+    }
+    career = next(item for item in items_by_id.values() if item.title == "Career")
+    module = items_by_id[career.parent_id]
+    assert module.title == "Module"
+    assert items_by_id[module.parent_id].title == "Semester"
+    assert [(s.skill, s.impact) for s in module.skill_impacts] == [("Python", 30)]
+    assert career.item_type == RoadmapItemType.CAREER
+
+
+def test_materialize_falls_back_to_nearest_level_above(test_db_session, roadmap):
+    """Unknown or missing ids fall back to the preceding item one level up."""
+    items = [
+        _item(None, "Semester", 0),
+        _item(None, "Module A", 1, parent_id=99),
+        _item(None, "Skill A", 2, parent_id=42),
+        _item(None, "Module B", 1, parent_id=1234),
+    ]
+
+    RoadmapMaterializer.materialize(roadmap.id, items, test_db_session)
+    test_db_session.commit()
+
+    assert _parents_by_title(test_db_session, roadmap.id) == {
+        "Semester": None,
+        "Module A": "Semester",
+        "Skill A": "Module A",
+        "Module B": "Semester",
+    }
+
+
+def test_materialize_rejects_parent_below_item(test_db_session, roadmap):
+    """A parent_id pointing at a deeper item (or itself) is not trusted."""
+    items = [
+        _item(1, "Semester", 0),
+        _item(2, "Module", 1, parent_id=3),
+        _item(3, "Skill", 2, parent_id=3),
+    ]
+
+    RoadmapMaterializer.materialize(roadmap.id, items, test_db_session)
+    test_db_session.commit()
+
+    assert _parents_by_title(test_db_session, roadmap.id) == {
+        "Semester": None,
+        "Module": "Semester",
+        "Skill": "Module",
+    }
+
+
+def test_materialize_normalizes_invalid_item_type(test_db_session, roadmap):
+    """SEMESTER_BREAK and unknown item types become COURSE."""
+    items = [
+        _item(1, "Break", 0, item_type="SEMESTER_BREAK"),
+        _item(2, "Unknown", 0, item_type="WORKSHOP"),
+    ]
+
+    RoadmapMaterializer.materialize(roadmap.id, items, test_db_session)
+
+    types = {item.title: item.item_type for item in test_db_session.query(RoadmapItem)}
+    assert types == {"Break": RoadmapItemType.COURSE, "Unknown": RoadmapItemType.COURSE}
+
+
+def test_materialize_requires_semester(test_db_session, roadmap):
+    """Items without semester are rejected before anything is written."""
+    items = [_item(1, "Semester", 0), _item(2, "No Semester", 1, parent_id=1, semester=None)]
+
+    with pytest.raises(ValidationError):
+        RoadmapMaterializer.materialize(roadmap.id, items, test_db_session)
+
+    assert test_db_session.query(RoadmapItem).count() == 0
+
+
+def test_materialize_uses_constant_statement_count(test_db_session, roadmap):
+    """A large roadmap is written with a fixed number of statements."""
+    items = [_item(1, "Semester", 0)]
+    for module in range(50):
+        module_id = 2 + module * 10
+        items.append(_item(module_id, f"Module {module}", 1, parent_id=1))
+        for skill in range(1, 10):
+            items.append(
+                _item(
+                    module_id + skill,
+                    f"Skill {module}.{skill}",
+                    2,
+                    parent_id=module_id,
+                    skill_impact=[{"skill": "Python", "impact": skill}],
+                )
+            )
+
+    statements = []
+
+    def count_statement(conn, cursor, statement, parameters, context, executemany):
+        statements.append(statement)
+
+    engine = test_db_session.get_bind()
+    event.listen(engine, "before_cursor_execute", count_statement)
+    try:
+        count = RoadmapMaterializer.materialize(roadmap.id, items, test_db_session)
+    finally:
+        event.remove(engine, "before_cursor_execute", count_statement)
+
+    assert count == len(items) == 501
+    # One MAX(id) lookup plus batched multi-row INSERTs, not one statement per item
+    assert statements[0].startswith("SELECT")
+    assert all(statement.startswith("INSERT") for statement in statements[1:])
+    assert len(statements) < 10
+    assert test_db_session.query(RoadmapItem).count() == 501
+    assert test_db_session.query(RoadmapItemSkill).count() == 450
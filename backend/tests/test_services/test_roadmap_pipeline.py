@@ -0,0 +1,156 @@
+"""Tests for the staged roadmap generation pipeline."""
+
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+
+from api.core.exceptions import ValidationError
+from api.prompts.prompt_blocks import prompt_text
+from api.services.roadmap_pipeline import (
+    ContextStage,
+    PipelineStage,
+    PromptStage,
+    RoadmapGenerationContext,
+    RoadmapPipeline,
+    StageMetrics,
+    default_stages,
+)
+from api.services.roadmap_service import RoadmapService
+from database.models import Module, ModuleType, RoadmapItem, UserModuleProgress, UserProfile
+
+LLM_RESPONSE = {
+    "name": "Pipeline Roadmap",
+    "description": "Generated",
+    "items": [
+        {"id": 1, "item_type": "MODULE", "title": "Semester", "semester": 1, "level": 0},
+        {"id": 2, "item_type": "CAREER", "title": "Job", "semester": 1, "level": 1, "parent_id": 1},
+    ],
+}
+
+
+@pytest.fixture
+def user_profile(test_user, test_study_program):
+    return UserProfile(user_id=test_user.id, study_program_id=test_study_program.id, current_semester=1)
+
+
+def test_context_stage_excludes_completed_modules(test_db_session, test_user, test_module, user_profile):
+    """Completed modules are split from the available ones."""
+    other = Module(
+        study_program_id=test_module.study_program_id,
+        name="Other Module",
+        module_type=ModuleType.REQUIRED,
+        semester=2,
+    )
+    test_db_session.add(other)
+    test_db_session.add(UserModuleProgress(user_id=test_user.id, module_id=test_module.id, completed=True))
+    test_db_session.commit()
+
+    context = RoadmapGenerationContext(user_profile, test_module.study_program, topic_field=None)
+    ContextStage().run(context, test_db_session)
+
+    assert [module.name for module in context.completed_modules] == ["Test Module"]
+    assert [module.name for module in context.available_modules] == ["Other Module"]
+
+
+def test_prompt_stage_picks_template(
+    test_db_session, test_study_program, test_topic_field, test_career_tree_node, user_profile
+):
+    """Job contexts get the job prompt, topic-field contexts the topic prompt."""
+    topic_context = RoadmapGenerationContext(user_profile, test_study_program, test_topic_field)
+    job_context = RoadmapGenerationContext(
+        user_profile, test_study_program, test_topic_field, job=test_career_tree_node
+    )
+
+    PromptStage().run(topic_context, test_db_session)
+    PromptStage().run(job_context, test_db_session)
+
+    assert test_topic_field.name in prompt_text(topic_context.prompt)
+    assert test_career_tree_node.name in prompt_text(job_context.prompt)
+    assert prompt_text(topic_context.prompt) != prompt_text(job_context.prompt)
+
+
+def test_prompt_stable_blocks_come_first(test_db_session, test_user, test_module, test_topic_field, user_profile):
+    """Instructions and module catalog do not depend on the user, so they form a cacheable prefix."""
+    other = Module(
+        study_program_id=test_module.study_program_id,
+        name="Other Module",
+        module_type=ModuleType.REQUIRED,
+        semester=2,
+    )
+    test_db_session.add(other)
+    test_db_session.commit()
+
+    fresh = RoadmapGenerationContext(user_profile, test_module.study_program, test_topic_field)
+    advanced_profile = UserProfile(
+        user_id=test_user.id, study_program_id=test_module.study_program_id, current_semester=3, skills="Python"
+    )
+    advanced = RoadmapGenerationContext(advanced_profile, test_module.study_program, test_topic_field)
+    advanced.available_modules, advanced.completed_modules = [other], [test_module]
+    fresh.available_modules = [test_module, other]
+
+    PromptStage().run(fresh, test_db_session)
+    PromptStage().run(advanced, test_db_session)
+
+    assert [block.cache for block in fresh.prompt] == [True, True, False]
+    assert fresh.prompt[:2] == advanced.prompt[:2]
+    assert "Other Module" in fresh.prompt[1].text and "Test Module" in fresh.prompt[1].text
+    assert fresh.prompt[2] != advanced.prompt[2]
+    assert "Python" in advanced.prompt[2].text
+
+
+def test_pipeline_records_stage_timings(test_db_session, test_study_program, test_topic_field, user_profile):
+    """Every stage is timed on the context and in the metrics."""
+    llm_service = MagicMock()
+    llm_service.generate_roadmap.return_value = LLM_RESPONSE
+    metrics = StageMetrics()
+    pipeline = RoadmapPipeline(default_stages(llm_service), metrics=metrics)
+
+    context = RoadmapGenerationContext(user_profile, test_study_program, test_topic_field)
+    pipeline.run(context, test_db_session)
+
+    assert list(context.timings) == ["context", "prompt", "llm", "validate", "materialize"]
+    assert context.roadmap.name == "Pipeline Roadmap"
+    assert context.item_count == 2
+    snapshot = metrics.snapshot()
+    assert snapshot["llm"]["count"] == 1
+    assert snapshot["llm"]["errors"] == 0
+    assert snapshot["materialize"]["avg_seconds"] == snapshot["materialize"]["total_seconds"]
+
+
+def test_pipeline_records_failed_stage(test_db_session, test_study_program, test_topic_field, user_profile):
+    """A failing stage is timed and counted as an error, later stages do not run."""
+    llm_service = MagicMock()
+    llm_service.generate_roadmap.return_value = {"unexpected": True}
+    metrics = StageMetrics()
+    pipeline = RoadmapPipeline(default_stages(llm_service), metrics=metrics)
+
+    context = RoadmapGenerationContext(user_profile, test_study_program, test_topic_field)
+    with pytest.raises(ValidationError):
+        pipeline.run(context, test_db_session)
+
+    assert metrics.snapshot()["validate"]["errors"] == 1
+    assert "materialize" not in context.timings
+
+
+async def test_service_uses_custom_stages(test_db_session, test_study_program, test_topic_field, user_profile):
+    """Stages are pluggable: a replacement LLM stage feeds the remaining stages."""
+
+    class CannedLLMStage(PipelineStage):
+        name = "llm"
+
+        def run(self, context, db):
+            context.llm_response = LLM_RESPONSE
+
+    llm_service = MagicMock()
+    llm_service.agenerate_roadmap = AsyncMock()
+    stages = default_stages(llm_service)
+    stages[2] = CannedLLMStage()
+    roadmap_service = RoadmapService(llm_service=llm_service, stages=stages)
+
+    roadmap = await roadmap_service.agenerate_roadmap(
+        user_profile, test_topic_field, test_study_program, test_db_session
+    )
+
+    assert roadmap.name == "Pipeline Roadmap"
+    assert test_db_session.query(RoadmapItem).filter(RoadmapItem.roadmap_id == roadmap.id).count() == 2
+    llm_service.agenerate_roadmap.assert_not_called()
@@ -0,0 +1,63 @@
+"""Tests for roadmap prompt fragments."""
+
+import json
+
+from sqlalchemy import update
+
+from api.prompts import roadmap_prompts
+from api.prompts.roadmap_prompts import (
+    ROADMAP_JSON_SCHEMA,
+    ROADMAP_JSON_SCHEMA_TEXT,
+    generate_module_catalog,
+    generate_roadmap_prompt,
+)
+from database.models import Module, ModuleType, UserProfile
+
+
+def test_schema_text_is_precomputed():
+    """Test that the schema is serialized once and embedded in the instructions."""
+    assert json.loads(ROADMAP_JSON_SCHEMA_TEXT) == ROADMAP_JSON_SCHEMA
+    assert ROADMAP_JSON_SCHEMA_TEXT in roadmap_prompts.ROADMAP_INSTRUCTIONS
+    assert ROADMAP_JSON_SCHEMA_TEXT in roadmap_prompts.ROADMAP_INSTRUCTIONS_FOR_JOB
+
+
+def test_module_catalog_is_memoized(test_db_session, test_study_program, test_module, monkeypatch):
+    """Test that the catalog is serialized once per study program and module set."""
+    roadmap_prompts.invalidate_module_catalogs()
+    dumps = []
+    real_dumps = json.dumps
+    monkeypatch.setattr(roadmap_prompts.json, "dumps", lambda *a, **kw: dumps.append(1) or real_dumps(*a, **kw))
+
+    first = generate_module_catalog(test_study_program, [test_module])
+    second = generate_module_catalog(test_study_program, [test_module])
+
+    assert first is second
+    assert len(dumps) == 1
+    assert "Test Module" in first
+
+
+def test_module_catalog_invalidated_on_module_change(
+    test_db_session, test_study_program, test_module, test_user, test_topic_field
+):
+    """Test that updates, inserts and bulk updates of modules rebuild the catalog."""
+    roadmap_prompts.invalidate_module_catalogs()
+    assert "Test Module" in generate_module_catalog(test_study_program, [test_module])
+
+    test_module.name = "Renamed Module"
+    test_db_session.commit()
+    assert "Renamed Module" in generate_module_catalog(test_study_program, [test_module])
+
+    test_db_session.execute(update(Module).where(Module.id == test_module.id).values(description="Neu"))
+    test_db_session.commit()
+    test_db_session.refresh(test_module)
+    assert "Neu" in generate_module_catalog(test_study_program, [test_module])
+
+    added = Module(
+        study_program_id=test_study_program.id, name="Added Module", module_type=ModuleType.ELECTIVE, semester=4
+    )
+    test_db_session.add(added)
+    test_db_session.commit()
+
+    profile = UserProfile(user_id=test_user.id, study_program_id=test_study_program.id, current_semester=1)
+    prompt = generate_roadmap_prompt(test_study_program, profile, test_topic_field, [test_module, added])
+    assert "Added Module" in prompt[1].text
@@ -72,3 +72,114 @@ def test_get_roadmap_not_found_by_field(test_db_session):
     roadmap = RoadmapService.get_roadmap(99999, test_db_session)
     assert roadmap is None
 
+
+
+async def test_agenerate_roadmap_single_flight(test_db_session, test_user, test_topic_field, test_study_program):
+    """Test that concurrent generations for one topic field call the LLM once."""
+    import asyncio
+    from unittest.mock import MagicMock
+
+    from database.models import Roadmap, UserProfile
+
+    profile = UserProfile(user_id=test_user.id, study_program_id=test_study_program.id, current_semester=1)
+    test_db_session.add(profile)
+    test_db_session.commit()
+
+    async def slow_generate(prompt):
+        await asyncio.sleep(0.05)
+        return {
+            "name": "Mock Roadmap",
+            "items": [{"item_type": "SKILL", "title": "Semester 1", "semester": 1, "level": 0, "order": 1}],
+        }
+
+    llm_service = MagicMock()
+    llm_service.agenerate_roadmap = MagicMock(side_effect=slow_generate)
+    roadmap_service = RoadmapService(llm_service=llm_service)
+
+    roadmaps = await asyncio.gather(
+        *[
+            roadmap_service.agenerate_roadmap(profile, test_topic_field, test_study_program, test_db_session)
+            for _ in range(3)
+        ]
+    )
+
+    assert llm_service.agenerate_roadmap.call_count == 1
+    assert len({roadmap.id for roadmap in roadmaps}) == 1
+    assert test_db_session.query(Roadmap).filter(Roadmap.topic_field_id == test_topic_field.id).count() == 1
+
+
+def test_build_tree_from_items_deep_chain():
+    """Test that very deep trees are built without hitting the recursion limit."""
+    import sys
+    from datetime import datetime
+
+    depth = sys.getrecursionlimit() + 500
+    items = [
+        RoadmapItem(
+            id=i,
+            roadmap_id=1,
+            parent_id=i - 1 if i > 1 else None,
+            item_type=RoadmapItemType.COURSE,
+            title=f"Item {i}",
+            semester=1,
+            is_semester_break=False,
+            order=i,
+            level=i - 1,
+            is_leaf=i == depth,
+            is_career_goal=False,
+            is_important=False,
+            created_at=datetime.utcnow(),
+        )
+        for i in range(1, depth + 1)
+    ]
+
+    node = RoadmapService.build_tree_from_items(items)
+
+    count = 1
+    while node.children:
+        assert len(node.children) == 1
+        node = node.children[0]
+        count += 1
+    assert count == depth
+    assert node.id == depth
+
+
+def test_generated_roadmap_stores_skills_in_tables(test_db_session, test_topic_field):
+    """Test that skill data from the LLM is stored as rows and returned without description markers."""
+    from api.services.roadmap_pipeline import (
+        MaterializeStage,
+        RoadmapGenerationContext,
+        RoadmapPipeline,
+        ValidateStage,
+    )
+
+    llm_response = {
+        "name": "Skill Roadmap",
+        "description": "Roadmap description",
+        "current_skills": [{"skill": "Python", "score": 20}, {"skill": "Broken", "score": 500}],
+        "items": [
+            {
+                "item_type": "COURSE",
+                "title": "Python Basics",
+                "description": "Learn Python",
+                "semester": 1,
+                "level": 0,
+                "order": 1,
+                "skill_impact": [{"skill": "Python", "impact": 40}],
+            },
+        ],
+    }
+
+    context = RoadmapGenerationContext(
+        user_profile=None, study_program=None, topic_field=test_topic_field, llm_response=llm_response
+    )
+    RoadmapPipeline([ValidateStage(), MaterializeStage()]).run(context, test_db_session)
+
+    response = RoadmapService.get_roadmap_with_tree(test_topic_field.id, test_db_session)
+
+    assert response.description == "Roadmap description"
+    assert [(s.skill, s.score) for s in response.current_skills] == [("Python", 20)]
+    item = response.items[0]
+    assert item.description == "Learn Python"
+    assert [(s.skill, s.impact) for s in item.skill_impact] == [("Python", 40)]
+    assert response.tree.skill_impact == item.skill_impact
@@ -0,0 +1,86 @@
+"""Tests for single-flight generation coordination."""
+
+import asyncio
+from datetime import datetime, timedelta
+
+from api.services.single_flight import SingleFlight
+from database.models import GenerationLock
+
+
+async def test_concurrent_callers_share_one_execution(test_db_session):
+    """Test that concurrent callers with the same key await one execution."""
+    single_flight = SingleFlight(poll_interval=0.01)
+    calls = []
+
+    async def work():
+        calls.append(1)
+        await asyncio.sleep(0.05)
+        return 42
+
+    results = await asyncio.gather(*[single_flight.run("topic_field:1", test_db_session, work) for _ in range(5)])
+
+    assert results == [42] * 5
+    assert len(calls) == 1
+    assert not single_flight.in_flight("topic_field:1")
+    assert test_db_session.query(GenerationLock).count() == 0
+
+
+async def test_waits_for_lock_held_by_other_process(test_db_session):
+    """Test that a lock row of another process blocks until it is released."""
+    now = datetime.utcnow()
+    test_db_session.add(
+        GenerationLock(key="topic_field:2", owner="other", acquired_at=now, expires_at=now + timedelta(minutes=5))
+    )
+    test_db_session.commit()
+
+    single_flight = SingleFlight(poll_interval=0.01)
+    events = []
+
+    async def work():
+        events.append("work")
+        return "done"
+
+    async def other_process_finishes():
+        await asyncio.sleep(0.05)
+        events.append("released")
+        test_db_session.query(GenerationLock).filter(GenerationLock.key == "topic_field:2").delete()
+        test_db_session.commit()
+
+    result, _ = await asyncio.gather(
+        single_flight.run("topic_field:2", test_db_session, work),
+        other_process_finishes(),
+    )
+
+    assert result == "done"
+    assert events == ["released", "work"]
+
+
+async def test_expired_lock_is_taken_over(test_db_session):
+    """Test that a lock abandoned by a crashed process does not block forever."""
+    past = datetime.utcnow() - timedelta(hours=1)
+    test_db_session.add(GenerationLock(key="job:3", owner="crashed", acquired_at=past, expires_at=past))
+    test_db_session.commit()
+
+    single_flight = SingleFlight(poll_interval=0.01)
+
+    async def work():
+        return "taken over"
+
+    assert await asyncio.wait_for(single_flight.run("job:3", test_db_session, work), timeout=1) == "taken over"
+
+
+async def test_lock_is_renewed_while_leader_runs(test_db_session):
+    """Test that a generation running longer than the TTL keeps its lock."""
+    single_flight = SingleFlight(lock_ttl=0.15, poll_interval=0.01)
+    other_process = SingleFlight(lock_ttl=0.15, poll_interval=0.01)
+    taken_over = []
+
+    async def work():
+        for _ in range(6):
+            await asyncio.sleep(0.05)
+            taken_over.append(other_process._try_acquire("topic_field:4", test_db_session))
+        return "done"
+
+    assert await single_flight.run("topic_field:4", test_db_session, work) == "done"
+    assert taken_over == [False] * 6
+    assert test_db_session.query(GenerationLock).count() == 0